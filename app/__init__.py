@@ -1,14 +1,28 @@
 import os
+import time
 from dotenv import load_dotenv
-from flask import Flask
+from flask import Flask, g
+from jinja2 import FileSystemBytecodeCache
 from app.routes.project_routes import project_bp
 from app.routes.task_routes import task_bp  
 from app.routes.error_routes import error_bp
 from app.routes.home_routes import home_bp
 from app.routes.auth_routes import auth_bp
 from app.routes.focus_session_route import focus_session_bp
+from app.routes.export_routes import export_bp
+from app.routes.metrics_routes import metrics_bp
+from app.routes.focus_group_routes import focus_group_bp
+from app.routes.leaderboard_routes import leaderboard_bp
+from app.routes.admin_routes import admin_bp
 from app.infra.db import db 
-from .websocket import socketio
+from app.infra.statement_metrics import register_statement_metrics
+from app.commands import register_commands
+from app.utils.fragment_cache import fragment_cache
+from app.utils.assets import register_assets
+from app.utils.compression import register_compression
+from app.utils.profiler import register_profiler
+from app.utils.json_provider import FastJSONProvider
+from .websocket import socketio, configure_presence
 
 load_dotenv()
 
@@ -18,9 +32,69 @@ def create_app():
     app.config['SECRET_KEY'] = 'secret'
     app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv("DATABASE_URI")
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    # Réplica opcional para leituras (ver app/infra/routing_session.py).
+    app.config['SQLALCHEMY_BINDS'] = {"replica": os.getenv("DATABASE_REPLICA_URI")} if os.getenv("DATABASE_REPLICA_URI") else {}
+    app.config['READ_YOUR_WRITES_SECONDS'] = float(os.getenv("READ_YOUR_WRITES_SECONDS", "0"))
+    # Corpos menores que isso saem sem compressão (ver app/utils/compression.py).
+    app.config['COMPRESS_MIN_SIZE'] = int(os.getenv("COMPRESS_MIN_SIZE", "500"))
+    # Sessões com mais de COLD_ARCHIVE_HORIZON_DAYS dias vão para arquivos por usuário (ver app/infra/cold_archive.py).
+    app.config['COLD_ARCHIVE_DIR'] = os.getenv("COLD_ARCHIVE_DIR", os.path.join(app.instance_path, "cold_archive"))
+    app.config['COLD_ARCHIVE_HORIZON_DAYS'] = int(os.getenv("COLD_ARCHIVE_HORIZON_DAYS", "365"))
+    # Fila de trabalhos em SQL (ver app/services/job_service.py). Por padrão executa tudo na hora, na requisição;
+    # JOBS_RUN_INLINE=0 só com um `flask jobs worker` rodando (ou `python prefork.py --job-workers N`), senão
+    # rollups, heatmap, analytics e leaderboard param de refletir as sessões novas.
+    app.config['JOBS_RUN_INLINE'] = os.getenv("JOBS_RUN_INLINE", "1") in ("1", "true", "yes")
+    app.config['JOB_MAX_ATTEMPTS'] = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+    app.config['JOB_BACKOFF_SECONDS'] = int(os.getenv("JOB_BACKOFF_SECONDS", "10"))
+    app.config['JOB_BACKOFF_MAX_SECONDS'] = int(os.getenv("JOB_BACKOFF_MAX_SECONDS", "3600"))
+    app.config['JOB_LOCK_TIMEOUT_SECONDS'] = int(os.getenv("JOB_LOCK_TIMEOUT_SECONDS", "600"))
+    # Intervalo da varredura de presença do websocket (sids que sumiram sem disconnect).
+    app.config['PRESENCE_SWEEP_SECONDS'] = float(os.getenv("PRESENCE_SWEEP_SECONDS", "60"))
+    # Fila (ex.: redis://...) que repassa os emits do Socket.IO entre processos; obrigatória com mais de um worker web.
+    app.config['SOCKETIO_MESSAGE_QUEUE'] = os.getenv("SOCKETIO_MESSAGE_QUEUE")
+    # Quem está em foco, compartilhado entre os workers web (ver app/utils/presence.py); obrigatório com mais de
+    # um worker. Por padrão usa o mesmo Redis da fila do Socket.IO; vazio guarda a presença em memória, por processo.
+    message_queue = app.config['SOCKETIO_MESSAGE_QUEUE'] or ""
+    app.config['PRESENCE_REDIS_URL'] = os.getenv(
+        "PRESENCE_REDIS_URL", message_queue if message_queue.startswith(("redis://", "rediss://", "unix://")) else "")
+    # Conexões com mais pacotes que isso esperando envio são derrubadas (cliente lento); checagem a cada N segundos.
+    app.config['SOCKET_OUTBOUND_MAX_PACKETS'] = int(os.getenv("SOCKET_OUTBOUND_MAX_PACKETS", "256"))
+    app.config['SOCKET_OUTBOUND_CHECK_SECONDS'] = float(os.getenv("SOCKET_OUTBOUND_CHECK_SECONDS", "5"))
+    # Quanto tempo um worker pode usar a lista de grupos de um usuário em cache depois de outro worker mudá-la.
+    # Com mais de um worker, entrar/sair de grupo só move as salas das abas do worker que atendeu a requisição;
+    # as abas dos outros workers refazem as delas (e o cache) quando o cliente responde groups_changed com sync_rooms.
+    app.config['FOCUS_GROUP_CACHE_SECONDS'] = float(os.getenv("FOCUS_GROUP_CACHE_SECONDS", "60"))
+    # Sorted sets no Redis para o leaderboard (compartilhado entre workers); vazio usa um índice em memória por processo.
+    app.config['LEADERBOARD_REDIS_URL'] = os.getenv("LEADERBOARD_REDIS_URL")
+    # Usuários com acesso às rotas /admin (lista separada por vírgulas); o profiler grava em PROFILE_DIR.
+    app.config['ADMIN_USER_IDS'] = {value.strip() for value in os.getenv("ADMIN_USER_IDS", "").split(",") if value.strip()}
+    app.config['PROFILE_DIR'] = os.getenv("PROFILE_DIR", os.path.join(app.instance_path, "profiles"))
+    app.config['EXPORT_DIR'] = os.getenv("EXPORT_DIR", os.path.join(app.instance_path, "exports"))
+
+    # orjson quando instalado, stdlib como fallback; mesma saída nos dois (ver app/utils/json_provider.py).
+    app.json = FastJSONProvider(app)
+
+    # Templates compilados ficam em disco (JINJA_BYTECODE_CACHE_DIR ou um diretório do usuário em /tmp),
+    # então um worker novo não recompila todos os templates na primeira requisição.
+    bytecode_cache_dir = os.getenv("JINJA_BYTECODE_CACHE_DIR")
+    if bytecode_cache_dir:
+        os.makedirs(bytecode_cache_dir, exist_ok=True)
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+    app.jinja_env.globals["cached_fragment"] = fragment_cache.render
+    # Assets com hash no nome resolvidos pelo manifest do `flask assets build` (ver app/utils/assets.py).
+    register_assets(app)
+    register_compression(app)
+    register_profiler(app)
+
+    @app.before_request
+    def _mark_request_start():
+        g.request_started_at = time.perf_counter()
 
     db.init_app(app)
-    socketio.init_app(app)
+    register_statement_metrics()
+    # Sem fila, emits para salas (user:<id>, group:<id>) só chegam aos sockets do próprio processo.
+    socketio.init_app(app, message_queue=app.config['SOCKETIO_MESSAGE_QUEUE'])
+    configure_presence(app)
     
     app.register_blueprint(project_bp)  
     app.register_blueprint(task_bp)  
@@ -28,5 +102,12 @@ def create_app():
     app.register_blueprint(home_bp)  
     app.register_blueprint(auth_bp)  
     app.register_blueprint(focus_session_bp)
+    app.register_blueprint(export_bp)
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(focus_group_bp)
+    app.register_blueprint(leaderboard_bp)
+    app.register_blueprint(admin_bp)
+
+    register_commands(app)
 
     return app
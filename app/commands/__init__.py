@@ -0,0 +1,15 @@
+from .focus_session_commands import focus_session_cli
+from .legacy_commands import legacy_cli
+from .export_commands import export_cli
+from .asset_commands import assets_cli
+from .job_commands import jobs_cli
+from .leaderboard_commands import leaderboard_cli
+
+
+def register_commands(app):
+    app.cli.add_command(focus_session_cli)
+    app.cli.add_command(legacy_cli)
+    app.cli.add_command(export_cli)
+    app.cli.add_command(assets_cli)
+    app.cli.add_command(jobs_cli)
+    app.cli.add_command(leaderboard_cli)
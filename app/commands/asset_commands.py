@@ -0,0 +1,19 @@
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from app.utils.asset_build import build_assets
+from app.utils.assets import load_manifest
+
+
+assets_cli = AppGroup("assets", help="Build dos assets estáticos.")
+
+
+@assets_cli.command("build")
+def build_assets_command():
+    """Gera bundles minificados com hash no nome, variantes .gz/.br e static/dist/manifest.json."""
+    manifest = build_assets(current_app.static_folder)
+    load_manifest(current_app)
+    for name, hashed in sorted(manifest["assets"].items()):
+        encodings = ", ".join(manifest["encodings"][hashed]) or "uncompressed"
+        click.echo(f"{name} -> {hashed} ({encodings})")
@@ -0,0 +1,38 @@
+import sys
+
+import click
+from flask.cli import AppGroup
+
+from app.infra.repository.user_repository import UserRepository
+from app.services.export_service import ExportService, EXPORT_FORMATS, EXPORT_DATASETS
+
+
+export_cli = AppGroup("export", help="Exportação do histórico de usuários.")
+
+
+@export_cli.command("history")
+@click.option("--user", "user_ref", required=True, help="Email ou identificator do usuário.")
+@click.option("--format", "export_format", type=click.Choice(EXPORT_FORMATS), default="ndjson", show_default=True)
+@click.option("--include", default=",".join(EXPORT_DATASETS), show_default=True, help="Conjuntos separados por vírgula.")
+@click.option("--gzip/--no-gzip", "compress", default=True, show_default=True)
+@click.option("--output", type=click.Path(dir_okay=False), default=None, help="Arquivo de saída. Padrão: stdout.")
+def export_history_command(user_ref, export_format, include, compress, output):
+    """Exporta em streaming as focus sessions e tasks de um usuário."""
+    repo = UserRepository()
+    user = repo.get_by_email(user_ref) if "@" in user_ref else repo.get_by_id(user_ref)
+    if not user:
+        raise click.ClickException(f"User '{user_ref}' not found.")
+
+    datasets = tuple(d for d in include.split(",") if d)
+    try:
+        chunks = ExportService().stream_history(user_id=user.identificator, export_format=export_format, compress=compress, datasets=datasets)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+    stream = open(output, "wb") if output else sys.stdout.buffer
+    try:
+        for chunk in chunks:
+            stream.write(chunk)
+    finally:
+        if output:
+            stream.close()
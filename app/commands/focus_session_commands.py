@@ -0,0 +1,108 @@
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import inspect, text
+
+from app.infra.cold_archive import utc_horizon
+from app.infra.db import db
+from app.infra.entities.focus_session_db import FocusSessionDB
+from app.infra.entities.focus_daily_rollup_db import FocusDailyRollupDB
+from app.infra.partitioning import FocusSessionPartitions
+from app.infra.repository.focus_daily_rollup_repository import FocusDailyRollupRepository
+from app.services.focus_session_service import FocusSessionService, rollup_rebuild_since
+from app.utils.timezones import is_valid_timezone
+
+
+focus_session_cli = AppGroup("focus-sessions", help="Manutenção da tabela focus_sessions.")
+
+
+@focus_session_cli.command("resegment")
+@click.option("--batch-size", default=500, show_default=True, help="Linhas lidas e commitadas por lote.")
+@click.option("--start-after-id", default=0, show_default=True, help="Retoma a migração a partir deste id.")
+def resegment_command(batch_size, start_after_id):
+    """Divide em segmentos diários as sessões gravadas que atravessam a meia-noite."""
+    # Bancos criados antes do índice (project_id, started_at) não o recebem via create_all.
+    for index in FocusSessionDB.__table__.indexes:
+        index.create(bind=db.engine, checkfirst=True)
+
+    result = FocusSessionService().resegment_existing_sessions(batch_size=batch_size, start_after_id=start_after_id)
+    click.echo(
+        f"Scanned {result['scanned']} sessions, split {result['split']}, "
+        f"created {result['created']} segments (last id {result['last_id']})."
+    )
+
+
+@focus_session_cli.command("rebuild-rollups")
+def rebuild_rollups_command():
+    """Recalcula a tabela focus_daily_rollups a partir de focus_sessions."""
+    FocusDailyRollupDB.__table__.create(bind=db.engine, checkfirst=True)
+    since = rollup_rebuild_since()
+    rows = FocusDailyRollupRepository().rebuild(since=since)
+    db.session.commit()
+    click.echo(f"Rebuilt {rows} daily rollup rows" + (f" since {since}." if since else "."))
+
+
+@focus_session_cli.command("archive")
+@click.option("--horizon-days", type=int, default=None, help="Idade mínima (dias) das sessões arquivadas. Padrão: COLD_ARCHIVE_HORIZON_DAYS.")
+def archive_command(horizon_days):
+    """Move as sessões antigas para arquivos colunares comprimidos por usuário (os rollups diários ficam no banco)."""
+    days = horizon_days if horizon_days is not None else current_app.config["COLD_ARCHIVE_HORIZON_DAYS"]
+    if days < 1:
+        raise click.BadParameter("must be at least 1 day.", param_hint="--horizon-days")
+    horizon = utc_horizon(days)
+    result = FocusSessionService().archive_older_than(horizon)
+    click.echo(f"Archived {result['archived']} sessions of {result['users']} users (started before {horizon:%Y-%m-%d} UTC).")
+
+
+partitions_cli = AppGroup("partitions", help="Partições mensais de focus_sessions (started_at).")
+focus_session_cli.add_command(partitions_cli)
+
+
+@partitions_cli.command("ensure")
+@click.option("--months-ahead", default=3, show_default=True, help="Meses futuros que devem ter partição pronta.")
+def ensure_partitions_command(months_ahead):
+    """Particiona a tabela (primeira execução) e cria as partições dos próximos meses. Rodar mensalmente."""
+    created = FocusSessionPartitions().ensure(months_ahead=months_ahead)
+    db.session.commit()
+    click.echo(f"Created {len(created)} partitions: {', '.join(created) or '-'}.")
+
+
+@partitions_cli.command("detach")
+@click.option("--keep-months", default=12, show_default=True, help="Meses (contando o atual) que ficam em focus_sessions.")
+def detach_partitions_command(keep_months):
+    """Move os meses antigos para tabelas focus_sessions_pYYYYMM, fora das consultas do dia a dia."""
+    if keep_months < 1:
+        raise click.BadParameter("must keep at least the current month.", param_hint="--keep-months")
+    detached = FocusSessionPartitions().detach_older_than(keep_months=keep_months)
+    db.session.commit()
+    click.echo(f"Detached {len(detached)} months: {', '.join(detached) or '-'}.")
+
+
+@partitions_cli.command("list")
+def list_partitions_command():
+    """Lista as partições vivas e os períodos destacados."""
+    for row in FocusSessionPartitions().describe():
+        click.echo(f"{row['name']:<28} {row['month'] or 'MAXVALUE':<10} {'live' if row['live'] else 'detached'}")
+
+
+@focus_session_cli.command("convert-to-utc")
+@click.option("--from-timezone", required=True, help="Fuso (IANA) em que os started_at atuais foram gravados.")
+@click.option("--user", "user_id", default=None, help="Converte apenas as sessões deste usuário (identificator).")
+@click.option("--batch-size", default=500, show_default=True, help="Linhas lidas e commitadas por lote.")
+@click.option("--start-after-id", default=0, show_default=True, help="Retoma a migração a partir deste id.")
+def convert_to_utc_command(from_timezone, user_id, batch_size, start_after_id):
+    """Migração única: passa started_at de hora local para UTC e grava o fuso dos usuários."""
+    if not is_valid_timezone(from_timezone):
+        raise click.BadParameter(f"Unknown timezone '{from_timezone}'.", param_hint="--from-timezone")
+    # Bancos criados antes de users.timezone não recebem a coluna via create_all.
+    if "timezone" not in {column["name"] for column in inspect(db.engine).get_columns("users")}:
+        with db.engine.begin() as connection:
+            connection.execute(text("ALTER TABLE users ADD COLUMN timezone VARCHAR(64) NOT NULL DEFAULT 'UTC'"))
+    FocusDailyRollupDB.__table__.create(bind=db.engine, checkfirst=True)
+
+    result = FocusSessionService().convert_to_utc(
+        from_timezone=from_timezone, user_id=user_id, batch_size=batch_size, start_after_id=start_after_id)
+    click.echo(
+        f"Converted {result['converted']} sessions of {result['users']} users, "
+        f"rebuilt {result['rollups']} daily rollups (last id {result['last_id']})."
+    )
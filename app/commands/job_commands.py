@@ -0,0 +1,88 @@
+import multiprocessing
+import os
+import signal
+import socket
+
+import click
+from flask.cli import AppGroup
+
+from app.infra.db import db
+from app.infra.entities.job_db import JobDB
+from app.services.job_service import JobService, TEMPLATES_WARM
+
+
+jobs_cli = AppGroup("jobs", help="Fila de trabalhos adiados (tabela jobs).")
+
+
+def run_worker(worker_id: str, burst: bool, poll_interval: float) -> int:
+    stopping = []
+    # SIGTERM/SIGINT terminam o trabalho atual e saem; o próximo fica na fila.
+    signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+    signal.signal(signal.SIGINT, lambda *_: stopping.append(True))
+    return JobService().work(worker_id, burst=burst, poll_interval=poll_interval, should_stop=lambda: bool(stopping))
+
+
+def _worker_process(worker_id: str, burst: bool, poll_interval: float) -> None:
+    # Processo novo (spawn): cria o próprio app e as próprias conexões com o banco.
+    from app import create_app
+    with create_app().app_context():
+        run_worker(worker_id, burst, poll_interval)
+
+
+@jobs_cli.command("worker")
+@click.option("--processes", default=1, show_default=True, help="Processos worker em paralelo.")
+@click.option("--burst", is_flag=True, help="Sai quando a fila estiver vazia.")
+@click.option("--poll-interval", default=1.0, show_default=True, help="Segundos entre consultas com a fila vazia.")
+def worker_command(processes, burst, poll_interval):
+    """Executa os trabalhos da fila até receber SIGTERM/SIGINT. Os processos web precisam de JOBS_RUN_INLINE=0."""
+    JobDB.__table__.create(bind=db.engine, checkfirst=True)
+    prefix = f"{socket.gethostname()}:{os.getpid()}"
+    if processes <= 1:
+        processed = run_worker(prefix, burst, poll_interval)
+        click.echo(f"Worker {prefix} processed {processed} jobs.")
+        return
+
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=_worker_process, args=(f"{prefix}-{i}", burst, poll_interval), daemon=False)
+               for i in range(processes)]
+    for process in workers:
+        process.start()
+    try:
+        for process in workers:
+            process.join()
+    except KeyboardInterrupt:
+        for process in workers:
+            process.terminate()
+        for process in workers:
+            process.join()
+    click.echo(f"{processes} workers exited.")
+
+
+@jobs_cli.command("stats")
+def stats_command():
+    """Quantidade de trabalhos por tipo e status."""
+    for kind, counts in sorted(JobService().stats().items()):
+        click.echo(f"{kind:<24} " + "  ".join(f"{status}={total}" for status, total in sorted(counts.items())))
+
+
+@jobs_cli.command("retry-failed")
+@click.option("--kind", default=None, help="Só trabalhos deste tipo.")
+def retry_failed_command(kind):
+    """Devolve à fila os trabalhos que esgotaram as tentativas."""
+    click.echo(f"Requeued {JobService().retry_failed(kind=kind)} jobs.")
+
+
+@jobs_cli.command("purge")
+@click.option("--older-than-days", default=7, show_default=True)
+def purge_command(older_than_days):
+    """Remove trabalhos concluídos há mais de N dias."""
+    click.echo(f"Purged {JobService().purge_finished(older_than_days=older_than_days)} jobs.")
+
+
+@jobs_cli.command("warm-templates")
+def warm_templates_command():
+    """Enfileira a compilação dos templates para o bytecode cache (rodar após o deploy)."""
+    service = JobService()
+    job = service.enqueue(TEMPLATES_WARM, dedupe_key=TEMPLATES_WARM, track=True)
+    db.session.commit()
+    click.echo(f"Queued job {job.id}.")
@@ -0,0 +1,20 @@
+from datetime import datetime, timedelta, timezone
+
+import click
+from flask.cli import AppGroup
+
+from app.services.leaderboard_service import LeaderboardService, PERIODS, period_start
+
+
+leaderboard_cli = AppGroup("leaderboard", help="Índices do leaderboard de tempo em foco.")
+
+
+@leaderboard_cli.command("rebuild")
+@click.option("--period", type=click.Choice(PERIODS), default=None, help="Só este período (padrão: todos).")
+def rebuild_command(period):
+    """Reconstrói a partir dos rollups os períodos atuais (ontem, hoje e amanhã em UTC cobrem todos os fusos)."""
+    service = LeaderboardService()
+    today = datetime.now(timezone.utc).date()
+    for name in ([period] if period else PERIODS):
+        for start in sorted({period_start(name, today + timedelta(days=offset)) for offset in (-1, 0, 1)}):
+            click.echo(f"{name} {start.isoformat()}: {service.rebuild(name, start)} users")
@@ -0,0 +1,28 @@
+import os
+
+import click
+from flask.cli import AppGroup
+
+from app.infra.importers import LegacyJsonImporter
+
+
+legacy_cli = AppGroup("legacy", help="Migração do antigo armazenamento em JSON.")
+
+DEFAULT_SOURCE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "infra", "repository", "database")
+
+
+@legacy_cli.command("import")
+@click.option("--source-dir", default=DEFAULT_SOURCE_DIR, show_default=True, help="Pasta com user.json, task.json e todo.json.")
+@click.option("--batch-size", default=1000, show_default=True, help="Elementos por lote (um commit + checkpoint por lote).")
+@click.option("--checkpoint", "checkpoint_path", default=None, help="Arquivo de checkpoint. Padrão: <source-dir>/.import_checkpoint.json")
+@click.option("--restart", is_flag=True, help="Ignora o checkpoint existente e começa do início.")
+def import_command(source_dir, batch_size, checkpoint_path, restart):
+    """Importa user.json, task.json e todo.json para as tabelas SQL, retomando do último checkpoint."""
+    importer = LegacyJsonImporter(source_dir=source_dir, batch_size=batch_size, checkpoint_path=checkpoint_path)
+    if restart and os.path.exists(importer.checkpoint_path):
+        os.remove(importer.checkpoint_path)
+    stats = importer.run()
+    click.echo(
+        f"Imported {stats.users} users, {stats.projects} projects, {stats.focus_sessions} focus sessions "
+        f"and {stats.tasks} tasks (skipped: {stats.skipped})."
+    )
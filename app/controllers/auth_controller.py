@@ -1,7 +1,8 @@
 from app.services.auth_service import AuthService
-from flask import jsonify, make_response
+from flask import make_response
 from ..models.exceptions import UserNotFoundError, InvalidPasswordError, UsernameAlreadyExists, EmailAlreadyExists, InvalidCreatePasswordError, UserValidationError
 from ..utils.logger import logger
+from ..utils.responses import success_response, error_response
 
 
 class AuthController():
@@ -17,104 +18,42 @@ class AuthController():
         try:
             self.service.create_user(user_email=user_email, username=username, password=password)
 
-            return jsonify({
-                "success": True,
-                "message": "Account created successfully",
-                "data": None,
-                "error": None
-            }), 201
+            return success_response(message="Account created successfully", status=201)
         
         except UsernameAlreadyExists as e:
-            return jsonify({
-                "success": False,
-                "message": str(e),
-                "data": None,
-                "error": {
-                    "code": 400,
-                    "type": "UsernameAlreadyExists",
-                    "details": str(e)
-                }
-            }), 400
+            return error_response(400, str(e), "UsernameAlreadyExists", str(e))
         except EmailAlreadyExists as e:
-            return jsonify({
-                "success": False,
-                "message": str(e),
-                "data": None,
-                "error": {
-                    "code": 400,
-                    "type": "EmailAlreadyExists",
-                    "details": str(e)
-                }
-            }), 400
+            return error_response(400, str(e), "EmailAlreadyExists", str(e))
         except InvalidCreatePasswordError as e:
-            return jsonify({
-                "success": False,
-                "message": str(e),
-                "data": None,
-                "error": {
-                    "code": 400,
-                    "type": "InvalidCreatePasswordError",
-                    "details": str(e)
-                }
-            }), 400
+            return error_response(400, str(e), "InvalidCreatePasswordError", str(e))
         except UserValidationError as e:
-            return jsonify({
-                "success": False,
-                "message": str(e),
-                "data": None,
-                "error": {
-                    "code": 400,
-                    "type": "UserValidationError",
-                    "details": str(e)
-                }
-            }), 400
+            return error_response(400, str(e), "UserValidationError", str(e))
         except Exception as e:   
-            return jsonify({
-                "success": False,
-                "message": "Something went wrong. Please try again later.",
-                "data": None,
-                "error": {
-                    "code": 500,
-                    "type": "InternalServerError",
-                    "details": str(e)
-                }
-            }), 500
+            return error_response(500, "Something went wrong. Please try again later.", "InternalServerError", str(e))
         
 
     def login(self, data):
         user_email = data.get('email')
         password = data.get('password')
+        timezone = data.get('timezone')
 
         try:
-            token = self.service.login(user_email, password)
-            response = make_response(jsonify({
-                "success": True,
-                "message": "Login realizado com sucesso",
-                "data": None, 
-                "error": None
-            }), 200)
+            token = self.service.login(user_email, password, timezone=timezone)
+            response = make_response(*success_response(message="Login realizado com sucesso"))
             response.set_cookie('auth_token', token, httponly=True, secure=True, samesite='Strict')
             return response
         except (UserNotFoundError, InvalidPasswordError):
-            return jsonify({
-                "success": False,
-                "message": "Invalid credentials",
-                "data": None,
-                "error": {
-                    "code": 401,
-                    "type": "InvalidCredentials",
-                    "details": "Invalid Password and/or E-mail"
-                }
-            }), 401
+            return error_response(401, "Invalid credentials", "InvalidCredentials", "Invalid Password and/or E-mail")
         except Exception as e:   
-            return jsonify({
-                "success": False,
-                "message": "Something went wrong. Please try again later.",
-                "data": None,
-                "error": {
-                    "code": 500,
-                    "type": "InternalServerError",
-                    "details": str(e)
-                }
-            }), 500
-        
+            return error_response(500, "Something went wrong. Please try again later.", "InternalServerError", str(e))
+
+    def update_timezone(self, data, user_id):
+        timezone = data.get('timezone') if isinstance(data, dict) else None
+        try:
+            self.service.update_timezone(user_id=user_id, timezone=timezone)
+            return success_response({"timezone": timezone}, message="Timezone updated successfully")
+        except UserValidationError as e:
+            return error_response(400, str(e), "UserValidationError", str(e))
+        except Exception as e:
+            logger.error(f"Erro ao atualizar timezone do usuário {user_id}: {str(e)}")
+            return error_response(500, "Something went wrong. Please try again later.", "InternalServerError", str(e))
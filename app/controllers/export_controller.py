@@ -0,0 +1,75 @@
+from datetime import date
+import json
+import os
+
+from flask import Response, send_file, stream_with_context
+from app.infra.entities.job_db import JobDB
+from app.services.export_service import ExportService, EXPORT_DATASETS
+from app.services.job_service import EXPORT_HISTORY
+from ..utils.logger import logger
+from ..utils.responses import error_response, success_response
+
+CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+class ExportController:
+    def __init__(self):
+        self.service = ExportService()
+
+    def export_history(self, user, args):
+        export_format = args.get('format', 'ndjson')
+        compress = args.get('gzip', '1') not in ('0', 'false', 'no')
+        datasets = tuple(d for d in args.get('include', ','.join(EXPORT_DATASETS)).split(',') if d)
+
+        try:
+            chunks = self.service.stream_history(user_id=user.identificator, export_format=export_format, compress=compress, datasets=datasets)
+        except ValueError as e:
+            logger.warning(f"Controller: Invalid export request for user '{user.identificator}'. Reason: {e}")
+            return error_response(400, str(e), "ValueError", str(e))
+
+        filename = f"focus_time_{user.username}_{date.today().isoformat()}.{export_format}"
+        mimetype = CONTENT_TYPES[export_format]
+        if compress:
+            filename += ".gz"
+            mimetype = "application/gzip"
+
+        # O gerador roda durante o envio; stream_with_context mantém a sessão do banco viva até o fim.
+        return Response(
+            stream_with_context(chunks),
+            mimetype=mimetype,
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+        )
+
+    def request_history_export(self, user, args):
+        export_format = args.get('format', 'ndjson')
+        compress = args.get('gzip', '1') not in ('0', 'false', 'no')
+        datasets = tuple(d for d in args.get('include', ','.join(EXPORT_DATASETS)).split(',') if d)
+        try:
+            job = self.service.request_export(user_id=user.identificator, export_format=export_format, compress=compress, datasets=datasets)
+        except ValueError as e:
+            logger.warning(f"Controller: Invalid export request for user '{user.identificator}'. Reason: {e}")
+            return error_response(400, str(e), "ValueError", str(e))
+        return success_response(data=self._job_status(job), message="Export queued.", status=202)
+
+    def export_job(self, user, job_id, download=False):
+        job = self.service.job_service.get(job_id)
+        payload = json.loads(job.payload) if job is not None and job.kind == EXPORT_HISTORY else {}
+        if payload.get("user_id") != user.identificator:
+            return error_response(404, "Export not found.", "NotFound")
+        if not download:
+            return success_response(data=self._job_status(job))
+
+        path = self.service.export_path(payload["filename"])
+        if job.status != JobDB.DONE or not os.path.exists(path):
+            return error_response(409, "Export is not ready yet.", "Conflict", {"status": job.status})
+        filename = f"focus_time_{user.username}_{job.created_at.date().isoformat()}.{payload['format']}" + (".gz" if payload["gzip"] else "")
+        mimetype = "application/gzip" if payload["gzip"] else CONTENT_TYPES[payload["format"]]
+        return send_file(path, mimetype=mimetype, as_attachment=True, download_name=filename)
+
+    @staticmethod
+    def _job_status(job):
+        return {"job_id": job.id, "status": job.status, "attempts": job.attempts,
+                "download_url": f"/export/jobs/{job.id}/download" if job.status == JobDB.DONE else None}
@@ -0,0 +1,52 @@
+from app.services.focus_group_service import FocusGroupService
+from app.websocket import sync_group_rooms
+from ..models.exceptions import FocusGroupNotFoundError, FocusGroupValidationError
+from ..utils.logger import logger
+from ..utils.responses import success_response, error_response
+
+
+class FocusGroupController:
+    def __init__(self):
+        self.service = FocusGroupService()
+
+    def my_groups(self, user):
+        try:
+            return success_response(self.service.list_groups(user_id=user.identificator), message="groups rescued successfully")
+        except Exception as e:
+            logger.error(f"Erro ao buscar os grupos de {user.username}: {str(e)}")
+            return error_response(500, "Something went wrong. Please try again later.", "InternalServerError", str(e))
+
+    def create_group(self, data, user):
+        name = data.get('name') if isinstance(data, dict) else None
+        try:
+            group = self.service.create_group(name=name, user_id=user.identificator)
+            sync_group_rooms(user.identificator, group["id"], joined=True)
+            return success_response({"identificator": group["identificator"], "name": group["name"]},
+                                    message="Group created successfully", status=201)
+        except FocusGroupValidationError as e:
+            return error_response(400, str(e), "BadRequest", str(e))
+        except Exception as e:
+            logger.error(f"Erro ao criar o grupo {name}: {str(e)}")
+            return error_response(500, "Something went wrong. Please try again later.", "InternalServerError", str(e))
+
+    def join_group(self, group_id, user):
+        return self._change_membership(group_id, user, join=True)
+
+    def leave_group(self, group_id, user):
+        return self._change_membership(group_id, user, join=False)
+
+    def _change_membership(self, group_id, user, join):
+        try:
+            if join:
+                group = self.service.join_group(group_identificator=group_id, user_id=user.identificator)
+            else:
+                group = self.service.leave_group(group_identificator=group_id, user_id=user.identificator)
+            if group["changed"]:
+                sync_group_rooms(user.identificator, group["id"], joined=join)
+            return success_response({"identificator": group["identificator"], "name": group["name"]},
+                                    message="Joined group" if join else "Left group")
+        except FocusGroupNotFoundError as e:
+            return error_response(404, str(e), "NotFound", str(e))
+        except Exception as e:
+            logger.error(f"Erro ao alterar a participação de {user.username} no grupo {group_id}: {str(e)}")
+            return error_response(500, "Something went wrong. Please try again later.", "InternalServerError", str(e))
@@ -0,0 +1,26 @@
+from app.services.leaderboard_service import LeaderboardService
+from ..models.exceptions import FocusGroupNotFoundError
+from ..utils.logger import logger
+from ..utils.responses import success_response, error_response
+
+
+class LeaderboardController:
+    def __init__(self):
+        self.service = LeaderboardService()
+
+    def get_leaderboard(self, args, user):
+        try:
+            leaderboard = self.service.get_leaderboard(
+                user_id=user.identificator,
+                period=args.get("period", "day"),
+                group_identificator=args.get("group") or None,
+                limit=args.get("limit", 10, type=int),
+            )
+            return success_response(leaderboard, message="leaderboard rescued successfully")
+        except ValueError as e:
+            return error_response(400, str(e), "BadRequest", str(e))
+        except FocusGroupNotFoundError as e:
+            return error_response(404, str(e), "NotFound", str(e))
+        except Exception as e:
+            logger.error(f"Erro ao buscar o leaderboard para {user.username}: {str(e)}")
+            return error_response(500, "Something went wrong. Please try again later.", "InternalServerError", str(e))
@@ -0,0 +1,7 @@
+from app.utils.responses import success_response
+from app.utils.metrics import metrics
+
+
+class MetricsController:
+    def get_metrics(self):
+        return success_response(metrics.snapshot(), message="metrics rescued successfully")
@@ -0,0 +1,33 @@
+import os
+
+from flask import current_app, send_from_directory
+from app.utils.profiler import profiler
+from ..utils.responses import success_response, error_response
+
+
+class ProfilerController:
+    def status(self):
+        return success_response({**profiler.status(), "profiles": profiler.profiles()}, message="profiler status")
+
+    def arm(self, data):
+        data = data if isinstance(data, dict) else {}
+        try:
+            status = profiler.arm(
+                directory=current_app.config["PROFILE_DIR"],
+                match=data.get("route") or None,
+                requests=int(data["requests"]) if data.get("requests") is not None else None,
+                seconds=float(data["seconds"]) if data.get("seconds") is not None else None,
+                interval_ms=float(data.get("interval_ms", 5)),
+            )
+        except (TypeError, ValueError) as e:
+            return error_response(400, str(e), "BadRequest", str(e))
+        return success_response(status, message="Profiler armed")
+
+    def disarm(self):
+        profiler.disarm()
+        return success_response(profiler.status(), message="Profiler disarmed")
+
+    def download(self, name):
+        if name not in profiler.profiles():
+            return error_response(404, "Profile not found.", "NotFound")
+        return send_from_directory(os.path.abspath(profiler.directory), name, mimetype="text/plain", as_attachment=True)
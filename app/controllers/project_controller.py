@@ -1,16 +1,20 @@
-from flask import jsonify, render_template, abort
+from flask import abort
 from app.services.project_service import ProjectService
+from app.services.analytics_service import AnalyticsService
 from ..models.exceptions import DatabaseError, ProjectNotFoundError, ProjectValidationError
 from ..utils.logger import logger
+from ..utils.responses import success_response, error_response
+from ..utils.rendering import stream_page
 
 class ProjectController:
     def __init__(self):
         self.service = ProjectService()
+        self.analytics_service = AnalyticsService()
 
     def my_projects(self, user=None):
         try:
             projects = self.service.get_projects_with_time_summary(user_id=user.identificator)
-            return render_template("my_projects.html", title="My Projects", projects=projects, active_page='home', user=user)
+            return stream_page("my_projects.html", title="My Projects", projects=projects, active_page='home', user=user)
         except Exception as e:
             logger.error(f"Erro ao buscar os projects de {user.username}: {str(e)}")
             return abort(500)
@@ -20,78 +24,53 @@ class ProjectController:
         project_color = data.get('color') if isinstance(data, dict) else None
         try:
             project = self.service.create_project(title=project_title, color=project_color, user_id=user_id)
-            return jsonify({
-                "success": True,
-                "message": "Project created successfully",
-                "data": {
-                    'identificator': project.identificator,
-                    'title': project.title,
-                    'color': project.color,
-                    'today_total_time': '00h00m', 
-                    'week_total_time': '00h00m',
-                    'today_total_minutes': 0,
-                    'week_total_minutes': 0
-                },
-                "error": None
-            }), 200
+            return success_response({
+                'identificator': project.identificator,
+                'title': project.title,
+                'color': project.color,
+                'today_total_time': '00h00m', 
+                'week_total_time': '00h00m',
+                'today_total_minutes': 0,
+                'week_total_minutes': 0
+            }, message="Project created successfully")
         except ProjectValidationError as e:
-            return jsonify({
-                "success": False,
-                "message": str(e),
-                "data": None,
-                "error": {
-                    "code": 400,
-                    "type": "BadRequest",
-                    "details": str(e)
-                }
-            }), 400
+            return error_response(400, str(e), "BadRequest", str(e))
         except Exception as e:   #TypeError, Exception
             logger.error(f"Erro ao criar a project {project_title}: {str(e)}")
-            return jsonify({
-                "success": False,
-                "message": "Something went wrong. Please try again later.",
-                "data": None,
-                "error": {
-                    "code": 500,
-                    "type": "InternalServerError",
-                    "details": str(e)
-                }
-            }), 500
+            return error_response(500, "Something went wrong. Please try again later.", "InternalServerError", str(e))
 
 
     def project_room(self, project_id, user):
         try:
             project = self.service.get_details_for_project_room(project_id=project_id, user_id=user.identificator)
-            return render_template("project_room.html", title=project["project"]["title"], project=project, user=user)
+            return stream_page("project_room.html", title=project["project"]["title"], project=project, user=user)
         except ProjectNotFoundError:
             return abort(404)
         except Exception as e:   
             logger.error(f"Erro ao acessar a task {project_id}: {str(e)}")
-            return jsonify({
-                "success": False,
-                "message": "Something went wrong. Please try again later.",
-                "data": None,
-                "error": {
-                    "code": 500,
-                    "type": "InternalServerError",
-                    "details": str(e)
-                }
-            }), 500
+            return error_response(500, "Something went wrong. Please try again later.", "InternalServerError", str(e))
 
     # colocar um try catch aqui.
     def get_data_for_last_365_days_home_chart(self, user_id=None):
         minutes_per_day = self.service.get_data_for_last_365_days_home_chart(user_id=user_id)
-        return jsonify({
-                "success": True,
-                "message": 'data rescued successfully',
-                "data":  {
-                    "minutes_per_day": minutes_per_day
-                },
-                "error": None
-            }), 200
+        return success_response({
+            "minutes_per_day": minutes_per_day
+        }, message='data rescued successfully')
 
-
-
-
-
-    
\ No newline at end of file
+    def get_analytics(self, args, user_id):
+        try:
+            analytics = self.analytics_service.get_focus_series(
+                user_id=user_id,
+                start=args.get("start"),
+                end=args.get("end"),
+                granularity=args.get("granularity", "day"),
+                project_id=args.get("project_id") or None,
+            )
+            return success_response(analytics, message="data rescued successfully")
+        except ProjectValidationError as e:
+            return error_response(400, str(e), "BadRequest", str(e))
+        except ProjectNotFoundError as e:
+            return error_response(404, str(e), "NotFound", str(e))
+        except Exception as e:
+            logger.error(f"Erro ao buscar analytics do usuário {user_id}: {str(e)}")
+            return error_response(500, "Something went wrong. Please try again later.", "InternalServerError", str(e))
@@ -1,8 +1,7 @@
-from pydoc import describe
-from flask import jsonify, render_template, abort
 from app.services.task_service import TaskService
 from ..models.exceptions import AuthorizationError, DatabaseError, ProjectNotFoundError, TaskStatusNotFound, TaskValidationError, TaskNotFoundError
 from ..utils.logger import logger
+from ..utils.responses import success_response, error_response
 
 class TaskController:
     def __init__(self):
@@ -21,44 +20,16 @@ class TaskController:
                 description=description
             )
 
-            return jsonify({
-                "success": True,
-                "message": "Task created successfully",
-                "data": {
-                    "id": new_task.identificator,
-                    "title": new_task.title,
-                    "created_at": new_task.created_at,
-                    "status": new_task.status.name
-                },
-                "error": None
-            }), 201
+            return success_response(new_task, message="Task created successfully", status=201)
         
         except ProjectNotFoundError as e:
             error_type = type(e).__name__ 
             logger.warning(f"Controller: Resource not found during creating task for project '{project_id}'. {error_type}: {e}")
-            return jsonify({
-                "success": False,
-                "message": str(e), 
-                "data": None,
-                "error": {
-                    "code": 404,
-                    "type": type(e).__name__,
-                    "details": str(e)
-                }
-            }), 404
+            return error_response(404, str(e), type(e).__name__, str(e))
         
         except AuthorizationError as e:
             logger.warning(f"Controller: Authorization failed for user '{user_id}' on project '{project_id}'. {e}")
-            return jsonify({
-                "success": False,
-                "message": "Authorization failed. You do not have permission to perform this action.",
-                "data": None,
-                "error": {
-                    "code": 403,
-                    "type": "AuthorizationError",
-                    "details": str(e)
-                }
-            }), 403
+            return error_response(403, "Authorization failed. You do not have permission to perform this action.", "AuthorizationError", str(e))
 
         except (TaskStatusNotFound, DatabaseError) as e:
             error_type = type(e).__name__ 
@@ -67,41 +38,14 @@ class TaskController:
             if isinstance(e, TaskStatusNotFound):
                 user_message = "An internal configuration error occurred. Please contact support."
 
-            return jsonify({
-                "success": False,
-                "message": user_message,
-                "data": None,
-                "error": {
-                    "code": 500,
-                    "type": "InternalServerError", 
-                    "details": f"Internal error of type: {error_type}" 
-                }
-            }), 500
+            return error_response(500, user_message, "InternalServerError", f"Internal error of type: {error_type}")
         
         except TaskValidationError as e:
-            return jsonify({
-                "success": False,
-                "message": str(e),
-                "data": None,
-                "error": {
-                    "code": 400,
-                    "type": "TaskValidationError",
-                    "details": str(e)
-                }
-            }), 400
+            return error_response(400, str(e), "TaskValidationError", str(e))
         
         except Exception as e:
             logger.error(f"Erro ao criar task para o projeto {project_id}: {str(e)}")
-            return jsonify({
-                "success": False,
-                "message": "Something went wrong. Please try again later.",
-                "data": None,
-                "error": {
-                    "code": 500,
-                    "type": "InternalServerError",
-                    "details": "An unexpected error occurred."
-                }
-            }), 500
+            return error_response(500, "Something went wrong. Please try again later.", "InternalServerError", "An unexpected error occurred.")
         
 
     def change_task_status(self, user_id: str, project_id: str, task_id: str, data: dict):
@@ -117,58 +61,22 @@ class TaskController:
                 target_status_name=target_status_name 
             )
 
-            return jsonify({
-                "success": True,
-                "message": "Task status changed successfully.",
-                "data": {
-                    "status": updated_task.status.name,
-                    "created_at": updated_task.created_at if updated_task.created_at else None,
-                    "completed_at": updated_task.completed_at if updated_task.completed_at else None
-                },
-                "error": None
-            }), 200
+            return success_response(updated_task, message="Task status changed successfully.")
 
 
         except (ProjectNotFoundError, TaskNotFoundError) as e:
             error_type = type(e).__name__ 
             logger.warning(f"Controller: Resource not found during task status change for task '{task_id}'. {error_type}: {e}")
-            return jsonify({
-                "success": False,
-                "message": str(e), 
-                "data": None,
-                "error": {
-                    "code": 404,
-                    "type": type(e).__name__,
-                    "details": str(e)
-                }
-            }), 404
+            return error_response(404, str(e), type(e).__name__, str(e))
 
         except AuthorizationError as e:
             logger.warning(f"Controller: Authorization failed for user '{user_id}' on task '{task_id}'. {e}")
-            return jsonify({
-                "success": False,
-                "message": "Authorization failed. You do not have permission to perform this action.",
-                "data": None,
-                "error": {
-                    "code": 403,
-                    "type": "AuthorizationError",
-                    "details": str(e)
-                }
-            }), 403
+            return error_response(403, "Authorization failed. You do not have permission to perform this action.", "AuthorizationError", str(e))
 
         except (TaskValidationError, ValueError) as e:
             error_type = type(e).__name__ 
             logger.warning(f"Controller: Validation error during task status change for task '{task_id}'. {error_type}: {e}")
-            return jsonify({
-                "success": False,
-                "message": str(e), 
-                "data": None,
-                "error": {
-                    "code": 400,
-                    "type": type(e).__name__, 
-                    "details": str(e)
-                }
-            }), 400
+            return error_response(400, str(e), type(e).__name__, str(e))
 
         except (TaskStatusNotFound, DatabaseError) as e:
             error_type = type(e).__name__ 
@@ -177,29 +85,11 @@ class TaskController:
             if isinstance(e, TaskStatusNotFound):
                 user_message = "An internal configuration error occurred. Please contact support."
 
-            return jsonify({
-                "success": False,
-                "message": user_message,
-                "data": None,
-                "error": {
-                    "code": 500,
-                    "type": "InternalServerError", 
-                    "details": f"Internal error of type: {error_type}" 
-                }
-            }), 500
+            return error_response(500, user_message, "InternalServerError", f"Internal error of type: {error_type}")
 
         except Exception as e:
             logger.error(f"Controller: Unexpected error changing task status for task '{task_id}': {e}", exc_info=True)
-            return jsonify({
-                "success": False,
-                "message": "An unexpected error occurred. Please try again later.",
-                "data": None,
-                "error": {
-                    "code": 500,
-                    "type": "InternalServerError",
-                    "details": "An unexpected error occurred."
-                }
-            }), 500
+            return error_response(500, "An unexpected error occurred. Please try again later.", "InternalServerError", "An unexpected error occurred.")
         
     def delete_task(self, user_id: str, project_id: str, task_id: str):
         logger.info(f"Controller: Received request to delete task '{task_id}' in project '{project_id}' by user '{user_id}'")
@@ -211,49 +101,24 @@ class TaskController:
                 task_id=task_id
             )
 
-            return jsonify({
-                "success": True,
-                "message": "Task deleted successfully.",
-                "data": None,
-                "error": None
-            }), 200
+            return success_response(message="Task deleted successfully.")
 
         except (ProjectNotFoundError, TaskNotFoundError) as e:
             error_type = type(e).__name__
             logger.warning(f"Controller: Resource not found during task deletion for task '{task_id}'. {error_type}: {e}")
-            return jsonify({
-                "success": False,
-                "message": str(e),
-                "data": None,
-                "error": {"code": 404, "type": error_type, "details": str(e)}
-            }), 404
+            return error_response(404, str(e), error_type, str(e))
 
         except AuthorizationError as e:
             logger.warning(f"Controller: Authorization failed for user '{user_id}' trying to delete task '{task_id}'. {e}")
-            return jsonify({
-                "success": False,
-                "message": "Authorization failed. You do not have permission to delete this task.",
-                "data": None,
-                "error": {"code": 403, "type": "AuthorizationError", "details": str(e)}
-            }), 403
+            return error_response(403, "Authorization failed. You do not have permission to delete this task.", "AuthorizationError", str(e))
 
         except DatabaseError as e:
             logger.error(f"Controller: Database error during task deletion for task '{task_id}'. {e}", exc_info=True)
-            return jsonify({
-                "success": False,
-                "message": "An internal server error occurred while deleting the task.",
-                "data": None,
-                "error": {"code": 500, "type": "InternalServerError", "details": "Database operation failed."}
-            }), 500
+            return error_response(500, "An internal server error occurred while deleting the task.", "InternalServerError", "Database operation failed.")
 
         except Exception as e:
             logger.error(f"Controller: Unexpected error deleting task '{task_id}': {e}", exc_info=True)
-            return jsonify({
-                "success": False,
-                "message": "An unexpected error occurred. Please try again later.",
-                "data": None,
-                "error": {"code": 500, "type": "InternalServerError", "details": "An unexpected error occurred."}
-            }), 500
+            return error_response(500, "An unexpected error occurred. Please try again later.", "InternalServerError", "An unexpected error occurred.")
 
         
 
@@ -0,0 +1,172 @@
+# Arquivo frio das focus sessions antigas: um arquivo por usuário em COLD_ARCHIVE_DIR (<identificator>.fsa).
+#
+# O arquivo é uma sequência de segmentos, um por execução do `flask focus-sessions archive`. Cada segmento tem
+# um cabeçalho fixo (quantidade, menor/maior started_at em epoch UTC, tamanho de cada coluna) seguido de três
+# colunas comprimidas com zlib: started_at em delta (int64), duration_seconds (int32) e project_id (int32).
+# Sessões são segmentos de dia com poucos valores distintos, então cada linha ocupa poucos bytes.
+#
+# A leitura mapeia o arquivo em memória (mmap), percorre só os cabeçalhos, descarta os segmentos fora do
+# intervalo pedido pelo min/max e descomprime as colunas direto das fatias do mapa, sem copiar o arquivo.
+# Os rollups diários continuam no SQL; só as sessões individuais saem do banco.
+
+import array
+import heapq
+import mmap
+import os
+import struct
+import sys
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from flask import current_app
+
+from app.utils.logger import logger
+
+FILE_SUFFIX = ".fsa"
+HORIZON_FILE = "HORIZON"
+_MAGIC = b"FSA1"
+_HEADER = struct.Struct("<4sIqqIII")  # magic, linhas, min epoch, max epoch, bytes das 3 colunas
+_EPOCH = datetime(1970, 1, 1)
+COMPRESSION_LEVEL = 9
+
+# (started_at UTC naive, duration_seconds, project_id), igual ao que está em focus_sessions.
+ArchivedSession = Tuple[datetime, int, int]
+
+
+def _to_epoch(value: datetime) -> int:
+    return int((value - _EPOCH).total_seconds())
+
+
+def _from_epoch(value: int) -> datetime:
+    return _EPOCH + timedelta(seconds=value)
+
+
+def _pack(typecode: str, values: Iterable[int]) -> bytes:
+    column = array.array(typecode, values)
+    if sys.byteorder == "big":  # o formato em disco é little-endian
+        column.byteswap()
+    return zlib.compress(column.tobytes(), COMPRESSION_LEVEL)
+
+
+def _unpack(typecode: str, data) -> array.array:
+    column = array.array(typecode)
+    column.frombytes(zlib.decompress(data))
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column
+
+
+def encode_segment(sessions: List[ArchivedSession]) -> bytes:
+    """Serializa as sessões (em qualquer ordem) como um segmento ordenado por started_at."""
+    sessions = sorted(sessions)
+    epochs = [_to_epoch(started_at) for started_at, _, _ in sessions]
+    deltas = [epochs[0]] + [b - a for a, b in zip(epochs, epochs[1:])] if epochs else []
+    starts = _pack("q", deltas)
+    durations = _pack("i", (duration for _, duration, _ in sessions))
+    projects = _pack("i", (project_id for _, _, project_id in sessions))
+    header = _HEADER.pack(_MAGIC, len(sessions), epochs[0] if epochs else 0, epochs[-1] if epochs else 0,
+                          len(starts), len(durations), len(projects))
+    return header + starts + durations + projects
+
+
+def _iter_segment(view, offset: int, count: int, sizes: Tuple[int, int, int],
+                  start_epoch: Optional[int], end_epoch: Optional[int]) -> Iterator[ArchivedSession]:
+    starts_size, durations_size, projects_size = sizes
+    starts = _unpack("q", view[offset:offset + starts_size])
+    offset += starts_size
+    durations = _unpack("i", view[offset:offset + durations_size])
+    offset += durations_size
+    projects = _unpack("i", view[offset:offset + projects_size])
+    epoch = 0
+    for i in range(count):
+        epoch += starts[i]
+        if start_epoch is not None and epoch < start_epoch:
+            continue
+        if end_epoch is not None and epoch >= end_epoch:
+            return
+        yield _from_epoch(epoch), durations[i], projects[i]
+
+
+class ColdArchive:
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or current_app.config["COLD_ARCHIVE_DIR"]
+
+    def path_for(self, user_identificator: str) -> str:
+        return os.path.join(self.directory, f"{user_identificator}{FILE_SUFFIX}")
+
+    def horizon(self) -> Optional[datetime]:
+        """Limite (UTC) da última execução: tudo antes dele está arquivado, ou None se nada foi arquivado."""
+        try:
+            with open(os.path.join(self.directory, HORIZON_FILE)) as horizon_file:
+                return datetime.fromisoformat(horizon_file.read().strip())
+        except FileNotFoundError:
+            return None
+
+    def set_horizon(self, horizon: datetime) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        current = self.horizon()
+        if current is not None and current >= horizon:
+            return
+        tmp_path = os.path.join(self.directory, f".{HORIZON_FILE}.tmp")
+        with open(tmp_path, "w") as horizon_file:
+            horizon_file.write(horizon.isoformat())
+        os.replace(tmp_path, os.path.join(self.directory, HORIZON_FILE))
+
+    def append(self, user_identificator: str, sessions: List[ArchivedSession]) -> int:
+        """Grava um segmento no fim do arquivo do usuário (fsync incluso). Retorna o tamanho anterior do arquivo,
+        para `truncate` desfazer a gravação se o DELETE no banco não for commitado."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path_for(user_identificator)
+        size_before = os.path.getsize(path) if os.path.exists(path) else 0
+        with open(path, "ab") as archive_file:
+            archive_file.write(encode_segment(sessions))
+            archive_file.flush()
+            os.fsync(archive_file.fileno())
+        return size_before
+
+    def truncate(self, user_identificator: str, size: int) -> None:
+        path = self.path_for(user_identificator)
+        if size == 0:
+            os.remove(path)
+        else:
+            with open(path, "r+b") as archive_file:
+                archive_file.truncate(size)
+        logger.warning(f"ColdArchive: Rolled back archive file of user '{user_identificator}' to {size} bytes.")
+
+    def iter_sessions(self, user_identificator: str, start: Optional[datetime] = None,
+                      end: Optional[datetime] = None) -> Iterator[ArchivedSession]:
+        """Sessões arquivadas do usuário com started_at em [start, end), em ordem de started_at."""
+        path = self.path_for(user_identificator)
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return
+        start_epoch = _to_epoch(start) if start else None
+        end_epoch = _to_epoch(end) if end else None
+        with open(path, "rb") as archive_file, mmap.mmap(archive_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                segments = []
+                offset = 0
+                while offset < len(mapped):
+                    magic, count, min_epoch, max_epoch, *sizes = _HEADER.unpack_from(mapped, offset)
+                    if magic != _MAGIC:
+                        raise ValueError(f"Corrupted cold archive '{path}' at offset {offset}.")
+                    offset += _HEADER.size
+                    if count and (start_epoch is None or max_epoch >= start_epoch) and (end_epoch is None or min_epoch < end_epoch):
+                        segments.append(_iter_segment(view, offset, count, tuple(sizes), start_epoch, end_epoch))
+                    offset += sum(sizes)
+                # Segmentos de execuções diferentes podem se sobrepor (sessões gravadas com atraso).
+                yield from heapq.merge(*segments)
+            finally:
+                view.release()
+
+    def users(self) -> List[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(name[:-len(FILE_SUFFIX)] for name in os.listdir(self.directory) if name.endswith(FILE_SUFFIX))
+
+
+def utc_horizon(days: int, now: Optional[datetime] = None) -> datetime:
+    """Meia-noite UTC de `days` dias atrás, naive como started_at."""
+    now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+    return datetime(now.year, now.month, now.day) - timedelta(days=days)
@@ -3,3 +3,6 @@ from .focus_session_db import FocusSessionDB
 from .project_db import ProjectDB
 from .task_db import TaskDB
 from .task_status_db import TaskStatusDB
+from .focus_daily_rollup_db import FocusDailyRollupDB
+from .job_db import JobDB
+from .focus_group_db import FocusGroupDB, FocusGroupMemberDB
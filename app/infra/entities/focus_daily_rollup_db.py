@@ -0,0 +1,28 @@
+from __future__ import annotations
+from datetime import date
+from typing import TYPE_CHECKING
+
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import Integer, ForeignKey, Date, UniqueConstraint
+from app.infra.db import db
+
+if TYPE_CHECKING:
+    from app.infra.entities.project_db import ProjectDB
+
+
+class FocusDailyRollupDB(db.Model):
+    """Total de segundos em foco por projeto e dia, mantido a cada sessão salva."""
+    __tablename__ = "focus_daily_rollups"
+    __table_args__ = (
+        UniqueConstraint("project_id", "day", name="uq_focus_daily_rollups_project_id_day"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False)
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    seconds: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    project: Mapped[ProjectDB] = relationship(back_populates="focus_daily_rollups")
+
+    def __repr__(self):
+        return f"<FocusDailyRollupDB project={self.project_id} {self.day} - {self.seconds}s>"
@@ -0,0 +1,44 @@
+from __future__ import annotations
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, List
+
+import uuid
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import String, Integer, DateTime, ForeignKey, UniqueConstraint
+from app.infra.db import db
+
+if TYPE_CHECKING:
+    from app.infra.entities.user_db import UserDB
+
+
+class FocusGroupDB(db.Model):
+    """Grupo de usuários que veem a presença (quem está em foco) uns dos outros."""
+    __tablename__ = "focus_groups"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True, nullable=False)
+    identificator: Mapped[str] = mapped_column(String(36), default=lambda: str(uuid.uuid4()), unique=True, nullable=False)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
+
+    members: Mapped[List[FocusGroupMemberDB]] = relationship(back_populates="group", cascade="all, delete-orphan")
+
+    def __repr__(self):
+        return f"<FocusGroupDB {self.name}>"
+
+
+class FocusGroupMemberDB(db.Model):
+    __tablename__ = "focus_group_members"
+    __table_args__ = (
+        UniqueConstraint("group_id", "user_id", name="uq_focus_group_members_group_id_user_id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True, nullable=False)
+    # Índice próprio em user_id: o connect do websocket busca os grupos do usuário.
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
+    group_id: Mapped[int] = mapped_column(ForeignKey("focus_groups.id"), nullable=False)
+
+    group: Mapped[FocusGroupDB] = relationship(back_populates="members")
+    user: Mapped[UserDB] = relationship()
+
+    def __repr__(self):
+        return f"<FocusGroupMemberDB group={self.group_id} user={self.user_id}>"
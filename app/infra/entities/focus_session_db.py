@@ -3,7 +3,7 @@ from datetime import datetime
 from typing import TYPE_CHECKING
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Integer, ForeignKey, DateTime
+from sqlalchemy import Integer, ForeignKey, DateTime, Index
 from app.infra.db import db
 
 if TYPE_CHECKING:
@@ -12,6 +12,10 @@ if TYPE_CHECKING:
 
 class FocusSessionDB(db.Model):
     __tablename__ = "focus_sessions"
+    __table_args__ = (
+        # Sessões são gravadas em segmentos alinhados ao dia, então "tempo no dia D" é uma soma por intervalo neste índice.
+        Index("ix_focus_sessions_project_id_started_at", "project_id", "started_at"),
+    )
 
     # Mudar aqui para started_at e finished_at 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
@@ -0,0 +1,44 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Integer, String, Text, DateTime, Index
+from app.infra.db import db
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class JobDB(db.Model):
+    """Fila de trabalhos adiados (ver app/services/job_service.py). Horários em UTC, como started_at."""
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # O worker busca o próximo trabalho pronto por (status, run_at).
+        Index("ix_jobs_status_run_at", "status", "run_at"),
+        Index("ix_jobs_dedupe_key", "dedupe_key"),
+    )
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    kind: Mapped[str] = mapped_column(String(64), nullable=False)
+    payload: Mapped[str] = mapped_column(Text, nullable=False, default="{}")
+    # Trabalhos ainda na fila com a mesma chave são agrupados em um só.
+    dedupe_key: Mapped[Optional[str]] = mapped_column(String(191), nullable=True)
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default=QUEUED)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    max_attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=5)
+    run_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=_utcnow)
+    locked_by: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    locked_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    result: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=_utcnow)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<JobDB {self.id} {self.kind} {self.status} attempt={self.attempts}>"
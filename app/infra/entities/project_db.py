@@ -10,6 +10,7 @@ if TYPE_CHECKING:
     from app.infra.entities.user_db import UserDB
     from app.infra.entities.task_db import TaskDB
     from app.infra.entities.focus_session_db import FocusSessionDB
+    from app.infra.entities.focus_daily_rollup_db import FocusDailyRollupDB
 
 
 class ProjectDB(db.Model):
@@ -25,6 +26,7 @@ class ProjectDB(db.Model):
     user: Mapped[UserDB] = relationship(back_populates="projects")
     tasks: Mapped[List[TaskDB]] = relationship(back_populates="project", cascade="all, delete-orphan")
     focus_sessions: Mapped[List[FocusSessionDB]] = relationship(back_populates="project", cascade="all, delete-orphan")
+    focus_daily_rollups: Mapped[List[FocusDailyRollupDB]] = relationship(back_populates="project", cascade="all, delete-orphan")
 
 
 
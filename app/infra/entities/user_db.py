@@ -19,6 +19,8 @@ class UserDB(db.Model):
     email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
     password: Mapped[str] = mapped_column(String(255), nullable=False)
     active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    # Nome IANA usado para decidir o dia local das sessões (started_at é gravado em UTC).
+    timezone: Mapped[str] = mapped_column(String(64), default="UTC", server_default="UTC", nullable=False)
 
     projects: Mapped[List[ProjectDB]] = relationship(back_populates="user", cascade="all, delete-orphan")
 
@@ -0,0 +1 @@
+from .legacy_json_importer import LegacyJsonImporter, ImportStats
@@ -0,0 +1,230 @@
+# Importa o antigo armazenamento em JSON (app/infra/repository/database) para o schema SQL.
+#
+# user.json -> UserDB, task.json (antigo "task" = projeto) -> ProjectDB + FocusSessionDB,
+# todo.json (antigo "todo" = task) -> TaskDB.
+#
+# Os arquivos são lidos em streaming e gravados em lotes multi-linha; após cada lote commitado
+# o número de elementos já processados por arquivo vai para um arquivo de checkpoint, então uma
+# importação interrompida pode ser retomada sem reprocessar (nem duplicar) o que já entrou.
+
+import json
+import os
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import insert, select, or_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.infra.db import db
+from app.infra.entities import UserDB, ProjectDB, TaskDB, TaskStatusDB, FocusSessionDB, FocusDailyRollupDB
+from app.models.exceptions import DatabaseError
+from app.models.focus_session import split_by_day
+from app.utils.json_stream import iter_json_array
+from app.utils.logger import logger
+
+LEGACY_PREFIXES = ("user-", "task-", "todo-")
+
+
+def legacy_identificator(value: str) -> str:
+    """Os ids antigos têm prefixo ("user-<uuid4>"); no schema SQL o identificator é o uuid puro (36 chars)."""
+    for prefix in LEGACY_PREFIXES:
+        if value.startswith(prefix):
+            return value[len(prefix):]
+    return value
+
+
+@dataclass
+class ImportStats:
+    users: int = 0
+    projects: int = 0
+    focus_sessions: int = 0
+    tasks: int = 0
+    skipped: Dict[str, int] = field(default_factory=lambda: {"users": 0, "projects": 0, "tasks": 0})
+
+
+class LegacyJsonImporter:
+    FILES = ("user.json", "task.json", "todo.json")
+
+    def __init__(self, source_dir: str, batch_size: int = 1000, checkpoint_path: Optional[str] = None,
+                 session: Session = db.session):
+        self._session = session
+        self.source_dir = source_dir
+        self.batch_size = batch_size
+        self.checkpoint_path = checkpoint_path or os.path.join(source_dir, ".import_checkpoint.json")
+        self.stats = ImportStats()
+
+    # --- Checkpoint ---
+
+    def _load_checkpoint(self) -> Dict[str, int]:
+        if not os.path.exists(self.checkpoint_path):
+            return {}
+        with open(self.checkpoint_path) as f:
+            return json.load(f)
+
+    def _save_checkpoint(self, checkpoint: Dict[str, int]) -> None:
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    # --- Streaming em lotes ---
+
+    def _batches(self, filename: str, already_done: int) -> Iterator[List[Dict[str, Any]]]:
+        batch = []
+        with open(os.path.join(self.source_dir, filename), encoding="utf-8") as f:
+            for index, element in enumerate(iter_json_array(f)):
+                if index < already_done:
+                    continue
+                batch.append(element)
+                if len(batch) >= self.batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    def _import_file(self, filename: str, checkpoint: Dict[str, int], insert_batch: Callable[[List[Dict[str, Any]]], None]) -> None:
+        done = checkpoint.get(filename, 0)
+        if not os.path.exists(os.path.join(self.source_dir, filename)):
+            logger.warning(f"Importer: '{filename}' not found in '{self.source_dir}', skipping.")
+            return
+        logger.info(f"Importer: Importing '{filename}' (resuming after {done} elements)")
+        for batch in self._batches(filename, done):
+            try:
+                insert_batch(batch)
+                self._session.commit()
+            except SQLAlchemyError as e:
+                self._session.rollback()
+                logger.error(f"Importer: Database error importing '{filename}' after element {done}: {e}", exc_info=True)
+                raise DatabaseError(f"Failed to import '{filename}' after element {done}. Re-run to resume.")
+            done += len(batch)
+            checkpoint[filename] = done
+            self._save_checkpoint(checkpoint)
+            logger.debug(f"Importer: '{filename}' checkpoint at {done} elements")
+
+    def _ids_by_identificator(self, model, identificators: Iterable[str]) -> Dict[str, int]:
+        identificators = list(set(identificators))
+        if not identificators:
+            return {}
+        stmt = select(model.identificator, model.id).where(model.identificator.in_(identificators))
+        return {identificator: id_ for identificator, id_ in self._session.execute(stmt)}
+
+    # --- Mapeamentos ---
+
+    def _insert_users(self, batch: List[Dict[str, Any]]) -> None:
+        rows = {
+            legacy_identificator(u["identificator"]): {
+                "identificator": legacy_identificator(u["identificator"]),
+                "username": u["username"],
+                "email": u["email"],
+                "password": u["password"],
+                "active": u.get("status", "active") == "active",
+            }
+            for u in batch
+        }
+        usernames = [r["username"] for r in rows.values()]
+        emails = [r["email"] for r in rows.values()]
+        existing = self._session.execute(
+            select(UserDB.identificator, UserDB.username, UserDB.email).where(or_(
+                UserDB.identificator.in_(list(rows)), UserDB.username.in_(usernames), UserDB.email.in_(emails)
+            ))
+        ).all()
+        taken = {value for row in existing for value in row}
+        new_rows = [r for r in rows.values() if not {r["identificator"], r["username"], r["email"]} & taken]
+        self.stats.skipped["users"] += len(batch) - len(new_rows)
+        if new_rows:
+            self._session.execute(insert(UserDB), new_rows)
+        self.stats.users += len(new_rows)
+
+    def _insert_projects(self, batch: List[Dict[str, Any]]) -> None:
+        user_ids = self._ids_by_identificator(UserDB, (legacy_identificator(p["user_FK"]) for p in batch))
+        existing = self._ids_by_identificator(ProjectDB, (legacy_identificator(p["identificator"]) for p in batch))
+
+        project_rows = []
+        for p in batch:
+            identificator = legacy_identificator(p["identificator"])
+            user_id = user_ids.get(legacy_identificator(p["user_FK"]))
+            if identificator in existing or user_id is None:
+                self.stats.skipped["projects"] += 1
+                continue
+            project_rows.append({
+                "identificator": identificator,
+                "title": p["title"],
+                "color": p["color"],
+                "active": p.get("status", "active") == "active",
+                "user_id": user_id,
+            })
+        if not project_rows:
+            return
+        self._session.execute(insert(ProjectDB), project_rows)
+        self.stats.projects += len(project_rows)
+
+        # As sessões entram na mesma transação dos projetos, então o checkpoint cobre ambos.
+        project_ids = self._ids_by_identificator(ProjectDB, (r["identificator"] for r in project_rows))
+        session_rows = []
+        rollup_seconds: Dict[tuple, int] = defaultdict(int)
+        for p in batch:
+            project_id = project_ids.get(legacy_identificator(p["identificator"]))
+            if project_id is None:
+                continue
+            for day, seconds in (p.get("seconds_in_focus_per_day") or {}).items():
+                if not seconds or seconds <= 0:
+                    continue
+                # O formato antigo só guardava o total do dia; a sessão começa à meia-noite desse dia.
+                day_start = datetime.combine(date.fromisoformat(day), time.min)
+                for started_at, duration in split_by_day(day_start, int(seconds)):
+                    session_rows.append({"project_id": project_id, "started_at": started_at, "duration_seconds": duration})
+                    rollup_seconds[(project_id, started_at.date())] += duration
+                if len(session_rows) >= self.batch_size:
+                    self._session.execute(insert(FocusSessionDB), session_rows)
+                    self.stats.focus_sessions += len(session_rows)
+                    session_rows = []
+        if session_rows:
+            self._session.execute(insert(FocusSessionDB), session_rows)
+            self.stats.focus_sessions += len(session_rows)
+        # Os projetos são novos, então os rollups diários podem ser inseridos direto.
+        if rollup_seconds:
+            self._session.execute(insert(FocusDailyRollupDB), [
+                {"project_id": project_id, "day": day, "seconds": seconds}
+                for (project_id, day), seconds in rollup_seconds.items()
+            ])
+
+    def _insert_tasks(self, batch: List[Dict[str, Any]], status_ids: Dict[str, int]) -> None:
+        project_ids = self._ids_by_identificator(ProjectDB, (legacy_identificator(t["task_FK"]) for t in batch))
+        existing = self._ids_by_identificator(TaskDB, (legacy_identificator(t["identificator"]) for t in batch))
+
+        rows = []
+        for t in batch:
+            identificator = legacy_identificator(t["identificator"])
+            project_id = project_ids.get(legacy_identificator(t["task_FK"]))
+            status_id = status_ids.get(t.get("status"))
+            if identificator in existing or project_id is None or status_id is None:
+                self.stats.skipped["tasks"] += 1
+                continue
+            rows.append({
+                "identificator": identificator,
+                "title": t["title"],
+                "description": t.get("description"),
+                "created_at": datetime.fromisoformat(t["created_time"]),
+                "completed_at": datetime.fromisoformat(t["completed_time"]) if t.get("completed_time") else None,
+                "project_id": project_id,
+                "status_id": status_id,
+            })
+        if rows:
+            self._session.execute(insert(TaskDB), rows)
+        self.stats.tasks += len(rows)
+
+    # --- Entrada ---
+
+    def run(self) -> ImportStats:
+        checkpoint = self._load_checkpoint()
+        status_ids = {name: id_ for name, id_ in self._session.execute(select(TaskStatusDB.name, TaskStatusDB.id))}
+
+        self._import_file("user.json", checkpoint, self._insert_users)
+        self._import_file("task.json", checkpoint, self._insert_projects)
+        self._import_file("todo.json", checkpoint, lambda batch: self._insert_tasks(batch, status_ids))
+
+        logger.info(f"Importer: Legacy import finished: {self.stats}")
+        return self.stats
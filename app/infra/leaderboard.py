@@ -0,0 +1,277 @@
+# Índices ordenados de tempo em foco por usuário, um por período ("day:2026-10-19", "week:2026-10-18").
+#
+# Cada sessão salva atualiza só a pontuação do dono nos períodos afetados (ver LeaderboardService), e o índice
+# inteiro é reconstruído a partir dos rollups diários quando ainda não existe (processo novo, virada do dia) ou
+# pelo `flask leaderboard rebuild`. Dois backends com a mesma interface:
+# - MemoryLeaderboard: skip list indexada (como o sorted set do Redis) + dicionário de pontuações, por processo.
+#   Atualizar uma pontuação e rank são O(log n) esperado, top(k) é O(k);
+#   com vários workers cada um tem o próprio índice, que só vê as sessões salvas nele até a próxima reconstrução
+#   (e só as salvas no processo web: o job de rollup, num worker da fila, atualiza o índice do worker);
+# - RedisLeaderboard: sorted sets (ZINCRBY/ZREVRANGE), compartilhado entre processos; precisa do pacote redis
+#   e de LEADERBOARD_REDIS_URL.
+
+import calendar
+import random
+import threading
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import redis
+except ImportError:  # opcional: sem o pacote, só o backend em memória
+    redis = None
+
+from app.utils.metrics import metrics
+
+Score = Tuple[str, int]
+
+PERIOD_LENGTH = {"day": timedelta(days=1), "week": timedelta(days=7)}
+# Quanto tempo o índice de um período fica depois que o período acaba (consultas de "ontem" ainda funcionam).
+RETENTION = {"day": timedelta(days=2), "week": timedelta(days=14)}
+
+
+def board_key(period: str, start: date) -> str:
+    return f"{period}:{start.isoformat()}"
+
+
+def expires_on(key: str) -> date:
+    period, start = key.split(":", 1)
+    return date.fromisoformat(start) + PERIOD_LENGTH[period] + RETENTION[period]
+
+
+class _Node:
+    __slots__ = ("key", "forward", "span")
+
+    def __init__(self, key, level: int):
+        self.key = key
+        self.forward: List[Optional["_Node"]] = [None] * level
+        self.span: List[int] = [0] * level  # quantas posições o salto forward[i] avança
+
+
+class _SkipList:
+    """Chaves ordenadas com inserção, remoção e posição em O(log n) esperado (spans por nível, como o zset do Redis)."""
+    MAX_LEVEL = 32
+    P = 0.25
+
+    def __init__(self):
+        self.head = _Node(None, self.MAX_LEVEL)
+        self.level = 1
+        self.size = 0
+
+    def _random_level(self) -> int:
+        level = 1
+        while level < self.MAX_LEVEL and random.random() < self.P:
+            level += 1
+        return level
+
+    def insert(self, key) -> None:
+        update = [self.head] * self.MAX_LEVEL
+        rank = [0] * self.MAX_LEVEL
+        node = self.head
+        for i in reversed(range(self.level)):
+            rank[i] = rank[i + 1] if i < self.level - 1 else 0
+            while node.forward[i] is not None and node.forward[i].key < key:
+                rank[i] += node.span[i]
+                node = node.forward[i]
+            update[i] = node
+        level = self._random_level()
+        if level > self.level:
+            for i in range(self.level, level):
+                self.head.span[i] = self.size
+            self.level = level
+        new = _Node(key, level)
+        for i in range(level):
+            new.forward[i] = update[i].forward[i]
+            update[i].forward[i] = new
+            new.span[i] = update[i].span[i] - (rank[0] - rank[i])
+            update[i].span[i] = rank[0] - rank[i] + 1
+        for i in range(level, self.level):
+            update[i].span[i] += 1
+        self.size += 1
+
+    def remove(self, key) -> bool:
+        update = [self.head] * self.MAX_LEVEL
+        node = self.head
+        for i in reversed(range(self.level)):
+            while node.forward[i] is not None and node.forward[i].key < key:
+                node = node.forward[i]
+            update[i] = node
+        node = node.forward[0]
+        if node is None or node.key != key:
+            return False
+        for i in range(self.level):
+            if update[i].forward[i] is node:
+                update[i].span[i] += node.span[i] - 1
+                update[i].forward[i] = node.forward[i]
+            else:
+                update[i].span[i] -= 1
+        while self.level > 1 and self.head.forward[self.level - 1] is None:
+            self.level -= 1
+        self.size -= 1
+        return True
+
+    def index(self, key) -> Optional[int]:
+        """Posição (0 = primeira) da chave, ou None se ela não está na lista."""
+        position = 0
+        node = self.head
+        for i in reversed(range(self.level)):
+            while node.forward[i] is not None and node.forward[i].key <= key:
+                position += node.span[i]
+                node = node.forward[i]
+            if node is not self.head and node.key == key:
+                return position - 1
+        return None
+
+    def first(self, count: int) -> List:
+        keys = []
+        node = self.head.forward[0]
+        while node is not None and len(keys) < count:
+            keys.append(node.key)
+            node = node.forward[0]
+        return keys
+
+    def __len__(self) -> int:
+        return self.size
+
+
+class _SortedScores:
+    """Pontuações de um período: chaves (-segundos, membro) na skip list, para o maior vir primeiro."""
+    __slots__ = ("scores", "order")
+
+    def __init__(self):
+        self.scores: Dict[str, int] = {}
+        self.order = _SkipList()
+
+    def set(self, member: str, score: int) -> None:
+        old = self.scores.get(member)
+        if old is not None:
+            self.order.remove((-old, member))
+        self.scores[member] = score
+        self.order.insert((-score, member))
+
+
+class MemoryLeaderboard:
+    shared = False  # cada processo tem o seu
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._boards: Dict[str, _SortedScores] = {}
+        metrics.register_gauge("leaderboard.boards", lambda: len(self._boards))
+
+    def exists(self, key: str) -> bool:
+        return key in self._boards
+
+    def set_score(self, key: str, member: str, seconds: int) -> None:
+        with self._lock:
+            self._boards.setdefault(key, _SortedScores()).set(member, seconds)
+
+    def increment(self, key: str, member: str, seconds: int) -> None:
+        with self._lock:
+            board = self._boards.setdefault(key, _SortedScores())
+            board.set(member, board.scores.get(member, 0) + seconds)
+
+    def replace(self, key: str, scores: Iterable[Score]) -> None:
+        board = _SortedScores()
+        for member, score in scores:
+            board.set(member, score)
+        with self._lock:
+            self._boards[key] = board
+
+    def top(self, key: str, limit: int) -> List[Score]:
+        with self._lock:
+            board = self._boards.get(key)
+            return [(member, -negative) for negative, member in board.order.first(limit)] if board else []
+
+    def scores(self, key: str, members: Iterable[str]) -> Dict[str, int]:
+        with self._lock:
+            board = self._boards.get(key)
+            return {member: board.scores[member] for member in members if board and member in board.scores}
+
+    def rank(self, key: str, member: str) -> Optional[int]:
+        """Posição (0 = primeiro) do membro no período, ou None se ele não pontuou."""
+        with self._lock:
+            board = self._boards.get(key)
+            if board is None or member not in board.scores:
+                return None
+            return board.order.index((-board.scores[member], member))
+
+    def prune(self, today: date) -> int:
+        """Remove os índices de períodos que acabaram há mais que RETENTION."""
+        with self._lock:
+            expired = [key for key in self._boards if expires_on(key) <= today]
+            for key in expired:
+                del self._boards[key]
+            return len(expired)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._boards.clear()
+
+
+class RedisLeaderboard:
+    shared = True
+
+    def __init__(self, url: str, prefix: str = "leaderboard:"):
+        if redis is None:
+            raise RuntimeError("LEADERBOARD_REDIS_URL is set but the 'redis' package is not installed.")
+        self._redis = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def _key(self, key: str) -> str:
+        return self.prefix + key
+
+    @staticmethod
+    def _expire_at(key: str) -> int:
+        return calendar.timegm(expires_on(key).timetuple())
+
+    def exists(self, key: str) -> bool:
+        # O marcador existe mesmo quando o período reconstruído não tem ninguém (sorted set vazio não existe).
+        return bool(self._redis.exists(self._key(key) + ":built"))
+
+    def set_score(self, key: str, member: str, seconds: int) -> None:
+        pipe = self._redis.pipeline()
+        pipe.zadd(self._key(key), {member: seconds})
+        pipe.expireat(self._key(key), self._expire_at(key))
+        pipe.execute()
+
+    def increment(self, key: str, member: str, seconds: int) -> None:
+        pipe = self._redis.pipeline()
+        pipe.zincrby(self._key(key), seconds, member)
+        pipe.expireat(self._key(key), self._expire_at(key))
+        pipe.execute()
+
+    def replace(self, key: str, scores: Iterable[Score]) -> None:
+        mapping = {member: score for member, score in scores}
+        temp = self._key(key) + ":rebuild"
+        pipe = self._redis.pipeline()
+        pipe.delete(temp)
+        if mapping:
+            pipe.zadd(temp, mapping)
+            pipe.rename(temp, self._key(key))
+            pipe.expireat(self._key(key), self._expire_at(key))
+        else:
+            pipe.delete(self._key(key))
+        pipe.set(self._key(key) + ":built", 1)
+        pipe.expireat(self._key(key) + ":built", self._expire_at(key))
+        pipe.execute()
+
+    def top(self, key: str, limit: int) -> List[Score]:
+        return [(member.decode(), int(score)) for member, score in
+                self._redis.zrevrange(self._key(key), 0, limit - 1, withscores=True)]
+
+    def scores(self, key: str, members: Iterable[str]) -> Dict[str, int]:
+        members = list(members)
+        if not members:
+            return {}
+        values = self._redis.zmscore(self._key(key), members)
+        return {member: int(score) for member, score in zip(members, values) if score is not None}
+
+    def rank(self, key: str, member: str) -> Optional[int]:
+        return self._redis.zrevrank(self._key(key), member)
+
+    def prune(self, today: date) -> int:
+        return 0  # as chaves expiram sozinhas (EXPIREAT)
+
+    def clear(self) -> None:
+        for key in self._redis.scan_iter(self.prefix + "*"):
+            self._redis.delete(key)
@@ -0,0 +1,241 @@
+# Partições mensais de focus_sessions por started_at (UTC).
+#
+# MySQL: partições nativas RANGE COLUMNS(started_at), uma por mês (pYYYYMM) mais pmax. O MySQL exige a coluna
+# de partição em toda chave única e não aceita FOREIGN KEY em tabela particionada, então a conversão troca a
+# PK para (id, started_at) e remove a FK para projects (a cascata do ORM em ProjectDB.focus_sessions continua).
+#
+# SQLite: não tem partições. A tabela focus_sessions é a janela quente e cada mês destacado vira uma tabela
+# própria (focus_sessions_pYYYYMM) com as mesmas colunas, que é o mesmo resultado do EXCHANGE PARTITION no MySQL.
+#
+# Em ambos, as consultas quentes filtram started_at por intervalo (poda de partição no MySQL, busca por faixa
+# no índice (project_id, started_at) no SQLite). `flask focus-sessions partitions ...` faz a manutenção.
+#
+# Os meses destacados continuam sendo do usuário: a exportação e o recálculo de rollups leem essas tabelas
+# (iter_sessions), e excluir projeto ou usuário apaga as linhas delas (delete_projects), já que nenhuma tem FK.
+
+from datetime import date, datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import Column, DateTime, Index, Integer, MetaData, Table, func, inspect, select, text
+from sqlalchemy.orm import Session
+
+from app.infra.db import db
+from app.infra.entities.focus_session_db import FocusSessionDB
+from app.utils.logger import logger
+
+TABLE_NAME = FocusSessionDB.__tablename__
+MAXVALUE_PARTITION = "pmax"
+
+
+def month_start(value) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"p{month:%Y%m}"
+
+
+def period_table_name(month: date) -> str:
+    return f"{TABLE_NAME}_{partition_name(month)}"
+
+
+def period_table(month: date) -> Table:
+    """Tabela (Core) de um mês destacado; mesmas colunas de focus_sessions, sem FK."""
+    name = period_table_name(month)
+    return Table(
+        name, MetaData(),
+        Column("id", Integer, primary_key=True),
+        Column("started_at", DateTime, nullable=False),
+        Column("duration_seconds", Integer, nullable=False),
+        Column("project_id", Integer, nullable=False),
+        Index(f"ix_{name}_project_id_started_at", "project_id", "started_at"),
+    )
+
+
+def _month_from_period_table(name: str) -> Optional[date]:
+    suffix = name[len(TABLE_NAME) + 2:] if name.startswith(f"{TABLE_NAME}_p") else ""
+    if len(suffix) != 6 or not suffix.isdigit():
+        return None
+    return date(int(suffix[:4]), int(suffix[4:]), 1)
+
+
+class FocusSessionPartitions:
+    def __init__(self, session: Session = db.session):
+        self._session = session
+
+    @property
+    def dialect(self) -> str:
+        return self._session.get_bind().dialect.name
+
+    def _execute(self, sql: str, **params):
+        logger.debug(f"Partitions: {sql}")
+        return self._session.execute(text(sql), params)
+
+    def detached_months(self) -> List[date]:
+        names = inspect(self._session.connection()).get_table_names()
+        return sorted(month for month in map(_month_from_period_table, names) if month)
+
+    def live_since(self) -> Optional[date]:
+        """Primeiro mês que ainda está em focus_sessions, ou None se nada foi destacado."""
+        detached = self.detached_months()
+        return add_months(detached[-1], 1) if detached else None
+
+    def _oldest_live_month(self) -> Optional[date]:
+        oldest = self._session.execute(select(func.min(FocusSessionDB.started_at))).scalar()
+        if isinstance(oldest, str):  # SQLite devolve texto em agregações
+            oldest = datetime.fromisoformat(oldest)
+        return month_start(oldest) if oldest else None
+
+    # --- MySQL ---
+
+    def _mysql_partitions(self) -> List[str]:
+        rows = self._execute(
+            "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table AND PARTITION_NAME IS NOT NULL "
+            "ORDER BY PARTITION_ORDINAL_POSITION",
+            table=TABLE_NAME,
+        )
+        return [name for (name,) in rows]
+
+    @staticmethod
+    def _mysql_definitions(months: List[date]) -> str:
+        parts = [f"PARTITION {partition_name(m)} VALUES LESS THAN ('{add_months(m, 1):%Y-%m-%d}')" for m in months]
+        parts.append(f"PARTITION {MAXVALUE_PARTITION} VALUES LESS THAN (MAXVALUE)")
+        return ", ".join(parts)
+
+    def _mysql_partition_table(self, months: List[date]) -> None:
+        foreign_keys = self._execute(
+            "SELECT CONSTRAINT_NAME FROM information_schema.TABLE_CONSTRAINTS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table AND CONSTRAINT_TYPE = 'FOREIGN KEY'",
+            table=TABLE_NAME,
+        ).scalars().all()
+        for name in foreign_keys:
+            self._execute(f"ALTER TABLE {TABLE_NAME} DROP FOREIGN KEY {name}")
+        self._execute(f"ALTER TABLE {TABLE_NAME} DROP PRIMARY KEY, ADD PRIMARY KEY (id, started_at)")
+        self._execute(f"ALTER TABLE {TABLE_NAME} PARTITION BY RANGE COLUMNS(started_at) ({self._mysql_definitions(months)})")
+
+    # --- Manutenção ---
+
+    def ensure(self, months_ahead: int = 3, today: Optional[date] = None) -> List[str]:
+        """Garante partições do mês mais antigo com dados até `months_ahead` meses à frente. Retorna as criadas."""
+        current = month_start(today or date.today())
+        last = add_months(current, months_ahead)
+        if self.dialect != "mysql":
+            logger.info(f"Partitions: {self.dialect} keeps the live window in '{TABLE_NAME}'; nothing to create ahead.")
+            return []
+
+        existing = self._mysql_partitions()
+        if not existing:
+            first = min(self._oldest_live_month() or current, current)
+            months = [add_months(first, i) for i in range((last.year - first.year) * 12 + last.month - first.month + 1)]
+            self._mysql_partition_table(months)
+            created = [partition_name(m) for m in months]
+        else:
+            newest = max((n for n in existing if n != MAXVALUE_PARTITION), default=None)
+            start = add_months(date(int(newest[1:5]), int(newest[5:]), 1), 1) if newest else current
+            months = []
+            month = start
+            while month <= last:
+                months.append(month)
+                month = add_months(month, 1)
+            if months:
+                self._execute(
+                    f"ALTER TABLE {TABLE_NAME} REORGANIZE PARTITION {MAXVALUE_PARTITION} INTO ({self._mysql_definitions(months)})"
+                )
+            created = [partition_name(m) for m in months]
+        logger.info(f"Partitions: created {len(created)} partitions on '{TABLE_NAME}': {', '.join(created) or '-'}")
+        return created
+
+    def detach_older_than(self, keep_months: int, today: Optional[date] = None) -> List[str]:
+        """Move os meses anteriores aos últimos `keep_months` (contando o atual) para tabelas focus_sessions_pYYYYMM.
+
+        Retorna as tabelas criadas. Os rollups diários desses meses ficam como estão; `rebuild-rollups` só
+        recalcula a partir de `live_since()`.
+        """
+        cutoff = add_months(month_start(today or date.today()), 1 - max(keep_months, 1))
+        oldest = self._oldest_live_month()
+        if oldest is None or oldest >= cutoff:
+            return []
+
+        detach = self._mysql_detach if self.dialect == "mysql" else self._copy_out
+        detached = []
+        month = oldest
+        while month < cutoff:
+            if detach(month):
+                detached.append(period_table_name(month))
+            month = add_months(month, 1)
+        logger.info(f"Partitions: detached {len(detached)} months from '{TABLE_NAME}' (before {cutoff})")
+        return detached
+
+    def _mysql_detach(self, month: date) -> bool:
+        name, table = partition_name(month), period_table_name(month)
+        if name not in self._mysql_partitions():
+            # A primeira partição também guarda o que for anterior a ela; meses sem partição própria não têm linhas.
+            return False
+        self._execute(f"CREATE TABLE {table} LIKE {TABLE_NAME}")
+        self._execute(f"ALTER TABLE {table} REMOVE PARTITIONING")
+        self._execute(f"ALTER TABLE {TABLE_NAME} EXCHANGE PARTITION {name} WITH TABLE {table}")
+        self._execute(f"ALTER TABLE {TABLE_NAME} DROP PARTITION {name}")
+        return True
+
+    def _copy_out(self, month: date) -> bool:
+        start = datetime.combine(month, datetime.min.time())
+        end = datetime.combine(add_months(month, 1), datetime.min.time())
+        in_month = (FocusSessionDB.started_at >= start) & (FocusSessionDB.started_at < end)
+        if not self._session.execute(select(func.count()).select_from(FocusSessionDB).where(in_month)).scalar():
+            return False
+
+        table = period_table(month)
+        table.create(self._session.connection(), checkfirst=True)
+        columns = [FocusSessionDB.id, FocusSessionDB.started_at, FocusSessionDB.duration_seconds, FocusSessionDB.project_id]
+        self._session.execute(table.insert().from_select([c.key for c in columns], select(*columns).where(in_month)))
+        self._session.execute(FocusSessionDB.__table__.delete().where(in_month))
+        return True
+
+    # --- Leitura e exclusão nos meses destacados ---
+
+    def iter_sessions(self, project_ids: Iterable[int], start: Optional[datetime] = None,
+                      end: Optional[datetime] = None) -> Iterator[Tuple[datetime, int, int]]:
+        """(started_at, duration_seconds, project_id) dos projetos nos meses destacados, com started_at em [start, end)."""
+        project_ids = list(project_ids)
+        if not project_ids:
+            return
+        for month in self.detached_months():
+            if (end is not None and datetime.combine(month, datetime.min.time()) >= end) or \
+                    (start is not None and datetime.combine(add_months(month, 1), datetime.min.time()) <= start):
+                continue
+            table = period_table(month)
+            stmt = select(table.c.started_at, table.c.duration_seconds, table.c.project_id).where(table.c.project_id.in_(project_ids))
+            if start is not None:
+                stmt = stmt.where(table.c.started_at >= start)
+            if end is not None:
+                stmt = stmt.where(table.c.started_at < end)
+            for row in self._session.execute(stmt.order_by(table.c.started_at)):
+                yield row.started_at, row.duration_seconds, row.project_id
+
+    def delete_projects(self, project_ids: Iterable[int]) -> int:
+        """Apaga as sessões dos projetos em todos os meses destacados (na transação atual). Retorna as linhas apagadas."""
+        project_ids = list(project_ids)
+        deleted = 0
+        if project_ids:
+            for month in self.detached_months():
+                table = period_table(month)
+                deleted += self._session.execute(table.delete().where(table.c.project_id.in_(project_ids))).rowcount
+        if deleted:
+            logger.info(f"Partitions: deleted {deleted} detached focus sessions of projects {project_ids}")
+        return deleted
+
+    def describe(self) -> List[Dict]:
+        """Uma linha por partição/período: nome, mês e se está na tabela viva ou destacado."""
+        rows = [{"name": period_table_name(m), "month": m.isoformat(), "live": False} for m in self.detached_months()]
+        if self.dialect == "mysql":
+            rows += [{"name": n, "month": None if n == MAXVALUE_PARTITION else f"{n[1:5]}-{n[5:]}-01", "live": True}
+                     for n in self._mysql_partitions()]
+        else:
+            rows.append({"name": TABLE_NAME, "month": (self._oldest_live_month() or month_start(date.today())).isoformat(), "live": True})
+        return rows
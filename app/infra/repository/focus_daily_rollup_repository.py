@@ -0,0 +1,248 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError, IntegrityError
+from sqlalchemy import String, select, update, delete, insert, func, literal
+
+from app.infra.db import db
+from app.infra.entities.focus_daily_rollup_db import FocusDailyRollupDB
+from app.infra.entities.focus_session_db import FocusSessionDB
+from app.infra.entities.project_db import ProjectDB
+from app.infra.entities.user_db import UserDB
+from app.models.exceptions import DatabaseError
+from app.utils.logger import logger
+from app.utils.timezones import DEFAULT_TIMEZONE, local_date, local_day_range_utc
+
+
+class FocusDailyRollupRepository:
+    def __init__(self, session: Session = db.session):
+        self._session = session
+
+    def add_segments(self, project_id: int, segments: Iterable[Tuple[datetime, int]], tz_name: str = DEFAULT_TIMEZONE) -> None:
+        """Soma os segmentos (UTC, já alinhados ao dia local) no rollup diário do projeto. Não faz commit."""
+        seconds_per_day: Dict[date, int] = defaultdict(int)
+        for started_at, duration_seconds in segments:
+            seconds_per_day[local_date(started_at, tz_name)] += duration_seconds
+        for day, seconds in seconds_per_day.items():
+            self.add_seconds(project_id=project_id, day=day, seconds=seconds)
+
+    def add_seconds(self, project_id: int, day: date, seconds: int) -> None:
+        logger.debug(f"Repository: Adding {seconds}s to daily rollup of project ID {project_id} on {day}")
+        try:
+            stmt = (
+                update(FocusDailyRollupDB)
+                .where(FocusDailyRollupDB.project_id == project_id, FocusDailyRollupDB.day == day)
+                .values(seconds=FocusDailyRollupDB.seconds + seconds)
+                .execution_options(synchronize_session=False)
+            )
+            if self._session.execute(stmt).rowcount:
+                return
+            try:
+                # Outro worker pode criar a linha do dia entre o UPDATE e o INSERT; o savepoint isola esse caso.
+                with self._session.begin_nested():
+                    self._session.execute(insert(FocusDailyRollupDB).values(project_id=project_id, day=day, seconds=seconds))
+            except IntegrityError:
+                self._session.execute(stmt)
+        except SQLAlchemyError as e:
+            logger.error(f"Repository: DB error updating daily rollup of project ID {project_id} on {day}: {e}", exc_info=True)
+            raise DatabaseError(f"Failed to update daily focus rollup for project ID {project_id}.")
+
+    def refresh_days(self, project_id: int, days: Iterable[date], tz_name: str = DEFAULT_TIMEZONE,
+                     extra_seconds: Optional[Dict[date, int]] = None) -> Dict[date, int]:
+        """Recalcula os dias (locais) do projeto a partir de focus_sessions. Idempotente; não faz commit.
+
+        `extra_seconds` soma o que já saiu da tabela (arquivo frio) nos mesmos dias.
+        """
+        totals: Dict[date, int] = {}
+        try:
+            for day in sorted(set(days)):
+                start, end = local_day_range_utc(day, day, tz_name)
+                seconds = self._session.execute(
+                    select(func.coalesce(func.sum(FocusSessionDB.duration_seconds), 0))
+                    .where(FocusSessionDB.project_id == project_id, FocusSessionDB.started_at >= start, FocusSessionDB.started_at < end)
+                ).scalar_one()
+                totals[day] = int(seconds) + (extra_seconds or {}).get(day, 0)
+                self.set_seconds(project_id=project_id, day=day, seconds=totals[day])
+            logger.debug(f"Repository: Refreshed daily rollups of project ID {project_id}: {totals}")
+            return totals
+        except SQLAlchemyError as e:
+            logger.error(f"Repository: DB error refreshing daily rollups of project ID {project_id}: {e}", exc_info=True)
+            raise DatabaseError(f"Failed to refresh daily focus rollups for project ID {project_id}.")
+
+    def set_seconds(self, project_id: int, day: date, seconds: int) -> None:
+        stmt = (
+            update(FocusDailyRollupDB)
+            .where(FocusDailyRollupDB.project_id == project_id, FocusDailyRollupDB.day == day)
+            .values(seconds=seconds)
+            .execution_options(synchronize_session=False)
+        )
+        if self._session.execute(stmt).rowcount or not seconds:
+            return
+        try:
+            with self._session.begin_nested():
+                self._session.execute(insert(FocusDailyRollupDB).values(project_id=project_id, day=day, seconds=seconds))
+        except IntegrityError:
+            self._session.execute(stmt)
+
+    def rebuild(self, batch_size: int = 5000, since: Optional[date] = None, user_identificator: Optional[str] = None) -> int:
+        """Recalcula os rollups a partir de focus_sessions, com o dia no fuso de cada usuário. Não faz commit.
+
+        Usuários em UTC são resolvidos com um INSERT ... SELECT agrupando por DATE(started_at); para os demais o dia
+        local depende das regras de horário de verão, então as sessões são lidas em streaming e agrupadas por projeto.
+        Com `since`, só os dias a partir dele são recalculados (os anteriores podem vir de partições já destacadas).
+        Com `user_identificator`, só os projetos desse usuário (depois de ele trocar de fuso).
+        """
+        logger.info(f"Repository: Rebuilding daily focus rollups from focus_sessions (since {since or 'the beginning'}, user {user_identificator or 'all'})")
+        try:
+            stale = delete(FocusDailyRollupDB)
+            if since is not None:
+                stale = stale.where(FocusDailyRollupDB.day >= since)
+            if user_identificator is not None:
+                stale = stale.where(FocusDailyRollupDB.project_id.in_(
+                    select(ProjectDB.id).join(ProjectDB.user).where(UserDB.identificator == user_identificator)))
+            self._session.execute(stale.execution_options(synchronize_session=False))
+            day = func.date(FocusSessionDB.started_at)
+            source = (
+                select(FocusSessionDB.project_id, day, func.sum(FocusSessionDB.duration_seconds))
+                .join(FocusSessionDB.project)
+                .join(ProjectDB.user)
+                .where(UserDB.timezone == DEFAULT_TIMEZONE)
+                .group_by(FocusSessionDB.project_id, day)
+            )
+            if since is not None:
+                source = source.where(FocusSessionDB.started_at >= datetime.combine(since, datetime.min.time()))
+            if user_identificator is not None:
+                source = source.where(UserDB.identificator == user_identificator)
+            rows = self._session.execute(
+                insert(FocusDailyRollupDB).from_select(["project_id", "day", "seconds"], source)
+            ).rowcount
+
+            stmt = (
+                select(FocusSessionDB.project_id, FocusSessionDB.started_at, FocusSessionDB.duration_seconds, UserDB.timezone)
+                .join(FocusSessionDB.project)
+                .join(ProjectDB.user)
+                .where(UserDB.timezone != DEFAULT_TIMEZONE)
+                .order_by(FocusSessionDB.project_id)
+                .execution_options(yield_per=batch_size)
+            )
+            if since is not None:
+                # Um dia margem: o dia local `since` pode começar no dia UTC anterior.
+                stmt = stmt.where(FocusSessionDB.started_at >= datetime.combine(since - timedelta(days=1), datetime.min.time()))
+            if user_identificator is not None:
+                stmt = stmt.where(UserDB.identificator == user_identificator)
+            current_project_id = None
+            seconds_per_day: Dict[date, int] = defaultdict(int)
+            pending: List[Dict] = []
+            for project_id, started_at, duration_seconds, tz_name in self._session.execute(stmt):
+                if project_id != current_project_id:
+                    pending.extend({"project_id": current_project_id, "day": d, "seconds": s} for d, s in seconds_per_day.items())
+                    seconds_per_day = defaultdict(int)
+                    current_project_id = project_id
+                    if len(pending) >= batch_size:
+                        self._session.execute(insert(FocusDailyRollupDB), pending)
+                        rows += len(pending)
+                        pending = []
+                day_local = local_date(started_at, tz_name)
+                if since is None or day_local >= since:
+                    seconds_per_day[day_local] += duration_seconds
+            pending.extend({"project_id": current_project_id, "day": d, "seconds": s} for d, s in seconds_per_day.items())
+            if pending:
+                self._session.execute(insert(FocusDailyRollupDB), pending)
+                rows += len(pending)
+
+            logger.info(f"Repository: Rebuilt {rows} daily focus rollup rows.")
+            return rows
+        except SQLAlchemyError as e:
+            logger.error(f"Repository: DB error rebuilding daily focus rollups: {e}", exc_info=True)
+            raise DatabaseError("Failed to rebuild daily focus rollups.")
+
+    def sum_seconds_per_day_by_user(self, user_identificator: str, start: date, end: date) -> Dict[date, int]:
+        """Retorna {dia local: segundos} do usuário para os dias em [start, end)."""
+        logger.debug(f"Repository: Summing daily focus rollups for user '{user_identificator}' from {start} to {end}")
+        try:
+            stmt = (
+                select(FocusDailyRollupDB.day, func.sum(FocusDailyRollupDB.seconds))
+                .join(FocusDailyRollupDB.project)
+                .join(ProjectDB.user)
+                .where(UserDB.identificator == user_identificator)
+                .where(FocusDailyRollupDB.day >= start, FocusDailyRollupDB.day < end)
+                .group_by(FocusDailyRollupDB.day)
+            )
+            return {day: int(seconds) for day, seconds in self._session.execute(stmt)}
+        except SQLAlchemyError as e:
+            logger.error(f"Repository: DB error summing daily focus rollups for user '{user_identificator}': {e}", exc_info=True)
+            raise DatabaseError(f"Error retrieving daily focus time for user '{user_identificator}'.")
+
+    def sum_seconds_by_user(self, start: date, end: date) -> List[Tuple[str, int]]:
+        """(identificator do usuário, segundos) de todos os usuários com foco nos dias em [start, end)."""
+        logger.debug(f"Repository: Summing daily focus rollups per user from {start} to {end}")
+        try:
+            stmt = (
+                select(UserDB.identificator, func.sum(FocusDailyRollupDB.seconds))
+                .join(FocusDailyRollupDB.project)
+                .join(ProjectDB.user)
+                .where(FocusDailyRollupDB.day >= start, FocusDailyRollupDB.day < end)
+                .group_by(UserDB.identificator)
+            )
+            return [(identificator, int(seconds)) for identificator, seconds in self._session.execute(stmt) if seconds]
+        except SQLAlchemyError as e:
+            logger.error(f"Repository: DB error summing daily focus rollups per user from {start} to {end}: {e}", exc_info=True)
+            raise DatabaseError("Error retrieving daily focus time per user.")
+
+    def _bucket(self, column, granularity: str):
+        """Expressão SQL que leva o dia ao início do período (semana começando no domingo, como no resumo semanal)."""
+        if granularity == "day":
+            return column
+        dialect = self._session.get_bind().dialect.name
+        if dialect == "sqlite":
+            if granularity == "week":
+                return func.date(column, literal("-", String) + func.strftime("%w", column) + " days")
+            return func.strftime("%Y-%m-01", column)
+        if dialect in ("mysql", "mariadb"):
+            if granularity == "week":
+                return func.subdate(column, func.dayofweek(column) - 1)
+            return func.date_format(column, "%Y-%m-01")
+        raise DatabaseError(f"Focus analytics buckets are not supported on '{dialect}'.")
+
+    def get_series(self, user_identificator: str, start: date, end: date, granularity: str,
+                   project_identificator: Optional[str] = None, max_rows: int = 50000) -> Tuple[List[Dict], int]:
+        """Soma os rollups do usuário por (período, projeto) em [start, end).
+
+        O GROUP BY roda sobre uma subconsulta com LIMIT max_rows + 1, então o banco nunca lê mais do que
+        isso; o segundo valor retornado é quantas linhas de rollup foram lidas (> max_rows = faixa grande demais).
+        """
+        logger.debug(f"Repository: Getting {granularity} focus series for user '{user_identificator}' from {start} to {end} (project={project_identificator})")
+        try:
+            scoped = (
+                select(FocusDailyRollupDB.day, FocusDailyRollupDB.seconds, FocusDailyRollupDB.project_id)
+                .join(FocusDailyRollupDB.project)
+                .join(ProjectDB.user)
+                .where(UserDB.identificator == user_identificator)
+                .where(FocusDailyRollupDB.day >= start, FocusDailyRollupDB.day < end)
+            )
+            if project_identificator:
+                scoped = scoped.where(ProjectDB.identificator == project_identificator)
+            scoped = scoped.limit(max_rows + 1).subquery()
+
+            period = self._bucket(scoped.c.day, granularity).label("period")
+            stmt = (
+                select(
+                    period,
+                    ProjectDB.identificator,
+                    ProjectDB.title,
+                    ProjectDB.color,
+                    func.sum(scoped.c.seconds).label("seconds"),
+                    func.count().label("rows"),
+                )
+                .join_from(scoped, ProjectDB, ProjectDB.id == scoped.c.project_id)
+                .group_by(period, ProjectDB.id, ProjectDB.identificator, ProjectDB.title, ProjectDB.color)
+                .order_by(period, ProjectDB.title)
+            )
+            rows = self._session.execute(stmt).mappings().all()
+            scanned = sum(row["rows"] for row in rows)
+            return [dict(row) for row in rows], scanned
+        except SQLAlchemyError as e:
+            logger.error(f"Repository: DB error getting focus series for user '{user_identificator}': {e}", exc_info=True)
+            raise DatabaseError(f"Error retrieving focus analytics for user '{user_identificator}'.")
@@ -0,0 +1,122 @@
+from typing import Dict, List, Optional
+
+from sqlalchemy import select, delete, func, bindparam
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.infra.db import db
+from app.infra.entities.focus_group_db import FocusGroupDB, FocusGroupMemberDB
+from app.infra.entities.user_db import UserDB
+from app.models.exceptions import DatabaseError, UserNotFoundError
+from app.utils.logger import logger
+
+_SELECT_USER_ID = select(UserDB.id).where(UserDB.identificator == bindparam("user_identificator"))
+
+_SELECT_GROUP_IDS_BY_USER = (
+    select(FocusGroupMemberDB.group_id)
+    .join(UserDB, UserDB.id == FocusGroupMemberDB.user_id)
+    .where(UserDB.identificator == bindparam("user_identificator"))
+    .order_by(FocusGroupMemberDB.group_id)
+)
+
+_SELECT_MEMBER_IDENTIFICATORS = (
+    select(UserDB.identificator)
+    .join(FocusGroupMemberDB, FocusGroupMemberDB.user_id == UserDB.id)
+    .where(FocusGroupMemberDB.group_id == bindparam("group_id"))
+)
+
+
+class FocusGroupRepository:
+    def __init__(self, session: Session = db.session):
+        self._session = session
+
+    def _user_id(self, user_identificator: str) -> int:
+        user_id = self._session.execute(_SELECT_USER_ID, {"user_identificator": user_identificator}).scalar_one_or_none()
+        if user_id is None:
+            raise UserNotFoundError(user_identificator)
+        return user_id
+
+    def create(self, name: str, user_identificator: str) -> FocusGroupDB:
+        """Cria o grupo com o criador como primeiro membro. Não faz commit."""
+        try:
+            group = FocusGroupDB(name=name)
+            group.members.append(FocusGroupMemberDB(user_id=self._user_id(user_identificator)))
+            self._session.add(group)
+            self._session.flush()
+            logger.debug(f"Repository: Group '{group.identificator}' created by user '{user_identificator}'")
+            return group
+        except SQLAlchemyError as e:
+            logger.error(f"Repository: DB error creating group '{name}': {e}", exc_info=True)
+            raise DatabaseError(f"Failed to create group '{name}'.")
+
+    def get_by_identificator(self, group_identificator: str) -> Optional[FocusGroupDB]:
+        try:
+            return self._session.execute(
+                select(FocusGroupDB).where(FocusGroupDB.identificator == group_identificator)
+            ).scalar_one_or_none()
+        except SQLAlchemyError as e:
+            logger.error(f"Repository: DB error reading group '{group_identificator}': {e}", exc_info=True)
+            raise DatabaseError(f"Error reading group '{group_identificator}'.")
+
+    def add_member(self, group_id: int, user_identificator: str) -> bool:
+        """Adiciona o usuário ao grupo; False se ele já era membro. Não faz commit."""
+        try:
+            user_id = self._user_id(user_identificator)
+            exists = self._session.execute(
+                select(FocusGroupMemberDB.id).where(FocusGroupMemberDB.group_id == group_id, FocusGroupMemberDB.user_id == user_id)
+            ).first()
+            if exists:
+                return False
+            self._session.add(FocusGroupMemberDB(group_id=group_id, user_id=user_id))
+            self._session.flush()
+            return True
+        except SQLAlchemyError as e:
+            logger.error(f"Repository: DB error adding user '{user_identificator}' to group {group_id}: {e}", exc_info=True)
+            raise DatabaseError(f"Failed to add member to group {group_id}.")
+
+    def remove_member(self, group_id: int, user_identificator: str) -> bool:
+        """Remove o usuário do grupo; False se ele não era membro. Não faz commit."""
+        try:
+            result = self._session.execute(
+                delete(FocusGroupMemberDB)
+                .where(FocusGroupMemberDB.group_id == group_id, FocusGroupMemberDB.user_id == self._user_id(user_identificator))
+                .execution_options(synchronize_session=False)
+            )
+            return result.rowcount > 0
+        except SQLAlchemyError as e:
+            logger.error(f"Repository: DB error removing user '{user_identificator}' from group {group_id}: {e}", exc_info=True)
+            raise DatabaseError(f"Failed to remove member from group {group_id}.")
+
+    def get_group_ids_by_user(self, user_identificator: str) -> List[int]:
+        try:
+            return list(self._session.execute(_SELECT_GROUP_IDS_BY_USER, {"user_identificator": user_identificator}).scalars())
+        except SQLAlchemyError as e:
+            logger.error(f"Repository: DB error listing groups of user '{user_identificator}': {e}", exc_info=True)
+            raise DatabaseError(f"Error listing groups for user '{user_identificator}'.")
+
+    def get_member_identificators(self, group_id: int) -> List[str]:
+        try:
+            return list(self._session.execute(_SELECT_MEMBER_IDENTIFICATORS, {"group_id": group_id}).scalars())
+        except SQLAlchemyError as e:
+            logger.error(f"Repository: DB error listing members of group {group_id}: {e}", exc_info=True)
+            raise DatabaseError(f"Error listing members for group {group_id}.")
+
+    def list_by_user(self, user_identificator: str) -> List[Dict]:
+        """Grupos do usuário com a quantidade de membros de cada um."""
+        try:
+            member_count = (
+                select(func.count(FocusGroupMemberDB.id))
+                .where(FocusGroupMemberDB.group_id == FocusGroupDB.id)
+                .correlate(FocusGroupDB)
+                .scalar_subquery()
+            )
+            rows = self._session.execute(
+                select(FocusGroupDB.identificator, FocusGroupDB.name, member_count)
+                .where(FocusGroupDB.id.in_(_SELECT_GROUP_IDS_BY_USER.order_by(None)))
+                .order_by(FocusGroupDB.name),
+                {"user_identificator": user_identificator},
+            ).all()
+            return [{"identificator": identificator, "name": name, "members": members} for identificator, name, members in rows]
+        except SQLAlchemyError as e:
+            logger.error(f"Repository: DB error listing groups of user '{user_identificator}': {e}", exc_info=True)
+            raise DatabaseError(f"Error listing groups for user '{user_identificator}'.")
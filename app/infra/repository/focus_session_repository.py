@@ -1,14 +1,16 @@
 # /home/gccintra/projects/focus_time_v2/app/infra/repository/focus_session_repository.py
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError, MultipleResultsFound
-from sqlalchemy import select
-from typing import Optional
+from sqlalchemy import select, delete, func, case, and_
+from typing import Dict, Iterator, List, Optional, Tuple
+from datetime import datetime
 
 from app.infra.db import db
 from app.infra.entities.focus_session_db import FocusSessionDB
 from app.infra.entities.project_db import ProjectDB
-from app.models.focus_session import FocusSession
+from app.infra.entities.user_db import UserDB
+from app.models.focus_session import FocusSession, split_by_day
 from app.models.project import Project # Import Project domain model for type hinting if needed
 from app.models.exceptions import DatabaseError, ProjectNotFoundError, FocusSessionValidationError
 from app.utils.logger import logger
@@ -73,5 +75,219 @@ class FocusSessionRepository:
              logger.error(f"Repository: Unexpected error adding focus session for project '{focus_session.project.identificator}': {e}", exc_info=True)
              raise DatabaseError(f"An unexpected error occurred while adding the focus session.")
 
+    def add_many(self, focus_sessions: List[FocusSession]) -> None:
+        """Adiciona segmentos de uma mesma sessão (mesmo projeto) resolvendo o projeto uma única vez."""
+        if not focus_sessions:
+            return
+        project_identificator = focus_sessions[0].project.identificator
+        logger.debug(f"Repository: Attempting to add {len(focus_sessions)} focus session segments for project '{project_identificator}'")
+        try:
+            for focus_session in focus_sessions:
+                if focus_session.duration_seconds <= 0:
+                    raise FocusSessionValidationError(field="duration_seconds", message="duration of focus session cannot be under or equal 0 seconds.")
+                if focus_session.project.identificator != project_identificator:
+                    raise FocusSessionValidationError(field="project", message="all segments must belong to the same project.")
+
+            project_db = self._find_project_db_by_identificator(project_identificator)
+            if not project_db:
+                logger.error(f"Repository: Project with identificator {project_identificator} not found. Cannot add focus sessions.")
+                raise ProjectNotFoundError(project_id=project_identificator)
+
+            focus_sessions_db = []
+            for focus_session in focus_sessions:
+                focus_session_db = focus_session.to_orm()
+                focus_session_db.project_id = project_db.id
+                focus_sessions_db.append(focus_session_db)
+
+            self._session.add_all(focus_sessions_db)
+            self._session.flush()
+
+            for focus_session, focus_session_db in zip(focus_sessions, focus_sessions_db):
+                if focus_session.id is None:
+                    focus_session._id = focus_session_db.id
+
+            logger.info(f"Repository: {len(focus_sessions_db)} focus session segments added and flushed to session for project ID {project_db.id}.")
+        except FocusSessionValidationError:
+            logger.warning(f"Repository: Failed to add focus session segments for project '{project_identificator}' due to invalid data.")
+            raise
+        except ProjectNotFoundError:
+            logger.warning(f"Repository: Failed to add focus session segments because project '{project_identificator}' was not found.")
+            raise
+        except (SQLAlchemyError, IntegrityError) as e:
+            logger.error(f"Repository: Database error adding/flushing focus session segments for project '{project_identificator}': {e}", exc_info=True)
+            raise DatabaseError(f"Failed to add focus sessions for project '{project_identificator}' to the database session.")
+        except Exception as e:
+            logger.error(f"Repository: Unexpected error adding focus session segments for project '{project_identificator}': {e}", exc_info=True)
+            raise DatabaseError("An unexpected error occurred while adding the focus sessions.")
+
+    def get_time_summary_by_user(self, user_identificator: str, today_start: datetime, week_start: datetime, end: datetime) -> List[Dict]:
+        """Soma, por projeto do usuário, os segundos de hoje e da semana com um único scan por intervalo em started_at."""
+        logger.debug(f"Repository: Summarizing focus time for user '{user_identificator}' (week from {week_start}, today from {today_start}, until {end})")
+        try:
+            stmt = (
+                select(
+                    ProjectDB.identificator,
+                    ProjectDB.title,
+                    ProjectDB.color,
+                    func.coalesce(func.sum(case((FocusSessionDB.started_at >= today_start, FocusSessionDB.duration_seconds), else_=0)), 0).label("today_seconds"),
+                    func.coalesce(func.sum(FocusSessionDB.duration_seconds), 0).label("week_seconds"),
+                )
+                .join(ProjectDB.user)
+                .outerjoin(
+                    FocusSessionDB,
+                    and_(
+                        FocusSessionDB.project_id == ProjectDB.id,
+                        FocusSessionDB.started_at >= week_start,
+                        FocusSessionDB.started_at < end,
+                    ),
+                )
+                .where(UserDB.identificator == user_identificator)
+                .group_by(ProjectDB.id, ProjectDB.identificator, ProjectDB.title, ProjectDB.color)
+                .order_by(ProjectDB.title)
+            )
+            rows = self._session.execute(stmt).mappings().all()
+            logger.info(f"Repository: Summarized focus time for {len(rows)} projects of user '{user_identificator}'.")
+            return [dict(row) for row in rows]
+        except SQLAlchemyError as e:
+            logger.error(f"Repository: DB error summarizing focus time for user '{user_identificator}': {e}", exc_info=True)
+            raise DatabaseError(f"Error retrieving focus time summary for user '{user_identificator}'.")
+
+    def sum_duration_by_project(self, project_identificator: str, start: datetime, end: datetime) -> int:
+        """Soma os segundos do projeto com started_at em [start, end)."""
+        logger.debug(f"Repository: Summing focus time for project '{project_identificator}' from {start} to {end}")
+        try:
+            stmt = (
+                select(func.coalesce(func.sum(FocusSessionDB.duration_seconds), 0))
+                .join(FocusSessionDB.project)
+                .where(ProjectDB.identificator == project_identificator)
+                .where(FocusSessionDB.started_at >= start, FocusSessionDB.started_at < end)
+            )
+            return int(self._session.execute(stmt).scalar_one())
+        except SQLAlchemyError as e:
+            logger.error(f"Repository: DB error summing focus time for project '{project_identificator}': {e}", exc_info=True)
+            raise DatabaseError(f"Error retrieving focus time for project '{project_identificator}'.")
+
+    def get_by_project_in_range(self, project_identificator: str, start: datetime, end: datetime) -> List[Dict]:
+        """Sessões do projeto com started_at em [start, end), sem hidratar entidades (id, started_at, duration_seconds)."""
+        logger.debug(f"Repository: Getting focus sessions for project '{project_identificator}' from {start} to {end}")
+        try:
+            stmt = (
+                select(FocusSessionDB.id, FocusSessionDB.started_at, FocusSessionDB.duration_seconds)
+                .join(FocusSessionDB.project)
+                .where(ProjectDB.identificator == project_identificator)
+                .where(FocusSessionDB.started_at >= start, FocusSessionDB.started_at < end)
+                .order_by(FocusSessionDB.started_at)
+            )
+            return [dict(row) for row in self._session.execute(stmt).mappings()]
+        except SQLAlchemyError as e:
+            logger.error(f"Repository: DB error getting focus sessions for project '{project_identificator}': {e}", exc_info=True)
+            raise DatabaseError(f"Error retrieving focus sessions for project '{project_identificator}'.")
+
+    def get_batch_after_id(self, last_id: int, batch_size: int, user_identificator: Optional[str] = None) -> List[FocusSessionDB]:
+        """Paginação por chave (id) usada pelas migrações, para poder commitar entre lotes e retomar de onde parou.
+
+        Projeto e usuário vêm no mesmo SELECT, pois as migrações precisam do fuso do dono de cada sessão.
+        """
+        try:
+            stmt = (
+                select(FocusSessionDB)
+                .options(joinedload(FocusSessionDB.project).joinedload(ProjectDB.user))
+                .where(FocusSessionDB.id > last_id)
+                .order_by(FocusSessionDB.id)
+                .limit(batch_size)
+            )
+            if user_identificator:
+                stmt = stmt.join(FocusSessionDB.project).join(ProjectDB.user).where(UserDB.identificator == user_identificator)
+            return self._session.execute(stmt).unique().scalars().all()
+        except SQLAlchemyError as e:
+            logger.error(f"Repository: DB error reading focus sessions after id {last_id}: {e}", exc_info=True)
+            raise DatabaseError(f"Error reading focus sessions after id {last_id}.")
+
+    def get_user_identificators_with_sessions_before(self, before: datetime) -> List[str]:
+        try:
+            stmt = (
+                select(UserDB.identificator)
+                .join(UserDB.projects)
+                .join(ProjectDB.focus_sessions)
+                .where(FocusSessionDB.started_at < before)
+                .distinct()
+                .order_by(UserDB.identificator)
+            )
+            return list(self._session.execute(stmt).scalars())
+        except SQLAlchemyError as e:
+            logger.error(f"Repository: DB error listing users with focus sessions before {before}: {e}", exc_info=True)
+            raise DatabaseError(f"Error listing users with focus sessions before {before}.")
+
+    def get_archivable_by_user(self, user_identificator: str, before: datetime) -> List[Tuple[int, datetime, int, int]]:
+        """(id, started_at, duration_seconds, project_id) das sessões do usuário com started_at < before."""
+        try:
+            stmt = (
+                select(FocusSessionDB.id, FocusSessionDB.started_at, FocusSessionDB.duration_seconds, FocusSessionDB.project_id)
+                .join(FocusSessionDB.project)
+                .join(ProjectDB.user)
+                .where(UserDB.identificator == user_identificator, FocusSessionDB.started_at < before)
+                .order_by(FocusSessionDB.started_at)
+            )
+            return [tuple(row) for row in self._session.execute(stmt)]
+        except SQLAlchemyError as e:
+            logger.error(f"Repository: DB error reading archivable focus sessions for user '{user_identificator}': {e}", exc_info=True)
+            raise DatabaseError(f"Error reading focus sessions for user '{user_identificator}'.")
+
+    def delete_by_ids(self, ids: List[int], batch_size: int = 500) -> int:
+        """Remove as sessões pelos ids (em lotes, por causa do limite de parâmetros). Não faz commit."""
+        deleted = 0
+        try:
+            for i in range(0, len(ids), batch_size):
+                stmt = delete(FocusSessionDB).where(FocusSessionDB.id.in_(ids[i:i + batch_size]))
+                deleted += self._session.execute(stmt.execution_options(synchronize_session=False)).rowcount
+            return deleted
+        except SQLAlchemyError as e:
+            logger.error(f"Repository: DB error deleting {len(ids)} focus sessions: {e}", exc_info=True)
+            raise DatabaseError("Failed to delete focus sessions.")
+
+    def split_by_day(self, focus_session_db: FocusSessionDB, tz_name: Optional[str] = None) -> int:
+        """Reduz a linha ao primeiro segmento do dia (local, se tz_name) e insere os demais. Retorna quantas linhas novas foram criadas."""
+        segments = split_by_day(focus_session_db.started_at, focus_session_db.duration_seconds, tz_name)
+        if len(segments) <= 1:
+            return 0
+        try:
+            first_start, first_seconds = segments[0]
+            focus_session_db.started_at = first_start
+            focus_session_db.duration_seconds = first_seconds
+            self._session.add_all([
+                FocusSessionDB(started_at=segment_start, duration_seconds=segment_seconds, project_id=focus_session_db.project_id)
+                for segment_start, segment_seconds in segments[1:]
+            ])
+            self._session.flush()
+            logger.debug(f"Repository: Focus session {focus_session_db.id} split into {len(segments)} day-aligned segments.")
+            return len(segments) - 1
+        except SQLAlchemyError as e:
+            logger.error(f"Repository: DB error splitting focus session {focus_session_db.id}: {e}", exc_info=True)
+            raise DatabaseError(f"Failed to split focus session {focus_session_db.id}.")
+
+    def iter_export_rows_by_user(self, user_identificator: str, batch_size: int = 1000) -> Iterator[Dict]:
+        """Percorre todas as sessões do usuário com cursor no servidor (yield_per), sem hidratar entidades."""
+        logger.debug(f"Repository: Streaming focus sessions for user '{user_identificator}' (batch_size={batch_size})")
+        stmt = (
+            select(
+                FocusSessionDB.id,
+                ProjectDB.identificator.label("project_identificator"),
+                ProjectDB.title.label("project_title"),
+                FocusSessionDB.started_at,
+                FocusSessionDB.duration_seconds,
+            )
+            .join(FocusSessionDB.project)
+            .join(ProjectDB.user)
+            .where(UserDB.identificator == user_identificator)
+            .order_by(FocusSessionDB.started_at, FocusSessionDB.id)
+            .execution_options(yield_per=batch_size)
+        )
+        try:
+            for row in self._session.execute(stmt).mappings():
+                yield row
+        except SQLAlchemyError as e:
+            logger.error(f"Repository: DB error streaming focus sessions for user '{user_identificator}': {e}", exc_info=True)
+            raise DatabaseError(f"Error streaming focus sessions for user '{user_identificator}'.")
+
     # --- Outros métodos (get_by_id, get_by_project, update, delete, etc.) serão adicionados aqui futuramente ---
 
@@ -0,0 +1,134 @@
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import select, update, func, or_, and_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.infra.db import db
+from app.infra.entities.job_db import JobDB
+from app.models.exceptions import DatabaseError
+from app.utils.logger import logger
+
+
+class JobRepository:
+    def __init__(self, session: Session = db.session):
+        self._session = session
+
+    def add(self, kind: str, payload: str, run_at: datetime, max_attempts: int, dedupe_key: Optional[str] = None) -> JobDB:
+        """Enfileira na transação corrente (o trabalho só existe se o commit do chamador acontecer). Não faz commit.
+
+        Com dedupe_key, um trabalho igual que ainda está na fila é reaproveitado em vez de criar outro.
+        """
+        try:
+            if dedupe_key:
+                existing = self._session.execute(
+                    select(JobDB).where(JobDB.dedupe_key == dedupe_key, JobDB.status == JobDB.QUEUED).limit(1)
+                ).scalar_one_or_none()
+                if existing is not None:
+                    logger.debug(f"Repository: Job '{dedupe_key}' already queued as {existing.id}")
+                    return existing
+            job = JobDB(kind=kind, payload=payload, run_at=run_at, max_attempts=max_attempts, dedupe_key=dedupe_key)
+            self._session.add(job)
+            self._session.flush()
+            return job
+        except SQLAlchemyError as e:
+            logger.error(f"Repository: DB error enqueuing job '{kind}': {e}", exc_info=True)
+            raise DatabaseError(f"Failed to enqueue job '{kind}'.")
+
+    def get(self, job_id: int) -> Optional[JobDB]:
+        try:
+            return self._session.get(JobDB, job_id)
+        except SQLAlchemyError as e:
+            logger.error(f"Repository: DB error reading job {job_id}: {e}", exc_info=True)
+            raise DatabaseError(f"Error reading job {job_id}.")
+
+    def claim_next(self, worker_id: str, now: datetime, lock_timeout_seconds: int) -> Optional[JobDB]:
+        """Reserva o próximo trabalho pronto para este worker. Não faz commit: o service commita a reserva.
+
+        A reserva é um UPDATE condicional em (id, status, attempts): se outro worker levou o mesmo trabalho
+        entre o SELECT e o UPDATE, nada muda e o próximo candidato é tentado. Trabalhos em execução há mais de
+        lock_timeout_seconds (worker que morreu) voltam a ser candidatos.
+        """
+        stale = now - timedelta(seconds=lock_timeout_seconds)
+        candidates = (
+            select(JobDB.id, JobDB.status, JobDB.attempts)
+            .where(or_(
+                and_(JobDB.status == JobDB.QUEUED, JobDB.run_at <= now),
+                and_(JobDB.status == JobDB.RUNNING, JobDB.locked_at < stale),
+            ))
+            .order_by(JobDB.run_at, JobDB.id)
+            .limit(10)
+        )
+        try:
+            for job_id, status, attempts in self._session.execute(candidates).all():
+                claimed = self._session.execute(
+                    update(JobDB)
+                    .where(JobDB.id == job_id, JobDB.status == status, JobDB.attempts == attempts)
+                    .values(status=JobDB.RUNNING, locked_by=worker_id, locked_at=now, attempts=attempts + 1)
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+                if claimed:
+                    job = self._session.get(JobDB, job_id, populate_existing=True)
+                    logger.debug(f"Repository: Worker '{worker_id}' claimed {job}")
+                    return job
+            return None
+        except SQLAlchemyError as e:
+            logger.error(f"Repository: DB error claiming next job for worker '{worker_id}': {e}", exc_info=True)
+            raise DatabaseError("Failed to claim next job.")
+
+    def mark_done(self, job: JobDB, now: datetime, result: Optional[str] = None) -> None:
+        job.status = JobDB.DONE
+        job.finished_at = now
+        job.result = result
+        job.last_error = None
+        job.locked_by = job.locked_at = None
+
+    def mark_failed(self, job: JobDB, now: datetime, error: str, retry_at: Optional[datetime]) -> None:
+        """Volta para a fila em retry_at, ou marca como falho de vez se retry_at for None."""
+        job.last_error = error[-4000:]
+        job.locked_by = job.locked_at = None
+        if retry_at is None:
+            job.status = JobDB.FAILED
+            job.finished_at = now
+        else:
+            job.status = JobDB.QUEUED
+            job.run_at = retry_at
+
+    def retry_failed(self, now: datetime, kind: Optional[str] = None) -> int:
+        stmt = (
+            update(JobDB)
+            .where(JobDB.status == JobDB.FAILED)
+            .values(status=JobDB.QUEUED, run_at=now, attempts=0, finished_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        if kind:
+            stmt = stmt.where(JobDB.kind == kind)
+        try:
+            return self._session.execute(stmt).rowcount
+        except SQLAlchemyError as e:
+            logger.error(f"Repository: DB error requeueing failed jobs: {e}", exc_info=True)
+            raise DatabaseError("Failed to requeue failed jobs.")
+
+    def count_by_status(self) -> Dict[str, Dict[str, int]]:
+        """{kind: {status: quantidade}}."""
+        try:
+            stmt = select(JobDB.kind, JobDB.status, func.count()).group_by(JobDB.kind, JobDB.status)
+            counts: Dict[str, Dict[str, int]] = {}
+            for kind, status, total in self._session.execute(stmt):
+                counts.setdefault(kind, {})[status] = total
+            return counts
+        except SQLAlchemyError as e:
+            logger.error(f"Repository: DB error counting jobs: {e}", exc_info=True)
+            raise DatabaseError("Error counting jobs.")
+
+    def delete_finished_before(self, before: datetime) -> int:
+        try:
+            stmt = (
+                JobDB.__table__.delete()
+                .where(JobDB.status == JobDB.DONE, JobDB.finished_at < before)
+            )
+            return self._session.execute(stmt).rowcount
+        except SQLAlchemyError as e:
+            logger.error(f"Repository: DB error purging finished jobs: {e}", exc_info=True)
+            raise DatabaseError("Failed to purge finished jobs.")
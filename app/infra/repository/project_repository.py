@@ -1,19 +1,63 @@
 from sqlalchemy.orm import joinedload, Session
 from sqlalchemy.exc import SQLAlchemyError, MultipleResultsFound, IntegrityError
-from sqlalchemy import select
-from typing import List, Optional
+from sqlalchemy import select, bindparam
+from typing import Dict, List, Optional
 
 from app.infra.db import db
+from app.infra.routing_session import read_only
 from app.infra.entities.project_db import ProjectDB
 from app.infra.entities.task_db import TaskDB
 from app.infra.entities.user_db import UserDB
+from app.infra.partitioning import FocusSessionPartitions
 from app.models.project import Project
 from app.models.task import Task
-from app.models.focus_session import FocusSession
 from app.models.dtos.project_dto import ProjectDetailsDTO
 from app.models.exceptions import ProjectNotFoundError, DatabaseError, UserNotFoundError 
 from app.utils.logger import logger
 
+# Consultas quentes montadas uma única vez: o SQLAlchemy memoiza a cache key no objeto e reaproveita o SQL compilado.
+_SELECT_USER_BY_IDENTIFICATOR = select(UserDB).where(UserDB.identificator == bindparam("user_identificator"))
+
+_SELECT_PROJECT_WITH_USER = (
+    select(ProjectDB)
+    .where(ProjectDB.identificator == bindparam("project_identificator"))
+    .options(joinedload(ProjectDB.user))
+)
+
+_SELECT_PROJECTS_BY_USER = (
+    select(ProjectDB)
+    .join(ProjectDB.user)
+    .where(UserDB.identificator == bindparam("user_identificator"))
+    .options(joinedload(ProjectDB.user)) # Eager load user for from_orm
+    .order_by(ProjectDB.title)
+)
+
+_SELECT_PROJECTS_WITH_FOCUS_SESSIONS_BY_USER = (
+    select(ProjectDB)
+    .join(ProjectDB.user)
+    .where(UserDB.identificator == bindparam("user_identificator"))
+    .options(
+        joinedload(ProjectDB.user),
+        joinedload(ProjectDB.focus_sessions)
+    )
+    .order_by(ProjectDB.title)
+)
+
+_SELECT_PROJECT_BY_USER = (
+    select(ProjectDB)
+    .join(ProjectDB.user)
+    .where(ProjectDB.identificator == bindparam("project_identificator"))
+    .where(UserDB.identificator == bindparam("user_identificator"))
+)
+
+_SELECT_PROJECT_DETAILS = _SELECT_PROJECT_BY_USER.options(
+    joinedload(ProjectDB.user), # Necessário para Project.from_orm
+    joinedload(ProjectDB.tasks).joinedload(TaskDB.status), # Carrega tarefas e seus status
+    # Sessões de foco não vêm aqui: o histórico inteiro não tem limite e atravessaria todas as partições.
+    # O service lê só o intervalo que precisa via FocusSessionRepository.
+)
+
+
 class ProjectRepository:
     def __init__(self, session: Session = db.session):
         self._session = session
@@ -21,8 +65,7 @@ class ProjectRepository:
     def _find_user_db_by_identificator(self, user_identificator: str) -> Optional[UserDB]:
         logger.debug(f"Repository: Finding user DB by identificator '{user_identificator}'")
         try:
-            stmt = select(UserDB).where(UserDB.identificator == user_identificator)
-            user_db = self._session.execute(stmt).scalar_one_or_none()
+            user_db = self._session.execute(_SELECT_USER_BY_IDENTIFICATOR, {"user_identificator": user_identificator}).scalar_one_or_none()
             if user_db:
                 logger.debug(f"Repository: User DB found for identificator '{user_identificator}'")
             else:
@@ -39,14 +82,9 @@ class ProjectRepository:
         """Encontra um ProjectDB pelo seu identificador, sem filtro de usuário, carregando o usuário."""
         logger.debug(f"Repository: Finding project DB by identificator '{project_identificator}' (no user filter, loading user)")
         try:
-            stmt = (
-                select(ProjectDB)
-                .where(ProjectDB.identificator == project_identificator)
-                .options(
-                    joinedload(ProjectDB.user) 
-                 )
-            )
-            project_db = self._session.execute(stmt).unique().scalar_one_or_none() 
+            project_db = self._session.execute(
+                _SELECT_PROJECT_WITH_USER, {"project_identificator": project_identificator}
+            ).unique().scalar_one_or_none()
             if project_db:
                 logger.debug(f"Repository: Project DB found for identificator '{project_identificator}'. User loaded: {'Yes' if project_db.user else 'No'}")
             else:
@@ -87,17 +125,11 @@ class ProjectRepository:
              logger.error(f"Repository: Unexpected error adding project '{project.title}': {e}", exc_info=True)
              raise DatabaseError(f"An unexpected error occurred while adding project '{project.title}'.")
 
+    @read_only
     def get_all_by_user(self, user_identificator: str) -> List[Project]:
         logger.debug(f"Repository: Attempting to get all projects for user '{user_identificator}'")
         try:
-            stmt = (
-                select(ProjectDB)
-                .join(ProjectDB.user)
-                .where(UserDB.identificator == user_identificator)
-                .options(joinedload(ProjectDB.user)) # Eager load user for from_orm
-                .order_by(ProjectDB.title)
-            )
-            projects_db = self._session.execute(stmt).scalars().all()
+            projects_db = self._session.execute(_SELECT_PROJECTS_BY_USER, {"user_identificator": user_identificator}).scalars().all()
 
             logger.info(f"Repository: Found {len(projects_db)} projects for user '{user_identificator}'.")
             return [Project.from_orm(p) for p in projects_db]
@@ -108,21 +140,28 @@ class ProjectRepository:
         except ValueError as e:
              logger.error(f"Repository: Error converting ProjectDB to Project during get_all_by_user for user '{user_identificator}': {e}", exc_info=True)
              raise DatabaseError(f"Error processing project data for user '{user_identificator}'.")
-        
-    def get_projects_with_focus_sessions_by_user(self, user_identificator: str) -> List[ProjectDB]:
-        logger.debug(f"Repository: Getting projects with focus sessions for user '{user_identificator}'")
+
+    @read_only
+    def get_labels_by_user(self, user_identificator: str) -> Dict[int, Dict[str, str]]:
+        """{id interno: {identificator, title}} dos projetos do usuário, para resolver o project_id do arquivo frio."""
         try:
             stmt = (
-                select(ProjectDB)
+                select(ProjectDB.id, ProjectDB.identificator, ProjectDB.title)
                 .join(ProjectDB.user)
                 .where(UserDB.identificator == user_identificator)
-                .options(
-                    joinedload(ProjectDB.user),
-                    joinedload(ProjectDB.focus_sessions)
-                )
-                .order_by(ProjectDB.title)
             )
-            projects_db = self._session.execute(stmt).unique().scalars().all()
+            return {row.id: {"identificator": row.identificator, "title": row.title} for row in self._session.execute(stmt)}
+        except SQLAlchemyError as e:
+            logger.error(f"Repository: DB error getting project labels for user '{user_identificator}': {e}", exc_info=True)
+            raise DatabaseError(f"Error retrieving projects for user '{user_identificator}'.")
+
+    @read_only
+    def get_projects_with_focus_sessions_by_user(self, user_identificator: str) -> List[ProjectDB]:
+        logger.debug(f"Repository: Getting projects with focus sessions for user '{user_identificator}'")
+        try:
+            projects_db = self._session.execute(
+                _SELECT_PROJECTS_WITH_FOCUS_SESSIONS_BY_USER, {"user_identificator": user_identificator}
+            ).unique().scalars().all()
             logger.info(f"Repository: Found {len(projects_db)} projects with focus sessions for user '{user_identificator}'.")
             return projects_db
         except SQLAlchemyError as e:
@@ -132,24 +171,16 @@ class ProjectRepository:
             logger.error(f"Repository: Unexpected error getting projects/sessions for user '{user_identificator}': {e}", exc_info=True)
             raise DatabaseError(f"An unexpected error occurred while retrieving project/session data for user '{user_identificator}'.")
 
+    @read_only
     def get_by_id(self, project_identificator: str, user_identificator: str) -> ProjectDetailsDTO:
         logger.debug(f"Repository: Attempting to get project details by id '{project_identificator}' for user '{user_identificator}'")
         result_dto = ProjectDetailsDTO()
 
         try:
-            stmt = (
-                select(ProjectDB)
-                .join(ProjectDB.user)
-                .where(ProjectDB.identificator == project_identificator)
-                .where(UserDB.identificator == user_identificator)
-                .options(
-                    joinedload(ProjectDB.user), # Necessário para Project.from_orm
-                    joinedload(ProjectDB.tasks).joinedload(TaskDB.status), # Carrega tarefas e seus status
-                    joinedload(ProjectDB.focus_sessions) # Carrega sessões de foco
-                )
-            )
-
-            project_db = self._session.execute(stmt).unique().scalar_one_or_none()
+            project_db = self._session.execute(
+                _SELECT_PROJECT_DETAILS,
+                {"project_identificator": project_identificator, "user_identificator": user_identificator}
+            ).unique().scalar_one_or_none()
 
             if not project_db:
                 logger.warning(f"Repository: Project with id '{project_identificator}' not found for user '{user_identificator}'.")
@@ -181,22 +212,6 @@ class ProjectRepository:
                  logger.debug(f"Repository: No tasks found/loaded for project '{result_dto.project.title}'.")
 
 
-            if project_db.focus_sessions:
-                logger.debug(f"Repository: Converting {len(project_db.focus_sessions)} focus sessions for project '{result_dto.project.title}'.")
-                for session_db in project_db.focus_sessions:
-                    try:
-                        session_domain = FocusSession.from_orm(session_db)
-                        if session_domain:
-                            result_dto.focus_sessions.append(session_domain)
-                        else:
-                            logger.warning(f"Repository: FocusSession.from_orm returned None for FocusSessionDB id {session_db.id}")
-                    except Exception as e:
-                        logger.error(f"Repository: Failed to convert FocusSessionDB id {session_db.id} to domain model: {e}", exc_info=True)
-                        # Considerar adicionar uma nota de erro ao DTO ou levantar exceção
-            else:
-                 logger.debug(f"Repository: No focus sessions found/loaded for project '{result_dto.project.title}'.")
-
-
             # Retorna o DTO preenchido
             return result_dto
 
@@ -229,13 +244,10 @@ class ProjectRepository:
         logger.debug(f"Repository: Attempting to find project for update: id '{project.identificator}' for user '{project.user_identificator}'")
         try:
             # Find the existing ProjectDB entity using select and scalar_one_or_none
-            stmt = (
-                 select(ProjectDB)
-                .join(ProjectDB.user)
-                .where(ProjectDB.identificator == project.identificator)
-                .where(UserDB.identificator == project.user_identificator)
-            )
-            project_db = self._session.execute(stmt).scalar_one_or_none() # Use _or_none
+            project_db = self._session.execute(
+                _SELECT_PROJECT_BY_USER,
+                {"project_identificator": project.identificator, "user_identificator": project.user_identificator}
+            ).scalar_one_or_none() # Use _or_none
 
             if not project_db:
                 logger.warning(f"Repository: Project with id '{project.identificator}' not found for update for user '{project.user_identificator}'.")
@@ -279,16 +291,15 @@ class ProjectRepository:
         """
         logger.debug(f"Repository: Attempting to find project for deletion: id '{project_identificator}' for user '{user_identificator}'")
         try:
-            stmt = (
-                 select(ProjectDB)
-                .join(ProjectDB.user)
-                .where(ProjectDB.identificator == project_identificator)
-                .where(UserDB.identificator == user_identificator)
-            )
-            project_db = self._session.execute(stmt).scalar_one_or_none() # Use _or_none
+            project_db = self._session.execute(
+                _SELECT_PROJECT_BY_USER,
+                {"project_identificator": project_identificator, "user_identificator": user_identificator}
+            ).scalar_one_or_none() # Use _or_none
 
             if project_db:
                 logger.info(f"Repository: Found project '{project_db.title}' (ID: {project_identificator}) for deletion.")
+                # Meses destacados não têm FK nem cascata do ORM.
+                FocusSessionPartitions(self._session).delete_projects([project_db.id])
                 self._session.delete(project_db)
                 self._session.flush() # Flush deletion
                 logger.info(f"Repository: Project '{project_db.title}' (ID: {project_identificator}) marked for deletion and flushed in session.")
@@ -1,9 +1,10 @@
-from typing import Optional, List
+from typing import Dict, Iterator, Optional, List
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import delete, select
+from sqlalchemy import delete, select, bindparam
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError, MultipleResultsFound 
 
 from app.infra.db import db
+from app.infra.routing_session import read_only
 from app.infra.entities.task_db import TaskDB
 from app.infra.entities.project_db import ProjectDB
 from app.infra.entities.task_status_db import TaskStatusDB
@@ -12,6 +13,29 @@ from app.models.task import Task
 from app.models.exceptions import DatabaseError, ProjectNotFoundError, TaskNotFoundError, TaskStatusNotFound # Assuming TaskNotFoundError exists
 from app.utils.logger import logger
 
+# Consultas quentes montadas uma única vez (cache key memoizada, SQL compilado reaproveitado).
+_SELECT_PROJECT_BY_IDENTIFICATOR = select(ProjectDB).where(ProjectDB.identificator == bindparam("project_identificator"))
+_SELECT_STATUS_BY_ID = select(TaskStatusDB).where(TaskStatusDB.id == bindparam("status_id"))
+
+_SELECT_TASK_BY_IDENTIFICATOR = select(TaskDB).where(TaskDB.identificator == bindparam("task_identificator"))
+_SELECT_TASK_WITH_RELATIONS = _SELECT_TASK_BY_IDENTIFICATOR.options(
+    joinedload(TaskDB.project).joinedload(ProjectDB.user), 
+    joinedload(TaskDB.status)
+)
+
+_SELECT_TASKS_BY_PROJECT = (
+    select(TaskDB)
+    .join(TaskDB.project) # Join TaskDB with ProjectDB
+    .where(ProjectDB.identificator == bindparam("project_identificator")) # Filter on ProjectDB's identificator
+    .order_by(TaskDB.created_at.desc())
+)
+_SELECT_TASKS_WITH_RELATIONS_BY_PROJECT = _SELECT_TASKS_BY_PROJECT.options(
+    # Eager load project (and its user) and status for each task
+    joinedload(TaskDB.project).joinedload(ProjectDB.user),
+    joinedload(TaskDB.status)
+)
+
+
 class TaskRepository:
     def __init__(self, session: Session = db.session):
         self._session = session
@@ -19,8 +43,9 @@ class TaskRepository:
     def _find_project_db_by_identificator(self, project_identificator: str) -> Optional[ProjectDB]:
         logger.debug(f"Repository: Finding project DB by identificator '{project_identificator}'")
         try:
-            stmt = select(ProjectDB).where(ProjectDB.identificator == project_identificator)
-            project_db = self._session.execute(stmt).scalar_one_or_none()
+            project_db = self._session.execute(
+                _SELECT_PROJECT_BY_IDENTIFICATOR, {"project_identificator": project_identificator}
+            ).scalar_one_or_none()
             if project_db:
                 logger.debug(f"Repository: Project DB found for identificator '{project_identificator}' (ID: {project_db.id})")
             else:
@@ -40,8 +65,7 @@ class TaskRepository:
             logger.error("Repository: Cannot find status with None ID.")
             return None
         try:
-            stmt = select(TaskStatusDB).where(TaskStatusDB.id == status_id)
-            status_db = self._session.execute(stmt).scalar_one_or_none()
+            status_db = self._session.execute(_SELECT_STATUS_BY_ID, {"status_id": status_id}).scalar_one_or_none()
             if status_db:
                 logger.debug(f"Repository: TaskStatusDB found for id '{status_id}' (Name: {status_db.name})")
             else:
@@ -100,16 +124,10 @@ class TaskRepository:
     def find_by_identificator(self, task_identificator: str, load_relations: bool = True) -> Optional[TaskDB]:
         logger.debug(f"Repository: Finding TaskDB by identificator '{task_identificator}' (load_relations={load_relations})")
         try:
-            stmt = select(TaskDB).where(TaskDB.identificator == task_identificator)
-
-            if load_relations:
-                stmt = stmt.options(
-                    joinedload(TaskDB.project).joinedload(ProjectDB.user), 
-                    joinedload(TaskDB.status)
-                )
+            stmt = _SELECT_TASK_WITH_RELATIONS if load_relations else _SELECT_TASK_BY_IDENTIFICATOR
 
             # Use unique() before scalar_one_or_none if joins might produce duplicate TaskDB rows
-            task_db = self._session.execute(stmt).unique().scalar_one_or_none()
+            task_db = self._session.execute(stmt, {"task_identificator": task_identificator}).unique().scalar_one_or_none()
 
             if not task_db:
                 logger.warning(f"Repository: Task with identificator '{task_identificator}' not found.")
@@ -137,8 +155,9 @@ class TaskRepository:
    
             # We don't necessarily need to load relations just to update fields,
             # unless the update logic itself depends on them.
-            stmt = select(TaskDB).where(TaskDB.identificator == task_domain.identificator)
-            task_db = self._session.execute(stmt).scalar_one_or_none()
+            task_db = self._session.execute(
+                _SELECT_TASK_BY_IDENTIFICATOR, {"task_identificator": task_domain.identificator}
+            ).scalar_one_or_none()
 
             if not task_db:
                 logger.error(f"Repository: Task with identificator '{task_domain.identificator}' not found for update.")
@@ -211,28 +230,15 @@ class TaskRepository:
 
 
         
+    @read_only
     def get_all_by_project_id(self, project_identificator: str, load_relations: bool = True) -> List[TaskDB]:
         """Retrieves all tasks associated with a specific project identificator using SQLAlchemy 2.0 syntax."""
         logger.debug(f"Repository: Getting all tasks for project identificator '{project_identificator}' (load_relations={load_relations})")
         try:
-            stmt = (
-                select(TaskDB)
-                .join(TaskDB.project) # Join TaskDB with ProjectDB
-                .where(ProjectDB.identificator == project_identificator) # Filter on ProjectDB's identificator
-            )
-
-            if load_relations:
-                stmt = stmt.options(
-                    # Eager load project (and its user) and status for each task
-                    joinedload(TaskDB.project).joinedload(ProjectDB.user),
-                    joinedload(TaskDB.status)
-                )
-
-            # Example ordering
-            stmt = stmt.order_by(TaskDB.created_at.desc())
+            stmt = _SELECT_TASKS_WITH_RELATIONS_BY_PROJECT if load_relations else _SELECT_TASKS_BY_PROJECT
 
             # Use unique().scalars().all() because joins might create duplicate TaskDB rows before unique()
-            tasks_db = self._session.execute(stmt).unique().scalars().all()
+            tasks_db = self._session.execute(stmt, {"project_identificator": project_identificator}).unique().scalars().all()
 
             logger.info(f"Repository: Found {len(tasks_db)} tasks for project '{project_identificator}'.")
             return tasks_db
@@ -243,9 +249,32 @@ class TaskRepository:
         except Exception as e:
             logger.error(f"Repository: Unexpected error getting tasks for project '{project_identificator}': {e}", exc_info=True)
             raise DatabaseError(f"An unexpected error occurred while retrieving tasks for project '{project_identificator}'.")
-        
-
-
-
 
 
+    def iter_export_rows_by_user(self, user_identificator: str, batch_size: int = 1000) -> Iterator[Dict]:
+        """Percorre todas as tasks do usuário com cursor no servidor (yield_per), sem hidratar entidades."""
+        logger.debug(f"Repository: Streaming tasks for user '{user_identificator}' (batch_size={batch_size})")
+        stmt = (
+            select(
+                TaskDB.identificator,
+                ProjectDB.identificator.label("project_identificator"),
+                ProjectDB.title.label("project_title"),
+                TaskDB.title,
+                TaskDB.description,
+                TaskStatusDB.name.label("status"),
+                TaskDB.created_at,
+                TaskDB.completed_at,
+            )
+            .join(TaskDB.project)
+            .join(TaskDB.status)
+            .join(ProjectDB.user)
+            .where(UserDB.identificator == user_identificator)
+            .order_by(TaskDB.created_at, TaskDB.id)
+            .execution_options(yield_per=batch_size)
+        )
+        try:
+            for row in self._session.execute(stmt).mappings():
+                yield row
+        except SQLAlchemyError as e:
+            logger.error(f"Repository: DB error streaming tasks for user '{user_identificator}': {e}", exc_info=True)
+            raise DatabaseError(f"Error streaming tasks for user '{user_identificator}'.")
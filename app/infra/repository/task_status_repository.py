@@ -1,6 +1,6 @@
-from typing import Optional
+from typing import List, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import select, bindparam
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError, MultipleResultsFound 
 
 from app.infra.db import db
@@ -10,6 +10,11 @@ from app.models.exceptions import DatabaseError, TaskStatusNotFound
 from app.utils.logger import logger
 
 
+# Consultas quentes montadas uma única vez (cache key memoizada, SQL compilado reaproveitado).
+_SELECT_STATUS_BY_NAME = select(TaskStatusDB).where(TaskStatusDB.name == bindparam("name"))
+_SELECT_STATUS_BY_ID = select(TaskStatusDB).where(TaskStatusDB.id == bindparam("status_id"))
+_SELECT_ALL_STATUSES = select(TaskStatusDB).order_by(TaskStatusDB.id)
+
 
 class TaskStatusRepository:
     def __init__(self, session: Session = db.session):
@@ -18,8 +23,7 @@ class TaskStatusRepository:
     def find_by_name(self, name: str) -> Optional[TaskStatusDB]:
         logger.debug(f"Repository: Finding TaskStatusDB by name '{name}'")
         try:
-            stmt = select(TaskStatusDB).where(TaskStatusDB.name == name)
-            status_db = self._session.execute(stmt).scalar_one_or_none()
+            status_db = self._session.execute(_SELECT_STATUS_BY_NAME, {"name": name}).scalar_one_or_none()
             if status_db:
                 logger.debug(f"Repository: TaskStatusDB found for name '{name}' (ID: {status_db.id})")
             else:
@@ -38,8 +42,7 @@ class TaskStatusRepository:
     def find_by_id(self, status_id: int) -> Optional[TaskStatusDB]:
         logger.debug(f"Repository: Finding TaskStatusDB by id '{status_id}'")
         try:
-            stmt = select(TaskStatusDB).where(TaskStatusDB.id == status_id)
-            status_db = self._session.execute(stmt).scalar_one_or_none()
+            status_db = self._session.execute(_SELECT_STATUS_BY_ID, {"status_id": status_id}).scalar_one_or_none()
             if status_db:
                 logger.debug(f"Repository: TaskStatusDB found for id '{status_id}' (Name: {status_db.name})")
             else:
@@ -55,6 +58,14 @@ class TaskStatusRepository:
              logger.error(f"Repository: Unexpected error finding TaskStatusDB by id '{status_id}': {e}", exc_info=True)
              raise DatabaseError(f"An unexpected error occurred while finding status id '{status_id}'.")
 
+    def list_all(self) -> List[TaskStatusDB]:
+        logger.debug("Repository: Listing all TaskStatusDB")
+        try:
+            return list(self._session.execute(_SELECT_ALL_STATUSES).scalars())
+        except SQLAlchemyError as e:
+            logger.error(f"Repository: Database error listing TaskStatusDB: {e}", exc_info=True)
+            raise DatabaseError("Error accessing database while listing task statuses.")
+
     def get_default_status(self) -> TaskStatusDB:
         default_status_name = "in progress"
         logger.debug(f"Repository: Getting default TaskStatusDB ('{default_status_name}')")
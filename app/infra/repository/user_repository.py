@@ -6,17 +6,27 @@
 # Usar flush aqui na repository e commit/rollback na service.
 
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from sqlalchemy import select 
+from sqlalchemy import select, update, bindparam
 
 from app.models.user import User
 from app.infra.entities.user_db import UserDB
-from app.infra.db import db 
+from app.infra.db import db
+from app.infra.partitioning import FocusSessionPartitions
+from app.infra.routing_session import read_only
 from app.models.exceptions import UserNotFoundError, UsernameAlreadyExists, EmailAlreadyExists, DatabaseError
 from app.utils.logger import logger
 
+# Consultas quentes montadas uma única vez (cache key memoizada, SQL compilado reaproveitado).
+# get_by_id roda em toda requisição autenticada (login_required).
+_SELECT_USER_BY_IDENTIFICATOR = select(UserDB).where(UserDB.identificator == bindparam("user_identificator"))
+_SELECT_USER_BY_EMAIL = select(UserDB).where(UserDB.email == bindparam("email"))
+_SELECT_USER_BY_USERNAME = select(UserDB).where(UserDB.username == bindparam("username"))
+_SELECT_TIMEZONE = select(UserDB.timezone).where(UserDB.identificator == bindparam("user_identificator"))
+
+
 class UserRepository:
     def __init__(self, session: Session = db.session):
         self._session = session
@@ -37,10 +47,10 @@ class UserRepository:
             logger.error(f"Error adding user '{user.username}' to session: {e}", exc_info=True)
             raise
 
+    @read_only
     def get_by_id(self, user_identificator: str) -> Optional[User]:
         logger.debug(f"Attempting to get user by id: {user_identificator}")
-        stmt = select(UserDB).where(UserDB.identificator == user_identificator)
-        user_db = self._session.execute(stmt).scalar_one_or_none() 
+        user_db = self._session.execute(_SELECT_USER_BY_IDENTIFICATOR, {"user_identificator": user_identificator}).scalar_one_or_none()
 
         if user_db:
             logger.info(f"User found by id: {user_identificator}")
@@ -50,10 +60,10 @@ class UserRepository:
             # raise UserNotFoundError(user_identificator=user_identificator)
             return None
 
+    @read_only
     def get_by_email(self, email: str) -> Optional[User]:
         logger.debug(f"Attempting to get user by email: {email}")
-        stmt = select(UserDB).where(UserDB.email == email)
-        user_db = self._session.execute(stmt).scalar_one_or_none()
+        user_db = self._session.execute(_SELECT_USER_BY_EMAIL, {"email": email}).scalar_one_or_none()
 
         if user_db:
             logger.info(f"User found by email: {email}")
@@ -63,10 +73,10 @@ class UserRepository:
             # raise UserNotFoundError(email=email)
             return None
 
+    @read_only
     def get_by_username(self, username: str) -> Optional[User]:
         logger.debug(f"Attempting to get user by username: {username}")
-        stmt = select(UserDB).where(UserDB.username == username)
-        user_db = self._session.execute(stmt).scalar_one_or_none()
+        user_db = self._session.execute(_SELECT_USER_BY_USERNAME, {"username": username}).scalar_one_or_none()
 
         if user_db:
             logger.info(f"User found by username: {username}")
@@ -79,6 +89,27 @@ class UserRepository:
 
 
 
+    def update_timezone(self, user_identificator: str, timezone: str) -> bool:
+        logger.debug(f"Attempting to set timezone '{timezone}' for user: {user_identificator}")
+        try:
+            stmt = update(UserDB).where(UserDB.identificator == user_identificator).values(timezone=timezone)
+            return self._session.execute(stmt).rowcount > 0
+        except SQLAlchemyError as e:
+            logger.error(f"Repository: Database error updating timezone for user '{user_identificator}': {e}", exc_info=True)
+            raise DatabaseError(f"Failed to update timezone for user '{user_identificator}'.")
+
+    @read_only
+    def get_timezone(self, user_identificator: str) -> Optional[str]:
+        return self._session.execute(_SELECT_TIMEZONE, {"user_identificator": user_identificator}).scalar_one_or_none()
+
+    @read_only
+    def get_usernames(self, user_identificators: List[str]) -> Dict[str, str]:
+        if not user_identificators:
+            return {}
+        stmt = select(UserDB.identificator, UserDB.username).where(UserDB.identificator.in_(user_identificators))
+        return dict(self._session.execute(stmt).all())
+
+
     # Nao vi ainda =================
 
 
@@ -186,6 +217,8 @@ class UserRepository:
 
         if user_db:
             try:
+                # Meses destacados não têm FK nem cascata do ORM.
+                FocusSessionPartitions(self._session).delete_projects([project.id for project in user_db.projects])
                 self._session.delete(user_db)
                 # Flush to catch potential errors early, but commit is external
                 self._session.flush()
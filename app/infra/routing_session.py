@@ -0,0 +1,104 @@
+# Sessão que envia leituras para uma réplica.
+#
+# Só os métodos de repository marcados com @read_only vão para o engine do bind "replica"
+# (SQLALCHEMY_BINDS). Fica tudo no primário quando:
+#   - não há réplica configurada;
+#   - a transação atual já escreveu (flush ou INSERT/UPDATE/DELETE), para o leitor enxergar as próprias escritas;
+#   - o usuário da requisição fez commit de uma escrita há menos de READ_YOUR_WRITES_SECONDS (atraso de replicação).
+
+import threading
+import time
+from contextvars import ContextVar
+from functools import wraps
+from typing import Dict, Optional
+
+from flask import current_app, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+from app.utils.metrics import metrics
+
+REPLICA_BIND_KEY = "replica"
+
+_read_only: ContextVar[bool] = ContextVar("read_only", default=False)
+
+_recent_writes: Dict[str, float] = {}
+_recent_writes_lock = threading.Lock()
+
+
+def read_only(fn):
+    """Marca um método de repository como leitura que pode ir para a réplica."""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        token = _read_only.set(True)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _read_only.reset(token)
+    return wrapper
+
+
+def _current_user_key() -> Optional[str]:
+    if not has_request_context():
+        return None
+    user = getattr(request, "current_user", None)
+    return getattr(user, "identificator", None)
+
+
+def _wrote_recently(user_key: Optional[str]) -> bool:
+    window = current_app.config.get("READ_YOUR_WRITES_SECONDS", 0)
+    if not user_key or not window:
+        return False
+    with _recent_writes_lock:
+        written_at = _recent_writes.get(user_key)
+    return written_at is not None and time.monotonic() - written_at < window
+
+
+def forget_recent_writes() -> None:
+    with _recent_writes_lock:
+        _recent_writes.clear()
+
+
+class RoutingSession(Session):
+    def in_write_transaction(self) -> bool:
+        return bool(self.info.get("wrote") or self.new or self.dirty or self.deleted)
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and _read_only.get():
+            replica = self._db.engines.get(REPLICA_BIND_KEY)
+            if replica is not None:
+                if not self.in_write_transaction() and not _wrote_recently(_current_user_key()):
+                    metrics.incr("db.route.replica")
+                    return replica
+                metrics.incr("db.route.primary_read")
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_flush(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _mark_dml(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _remember_write(session):
+    if session.info.pop("wrote", False):
+        user_key = _current_user_key()
+        if user_key and current_app.config.get("READ_YOUR_WRITES_SECONDS", 0):
+            now = time.monotonic()
+            with _recent_writes_lock:
+                _recent_writes[user_key] = now
+                if len(_recent_writes) > 10000:
+                    window = current_app.config["READ_YOUR_WRITES_SECONDS"]
+                    for key in [k for k, t in _recent_writes.items() if now - t >= window]:
+                        del _recent_writes[key]
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _forget_write(session):
+    session.info.pop("wrote", None)
@@ -0,0 +1,35 @@
+# Mede o cache de compilação do SQLAlchemy: cada execução informa se o SQL compilado veio do cache
+# (mesma cache key de uma execução anterior) ou precisou ser gerado. Os repositories definem as consultas
+# quentes uma única vez no módulo, com bindparam, então a cache key também é memoizada no próprio objeto.
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+
+from app.utils.metrics import metrics
+
+HIT = "sql.compile_cache.hit"
+MISS = "sql.compile_cache.miss"
+UNCACHED = "sql.compile_cache.uncached"
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    cache_hit = getattr(context, "cache_hit", None)
+    if cache_hit is CACHE_HIT:
+        metrics.incr(HIT)
+    elif cache_hit is CACHE_MISS:
+        metrics.incr(MISS)
+    else:
+        metrics.incr(UNCACHED)
+
+
+def compile_cache_hit_rate() -> float:
+    hits, misses = metrics.counter(HIT), metrics.counter(MISS)
+    return round(hits / (hits + misses), 4) if hits + misses else 0.0
+
+
+def register_statement_metrics() -> None:
+    """Escuta todos os Engines (o do Flask-SQLAlchemy é criado sob demanda). Pode ser chamada mais de uma vez."""
+    if not event.contains(Engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    metrics.register_gauge("sql.compile_cache.hit_rate", compile_cache_hit_rate)
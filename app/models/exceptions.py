@@ -150,3 +150,28 @@ class AuthorizationError(Exception):
         if details:
             message = f"{' accessing '.join(details)}: {message}"
         super().__init__(message)
+
+
+class FocusGroupError(Exception):
+    """Erro geral relacionado a grupos de foco."""
+    def __init__(self, message="Erro relacionado ao grupo."):
+        super().__init__(message)
+
+
+class FocusGroupNotFoundError(FocusGroupError):
+    """Erro para quando um grupo não é encontrado (ou o usuário não é membro dele)."""
+    def __init__(self, group_id=None, message="Group Not Found."):
+        if group_id:
+            message = f"Group ID '{group_id}' not found."
+        super().__init__(message)
+
+
+class FocusGroupValidationError(FocusGroupError):
+    def __init__(self, field=None, message=None):
+        if field and not message:
+            message = f"The field '{field}' is required or contains invalid data."
+        elif field and message:
+            message = f"Validation error in field '{field}': {message}"
+        elif not message and not field:
+            message = "Group validation failed due to invalid or missing data."
+        super().__init__(message)
@@ -1,16 +1,38 @@
 # /home/gccintra/projects/focus_time_v2/app/models/focus_session.py
 
-from datetime import datetime, timedelta
-from typing import Optional, TYPE_CHECKING
+from datetime import datetime, timedelta, time
+from typing import List, Optional, Tuple, TYPE_CHECKING
 
 
 from app.models.exceptions import FocusSessionValidationError
 from app.infra.entities.focus_session_db import FocusSessionDB
+from app.utils.timezones import local_date, local_midnight_utc
 
 if TYPE_CHECKING:
     from app.models.project import Project
 
 
+def split_by_day(started_at: datetime, duration_seconds: int, tz_name: Optional[str] = None) -> List[Tuple[datetime, int]]:
+    """Quebra um intervalo (início, duração) em segmentos que não atravessam a meia-noite.
+
+    Com tz_name, started_at é UTC naive e os cortes caem na meia-noite local desse fuso (segmentos em UTC).
+    """
+    segments = []
+    segment_start = started_at
+    remaining = duration_seconds
+    while remaining > 0:
+        if tz_name:
+            next_midnight = local_midnight_utc(local_date(segment_start, tz_name) + timedelta(days=1), tz_name)
+        else:
+            next_midnight = datetime.combine(segment_start.date() + timedelta(days=1), time.min, tzinfo=segment_start.tzinfo)
+        segment_seconds = min(remaining, int((next_midnight - segment_start).total_seconds()))
+        if segment_seconds > 0:
+            segments.append((segment_start, segment_seconds))
+        remaining -= segment_seconds
+        segment_start = next_midnight
+    return segments
+
+
 class FocusSession:
     def __init__(
         self,
@@ -68,6 +90,16 @@ class FocusSession:
     def end_time(self) -> datetime:
         return self.started_at + timedelta(seconds=self.duration_seconds)
 
+    def split_by_day(self, tz_name: Optional[str] = None) -> List['FocusSession']:
+        """Retorna a sessão dividida em segmentos alinhados ao dia (a própria sessão se não cruzar a meia-noite)."""
+        segments = split_by_day(self.started_at, self.duration_seconds, tz_name)
+        if len(segments) <= 1:
+            return [self]
+        return [
+            FocusSession(project=self.project, started_at=segment_start, duration_seconds=segment_seconds)
+            for segment_start, segment_seconds in segments
+        ]
+
     # --- Métodos de Mapeamento ORM ---
 
     @classmethod
@@ -188,6 +188,17 @@ class Task:
             # project_id, status_id, project, status são omitidos intencionalmente
         )
 
+    def __json__(self) -> dict:
+        """Representação usada nas respostas da API (ver app/utils/json_provider.py)."""
+        return {
+            "id": self.identificator,
+            "title": self.title,
+            "description": self.description,
+            "status": getattr(self.status, 'name', None),
+            "created_at": self.created_at,
+            "completed_at": self.completed_at,
+        }
+
     # --- Métodos Utilitários ---
 
     def __repr__(self) -> str:
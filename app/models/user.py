@@ -1,10 +1,11 @@
 import bcrypt, re, uuid
 from app.models.exceptions import UserValidationError, InvalidCreatePasswordError
 from app.infra.entities.user_db import UserDB
+from app.utils.timezones import DEFAULT_TIMEZONE, is_valid_timezone
 
 
 class User:
-    def __init__(self, username, email, password, active=True, hashed=False, identificator=None):
+    def __init__(self, username, email, password, active=True, hashed=False, identificator=None, timezone=DEFAULT_TIMEZONE):
         self.identificator = identificator if identificator is not None else str(uuid.uuid4())
         self.username = username
         self.email = email
@@ -15,6 +16,7 @@ class User:
             self.password = password 
             
         self.active = active
+        self.timezone = timezone
 
     @property
     def identificator(self):
@@ -60,6 +62,16 @@ class User:
             raise UserValidationError("Active", "Invalid value. 'active' must be a boolean.")
         self._active = value
 
+    @property
+    def timezone(self):
+        return self._timezone
+
+    @timezone.setter
+    def timezone(self, value):
+        if not value or not is_valid_timezone(value):
+            raise UserValidationError("Timezone", f"Unknown timezone '{value}'.")
+        self._timezone = value
+
     @property
     def password(self):
         return self._password
@@ -100,7 +112,8 @@ class User:
             email=user_db.email,
             password=user_db.password, 
             active=user_db.active,
-            hashed=True
+            hashed=True,
+            timezone=user_db.timezone or DEFAULT_TIMEZONE
         )
 
     def to_orm(self) -> 'UserDB':
@@ -109,7 +122,8 @@ class User:
             username=self._username,
             email=self._email,
             password=self._password,
-            active=self._active
+            active=self._active,
+            timezone=self._timezone
         )
 
 
@@ -0,0 +1,34 @@
+from flask import Blueprint, request
+from ..utils.auth_decorator import login_required, admin_required
+from ..utils.lazy import lazy_instance
+
+
+admin_bp = Blueprint("admin", __name__, url_prefix="/admin")
+profiler_controller = lazy_instance("app.controllers.profiler_controller:ProfilerController")
+
+@admin_bp.route("/profiler", methods=["GET"])
+@login_required
+@admin_required
+def profiler_status_route():
+    return profiler_controller.status()
+
+
+@admin_bp.route("/profiler", methods=["POST"])
+@login_required
+@admin_required
+def profiler_arm_route():
+    return profiler_controller.arm(data=request.get_json(silent=True))
+
+
+@admin_bp.route("/profiler", methods=["DELETE"])
+@login_required
+@admin_required
+def profiler_disarm_route():
+    return profiler_controller.disarm()
+
+
+@admin_bp.route("/profiler/profiles/<name>", methods=["GET"])
+@login_required
+@admin_required
+def profiler_download_route(name):
+    return profiler_controller.download(name=name)
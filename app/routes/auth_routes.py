@@ -1,10 +1,10 @@
 from flask import Blueprint, request, render_template, redirect, url_for, make_response, jsonify
-from app.controllers.auth_controller import AuthController
 from ..utils.auth_decorator import redirect_if_logged_in, login_required
+from ..utils.lazy import lazy_instance
 
 
 auth_bp = Blueprint("auth", __name__, url_prefix="/auth")
-auth_controller = AuthController()
+auth_controller = lazy_instance("app.controllers.auth_controller:AuthController")
 
 
 @auth_bp.route("/login", methods=["POST"])
@@ -26,6 +26,14 @@ def create_account_route():
     return auth_controller.create_user(data)
      
 
+@auth_bp.route("/timezone", methods=["PUT"])
+@login_required
+def update_timezone_route():
+    user_id = request.current_user.identificator
+    data = request.get_json()
+    return auth_controller.update_timezone(data=data, user_id=user_id)
+
+
 @auth_bp.route("/logout", methods=["POST"])
 @login_required
 def logout_route():
@@ -0,0 +1,32 @@
+from flask import Blueprint, request
+from ..utils.auth_decorator import login_required
+from ..utils.lazy import lazy_instance
+
+
+export_bp = Blueprint("export", __name__, url_prefix="/export")
+export_controller = lazy_instance("app.controllers.export_controller:ExportController")
+
+@export_bp.route("/history", methods=["GET"])
+@login_required
+def export_history_route():
+    user = request.current_user
+    return export_controller.export_history(user=user, args=request.args)
+
+
+@export_bp.route("/history/jobs", methods=["POST"])
+@login_required
+def request_history_export_route():
+    user = request.current_user
+    return export_controller.request_history_export(user=user, args=request.args)
+
+
+@export_bp.route("/jobs/<int:job_id>", methods=["GET"])
+@login_required
+def export_job_route(job_id):
+    return export_controller.export_job(user=request.current_user, job_id=job_id)
+
+
+@export_bp.route("/jobs/<int:job_id>/download", methods=["GET"])
+@login_required
+def export_job_download_route(job_id):
+    return export_controller.export_job(user=request.current_user, job_id=job_id, download=True)
@@ -0,0 +1,30 @@
+from flask import Blueprint, request
+from ..utils.auth_decorator import login_required
+from ..utils.lazy import lazy_instance
+
+
+focus_group_bp = Blueprint("focus_groups", __name__, url_prefix="/groups")
+focus_group_controller = lazy_instance("app.controllers.focus_group_controller:FocusGroupController")
+
+@focus_group_bp.route("/", methods=["GET"])
+@login_required
+def my_groups_route():
+    return focus_group_controller.my_groups(user=request.current_user)
+
+
+@focus_group_bp.route("/", methods=["POST"])
+@login_required
+def create_group_route():
+    return focus_group_controller.create_group(data=request.get_json(silent=True), user=request.current_user)
+
+
+@focus_group_bp.route("/<group_id>/join", methods=["POST"])
+@login_required
+def join_group_route(group_id):
+    return focus_group_controller.join_group(group_id=group_id, user=request.current_user)
+
+
+@focus_group_bp.route("/<group_id>/leave", methods=["POST"])
+@login_required
+def leave_group_route(group_id):
+    return focus_group_controller.leave_group(group_id=group_id, user=request.current_user)
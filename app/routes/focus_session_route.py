@@ -1,10 +1,10 @@
 from flask import Blueprint, request, redirect, url_for
-from app.controllers.focus_session_controller import FocusSessionController
 from ..utils.auth_decorator import login_required
+from ..utils.lazy import lazy_instance
 
 
 focus_session_bp = Blueprint("focus_session", __name__, url_prefix="/focus_session")
-focus_session_controller = FocusSessionController()
+focus_session_controller = lazy_instance("app.controllers.focus_session_controller:FocusSessionController")
 
 # Alterar a rota, colocar o id do project aqui, inves de colocar no corpo da requisição, para seguir um padrao
 @focus_session_bp.route("/save", methods=["POST"])
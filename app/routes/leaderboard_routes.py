@@ -0,0 +1,12 @@
+from flask import Blueprint, request
+from ..utils.auth_decorator import login_required
+from ..utils.lazy import lazy_instance
+
+
+leaderboard_bp = Blueprint("leaderboard", __name__, url_prefix="/leaderboard")
+leaderboard_controller = lazy_instance("app.controllers.leaderboard_controller:LeaderboardController")
+
+@leaderboard_bp.route("/", methods=["GET"])
+@login_required
+def leaderboard_route():
+    return leaderboard_controller.get_leaderboard(args=request.args, user=request.current_user)
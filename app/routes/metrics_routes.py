@@ -0,0 +1,13 @@
+from flask import Blueprint
+from ..utils.auth_decorator import login_required, admin_required
+from ..utils.lazy import lazy_instance
+
+
+metrics_bp = Blueprint("metrics", __name__, url_prefix="/metrics")
+metrics_controller = lazy_instance("app.controllers.metrics_controller:MetricsController")
+
+@metrics_bp.route("/", methods=["GET"])
+@login_required
+@admin_required
+def metrics_route():
+    return metrics_controller.get_metrics()
@@ -1,10 +1,10 @@
 from flask import Blueprint, request, redirect, url_for
-from app.controllers.project_controller import ProjectController
 from ..utils.auth_decorator import login_required
+from ..utils.lazy import lazy_instance
 
 
 project_bp = Blueprint("project", __name__, url_prefix="/project")
-project_controller = ProjectController()
+project_controller = lazy_instance("app.controllers.project_controller:ProjectController")
 
 @project_bp.route("/", methods=["GET"])
 @login_required  
@@ -25,6 +25,12 @@ def get_data_for_last_365_days_home_chart_route():
     user_id = request.current_user.identificator
     return project_controller.get_data_for_last_365_days_home_chart(user_id=user_id)
 
+@project_bp.route("/analytics", methods=["GET"])
+@login_required
+def analytics_route():
+    user_id = request.current_user.identificator
+    return project_controller.get_analytics(args=request.args, user_id=user_id)
+
 @project_bp.route("/<project_id>", methods=["GET"])
 @login_required   
 def project_room_route(project_id):
@@ -1,10 +1,10 @@
 from flask import Blueprint, request
-from app.controllers.task_controller import TaskController
 from ..utils.auth_decorator import login_required 
+from ..utils.lazy import lazy_instance
 
 
 task_bp = Blueprint("task", __name__, url_prefix="/task")
-task_controller = TaskController()
+task_controller = lazy_instance("app.controllers.task_controller:TaskController")
 
 @task_bp.route("/<project_id>/create_task", methods=["POST"])
 @login_required  
@@ -0,0 +1,88 @@
+from datetime import date, timedelta
+from typing import Any, Dict, Optional
+
+from ..infra.repository.focus_daily_rollup_repository import FocusDailyRollupRepository
+from ..infra.repository.project_repository import ProjectRepository
+from ..models.exceptions import ProjectNotFoundError, ProjectValidationError
+from ..utils.logger import logger
+
+GRANULARITIES = ("day", "week", "month")
+
+
+def _parse_date(field: str, value: Any) -> date:
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ProjectValidationError(field=field, message="expected a date in YYYY-MM-DD format.")
+
+
+class AnalyticsService:
+    # Teto de linhas de rollup (projeto x dia) lidas por consulta: ~10 anos de um usuário com 13 projetos ativos.
+    MAX_ROWS_SCANNED = 50000
+    MAX_RANGE_DAYS = 3660
+
+    def __init__(self):
+        self.project_repo = ProjectRepository()
+        self.rollup_repo = FocusDailyRollupRepository()
+
+    def get_focus_series(self, user_id: str, start: Any, end: Any, granularity: str = "day",
+                         project_id: Optional[str] = None) -> Dict[str, Any]:
+        """Tempo de foco por período e projeto em [start, end] (datas inclusivas), em formato colunar.
+
+        `projects` traz as colunas dos projetos presentes e `points` as colunas da série;
+        `points.project_index` aponta para a posição do projeto em `projects`.
+        """
+        logger.info(f"Service: Getting {granularity} focus analytics for user '{user_id}' from {start} to {end} (project={project_id})")
+        if granularity not in GRANULARITIES:
+            raise ProjectValidationError(field="granularity", message=f"allowed values are {', '.join(GRANULARITIES)}.")
+        start_date = _parse_date("start", start)
+        end_date = _parse_date("end", end)
+        if end_date < start_date:
+            raise ProjectValidationError(field="end", message="must be on or after start.")
+        if (end_date - start_date).days + 1 > self.MAX_RANGE_DAYS:
+            raise ProjectValidationError(field="end", message=f"range cannot exceed {self.MAX_RANGE_DAYS} days.")
+
+        if project_id:
+            project_db = self.project_repo.find_by_id_with_user(project_identificator=project_id)
+            if project_db is None or project_db.user is None or project_db.user.identificator != user_id:
+                logger.warning(f"Service: Project '{project_id}' not found for user '{user_id}'.")
+                raise ProjectNotFoundError(project_id=project_id)
+
+        rows, rows_scanned = self.rollup_repo.get_series(
+            user_identificator=user_id,
+            start=start_date,
+            end=end_date + timedelta(days=1),
+            granularity=granularity,
+            project_identificator=project_id,
+            max_rows=self.MAX_ROWS_SCANNED,
+        )
+        if rows_scanned > self.MAX_ROWS_SCANNED:
+            logger.warning(f"Service: Analytics query for user '{user_id}' exceeded {self.MAX_ROWS_SCANNED} rows.")
+            raise ProjectValidationError(field="start", message="range is too large for this query; narrow it or filter by project.")
+
+        projects = {"identificator": [], "title": [], "color": []}
+        points = {"period": [], "project_index": [], "seconds": []}
+        project_index: Dict[str, int] = {}
+        for row in rows:
+            identificator = row["identificator"]
+            if identificator not in project_index:
+                project_index[identificator] = len(projects["identificator"])
+                projects["identificator"].append(identificator)
+                projects["title"].append(row["title"])
+                projects["color"].append(row["color"])
+            period = row["period"]
+            points["period"].append(period.isoformat() if isinstance(period, date) else str(period)[:10])
+            points["project_index"].append(project_index[identificator])
+            points["seconds"].append(int(row["seconds"] or 0))
+
+        logger.debug(f"Service: Analytics for user '{user_id}' returned {len(points['period'])} points ({rows_scanned} rows scanned)")
+        return {
+            "granularity": granularity,
+            "start": start_date.isoformat(),
+            "end": end_date.isoformat(),
+            "rows_scanned": rows_scanned,
+            "projects": projects,
+            "points": points,
+        }
@@ -5,6 +5,8 @@ import datetime
 import jwt
 from flask import current_app, make_response
 from app.infra.repository.user_repository import UserRepository
+from app.services.job_service import JobService, ROLLUP_REBUILD_USER
+from app.utils.timezones import is_valid_timezone
 
 class AuthService:
     def __init__(self):
@@ -39,7 +41,28 @@ class AuthService:
             self.repo._session.rollback()
             raise
 
-    def login(self, user_email, password):
+    def update_timezone(self, user_id, timezone):
+        """Grava o fuso IANA do usuário; se mudou, enfileira o recálculo dos rollups e do leaderboard dele no fuso novo."""
+        try:
+            if not timezone or not is_valid_timezone(timezone):
+                raise UserValidationError("Timezone", f"Unknown timezone '{timezone}'.")
+            previous = self.repo.get_timezone(user_identificator=user_id)
+            if not self.repo.update_timezone(user_identificator=user_id, timezone=timezone):
+                raise UserNotFoundError
+            if timezone != previous:
+                JobService().enqueue(ROLLUP_REBUILD_USER, {"user_id": user_id}, dedupe_key=f"{ROLLUP_REBUILD_USER}:{user_id}")
+            self.repo._session.commit()
+            logger.info(f"Timezone do usuário '{user_id}' atualizado para '{timezone}'.")
+        except (UserValidationError, UserNotFoundError) as e:
+            logger.warning(f"Falha ao atualizar timezone do usuário '{user_id}': {e}")
+            self.repo._session.rollback()
+            raise
+        except Exception as e:
+            logger.error(f"Erro inesperado ao atualizar timezone do usuário '{user_id}': {e}")
+            self.repo._session.rollback()
+            raise
+
+    def login(self, user_email, password, timezone=None):
         try:
             user = self.repo.get_by_email(user_email)
 
@@ -51,6 +74,10 @@ class AuthService:
                 logger.error(f"Senha incorreta para o usuário com email '{user_email}'.")
                 raise InvalidPasswordError()
             
+            # O navegador informa o fuso no login; só grava quando mudou e é válido (e aí os rollups são recalculados).
+            if timezone and timezone != user.timezone and is_valid_timezone(timezone):
+                self.update_timezone(user_id=user.identificator, timezone=timezone)
+
             token = self.create_jwt_token(user)
             logger.info(f"Login bem-sucedido para o usuário: {user.username} ({user_email})")
 
@@ -0,0 +1,173 @@
+import csv
+import io
+import itertools
+import json
+import os
+import uuid
+import zlib
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, Tuple
+
+from flask import current_app
+
+from ..infra.cold_archive import ColdArchive
+from ..infra.partitioning import FocusSessionPartitions
+from ..infra.repository.focus_session_repository import FocusSessionRepository
+from ..infra.repository.project_repository import ProjectRepository
+from ..infra.repository.task_repository import TaskRepository
+from ..infra.entities.job_db import JobDB
+from .job_service import JobService, EXPORT_HISTORY
+from ..utils.logger import logger
+
+EXPORT_FORMATS = ("ndjson", "csv")
+EXPORT_DATASETS = ("focus_sessions", "tasks")
+
+CSV_COLUMNS = (
+    "record_type", "project_identificator", "project_title",
+    "started_at", "duration_seconds",
+    "task_identificator", "title", "description", "status", "created_at", "completed_at",
+)
+
+
+def _iso(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+class ExportService:
+    # Tamanho aproximado de cada pedaço entregue à resposta/arquivo (antes da compressão).
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self):
+        self.focus_session_repo = FocusSessionRepository()
+        self.project_repo = ProjectRepository()
+        self.task_repo = TaskRepository()
+        self.job_service = JobService()
+
+    def _iter_archived_sessions(self, user_id: str) -> Iterator[Dict]:
+        """Sessões que já saíram de focus_sessions (arquivo frio e meses destacados), antes das que estão no banco."""
+        archived = ColdArchive().iter_sessions(user_id)
+        first = next(archived, None)
+        partitions = FocusSessionPartitions()
+        detached = partitions.detached_months()
+        if first is None and not detached:
+            return
+        projects = self.project_repo.get_labels_by_user(user_identificator=user_id)
+        if first is not None:
+            archived = itertools.chain((first,), archived)
+        if detached:
+            archived = itertools.chain(archived, partitions.iter_sessions(projects))
+        for started_at, duration_seconds, project_id in archived:
+            project = projects.get(project_id)
+            if project is None:  # projeto excluído depois do arquivamento; no banco as sessões iriam junto
+                continue
+            yield {
+                "record_type": "focus_session",
+                "project_identificator": project["identificator"],
+                "project_title": project["title"],
+                "started_at": _iso(started_at),
+                "duration_seconds": duration_seconds,
+            }
+
+    def iter_records(self, user_id: str, datasets: Iterable[str] = EXPORT_DATASETS, batch_size: int = 1000) -> Iterator[Dict]:
+        if "focus_sessions" in datasets:
+            yield from self._iter_archived_sessions(user_id)
+            for row in self.focus_session_repo.iter_export_rows_by_user(user_identificator=user_id, batch_size=batch_size):
+                yield {
+                    "record_type": "focus_session",
+                    "project_identificator": row["project_identificator"],
+                    "project_title": row["project_title"],
+                    "started_at": _iso(row["started_at"]),
+                    "duration_seconds": row["duration_seconds"],
+                }
+        if "tasks" in datasets:
+            for row in self.task_repo.iter_export_rows_by_user(user_identificator=user_id, batch_size=batch_size):
+                yield {
+                    "record_type": "task",
+                    "project_identificator": row["project_identificator"],
+                    "project_title": row["project_title"],
+                    "task_identificator": row["identificator"],
+                    "title": row["title"],
+                    "description": row["description"],
+                    "status": row["status"],
+                    "created_at": _iso(row["created_at"]),
+                    "completed_at": _iso(row["completed_at"]),
+                }
+
+    @staticmethod
+    def _validate(export_format: str, datasets: Tuple[str, ...]) -> None:
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Invalid export format '{export_format}'. Allowed values are {', '.join(EXPORT_FORMATS)}.")
+        unknown = set(datasets) - set(EXPORT_DATASETS)
+        if unknown or not datasets:
+            raise ValueError(f"Invalid datasets {sorted(unknown) or '[]'}. Allowed values are {', '.join(EXPORT_DATASETS)}.")
+
+    def stream_history(self, user_id: str, export_format: str = "ndjson", compress: bool = True,
+                       datasets: Tuple[str, ...] = EXPORT_DATASETS) -> Iterator[bytes]:
+        """Valida os parâmetros já na chamada e devolve um gerador de bytes (gzip opcional) com memória constante."""
+        self._validate(export_format, datasets)
+        logger.info(f"Service: Streaming history export for user '{user_id}' (format={export_format}, gzip={compress}, datasets={datasets})")
+        return self._generate(user_id, export_format, compress, datasets)
+
+    def _generate(self, user_id: str, export_format: str, compress: bool, datasets: Tuple[str, ...]) -> Iterator[bytes]:
+        # wbits=31 -> container gzip (não apenas zlib)
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+        buffer = io.StringIO()
+        writer = None
+        if export_format == "csv":
+            writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS, extrasaction="ignore")
+            writer.writeheader()
+
+        def drain() -> bytes:
+            data = buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            return compressor.compress(data) if compressor else data
+
+        records = 0
+        for record in self.iter_records(user_id, datasets):
+            if writer:
+                writer.writerow(record)
+            else:
+                buffer.write(json.dumps(record, ensure_ascii=False))
+                buffer.write("\n")
+            records += 1
+            if buffer.tell() >= self.CHUNK_SIZE:
+                chunk = drain()
+                if chunk:
+                    yield chunk
+
+        chunk = drain()
+        if compressor:
+            chunk += compressor.flush()
+        if chunk:
+            yield chunk
+        logger.info(f"Service: History export for user '{user_id}' finished with {records} records.")
+
+    def request_export(self, user_id: str, export_format: str = "ndjson", compress: bool = True,
+                       datasets: Tuple[str, ...] = EXPORT_DATASETS) -> JobDB:
+        """Enfileira a exportação para arquivo e retorna o trabalho; o download fica em export_path(job)."""
+        self._validate(export_format, datasets)
+        filename = f"{uuid.uuid4().hex}.{export_format}" + (".gz" if compress else "")
+        job = self.job_service.enqueue(EXPORT_HISTORY, {
+            "user_id": user_id, "format": export_format, "gzip": compress, "datasets": list(datasets), "filename": filename,
+        }, track=True)
+        self.job_service.repo._session.commit()
+        logger.info(f"Service: History export for user '{user_id}' queued as job {job.id}")
+        return job
+
+    @staticmethod
+    def export_path(filename: str) -> str:
+        return os.path.join(current_app.config["EXPORT_DIR"], filename)
+
+    def write_export(self, payload: Dict) -> Dict:
+        """Handler do trabalho: grava em um temporário e renomeia, então reexecutar só sobrescreve o mesmo arquivo."""
+        path = self.export_path(payload["filename"])
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        size = 0
+        with open(tmp_path, "wb") as export_file:
+            for chunk in self.stream_history(payload["user_id"], payload["format"], payload["gzip"], tuple(payload["datasets"])):
+                export_file.write(chunk)
+                size += len(chunk)
+        os.replace(tmp_path, path)
+        return {"filename": payload["filename"], "bytes": size}
@@ -0,0 +1,103 @@
+from typing import Dict, List, Tuple
+
+from flask import current_app
+
+from ..infra.repository.focus_group_repository import FocusGroupRepository
+from ..models.exceptions import DatabaseError, FocusGroupNotFoundError, FocusGroupValidationError
+from ..utils.logger import logger
+from ..utils.live_updates import group_room, user_room
+from ..utils.membership_cache import MembershipCache
+
+# user identificator -> ids dos grupos; id do grupo -> identificators dos membros.
+user_groups = MembershipCache("focus_groups.user_groups")
+group_members = MembershipCache("focus_groups.group_members")
+
+MAX_GROUP_NAME_LENGTH = 255
+
+
+class FocusGroupService:
+    def __init__(self):
+        self.repo = FocusGroupRepository()
+
+    @staticmethod
+    def _ttl() -> float:
+        return current_app.config["FOCUS_GROUP_CACHE_SECONDS"]
+
+    def get_group_ids(self, user_id: str) -> Tuple[int, ...]:
+        user_groups.ttl_seconds = self._ttl()
+        return user_groups.get(user_id, lambda: self.repo.get_group_ids_by_user(user_identificator=user_id))
+
+    def get_members(self, group_id: int) -> Tuple[str, ...]:
+        group_members.ttl_seconds = self._ttl()
+        return group_members.get(group_id, lambda: self.repo.get_member_identificators(group_id=group_id))
+
+    def get_rooms(self, user_id: str) -> List[str]:
+        """Salas que recebem a presença do usuário: a dele (outras abas) e as dos grupos dele."""
+        return [user_room(user_id)] + [group_room(group_id) for group_id in self.get_group_ids(user_id)]
+
+    def refresh(self, user_id: str, group_id: int) -> None:
+        """Descarta do cache deste processo os grupos do usuário e os membros de `group_id` (mudados em outro worker)."""
+        self._invalidate(group_id, user_id)
+
+    def get_visible_users(self, user_id: str) -> List[str]:
+        """O próprio usuário e os membros dos grupos dele, sem repetição."""
+        visible = {user_id}
+        for group_id in self.get_group_ids(user_id):
+            visible.update(self.get_members(group_id))
+        return list(visible)
+
+    def get_group_id_for_member(self, group_identificator: str, user_id: str) -> int:
+        """Id do grupo, se o usuário for membro dele; para quem não é, o grupo não existe."""
+        group = self.repo.get_by_identificator(group_identificator)
+        if group is None or group.id not in self.get_group_ids(user_id):
+            raise FocusGroupNotFoundError(group_identificator)
+        return group.id
+
+    def list_groups(self, user_id: str) -> List[Dict]:
+        return self.repo.list_by_user(user_identificator=user_id)
+
+    def create_group(self, name: str, user_id: str) -> Dict:
+        name = (name or "").strip() if isinstance(name, str) else None
+        if not name:
+            raise FocusGroupValidationError(field="name")
+        if len(name) > MAX_GROUP_NAME_LENGTH:
+            raise FocusGroupValidationError(field="name", message=f"must have at most {MAX_GROUP_NAME_LENGTH} characters")
+
+        logger.info(f"Service: Creating group '{name}' for user '{user_id}'")
+        try:
+            group = self.repo.create(name=name, user_identificator=user_id)
+            self.repo._session.commit()
+        except DatabaseError:
+            self.repo._session.rollback()
+            raise
+        self._invalidate(group.id, user_id)
+        return {"id": group.id, "identificator": group.identificator, "name": group.name}
+
+    def join_group(self, group_identificator: str, user_id: str) -> Dict:
+        return self._change_membership(group_identificator, user_id, join=True)
+
+    def leave_group(self, group_identificator: str, user_id: str) -> Dict:
+        return self._change_membership(group_identificator, user_id, join=False)
+
+    def _change_membership(self, group_identificator: str, user_id: str, join: bool) -> Dict:
+        group = self.repo.get_by_identificator(group_identificator)
+        if group is None:
+            raise FocusGroupNotFoundError(group_identificator)
+        try:
+            if join:
+                changed = self.repo.add_member(group_id=group.id, user_identificator=user_id)
+            else:
+                changed = self.repo.remove_member(group_id=group.id, user_identificator=user_id)
+            self.repo._session.commit()
+        except DatabaseError:
+            self.repo._session.rollback()
+            raise
+        if changed:
+            logger.info(f"Service: User '{user_id}' {'joined' if join else 'left'} group '{group_identificator}'")
+            self._invalidate(group.id, user_id)
+        return {"id": group.id, "identificator": group.identificator, "name": group.name, "changed": changed}
+
+    @staticmethod
+    def _invalidate(group_id: int, user_id: str) -> None:
+        user_groups.invalidate(user_id)
+        group_members.invalidate(group_id)
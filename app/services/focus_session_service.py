@@ -3,18 +3,41 @@ from app.infra.repository.project_repository import ProjectRepository
 from app.models.project import Project
 from ..models.focus_session import FocusSession
 from ..infra.repository.focus_session_repository import FocusSessionRepository
+from ..infra.repository.focus_daily_rollup_repository import FocusDailyRollupRepository
+from ..infra.repository.user_repository import UserRepository
+from ..infra.cold_archive import ColdArchive
+from ..infra.partitioning import FocusSessionPartitions
+from .job_service import JobService, ROLLUP_REFRESH
+from .leaderboard_service import LeaderboardService
 from app.models.exceptions import FocusSessionValidationError
 
 from typing import List, Dict, Any, Optional 
 from datetime import date, timedelta, datetime
 from ..models.exceptions import ProjectNotFoundError, ProjectValidationError, DatabaseError, AuthorizationError, UserNotFoundError
+from ..utils.live_updates import PROJECT_TIME_DELTA, project_time_deltas, push_to_user
 from ..utils.logger import logger
+from ..utils.timezones import get_zone, local_date, to_utc
+
+
+def rollup_rebuild_since() -> Optional[date]:
+    """Primeiro dia cujos rollups podem ser recalculados de focus_sessions, ou None para todos.
+
+    Meses destacados e sessões arquivadas não estão mais em focus_sessions: os rollups deles ficam. O primeiro
+    dia vivo também fica, pois no fuso do usuário ele pode começar ainda no período que saiu do banco.
+    """
+    live_since = FocusSessionPartitions().live_since()
+    horizon = ColdArchive().horizon()
+    boundaries = [d for d in (live_since, horizon.date() if horizon else None) if d]
+    return max(boundaries) + timedelta(days=1) if boundaries else None
 
 
 class FocusSessionService:
     def __init__(self):
         self.project_repo = ProjectRepository()
         self.repo = FocusSessionRepository()
+        self.rollup_repo = FocusDailyRollupRepository()
+        self.user_repo = UserRepository()
+        self.job_service = JobService()
 
     def save_focus_session(self, user_id: str, project_id: str, started_at: datetime, duration_seconds: int) -> FocusSession:
         logger.info(f"Service: Attempting to save focus session for project '{project_id}' by user '{user_id}'")
@@ -43,16 +66,36 @@ class FocusSessionService:
                 logger.error(f"Service: Error converting ProjectDB to Project domain object for id '{project_id}': {e}", exc_info=True)
                 raise DatabaseError(f"Error processing project data for project '{project_id}'.")
 
+            # started_at é gravado em UTC; horários sem offset (clientes antigos) são lidos no fuso do usuário.
+            user_timezone = project_db_check.user.timezone
             new_focus_session = FocusSession(
                 project=project_domain, 
-                started_at=datetime.fromisoformat(started_at),
+                started_at=to_utc(datetime.fromisoformat(started_at), user_timezone),
                 duration_seconds=duration_seconds
             )
 
-            self.repo.add(new_focus_session)
+            # Sessões que atravessam a meia-noite local são gravadas como um segmento por dia.
+            segments = new_focus_session.split_by_day(tz_name=user_timezone)
+            self.repo.add_many(segments)
+            # O rollup diário é recalculado fora da requisição; o trabalho entra na mesma transação das sessões,
+            # então não se perde, e trabalhos do mesmo projeto/dias ainda na fila são agrupados.
+            days = sorted({local_date(segment.started_at, user_timezone).isoformat() for segment in segments})
+            self.job_service.enqueue(
+                ROLLUP_REFRESH,
+                {"project_id": project_db_check.id, "user_id": user_id, "timezone": user_timezone, "days": days},
+                dedupe_key=f"{ROLLUP_REFRESH}:{project_db_check.id}:{','.join(days)}",
+            )
             self.repo._session.commit() 
 
-            logger.info(f"Focus session (Domain ID: {new_focus_session.id}) saved successfully for project '{project_id}' by user '{user_id}'")
+            logger.info(f"Focus session (Domain ID: {new_focus_session.id}, {len(segments)} segment(s)) saved successfully for project '{project_id}' by user '{user_id}'")
+            seconds_by_day = [(local_date(segment.started_at, user_timezone), segment.duration_seconds) for segment in segments]
+            # As abas abertas na home somam o delta aos números exibidos, sem recarregar a página.
+            deltas = project_time_deltas(project_id, seconds_by_day, user_timezone)
+            push_to_user(user_id, PROJECT_TIME_DELTA, {"deltas": deltas})
+            try:
+                LeaderboardService().record_session(user_id, seconds_by_day)
+            except Exception as e:  # a sessão já está salva; o índice se corrige na próxima reconstrução
+                logger.warning(f"Service: Failed to update leaderboard for user '{user_id}': {e}")
             return new_focus_session
 
         except (ProjectNotFoundError, AuthorizationError, FocusSessionValidationError, ProjectValidationError) as e: 
@@ -70,3 +113,118 @@ class FocusSessionService:
             self.repo._session.rollback()
             logger.error(f"Service: Unexpected error saving focus session for project '{project_id}' by user '{user_id}': {e}", exc_info=True)
             raise DatabaseError("An unexpected error occurred while saving the focus session.")
+
+
+    def resegment_existing_sessions(self, batch_size: int = 500, start_after_id: int = 0) -> Dict[str, int]:
+        """Migração: divide em segmentos diários as sessões já gravadas que atravessam a meia-noite.
+
+        Percorre a tabela por id em lotes, commitando a cada lote; pode ser reexecutada
+        (ou retomada com start_after_id) sem efeito sobre linhas já segmentadas.
+        """
+        logger.info(f"Service: Resegmenting focus sessions by day (batch_size={batch_size}, start_after_id={start_after_id})")
+        last_id = start_after_id
+        scanned = 0
+        split = 0
+        created = 0
+        try:
+            while True:
+                batch = self.repo.get_batch_after_id(last_id=last_id, batch_size=batch_size)
+                if not batch:
+                    break
+                for focus_session_db in batch:
+                    new_rows = self.repo.split_by_day(focus_session_db, tz_name=focus_session_db.project.user.timezone)
+                    if new_rows:
+                        split += 1
+                        created += new_rows
+                last_id = batch[-1].id
+                scanned += len(batch)
+                self.repo._session.commit()
+                logger.debug(f"Service: Resegmentation checkpoint at id {last_id} ({scanned} scanned, {split} split)")
+        except DatabaseError:
+            self.repo._session.rollback()
+            logger.error(f"Service: Resegmentation stopped at id {last_id}. Re-run with start_after_id={last_id} to resume.")
+            raise
+        except Exception as e:
+            self.repo._session.rollback()
+            logger.error(f"Service: Unexpected error resegmenting focus sessions after id {last_id}: {e}", exc_info=True)
+            raise DatabaseError("An unexpected error occurred while resegmenting focus sessions.")
+
+        logger.info(f"Service: Resegmentation finished. Scanned {scanned}, split {split}, created {created} segments.")
+        return {"scanned": scanned, "split": split, "created": created, "last_id": last_id}
+
+
+    def convert_to_utc(self, from_timezone: str, user_id: Optional[str] = None, batch_size: int = 500, start_after_id: int = 0) -> Dict[str, int]:
+        """Migração única: converte para UTC os started_at gravados como hora local de `from_timezone`.
+
+        Grava `from_timezone` como fuso dos usuários afetados no mesmo commit de cada lote (os cortes de meia-noite
+        continuam válidos nesse fuso), então retomar com start_after_id não deixa ninguém em UTC. Recalcula os
+        rollups no final (só dos dias ainda em focus_sessions, ver rollup_rebuild_since). Não é idempotente: rode uma vez por usuário/base.
+        """
+        logger.info(f"Service: Converting focus sessions from '{from_timezone}' to UTC (user={user_id}, batch_size={batch_size}, start_after_id={start_after_id})")
+        get_zone(from_timezone)
+        last_id = start_after_id
+        converted = 0
+        user_ids = set()
+        try:
+            while True:
+                batch = self.repo.get_batch_after_id(last_id=last_id, batch_size=batch_size, user_identificator=user_id)
+                if not batch:
+                    break
+                batch_user_ids = set()
+                for focus_session_db in batch:
+                    focus_session_db.started_at = to_utc(focus_session_db.started_at, from_timezone)
+                    batch_user_ids.add(focus_session_db.project.user.identificator)
+                for identificator in batch_user_ids - user_ids:
+                    self.user_repo.update_timezone(user_identificator=identificator, timezone=from_timezone)
+                user_ids |= batch_user_ids
+                last_id = batch[-1].id
+                converted += len(batch)
+                self.repo._session.commit()
+                logger.debug(f"Service: UTC conversion checkpoint at id {last_id} ({converted} converted)")
+
+            # Sessões em partições destacadas ou no arquivo frio não são convertidas; os rollups delas ficam.
+            rollups = self.rollup_repo.rebuild(since=rollup_rebuild_since())
+            self.repo._session.commit()
+        except DatabaseError:
+            self.repo._session.rollback()
+            logger.error(f"Service: UTC conversion stopped at id {last_id}. Re-run with start_after_id={last_id} to resume.")
+            raise
+        except Exception as e:
+            self.repo._session.rollback()
+            logger.error(f"Service: Unexpected error converting focus sessions to UTC after id {last_id}: {e}", exc_info=True)
+            raise DatabaseError("An unexpected error occurred while converting focus sessions to UTC.")
+
+        logger.info(f"Service: UTC conversion finished. Converted {converted} sessions of {len(user_ids)} users, rebuilt {rollups} rollups.")
+        return {"converted": converted, "users": len(user_ids), "rollups": rollups, "last_id": last_id}
+
+    def archive_older_than(self, horizon: datetime, archive: Optional[ColdArchive] = None) -> Dict[str, int]:
+        """Move para o arquivo frio as sessões com started_at < horizon (UTC), um usuário por transação.
+
+        O segmento é gravado (com fsync) antes do commit do DELETE; se o commit falhar, o arquivo volta ao tamanho
+        anterior, então uma sessão nunca fica nos dois lugares nem em nenhum. Os rollups diários não mudam.
+        """
+        archive = archive or ColdArchive()
+        logger.info(f"Service: Archiving focus sessions before {horizon} into '{archive.directory}'")
+        users = archived = 0
+        for user_identificator in self.repo.get_user_identificators_with_sessions_before(horizon):
+            rows = self.repo.get_archivable_by_user(user_identificator=user_identificator, before=horizon)
+            if not rows:
+                continue
+            size_before = None
+            try:
+                self.repo.delete_by_ids([row[0] for row in rows])
+                size_before = archive.append(user_identificator, [row[1:] for row in rows])
+                self.repo._session.commit()
+            except Exception as e:
+                self.repo._session.rollback()
+                if size_before is not None:
+                    archive.truncate(user_identificator, size_before)
+                logger.error(f"Service: Archiving stopped at user '{user_identificator}': {e}", exc_info=True)
+                raise DatabaseError(f"Failed to archive focus sessions of user '{user_identificator}'.")
+            users += 1
+            archived += len(rows)
+            logger.debug(f"Service: Archived {len(rows)} focus sessions of user '{user_identificator}'")
+
+        archive.set_horizon(horizon)
+        logger.info(f"Service: Archived {archived} focus sessions of {users} users before {horizon}.")
+        return {"users": users, "archived": archived}
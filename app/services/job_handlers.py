@@ -0,0 +1,63 @@
+# Handlers dos trabalhos da fila (ver job_service.py). Todos são idempotentes: recalculam ou sobrescrevem.
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict
+
+from flask import current_app
+
+from ..infra.cold_archive import ColdArchive
+from ..infra.repository.focus_daily_rollup_repository import FocusDailyRollupRepository
+from ..utils import preload
+from ..utils.timezones import local_date, local_day_range_utc
+from .export_service import ExportService
+from .leaderboard_service import LeaderboardService
+from .job_service import job_handler, ROLLUP_REFRESH, ROLLUP_REBUILD_USER, TEMPLATES_WARM, EXPORT_HISTORY
+
+
+@job_handler(ROLLUP_REFRESH)
+def refresh_rollups(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Recalcula os rollups dos dias afetados por uma sessão salva (payload: project_id, user_id, timezone, days)."""
+    days = [date.fromisoformat(day) for day in payload["days"]]
+    tz_name = payload["timezone"]
+
+    # Dias antes do horizonte do arquivo frio também contam as sessões que já saíram do banco.
+    archived: Dict[date, int] = defaultdict(int)
+    horizon = ColdArchive().horizon()
+    start, end = local_day_range_utc(min(days), max(days), tz_name)
+    if horizon is not None and start < horizon:
+        for started_at, duration_seconds, project_id in ColdArchive().iter_sessions(payload["user_id"], start, end):
+            if project_id == payload["project_id"]:
+                archived[local_date(started_at, tz_name)] += duration_seconds
+
+    totals = FocusDailyRollupRepository().refresh_days(
+        project_id=payload["project_id"], days=days, tz_name=tz_name, extra_seconds=archived)
+    # O leaderboard lê os mesmos rollups: a pontuação do usuário nos períodos afetados sai já recalculada.
+    LeaderboardService().update_user(payload["user_id"], days)
+    return {day.isoformat(): seconds for day, seconds in totals.items()}
+
+
+@job_handler(ROLLUP_REBUILD_USER)
+def rebuild_user_rollups(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Recalcula os rollups do usuário no fuso atual dele (payload: user_id), depois de uma troca de fuso.
+
+    Dias que já saíram de focus_sessions ficam no fuso antigo (ver rollup_rebuild_since).
+    """
+    from .focus_session_service import rollup_rebuild_since
+
+    rows = FocusDailyRollupRepository().rebuild(since=rollup_rebuild_since(), user_identificator=payload["user_id"])
+    # Os dias locais de hoje e desta semana mudaram de lugar; qualquer fuso cai nesta faixa de dias UTC.
+    today = datetime.now(timezone.utc).date()
+    LeaderboardService().update_user(payload["user_id"], [today + timedelta(days=offset) for offset in range(-7, 2)])
+    return {"rollups": rows}
+
+
+@job_handler(TEMPLATES_WARM)
+def warm_templates(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Compila todos os templates para o bytecode cache em disco, compartilhado pelos workers web."""
+    return {"templates": preload.warm_templates(current_app)}
+
+
+@job_handler(EXPORT_HISTORY)
+def export_history(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return ExportService().write_export(payload)
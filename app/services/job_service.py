@@ -0,0 +1,158 @@
+# Fila de trabalhos adiados em uma tabela SQL (jobs), sem broker externo.
+#
+# - enqueue() grava o trabalho na transação do chamador: ele só existe se a operação que o originou for
+#   commitada, e nunca se perde depois do commit;
+# - `flask jobs worker` roda N processos que reservam trabalhos com um UPDATE condicional, executam o handler
+#   registrado para o tipo e commitam; falhas voltam para a fila com backoff exponencial até max_attempts;
+# - handlers precisam ser idempotentes: um worker pode morrer entre o handler e o commit, e o trabalho roda de
+#   novo quando o lock expira (JOB_LOCK_TIMEOUT_SECONDS);
+# - com JOBS_RUN_INLINE (o padrão) o handler roda na hora, na transação do chamador, sem gravar linha em jobs
+#   (a não ser com track=True, quando o chamador devolve o id do trabalho para consulta); desligue
+#   (JOBS_RUN_INLINE=0) só quando houver um worker consumindo a fila, senão os trabalhos ficam parados nela.
+
+import json
+import time
+import traceback
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional
+
+from flask import current_app
+
+from ..infra.entities.job_db import JobDB
+from ..infra.repository.job_repository import JobRepository
+from ..utils.logger import logger
+from ..utils.metrics import metrics
+
+ROLLUP_REFRESH = "rollups.refresh"
+ROLLUP_REBUILD_USER = "rollups.rebuild_user"
+TEMPLATES_WARM = "cache.warm_templates"
+EXPORT_HISTORY = "export.history"
+
+HANDLERS: Dict[str, Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]] = {}
+
+
+def job_handler(kind: str):
+    """Registra a função que executa os trabalhos de `kind`. Ela recebe o payload e devolve um resultado (ou None)."""
+    def register(func):
+        HANDLERS[kind] = func
+        return func
+    return register
+
+
+def _load_handlers() -> None:
+    # Importado só na hora de executar: os handlers dependem dos services que enfileiram trabalhos.
+    from . import job_handlers  # noqa: F401
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def backoff_seconds(attempts: int, base: int, cap: int) -> int:
+    return min(cap, base * 2 ** max(attempts - 1, 0))
+
+
+class JobService:
+    def __init__(self):
+        self.repo = JobRepository()
+
+    def enqueue(self, kind: str, payload: Optional[Dict[str, Any]] = None, dedupe_key: Optional[str] = None,
+                delay_seconds: int = 0, max_attempts: Optional[int] = None, track: bool = False) -> Optional[JobDB]:
+        """Enfileira sem commitar; o chamador commita junto com o trabalho que originou este.
+
+        Inline e sem `track`, só executa o handler e devolve None: nada é gravado em jobs.
+        """
+        config = current_app.config
+        if config["JOBS_RUN_INLINE"] and not track:
+            _load_handlers()
+            HANDLERS[kind](payload or {})
+            logger.debug(f"Service: Ran job '{kind}' inline")
+            return None
+        job = self.repo.add(
+            kind=kind,
+            payload=json.dumps(payload or {}),
+            run_at=_utcnow() + timedelta(seconds=delay_seconds),
+            max_attempts=max_attempts or config["JOB_MAX_ATTEMPTS"],
+            dedupe_key=dedupe_key,
+        )
+        logger.debug(f"Service: Enqueued {job}")
+        if config["JOBS_RUN_INLINE"] and job.status == JobDB.QUEUED:
+            _load_handlers()
+            job.attempts += 1
+            result = HANDLERS[kind](payload or {})
+            self.repo.mark_done(job, _utcnow(), json.dumps(result) if result is not None else None)
+        return job
+
+    def get(self, job_id: int) -> Optional[JobDB]:
+        return self.repo.get(job_id)
+
+    def run_next(self, worker_id: str) -> Optional[JobDB]:
+        """Reserva e executa um trabalho. Retorna o trabalho executado (com o status final) ou None se a fila está vazia."""
+        _load_handlers()
+        config = current_app.config
+        session = self.repo._session
+        try:
+            job = self.repo.claim_next(worker_id=worker_id, now=_utcnow(), lock_timeout_seconds=config["JOB_LOCK_TIMEOUT_SECONDS"])
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        if job is None:
+            return None
+
+        job_id, kind = job.id, job.kind
+        started = time.perf_counter()
+        try:
+            handler = HANDLERS.get(kind)
+            if handler is None:
+                raise LookupError(f"No handler registered for job kind '{kind}'.")
+            result = handler(json.loads(job.payload))
+            self.repo.mark_done(job, _utcnow(), json.dumps(result) if result is not None else None)
+            session.commit()
+            metrics.incr(f"jobs.{kind}.done")
+            logger.info(f"Service: Job {job_id} ({kind}) done in {(time.perf_counter() - started) * 1000:.1f}ms")
+        except Exception as e:
+            session.rollback()
+            job = self.repo.get(job_id)
+            retry_at = None
+            if job.attempts < job.max_attempts:
+                delay = backoff_seconds(job.attempts, config["JOB_BACKOFF_SECONDS"], config["JOB_BACKOFF_MAX_SECONDS"])
+                retry_at = _utcnow() + timedelta(seconds=delay)
+            self.repo.mark_failed(job, _utcnow(), traceback.format_exc(), retry_at)
+            session.commit()
+            if retry_at:
+                metrics.incr(f"jobs.{kind}.retried")
+                logger.warning(f"Service: Job {job_id} ({kind}) failed on attempt {job.attempts}/{job.max_attempts}, retrying at {retry_at}: {e}")
+            else:
+                metrics.incr(f"jobs.{kind}.failed")
+                logger.error(f"Service: Job {job_id} ({kind}) failed permanently after {job.attempts} attempts: {e}")
+        metrics.observe(f"jobs.{kind}.run", (time.perf_counter() - started) * 1000)
+        return job
+
+    def work(self, worker_id: str, burst: bool = False, poll_interval: float = 1.0,
+             should_stop: Callable[[], bool] = lambda: False) -> int:
+        """Executa trabalhos até should_stop() (ou até a fila esvaziar, com burst). Retorna quantos executou."""
+        logger.info(f"Service: Worker '{worker_id}' started (burst={burst}, poll_interval={poll_interval}s)")
+        processed = 0
+        while not should_stop():
+            if self.run_next(worker_id) is not None:
+                processed += 1
+                continue
+            if burst:
+                break
+            time.sleep(poll_interval)
+        logger.info(f"Service: Worker '{worker_id}' stopped after {processed} jobs")
+        return processed
+
+    def retry_failed(self, kind: Optional[str] = None) -> int:
+        requeued = self.repo.retry_failed(now=_utcnow(), kind=kind)
+        self.repo._session.commit()
+        return requeued
+
+    def purge_finished(self, older_than_days: int) -> int:
+        purged = self.repo.delete_finished_before(_utcnow() - timedelta(days=older_than_days))
+        self.repo._session.commit()
+        return purged
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return self.repo.count_by_status()
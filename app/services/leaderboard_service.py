@@ -0,0 +1,126 @@
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from flask import current_app
+
+from ..infra.leaderboard import MemoryLeaderboard, RedisLeaderboard, PERIOD_LENGTH, board_key
+from ..infra.repository.focus_daily_rollup_repository import FocusDailyRollupRepository
+from ..infra.repository.user_repository import UserRepository
+from ..utils.logger import logger
+from ..utils.metrics import metrics
+from ..utils.timezones import DEFAULT_TIMEZONE, first_day_of_week, local_today
+from .focus_group_service import FocusGroupService
+from .project_service import format_hour_minute
+
+PERIODS = tuple(PERIOD_LENGTH)
+MAX_LIMIT = 100
+
+_backend = None
+
+
+def get_backend():
+    """Backend do processo: Redis com LEADERBOARD_REDIS_URL, senão em memória."""
+    global _backend
+    if _backend is None:
+        url = current_app.config["LEADERBOARD_REDIS_URL"]
+        _backend = RedisLeaderboard(url) if url else MemoryLeaderboard()
+    return _backend
+
+
+def period_start(period: str, day: date) -> date:
+    return day if period == "day" else first_day_of_week(day)
+
+
+class LeaderboardService:
+    def __init__(self):
+        self.rollup_repo = FocusDailyRollupRepository()
+        self.user_repo = UserRepository()
+        self.group_service = FocusGroupService()
+
+    @property
+    def board(self):
+        return get_backend()
+
+    def rebuild(self, period: str, start: date) -> int:
+        """Recria o índice do período a partir dos rollups diários. Devolve quantos usuários pontuaram."""
+        scores = self.rollup_repo.sum_seconds_by_user(start=start, end=start + PERIOD_LENGTH[period])
+        key = board_key(period, start)
+        self.board.replace(key, scores)
+        # Um período novo (virada do dia ou da semana) também é a hora de descartar os que já passaram.
+        self.board.prune(datetime.now(timezone.utc).date())
+        metrics.incr("leaderboard.rebuild")
+        logger.info(f"Service: Leaderboard '{key}' rebuilt with {len(scores)} users.")
+        return len(scores)
+
+    def update_user(self, user_id: str, days: Iterable[date]) -> None:
+        """Atualiza a pontuação do usuário nos períodos que contêm `days`, a partir dos rollups já recalculados.
+
+        Idempotente (grava o total, não soma). Índices que ainda não existem ficam como estão: a primeira
+        leitura os reconstrói dos mesmos rollups.
+        """
+        for period in PERIODS:
+            for start in sorted({period_start(period, day) for day in days}):
+                key = board_key(period, start)
+                if not self.board.exists(key):
+                    continue
+                per_day = self.rollup_repo.sum_seconds_per_day_by_user(
+                    user_identificator=user_id, start=start, end=start + PERIOD_LENGTH[period])
+                self.board.set_score(key, user_id, sum(per_day.values()))
+
+    def record_session(self, user_id: str, seconds_by_day: Iterable[Tuple[date, int]]) -> None:
+        """Soma uma sessão recém-commitada ao índice deste processo, quando o job de rollup não faz isso por ele.
+
+        Com a fila num worker separado e o índice em memória, o update_user do job roda no índice do worker, não
+        no do processo web. Com Redis (compartilhado) ou jobs inline o job já atualiza o índice certo.
+        """
+        if self.board.shared or current_app.config["JOBS_RUN_INLINE"]:
+            return
+        for period in PERIODS:
+            totals: Dict[date, int] = defaultdict(int)
+            for day, seconds in seconds_by_day:
+                totals[period_start(period, day)] += seconds
+            for start, seconds in totals.items():
+                key = board_key(period, start)
+                if self.board.exists(key):  # índices ainda não montados saem dos rollups na primeira leitura
+                    self.board.increment(key, user_id, seconds)
+
+    def get_leaderboard(self, user_id: str, period: str = "day", group_identificator: Optional[str] = None,
+                        limit: int = 10) -> Dict[str, Any]:
+        if period not in PERIODS:
+            raise ValueError(f"Unsupported period '{period}'. Use one of: {', '.join(PERIODS)}.")
+        if not 1 <= limit <= MAX_LIMIT:
+            raise ValueError(f"limit must be between 1 and {MAX_LIMIT}.")
+
+        today = local_today(self.user_repo.get_timezone(user_identificator=user_id) or DEFAULT_TIMEZONE)
+        start = period_start(period, today)
+        key = board_key(period, start)
+        if not self.board.exists(key):
+            self.rebuild(period, start)
+
+        if group_identificator:
+            # Grupo: só as pontuações dos membros, ordenadas aqui (O(g log g) no tamanho do grupo).
+            group_id = self.group_service.get_group_id_for_member(group_identificator, user_id)
+            scores = self.board.scores(key, self.group_service.get_members(group_id))
+            ranking = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+            top = ranking[:limit]
+            me = next(((rank, seconds) for rank, (member, seconds) in enumerate(ranking) if member == user_id), None)
+        else:
+            top = self.board.top(key, limit)
+            rank = self.board.rank(key, user_id)
+            me = (rank, self.board.scores(key, [user_id])[user_id]) if rank is not None else None
+
+        usernames = self.user_repo.get_usernames([member for member, _ in top])
+        return {
+            "period": period,
+            "start": start.isoformat(),
+            "entries": [self._entry(rank, member, seconds, usernames.get(member)) for rank, (member, seconds) in enumerate(top)],
+            "me": self._entry(me[0], user_id, me[1]) if me else None,
+        }
+
+    @staticmethod
+    def _entry(rank: int, user_id: str, seconds: int, username: Optional[str] = None) -> Dict[str, Any]:
+        entry = {"rank": rank + 1, "user_id": user_id, "seconds": seconds, "time": format_hour_minute(seconds)}
+        if username is not None:
+            entry["username"] = username
+        return entry
@@ -1,14 +1,17 @@
-from functools import total_ordering
 from typing import List, Dict, Any 
 from datetime import date, timedelta, datetime
 
-from app.models import user
 from app.models.dtos.project_dto import ProjectDetailsDTO
 
 from ..models.project import Project 
 from ..models.exceptions import ProjectNotFoundError, ProjectValidationError, DatabaseError, UserNotFoundError
 from ..infra.repository.project_repository import ProjectRepository
+from ..infra.repository.focus_session_repository import FocusSessionRepository
+from ..infra.repository.focus_daily_rollup_repository import FocusDailyRollupRepository
+from ..infra.repository.user_repository import UserRepository
+from ..utils.fragment_cache import data_version
 from ..utils.logger import logger
+from ..utils.timezones import DEFAULT_TIMEZONE, local_today, local_day_range_utc, first_day_of_week
 
 def format_hour_minute(total_seconds: int) -> str:
     hours, remainder = divmod(total_seconds, 3600)
@@ -24,8 +27,12 @@ def format_hour_minute_second(total_seconds: int) -> str:
 class ProjectService:
     def __init__(self):
         self.repo = ProjectRepository()
-        # You might need a FocusSessionRepository if you need more complex session queries later
-        # self.focus_session_repo = FocusSessionRepository()
+        self.focus_session_repo = FocusSessionRepository()
+        self.rollup_repo = FocusDailyRollupRepository()
+        self.user_repo = UserRepository()
+
+    def _user_timezone(self, user_id: str) -> str:
+        return self.user_repo.get_timezone(user_identificator=user_id) or DEFAULT_TIMEZONE
 
     def get_all_projects_per_user(self, user_id=None):
         logger.debug(f"Service: Getting all projects for user '{user_id}'")
@@ -105,26 +112,38 @@ class ProjectService:
                     "completed_at": task.completed_at.strftime("%Y-%m-%d %H:%M") if task.completed_at else None,
                 } for task in project_details_dto.tasks
             ]
+            # Separadas uma vez aqui (o template não filtra a lista duas vezes) e versionadas para o cache de fragmentos.
+            response_data["tasks_in_progress"] = [task for task in response_data["tasks"] if task["status"] == "in progress"]
+            response_data["tasks_completed"] = [task for task in response_data["tasks"] if task["status"] == "completed"]
+            response_data["tasks_version"] = data_version(
+                (task["identificator"], task["title"], task["status"], task["created_at"], task["completed_at"])
+                for task in response_data["tasks"]
+            )
 
+            # "Hoje" é o dia local do usuário, convertido para um intervalo UTC em started_at.
+            user_timezone = self._user_timezone(user_id)
+            today = local_today(user_timezone)
+            today_start, today_end = local_day_range_utc(today, today, user_timezone)
+
+            # Só as sessões de hoje: a faixa em started_at fica em uma partição (MySQL) / no índice (SQLite).
             response_data["focus_sessions"] = [
                 {
-                    "id": session.id,
-                    "started_at": session.started_at,
-                    "duration_seconds": session.duration_seconds,
-                    "end_time": session.end_time,
-                } for session in project_details_dto.focus_sessions
+                    "id": session["id"],
+                    "started_at": session["started_at"],
+                    "duration_seconds": session["duration_seconds"],
+                    "end_time": session["started_at"] + timedelta(seconds=session["duration_seconds"]),
+                } for session in self.focus_session_repo.get_by_project_in_range(
+                    project_identificator=project_id, start=today_start, end=today_end)
             ]
-
-            today = date.today()
-            today_total_seconds = sum(
-                session.duration_seconds
-                for session in project_details_dto.focus_sessions
-                if session.started_at.date() == today
+            today_total_seconds = self.focus_session_repo.sum_duration_by_project(
+                project_identificator=project_id,
+                start=today_start,
+                end=today_end
             )
             response_data["today_focus_time_formatted"] = format_hour_minute_second(today_total_seconds)
             response_data["today_focus_total_seconds"] = today_total_seconds 
 
-            logger.info(f"Service: Successfully prepared project details for frontend - id '{project_id}', today_focus_time_formatted: {response_data["today_focus_time_formatted"]}, today_total_seconds: {today_total_seconds}, response_data: {response_data["focus_sessions"]}")
+            logger.info(f"Service: Successfully prepared project details for frontend - id '{project_id}', today_focus_time_formatted: {response_data["today_focus_time_formatted"]}, today_total_seconds: {today_total_seconds}, tasks: {len(response_data["tasks"])}, focus_sessions: {len(response_data["focus_sessions"])}")
             return response_data
 
         except (ProjectNotFoundError, DatabaseError, UserNotFoundError) as e:
@@ -138,41 +157,41 @@ class ProjectService:
         logger.info(f"Service: Calculating time summaries per project for user '{user_id}'")
         projects_summary = []
         try:
-            projects_db = self.repo.get_projects_with_focus_sessions_by_user(user_identificator=user_id)
-
-            today = date.today()
-            days_since_sunday = (today.weekday() + 1) % 7
-            start_of_week = today - timedelta(days=days_since_sunday) 
-            logger.debug(f"Service: Calculating summaries for today ({today}) and week starting {start_of_week}")
-
-            for project_db in projects_db:
-                today_total_seconds = 0
-                week_total_seconds = 0
-
-                for focus_session_db in project_db.focus_sessions:
-                    session_date = focus_session_db.started_at.date()
-
-                    if session_date == today:
-                        today_total_seconds += focus_session_db.duration_seconds
+            user_timezone = self._user_timezone(user_id)
+            today = local_today(user_timezone)
+            start_of_week = first_day_of_week(today)
+            logger.debug(f"Service: Calculating summaries for today ({today}, {user_timezone}) and week starting {start_of_week}")
+
+            # Limites calculados por dia local (dias de 23/25h no horário de verão) e comparados em UTC no índice.
+            week_start, end = local_day_range_utc(start_of_week, today, user_timezone)
+            today_start, _ = local_day_range_utc(today, today, user_timezone)
+            summaries = self.focus_session_repo.get_time_summary_by_user(
+                user_identificator=user_id,
+                today_start=today_start,
+                week_start=week_start,
+                end=end
+            )
 
-                    if session_date >= start_of_week:
-                        week_total_seconds += focus_session_db.duration_seconds
+            for summary in summaries:
+                today_total_seconds = int(summary["today_seconds"])
+                week_total_seconds = int(summary["week_seconds"])
 
                 today_total_minutes = today_total_seconds // 60
                 week_total_minutes = week_total_seconds // 60
 
                 projects_summary.append({
-                    "identificator": project_db.identificator,
-                    "title": project_db.title,
-                    "color": project_db.color,
+                    "identificator": summary["identificator"],
+                    "title": summary["title"],
+                    "color": summary["color"],
                     "today_total_time": format_hour_minute(today_total_seconds),
                     "week_total_time": format_hour_minute(week_total_seconds),
                     "today_total_minutes": today_total_minutes,
-                    "week_total_minutes": week_total_minutes
+                    "week_total_minutes": week_total_minutes,
+                    # Base para os deltas enviados pelo websocket (ver app/utils/live_updates.py).
+                    "today_total_seconds": today_total_seconds,
+                    "week_total_seconds": week_total_seconds
                 })
-                logger.debug(f"Service: Project '{project_db.title}' ({project_db.identificator}) - Today: {today_total_minutes}m, Week: {week_total_minutes}m")
-
-            #projects_summary.sort(key=lambda x: x["title"])
+                logger.debug(f"Service: Project '{summary['title']}' ({summary['identificator']}) - Today: {today_total_minutes}m, Week: {week_total_minutes}m")
 
             logger.info(f"Service: Successfully calculated time summaries for {len(projects_summary)} projects for user '{user_id}'")
             return projects_summary
@@ -187,21 +206,18 @@ class ProjectService:
 
     def get_data_for_last_365_days_home_chart(self, user_id: str) -> List[Dict[str, Any]]:
         logger.info(f"Service: Calculating daily focus minutes (365 days) for user '{user_id}'")
-        minutes_per_day: Dict[date, int] = {}
         try:
-            projects_db = self.repo.get_projects_with_focus_sessions_by_user(user_identificator=user_id)
-
-            today = date.today()
+            today = local_today(self._user_timezone(user_id))
             start_date = today - timedelta(days=365)
             logger.debug(f"Service: Calculating heatmap data from {start_date} to {today}")
 
-            for project_db in projects_db:
-                for fs in project_db.focus_sessions:
-                    session_date = fs.started_at.date()
-                   
-                    if session_date >= start_date:
-                        minutes = fs.duration_seconds // 60
-                        minutes_per_day[session_date] = minutes_per_day.get(session_date, 0) + minutes
+            # Os rollups já estão chaveados pelo dia local do usuário.
+            seconds_per_day = self.rollup_repo.sum_seconds_per_day_by_user(
+                user_identificator=user_id,
+                start=start_date,
+                end=today + timedelta(days=1)
+            )
+            minutes_per_day = {d: seconds // 60 for d, seconds in seconds_per_day.items()}
 
             heatmap_data = [
                 {"date": d.isoformat(), "count": m}
@@ -1,10 +1,9 @@
 #from ..models.task import ToDo
 #from ..models.exceptions import TaskValidationError, TaskNotFoundError
-from multiprocessing import Value
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional
 
-from sqlalchemy import Boolean
 from app.infra.entities.project_db import ProjectDB
+from app.infra.entities.task_status_db import TaskStatusDB
 from app.infra.repository.project_repository import ProjectRepository
 from app.infra.repository.task_status_repository import TaskStatusRepository
 from app.models.project import Project
@@ -15,12 +14,31 @@ from datetime import datetime
 from ..utils.logger import logger
 from ..models.exceptions import AuthorizationError, DatabaseError, ProjectNotFoundError, TaskNotFoundError, TaskStatusNotFound, TaskValidationError
 
+# Status de tarefa são dados de referência (poucas linhas que não mudam com o app no ar): o domínio de cada um
+# fica em cache no processo, aquecido pelo launcher pre-fork. O repository ainda confere o id ao gravar a tarefa.
+_status_cache: Dict[str, TaskStatus] = {}
+
+
 class TaskService:
     def __init__(self):
         self.project_repo = ProjectRepository()
         self.task_status_repo = TaskStatusRepository()
         self.repo = TaskRepository()
 
+    def _get_status(self, name: str, load: Callable[[], TaskStatusDB]) -> Optional[TaskStatus]:
+        status = _status_cache.get(name)
+        if status is None:
+            status = TaskStatus.from_orm(load())
+            if status:
+                _status_cache[name] = status
+        return status
+
+    def warm_status_cache(self) -> int:
+        """Carrega todos os status no cache do processo. Devolve quantos."""
+        for status_db in self.task_status_repo.list_all():
+            _status_cache[status_db.name] = TaskStatus.from_orm(status_db)
+        return len(_status_cache)
+
         
     def create_task(self, user_id: str, project_id: str, title: str, description: str = None) -> Task:
         logger.info(f"Service: Attempting to save focus session for project '{project_id}' by user '{user_id}'")
@@ -37,7 +55,7 @@ class TaskService:
                 raise DatabaseError(f"Error processing project data for project '{project_id}'.")
             
             try:
-                default_status_db = self.task_status_repo.get_default_status()
+                default_status_domain = self._get_status("in progress", self.task_status_repo.get_default_status)
             except TaskStatusNotFound as e:
                 logger.critical(f"Service: Default task status not found in DB: {e}", exc_info=True)
                 raise 
@@ -46,7 +64,6 @@ class TaskService:
                 raise 
             
             try:
-                default_status_domain = TaskStatus.from_orm(default_status_db)
                 if not default_status_domain:
                     raise ValueError("Conversion from TaskStatusDB to TaskStatus domain returned None.")
             except (ValueError, DatabaseError) as e:
@@ -109,8 +126,7 @@ class TaskService:
  
             if target_status_name == "completed":
                 try:
-                    new_status_db = self.task_status_repo.get_completed_status()
-                    new_status_domain = TaskStatus.from_orm(new_status_db)
+                    new_status_domain = self._get_status("completed", self.task_status_repo.get_completed_status)
                     if not new_status_domain: raise ValueError("Conversion from completed TaskStatusDB returned None.")
                     task_domain.complete(new_status_domain)
                 except TaskStatusNotFound as e:
@@ -125,8 +141,7 @@ class TaskService:
     
             elif target_status_name == "in progress":  
                 try:
-                    new_status_db = self.task_status_repo.get_default_status()
-                    new_status_domain = TaskStatus.from_orm(new_status_db)
+                    new_status_domain = self._get_status("in progress", self.task_status_repo.get_default_status)
                     if not new_status_domain: raise ValueError("Conversion from default TaskStatusDB returned None.")
                     task_domain.reopen(new_status_domain)
                 except TaskStatusNotFound as e:
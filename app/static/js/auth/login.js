@@ -9,7 +9,7 @@ document.getElementById('loginForm').addEventListener('submit', function(e) {
         headers: {
         "Content-Type": "application/json"
         },
-        body: JSON.stringify({ email: email, password: password })
+        body: JSON.stringify({ email: email, password: password, timezone: Intl.DateTimeFormat().resolvedOptions().timeZone })
     })
     .then(response => response.json())
     .then(({ success, message, data, error }) => {
@@ -19,6 +19,12 @@ function updateUserInFocus() {
     }
     
     const keys = Object.keys(usersInFocus);
+    if (keys.length === 0) {
+        const emptyItem = document.createElement("li");
+        emptyItem.innerHTML = `<span class="dropdown-item-text text-start"><small>No one in your groups is focusing right now.</small></span>`;
+        userList.appendChild(emptyItem);
+        return;
+    }
     const lastKey = keys[keys.length - 1];
 
     Object.entries(usersInFocus).forEach(([key, value]) => {
@@ -41,7 +47,8 @@ function updateUserInFocus() {
 
 
 
-const socket = io({ query: { user_id: userId, username: username } });
+// Só websocket: com vários workers, as requisições de long-polling de uma sessão cairiam em workers diferentes.
+const socket = io({ transports: ["websocket"] });
 
 socket.on("connect", () => {
     console.log("Conectado ao servidor WebSocket");
@@ -67,6 +74,12 @@ socket.on("focus_user_left", (data) => {
     delete usersInFocus[data.user_id];
 });
 
+// Alguém entrou ou saiu de um dos grupos: o servidor refaz as salas desta aba (a mudança pode ter sido feita
+// em outro worker) e devolve a lista visível atualizada.
+socket.on("groups_changed", (data) => {
+    socket.emit("sync_rooms", { group_id: data.group_id });
+});
+
 
 document.getElementById("communityDropdown").addEventListener("show.bs.dropdown", () => {
     updateUserInFocus(); 
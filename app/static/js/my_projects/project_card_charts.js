@@ -25,10 +25,12 @@ function inicializateChartContent() {
         const currentProjectIndex = allProjectsData.findIndex(t => t.identificator === projectID);
         const currentProjectMinutes = (currentProjectIndex !== -1) ? (allProjectsData[currentProjectIndex].week_total_minutes || 0) : 0;
 
-        if (ctx.chart) {
+        const existingChart = Chart.getChart(canvas);
+        if (existingChart) {
             console.debug(`Destroying existing chart for canvas myPieChart-${projectID}`); // Log para debug
-            ctx.chart.destroy();
+            existingChart.destroy();
         }
+        canvas.style.display = '';
 
         const labels = allProjectsData.map(t => t.title);
         const projectMinutes = allProjectsData.map(t => t.week_total_minutes);
@@ -100,7 +102,41 @@ function inicializateChartContent() {
 }
 
 
+function formatHourMinute(totalSeconds) {
+    const hours = Math.floor(totalSeconds / 3600);
+    const minutes = Math.round((totalSeconds % 3600) / 60);
+    return `${String(hours).padStart(2, "0")}h${String(minutes).padStart(2, "0")}m`;
+}
+
+// Deltas enviados pelo servidor quando uma sessão de foco é salva (em qualquer aba): soma aos totais do card
+// e redesenha os gráficos, sem recarregar a página.
+function applyProjectTimeDeltas(deltas) {
+    let changed = false;
+    deltas.forEach(delta => {
+        const projectData = allProjectsData.find(t => t.identificator === delta.project_id);
+        if (!projectData || !(delta.today || delta.week)) return;
+
+        if (delta.today) projectData.today_total_seconds += delta.seconds;
+        if (delta.week) projectData.week_total_seconds += delta.seconds;
+        projectData.today_total_minutes = Math.floor(projectData.today_total_seconds / 60);
+        projectData.week_total_minutes = Math.floor(projectData.week_total_seconds / 60);
+        projectData.today_total_time = formatHourMinute(projectData.today_total_seconds);
+        projectData.week_total_time = formatHourMinute(projectData.week_total_seconds);
+
+        const card = document.querySelector(`.custom-card[data-id="${delta.project_id}"]`);
+        if (card) {
+            card.querySelector('[data-field="today_total_time"]').textContent = projectData.today_total_time;
+            card.querySelector('[data-field="week_total_time"]').textContent = projectData.week_total_time;
+        }
+        changed = true;
+    });
+    if (changed) inicializateChartContent();
+}
+
+
 document.addEventListener('DOMContentLoaded', function() {
     inicializateChartContent();
+    // `socket` é criado em focus_users_display..js (mesmo bundle), já conectado à sala privada do usuário.
+    socket.on("project_time_delta", (data) => applyProjectTimeDeltas(data.deltas));
 });
 
@@ -9,7 +9,8 @@ const userId = user_data.user_id;
 const username = user_data.username;
 const projectName = project_data.project_name
 const projectID = project_data.project_id
-const socket = io({ query: { user_id: userId, username: username } });
+// Só websocket: com vários workers, as requisições de long-polling de uma sessão cairiam em workers diferentes.
+const socket = io({ transports: ["websocket"], query: { user_id: userId, username: username } });
 
 socket.on("connect", () => {
     console.log("Conectado ao servidor WebSocket");
@@ -32,7 +33,8 @@ document.addEventListener("DOMContentLoaded", function() {
 
     function startTimer(){
         let realStartTime = new Date(Date.now())
-        realStartTimeISO = getISOString(realStartTime);
+        // UTC com offset ("...Z"); o servidor agrupa por dia no fuso do usuário.
+        realStartTimeISO = realStartTime.toISOString();
         
         elapsedTimeSession = 0;
 
@@ -120,20 +122,3 @@ document.addEventListener("DOMContentLoaded", function() {
         }
     });
 });
-
-function getISOString(date) {
-
-    const pad = (num) => String(num).padStart(2, '0');
-  
-    const year = date.getFullYear();
-    const month = pad(date.getMonth() + 1); 
-    const day = pad(date.getDate());
-    const hours = pad(date.getHours());
-    const minutes = pad(date.getMinutes());
-    const seconds = pad(date.getSeconds());
-    const milliseconds = String(date.getMilliseconds()).padStart(3, '0');
-  
-  
-    return `${year}-${month}-${day}T${hours}:${minutes}:${seconds}.${milliseconds}`;
-  
-  }
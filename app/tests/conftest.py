@@ -0,0 +1,75 @@
+import os
+import uuid
+
+import pytest
+
+# Os testes de integração rodam em um SQLite em memória, nunca no banco do .env.
+os.environ["DATABASE_URI"] = "sqlite://"
+# Trabalhos adiados (rollups, exportações) rodam na hora; os testes da fila desligam isso.
+os.environ["JOBS_RUN_INLINE"] = "1"
+
+from app import create_app
+from app.infra.db import db
+from app.infra.entities import UserDB, ProjectDB, TaskStatusDB
+
+
+@pytest.fixture(scope="session")
+def app():
+    app = create_app()
+    app.config["TESTING"] = True
+    return app
+
+
+@pytest.fixture
+def db_session(app):
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([TaskStatusDB(name="in progress"), TaskStatusDB(name="completed")])
+        db.session.commit()
+        yield db.session
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def make_user(db_session):
+    def _make_user(username=None):
+        username = username or f"user_{uuid.uuid4().hex[:8]}"
+        user_db = UserDB(username=username, email=f"{username}@example.com", password="not-a-real-hash")
+        db_session.add(user_db)
+        db_session.commit()
+        return user_db
+    return _make_user
+
+
+@pytest.fixture
+def make_project(db_session, make_user):
+    def _make_project(user_db=None, title="Project", color="#ffffff"):
+        user_db = user_db or make_user()
+        project_db = ProjectDB(title=title, color=color, user_id=user_db.id)
+        db_session.add(project_db)
+        db_session.commit()
+        return project_db
+    return _make_project
+
+
+@pytest.fixture
+def client(app, db_session):
+    return app.test_client()
+
+
+@pytest.fixture
+def login_as(app, client):
+    """Autentica o test client como o UserDB informado (mesmo cookie emitido pelo /auth/login)."""
+    import jwt
+    import datetime
+
+    def _login_as(user_db):
+        token = jwt.encode(
+            {"id": user_db.identificator, "exp": datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=1)},
+            app.config["SECRET_KEY"],
+            algorithm="HS256",
+        )
+        client.set_cookie("auth_token", token)
+        return client
+    return _login_as
@@ -0,0 +1,91 @@
+from datetime import date
+
+import pytest
+
+from app.infra.entities import FocusDailyRollupDB
+from app.infra.repository.focus_daily_rollup_repository import FocusDailyRollupRepository
+from app.models.exceptions import ProjectNotFoundError, ProjectValidationError
+from app.services.analytics_service import AnalyticsService
+from app.services.focus_session_service import FocusSessionService
+
+
+def _rollups(db_session, project_db):
+    rows = db_session.query(FocusDailyRollupDB).filter_by(project_id=project_db.id).order_by(FocusDailyRollupDB.day)
+    return [(r.day, r.seconds) for r in rows]
+
+
+def test_save_focus_session_updates_daily_rollup(db_session, make_project):
+    project_db = make_project()
+    service = FocusSessionService()
+    user_id = project_db.user.identificator
+
+    service.save_focus_session(user_id=user_id, project_id=project_db.identificator, started_at="2025-03-10T23:30:00", duration_seconds=3600)
+    service.save_focus_session(user_id=user_id, project_id=project_db.identificator, started_at="2025-03-11T08:00:00", duration_seconds=600)
+
+    assert _rollups(db_session, project_db) == [(date(2025, 3, 10), 1800), (date(2025, 3, 11), 2400)]
+
+    FocusDailyRollupRepository(db_session).rebuild()
+    db_session.commit()
+    assert _rollups(db_session, project_db) == [(date(2025, 3, 10), 1800), (date(2025, 3, 11), 2400)]
+
+
+def _seed(db_session, make_project):
+    reading = make_project(title="Reading")
+    writing = make_project(user_db=reading.user, title="Writing")
+    db_session.add_all([
+        FocusDailyRollupDB(project_id=reading.id, day=date(2024, 12, 31), seconds=100),  # terça
+        FocusDailyRollupDB(project_id=reading.id, day=date(2025, 1, 4), seconds=200),    # sábado
+        FocusDailyRollupDB(project_id=reading.id, day=date(2025, 1, 5), seconds=300),    # domingo
+        FocusDailyRollupDB(project_id=writing.id, day=date(2025, 2, 1), seconds=400),
+    ])
+    db_session.commit()
+    return reading, writing
+
+
+@pytest.mark.parametrize("granularity, expected", [
+    ("day", [("2024-12-31", 0, 100), ("2025-01-04", 0, 200), ("2025-01-05", 0, 300), ("2025-02-01", 1, 400)]),
+    ("week", [("2024-12-29", 0, 300), ("2025-01-05", 0, 300), ("2025-01-26", 1, 400)]),
+    ("month", [("2024-12-01", 0, 100), ("2025-01-01", 0, 500), ("2025-02-01", 1, 400)]),
+])
+def test_focus_series_is_columnar(db_session, make_project, granularity, expected):
+    reading, _ = _seed(db_session, make_project)
+
+    result = AnalyticsService().get_focus_series(
+        user_id=reading.user.identificator, start="2024-01-01", end="2025-12-31", granularity=granularity)
+
+    assert result["projects"]["title"] == ["Reading", "Writing"]
+    assert list(zip(*result["points"].values())) == expected
+    assert result["rows_scanned"] == 4
+
+
+def test_focus_series_filters_and_validates(db_session, make_project):
+    reading, _ = _seed(db_session, make_project)
+    service = AnalyticsService()
+    user_id = reading.user.identificator
+
+    result = service.get_focus_series(user_id=user_id, start="2025-01-01", end="2025-01-04", project_id=reading.identificator)
+    assert result["points"]["seconds"] == [200]
+
+    with pytest.raises(ProjectValidationError):
+        service.get_focus_series(user_id=user_id, start="2025-01-01", end="2025-01-04", granularity="year")
+    with pytest.raises(ProjectNotFoundError):
+        service.get_focus_series(user_id=make_project().user.identificator, start="2025-01-01", end="2025-01-04", project_id=reading.identificator)
+
+
+def test_focus_series_row_cap(db_session, make_project, monkeypatch):
+    reading, _ = _seed(db_session, make_project)
+    monkeypatch.setattr(AnalyticsService, "MAX_ROWS_SCANNED", 3)
+
+    with pytest.raises(ProjectValidationError):
+        AnalyticsService().get_focus_series(user_id=reading.user.identificator, start="2024-01-01", end="2025-12-31", granularity="month")
+
+
+def test_analytics_route(db_session, make_project, login_as):
+    reading, _ = _seed(db_session, make_project)
+    client = login_as(reading.user)
+
+    response = client.get("/project/analytics?start=2024-01-01&end=2025-12-31&granularity=month")
+    assert response.status_code == 200
+    assert response.get_json()["data"]["points"]["seconds"] == [100, 500, 400]
+
+    assert client.get("/project/analytics?start=2025-01-01&end=bad").status_code == 400
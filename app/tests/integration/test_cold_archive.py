@@ -0,0 +1,100 @@
+import json
+import os
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from app.infra.cold_archive import ColdArchive
+from app.infra.entities import FocusDailyRollupDB, FocusSessionDB
+from app.infra.repository.focus_daily_rollup_repository import FocusDailyRollupRepository
+from app.services.analytics_service import AnalyticsService
+from app.services.export_service import ExportService
+from app.services.focus_session_service import FocusSessionService
+
+HORIZON = datetime(2025, 1, 1)
+
+
+@pytest.fixture
+def archive_dir(app, tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, "COLD_ARCHIVE_DIR", str(tmp_path / "cold"))
+    return str(tmp_path / "cold")
+
+
+def _sessions(db_session, project_db, start, days):
+    for day in range(days):
+        for hour in (9, 14):
+            db_session.add(FocusSessionDB(project_id=project_db.id, started_at=start + timedelta(days=day, hours=hour), duration_seconds=1500))
+    db_session.commit()
+
+
+def _export(user_id):
+    return [json.loads(line) for line in b"".join(ExportService().stream_history(user_id, compress=False, datasets=("focus_sessions",))).splitlines()]
+
+
+def test_archive_moves_old_sessions_and_reads_stay_transparent(db_session, make_project, archive_dir):
+    project_db = make_project()
+    user_id = project_db.user.identificator
+    _sessions(db_session, project_db, datetime(2024, 10, 1), days=92)
+    _sessions(db_session, project_db, datetime(2025, 1, 1), days=10)
+    FocusDailyRollupRepository(db_session).rebuild()
+    db_session.commit()
+    exported_before = _export(user_id)
+    series_before = AnalyticsService().get_focus_series(user_id, "2024-10-01", "2025-01-31", "month")
+
+    result = FocusSessionService().archive_older_than(HORIZON)
+
+    assert result == {"users": 1, "archived": 184}
+    assert db_session.execute(select(func.count()).select_from(FocusSessionDB)).scalar() == 20
+    archive = ColdArchive(archive_dir)
+    assert archive.horizon() == HORIZON and archive.users() == [user_id]
+    assert os.path.getsize(archive.path_for(user_id)) < 184 * 2  # bem menos que 2 bytes por sessão
+    assert _export(user_id) == exported_before
+    assert AnalyticsService().get_focus_series(user_id, "2024-10-01", "2025-01-31", "month") == series_before
+
+    # Leitura por intervalo descarta segmentos e linhas fora da faixa.
+    december = list(archive.iter_sessions(user_id, datetime(2024, 12, 1), datetime(2025, 1, 1)))
+    assert len(december) == 62 and december[0][0] == datetime(2024, 12, 1, 9)
+
+
+def test_sessions_recorded_late_are_appended_as_a_new_segment(db_session, make_project, archive_dir):
+    project_db = make_project()
+    user_id = project_db.user.identificator
+    _sessions(db_session, project_db, datetime(2024, 12, 1), days=2)
+    FocusSessionService().archive_older_than(HORIZON)
+    _sessions(db_session, project_db, datetime(2024, 11, 30), days=3)  # gravadas depois, antes do horizonte
+    FocusSessionService().archive_older_than(HORIZON)
+
+    started = [row[0] for row in ColdArchive(archive_dir).iter_sessions(user_id)]
+    assert len(started) == 10 and started == sorted(started)
+    assert db_session.execute(select(func.count()).select_from(FocusSessionDB)).scalar() == 0
+
+
+def test_failed_commit_rolls_back_archive_file(db_session, make_project, archive_dir, monkeypatch):
+    project_db = make_project()
+    _sessions(db_session, project_db, datetime(2024, 12, 1), days=2)
+    service = FocusSessionService()
+
+    def _fail():
+        raise RuntimeError("commit failed")
+
+    monkeypatch.setattr(service.repo._session, "commit", _fail)
+    with pytest.raises(Exception):
+        service.archive_older_than(HORIZON)
+
+    assert not os.path.exists(ColdArchive(archive_dir).path_for(project_db.user.identificator))
+    assert db_session.execute(select(func.count()).select_from(FocusSessionDB)).scalar() == 4
+
+
+def test_convert_to_utc_keeps_rollups_of_archived_days(db_session, make_project, archive_dir):
+    project_db = make_project()
+    _sessions(db_session, project_db, datetime(2024, 12, 30), days=4)
+    FocusDailyRollupRepository(db_session).rebuild()
+    db_session.commit()
+    FocusSessionService().archive_older_than(HORIZON)
+
+    FocusSessionService().convert_to_utc(from_timezone="Europe/Berlin")
+
+    rollups = dict(db_session.execute(select(FocusDailyRollupDB.day, FocusDailyRollupDB.seconds)).all())
+    assert rollups[date(2024, 12, 30)] == rollups[date(2024, 12, 31)] == 3000
+    assert rollups[date(2025, 1, 2)] == 3000
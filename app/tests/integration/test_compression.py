@@ -0,0 +1,51 @@
+import gzip
+import zlib
+
+from flask import Response, jsonify
+
+from app.services.task_service import TaskService
+from app.utils.compression import compress_response
+from app.utils.metrics import metrics
+
+
+def test_streamed_page_is_gzipped_chunk_by_chunk(db_session, make_project, login_as):
+    project_db = make_project()
+    user_id, project_id = project_db.user.identificator, project_db.identificator
+    for i in range(30):
+        TaskService().create_task(user_id=user_id, project_id=project_id, title=f"Task number {i}")
+    client = login_as(project_db.user)
+    metrics.reset()
+
+    response = client.get(f"/project/{project_id}", headers={"Accept-Encoding": "gzip"}, buffered=False)
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+
+    # Cada chunk sai com flush: o primeiro já descomprime para o início da página.
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    chunks = iter(response.response)
+    assert decompressor.decompress(next(chunks)).startswith(b"<!doctype html>")
+    html = b"".join(decompressor.decompress(chunk) for chunk in chunks)
+    response.close()
+    assert b"Task number 29" in html
+
+    snapshot = metrics.snapshot()
+    assert 0 < snapshot["gauges"]["compression./project/<project_id>.ratio"] < 0.5
+    assert snapshot["timings"]["compression./project/<project_id>.cpu"]["count"] == 1
+
+
+def test_json_is_compressed_only_above_threshold(app, db_session, make_project, login_as):
+    client = login_as(make_project().user)
+
+    small = client.get("/project/analytics?start=2025-01-01&end=2025-01-31", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in small.headers
+    assert "Accept-Encoding" in small.headers["Vary"]
+
+    with app.test_request_context(headers={"Accept-Encoding": "br;q=0.5, gzip;q=1"}):
+        large = compress_response(jsonify({"data": "x" * 2000}), min_size=app.config["COMPRESS_MIN_SIZE"])
+        already_compressed = compress_response(Response(b"\x1f\x8b" * 1000, mimetype="application/gzip"), min_size=0)
+    assert large.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(large.get_data()).startswith(b'{"data":"xxx')
+    assert "Content-Encoding" not in already_compressed.headers
+
+    plain = client.get("/project/analytics?start=2025-01-01&end=2025-01-31")
+    assert "Content-Encoding" not in plain.headers
@@ -0,0 +1,28 @@
+from sqlalchemy import func, select
+
+from app.infra.entities import UserDB, ProjectDB, TaskDB, FocusSessionDB
+from app.tests.testbench.dataset_generator import DatasetSpec, generate_dataset
+from app.tests.testbench.benchmark_suite import summarize
+
+
+def _count(db_session, model):
+    return db_session.execute(select(func.count()).select_from(model)).scalar_one()
+
+
+def test_generate_dataset_populates_requested_shape(db_session):
+    result = generate_dataset(DatasetSpec(users=2, projects_per_user=3, tasks_per_project=4, years=0.1, chunk_size=7))
+
+    assert _count(db_session, UserDB) == 2
+    assert _count(db_session, ProjectDB) == 6
+    assert _count(db_session, TaskDB) == 24
+    assert _count(db_session, FocusSessionDB) == result["counts"]["focus_sessions"] > 0
+    assert result["sample"]["project_identificator"] is not None
+
+
+def test_summarize_reports_percentiles():
+    stats = summarize([5.0, 1.0, 3.0, 2.0, 4.0])
+
+    assert stats["runs"] == 5
+    assert stats["min_ms"] == 1.0
+    assert stats["median_ms"] == 3.0
+    assert stats["max_ms"] == 5.0
@@ -0,0 +1,56 @@
+import csv
+import gzip
+import io
+import json
+from datetime import datetime
+
+from app.infra.entities import FocusSessionDB, TaskDB, TaskStatusDB
+from app.services.export_service import ExportService
+
+
+def _seed(db_session, make_project):
+    project_db = make_project(title="Reading")
+    status_id = db_session.query(TaskStatusDB.id).filter_by(name="completed").scalar()
+    db_session.add_all([
+        FocusSessionDB(project_id=project_db.id, started_at=datetime(2025, 1, 2, 10, 0), duration_seconds=600),
+        FocusSessionDB(project_id=project_db.id, started_at=datetime(2025, 1, 1, 9, 0), duration_seconds=300),
+        TaskDB(project_id=project_db.id, status_id=status_id, title="Chapter 1", created_at=datetime(2025, 1, 1, 8, 0), completed_at=datetime(2025, 1, 3, 8, 0)),
+    ])
+    db_session.commit()
+    return project_db
+
+
+def test_stream_history_ndjson_gzip(db_session, make_project):
+    project_db = _seed(db_session, make_project)
+
+    data = b"".join(ExportService().stream_history(user_id=project_db.user.identificator))
+    records = [json.loads(line) for line in gzip.decompress(data).decode().splitlines()]
+
+    assert [r["record_type"] for r in records] == ["focus_session", "focus_session", "task"]
+    assert records[0]["started_at"] == "2025-01-01T09:00:00"
+    assert records[2]["status"] == "completed"
+
+
+def test_stream_history_csv_small_chunks(db_session, make_project, monkeypatch):
+    project_db = _seed(db_session, make_project)
+    monkeypatch.setattr(ExportService, "CHUNK_SIZE", 16)
+
+    chunks = list(ExportService().stream_history(user_id=project_db.user.identificator, export_format="csv", compress=False))
+    rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode())))
+
+    assert len(chunks) > 1
+    assert [r["record_type"] for r in rows] == ["focus_session", "focus_session", "task"]
+    assert rows[2]["title"] == "Chapter 1"
+    assert rows[0]["duration_seconds"] == "300"
+
+
+def test_export_route(db_session, make_project, login_as):
+    project_db = _seed(db_session, make_project)
+    client = login_as(project_db.user)
+
+    response = client.get("/export/history?format=ndjson&gzip=0")
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    assert len(response.get_data(as_text=True).splitlines()) == 3
+
+    assert client.get("/export/history?format=xml").status_code == 400
@@ -0,0 +1,61 @@
+import pytest
+
+from app.extensions import socketio
+from app.services.focus_group_service import user_groups, group_members
+from app.websocket import presence
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    presence.clear()
+    user_groups.clear()
+    group_members.clear()
+    yield
+    presence.clear()
+
+
+def _received(socket_client, name):
+    return [event["args"][0] for event in socket_client.get_received() if event["name"] == name]
+
+
+def test_presence_only_reaches_group_members(app, make_user, login_as):
+    # O test client é um só; login_as troca o cookie, e cada socket guarda o do momento em que conectou.
+    owner, member, outsider = make_user(), make_user(), make_user()
+    response = login_as(owner).post("/groups/", json={"name": "Equipe"})
+    assert response.status_code == 201
+    group_id = response.get_json()["data"]["identificator"]
+
+    owner_socket = socketio.test_client(app, flask_test_client=login_as(owner))
+    outsider_socket = socketio.test_client(app, flask_test_client=login_as(outsider))
+    member_socket = socketio.test_client(app, flask_test_client=login_as(member))
+
+    # O membro entra no grupo já conectado: a aba aberta passa a ouvir a sala sem reconectar.
+    assert login_as(member).post(f"/groups/{group_id}/join").status_code == 200
+    assert _received(member_socket, "groups_changed")
+
+    owner_socket.emit("enter_focus", {"task_name": "Estudo", "start_time": 1})
+    assert _received(member_socket, "focus_user_joined") == [{owner.identificator: {"start_time": 1, "username": owner.username, "task_name": "Estudo"}}]
+    assert _received(outsider_socket, "focus_user_joined") == []
+
+    outsider_socket.emit("get_focus_users")
+    assert _received(outsider_socket, "update_focus_users") == [{"focused_users": {}}]
+    member_socket.emit("get_focus_users")
+    assert list(_received(member_socket, "update_focus_users")[0]["focused_users"]) == [owner.identificator]
+
+    # Depois de sair, o membro não recebe mais nada do grupo.
+    assert login_as(member).post(f"/groups/{group_id}/leave").status_code == 200
+    member_socket.get_received()
+    owner_socket.emit("leave_focus")
+    assert _received(member_socket, "focus_user_left") == []
+    assert _received(owner_socket, "focus_user_left") == [{"user_id": owner.identificator}]
+
+
+def test_group_api(make_user, login_as):
+    user = make_user()
+    client = login_as(user)
+    assert client.post("/groups/", json={"name": "  "}).status_code == 400
+    assert client.post("/groups/missing/join").status_code == 404
+
+    group_id = client.post("/groups/", json={"name": "Equipe"}).get_json()["data"]["identificator"]
+    login_as(make_user()).post(f"/groups/{group_id}/join")
+    assert login_as(user).get("/groups/").get_json()["data"] == [{"identificator": group_id, "name": "Equipe", "members": 2}]
@@ -0,0 +1,167 @@
+from datetime import datetime, date, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+
+from app.infra.entities import FocusSessionDB, FocusDailyRollupDB
+from app.infra.repository.focus_daily_rollup_repository import FocusDailyRollupRepository
+from app.services.focus_session_service import FocusSessionService
+from app.services.project_service import ProjectService
+
+
+def test_save_focus_session_splits_at_midnight(db_session, make_project):
+    project_db = make_project()
+    service = FocusSessionService()
+
+    service.save_focus_session(
+        user_id=project_db.user.identificator,
+        project_id=project_db.identificator,
+        started_at="2025-03-10T23:45:00.000",
+        duration_seconds=1800,
+    )
+
+    rows = db_session.execute(select(FocusSessionDB).order_by(FocusSessionDB.started_at)).scalars().all()
+    assert [(r.started_at, r.duration_seconds) for r in rows] == [
+        (datetime(2025, 3, 10, 23, 45), 900),
+        (datetime(2025, 3, 11, 0, 0), 900),
+    ]
+
+
+def test_resegment_existing_sessions(db_session, make_project):
+    project_db = make_project()
+    db_session.add_all([
+        FocusSessionDB(project_id=project_db.id, started_at=datetime(2025, 3, 10, 23, 0), duration_seconds=7200),
+        FocusSessionDB(project_id=project_db.id, started_at=datetime(2025, 3, 12, 10, 0), duration_seconds=600),
+    ])
+    db_session.commit()
+
+    result = FocusSessionService().resegment_existing_sessions(batch_size=1)
+
+    assert result["split"] == 1
+    assert result["created"] == 1
+    rows = db_session.execute(select(FocusSessionDB).order_by(FocusSessionDB.started_at)).scalars().all()
+    assert [(r.started_at, r.duration_seconds) for r in rows] == [
+        (datetime(2025, 3, 10, 23, 0), 3600),
+        (datetime(2025, 3, 11, 0, 0), 3600),
+        (datetime(2025, 3, 12, 10, 0), 600),
+    ]
+    assert FocusSessionService().resegment_existing_sessions()["split"] == 0
+
+
+def test_time_summary_and_heatmap_use_day_segments(db_session, make_project):
+    project_db = make_project(title="Deep Work")
+    user_id = project_db.user.identificator
+    today = datetime.now(timezone.utc).date()
+    today_start = datetime.combine(today, datetime.min.time())
+    FocusSessionService().save_focus_session(
+        user_id=user_id,
+        project_id=project_db.identificator,
+        started_at=(today_start - timedelta(minutes=30)).isoformat(),
+        duration_seconds=3600,
+    )
+
+    summary = ProjectService().get_projects_with_time_summary(user_id=user_id)
+    heatmap = ProjectService().get_data_for_last_365_days_home_chart(user_id=user_id)
+
+    assert summary[0]["today_total_minutes"] == 30
+    assert {"date": today.isoformat(), "count": 30} in heatmap
+    assert {"date": (today - timedelta(days=1)).isoformat(), "count": 30} in heatmap
+
+
+def test_time_summary_lists_projects_without_sessions(db_session, make_user, make_project):
+    user_db = make_user()
+    make_project(user_db=user_db, title="B")
+    make_project(user_db=user_db, title="A")
+
+    summary = ProjectService().get_projects_with_time_summary(user_id=user_db.identificator)
+
+    assert [p["title"] for p in summary] == ["A", "B"]
+    assert all(p["week_total_minutes"] == 0 for p in summary)
+
+
+def test_save_focus_session_stores_utc_and_splits_at_local_midnight(db_session, make_user, make_project):
+    user_db = make_user()
+    user_db.timezone = "America/Sao_Paulo"
+    project_db = make_project(user_db=user_db)
+    db_session.commit()
+    service = FocusSessionService()
+
+    # Sem offset: hora local do usuário (UTC-3).
+    service.save_focus_session(user_id=user_db.identificator, project_id=project_db.identificator,
+                               started_at="2025-03-10T22:30:00", duration_seconds=3600)
+    # Com offset: 23:30 local, atravessa a meia-noite local (03:00 UTC).
+    service.save_focus_session(user_id=user_db.identificator, project_id=project_db.identificator,
+                               started_at="2025-03-11T02:30:00Z", duration_seconds=3600)
+
+    rows = db_session.execute(select(FocusSessionDB).order_by(FocusSessionDB.started_at)).scalars().all()
+    assert [(r.started_at, r.duration_seconds) for r in rows] == [
+        (datetime(2025, 3, 11, 1, 30), 3600),
+        (datetime(2025, 3, 11, 2, 30), 1800),
+        (datetime(2025, 3, 11, 3, 0), 1800),
+    ]
+    rollups = db_session.query(FocusDailyRollupDB.day, FocusDailyRollupDB.seconds).order_by(FocusDailyRollupDB.day).all()
+    assert rollups == [(date(2025, 3, 10), 5400), (date(2025, 3, 11), 1800)]
+
+    FocusDailyRollupRepository(db_session).rebuild()
+    assert db_session.query(FocusDailyRollupDB.day, FocusDailyRollupDB.seconds).order_by(FocusDailyRollupDB.day).all() == rollups
+
+
+def test_convert_to_utc(db_session, make_project):
+    project_db = make_project()
+    db_session.add(FocusSessionDB(project_id=project_db.id, started_at=datetime(2025, 7, 1, 9, 0), duration_seconds=600))
+    db_session.commit()
+
+    result = FocusSessionService().convert_to_utc(from_timezone="Europe/Berlin")
+
+    assert result["converted"] == 1
+    assert db_session.execute(select(FocusSessionDB.started_at)).scalar_one() == datetime(2025, 7, 1, 7, 0)
+    db_session.refresh(project_db.user)
+    assert project_db.user.timezone == "Europe/Berlin"
+    assert db_session.query(FocusDailyRollupDB.day, FocusDailyRollupDB.seconds).all() == [(date(2025, 7, 1), 600)]
+
+
+def test_convert_to_utc_resumed_run_keeps_timezone_of_earlier_batches(db_session, make_project, monkeypatch):
+    from app.models.exceptions import DatabaseError
+
+    first, second = make_project(), make_project()
+    for project_db in (first, second):
+        db_session.add(FocusSessionDB(project_id=project_db.id, started_at=datetime(2025, 7, 1, 9, 0), duration_seconds=600))
+    db_session.commit()
+
+    service = FocusSessionService()
+    get_batch = service.repo.get_batch_after_id
+
+    def failing_second_batch(last_id, **kwargs):
+        if last_id:
+            raise DatabaseError("connection lost")
+        return get_batch(last_id=last_id, **kwargs)
+
+    monkeypatch.setattr(service.repo, "get_batch_after_id", failing_second_batch)
+    with pytest.raises(DatabaseError):
+        service.convert_to_utc(from_timezone="Europe/Berlin", batch_size=1)
+    monkeypatch.undo()
+    last_id = db_session.execute(select(FocusSessionDB.id).order_by(FocusSessionDB.id)).scalars().first()
+
+    result = FocusSessionService().convert_to_utc(from_timezone="Europe/Berlin", batch_size=1, start_after_id=last_id)
+
+    assert result["converted"] == 1
+    for project_db in (first, second):
+        db_session.refresh(project_db.user)
+        assert project_db.user.timezone == "Europe/Berlin"
+    assert db_session.execute(select(FocusSessionDB.started_at)).scalars().all() == [datetime(2025, 7, 1, 7, 0)] * 2
+
+
+def test_timezone_change_rebuilds_the_users_rollups(db_session, make_project):
+    from app.services.auth_service import AuthService
+
+    project_db, other_project_db = make_project(), make_project()
+    for project in (project_db, other_project_db):
+        db_session.add(FocusSessionDB(project_id=project.id, started_at=datetime(2025, 7, 1, 23, 30), duration_seconds=600))
+    db_session.commit()
+    FocusDailyRollupRepository(db_session).rebuild()
+    db_session.commit()
+
+    AuthService().update_timezone(user_id=project_db.user.identificator, timezone="Asia/Tokyo")
+
+    rollups = db_session.query(FocusDailyRollupDB.project_id, FocusDailyRollupDB.day).order_by(FocusDailyRollupDB.project_id).all()
+    assert rollups == [(project_db.id, date(2025, 7, 2)), (other_project_db.id, date(2025, 7, 1))]
@@ -0,0 +1,124 @@
+import gzip
+import json
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from app.infra.entities.focus_daily_rollup_db import FocusDailyRollupDB
+from app.infra.entities.job_db import JobDB
+from app.services import job_service as job_module
+from app.services.focus_session_service import FocusSessionService
+from app.services.job_service import JobService, ROLLUP_REFRESH, EXPORT_HISTORY
+
+
+@pytest.fixture
+def queued(app, monkeypatch, tmp_path):
+    """Desliga a execução inline: os trabalhos ficam na tabela até um worker rodar."""
+    monkeypatch.setitem(app.config, "JOBS_RUN_INLINE", False)
+    monkeypatch.setitem(app.config, "EXPORT_DIR", str(tmp_path / "exports"))
+    return JobService()
+
+
+def _rollups(db_session):
+    return db_session.query(FocusDailyRollupDB.day, FocusDailyRollupDB.seconds).order_by(FocusDailyRollupDB.day).all()
+
+
+def test_rollup_refresh_is_deferred_coalesced_and_idempotent(db_session, make_project, queued):
+    project_db = make_project()
+    service = FocusSessionService()
+    for started_at in ("2025-03-10T09:00:00Z", "2025-03-10T14:00:00Z"):
+        service.save_focus_session(user_id=project_db.user.identificator, project_id=project_db.identificator,
+                                   started_at=started_at, duration_seconds=1200)
+
+    assert _rollups(db_session) == []
+    assert queued.stats() == {ROLLUP_REFRESH: {JobDB.QUEUED: 1}}
+
+    assert queued.work("test-worker", burst=True) == 1
+    assert _rollups(db_session) == [(date(2025, 3, 10), 2400)]
+
+    # Reexecutar o mesmo trabalho (worker morto antes do commit) não soma de novo.
+    job = queued.enqueue(ROLLUP_REFRESH, {"project_id": project_db.id, "user_id": project_db.user.identificator,
+                                          "timezone": "UTC", "days": ["2025-03-10"]})
+    db_session.commit()
+    queued.run_next("test-worker")
+    assert job.status == JobDB.DONE and _rollups(db_session) == [(date(2025, 3, 10), 2400)]
+
+
+def test_failures_retry_with_backoff_then_fail(db_session, queued, monkeypatch):
+    calls = []
+
+    def flaky(payload):
+        calls.append(payload)
+        if len(calls) < 2:
+            raise RuntimeError("temporary")
+        return {"ok": True}
+
+    monkeypatch.setitem(job_module.HANDLERS, "test.flaky", flaky)
+    monkeypatch.setitem(job_module.HANDLERS, "test.broken", lambda payload: 1 / 0)
+    flaky_job = queued.enqueue("test.flaky", {"n": 1})
+    broken_job = queued.enqueue("test.broken", max_attempts=2)
+    db_session.commit()
+
+    queued.run_next("w")
+    assert flaky_job.status == JobDB.QUEUED and flaky_job.attempts == 1 and "temporary" in flaky_job.last_error
+    assert flaky_job.run_at > datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(seconds=5)
+    assert queued.run_next("w").id == broken_job.id  # o flaky espera o backoff
+
+    for job in (flaky_job, broken_job):
+        job.run_at = datetime(2000, 1, 1)
+    db_session.commit()
+    queued.work("w", burst=True)
+
+    assert (flaky_job.status, json.loads(flaky_job.result)) == (JobDB.DONE, {"ok": True})
+    assert (broken_job.status, broken_job.attempts) == (JobDB.FAILED, 2)
+    assert queued.retry_failed(kind="test.broken") == 1
+
+
+def test_stale_running_job_is_reclaimed(db_session, queued, monkeypatch):
+    monkeypatch.setitem(job_module.HANDLERS, "test.noop", lambda payload: None)
+    job = queued.enqueue("test.noop")
+    job.status, job.attempts, job.locked_by, job.locked_at = JobDB.RUNNING, 1, "dead-worker", datetime(2000, 1, 1)
+    db_session.commit()
+
+    assert queued.run_next("w").id == job.id
+    assert (job.status, job.attempts) == (JobDB.DONE, 2)
+
+
+def test_history_export_runs_as_a_job(db_session, make_project, login_as, queued):
+    project_db = make_project()
+    FocusSessionService().save_focus_session(user_id=project_db.user.identificator, project_id=project_db.identificator,
+                                             started_at="2025-03-10T09:00:00Z", duration_seconds=600)
+    client = login_as(project_db.user)
+
+    response = client.post("/export/history/jobs?include=focus_sessions")
+    assert response.status_code == 202
+    job_id = response.get_json()["data"]["job_id"]
+    assert client.get(f"/export/jobs/{job_id}/download").status_code == 409
+
+    queued.work("w", burst=True)
+
+    status = client.get(f"/export/jobs/{job_id}").get_json()["data"]
+    assert status["status"] == JobDB.DONE
+    download = client.get(status["download_url"])
+    records = [json.loads(line) for line in gzip.decompress(download.data).splitlines()]
+    download.close()
+    assert [r["duration_seconds"] for r in records] == [600]
+
+    other = login_as(make_project().user)
+    assert other.get(f"/export/jobs/{job_id}").status_code == 404
+
+
+def test_inline_jobs_leave_no_rows_unless_tracked(app, db_session, make_project, login_as, monkeypatch, tmp_path):
+    monkeypatch.setitem(app.config, "EXPORT_DIR", str(tmp_path / "exports"))
+    project_db = make_project()
+    for started_at in ("2025-03-10T09:00:00Z", "2025-03-11T09:00:00Z", "2025-03-12T09:00:00Z"):
+        FocusSessionService().save_focus_session(user_id=project_db.user.identificator, project_id=project_db.identificator,
+                                                 started_at=started_at, duration_seconds=600)
+
+    assert _rollups(db_session) == [(date(2025, 3, 10), 600), (date(2025, 3, 11), 600), (date(2025, 3, 12), 600)]
+    assert db_session.query(JobDB).count() == 0
+
+    # A exportação devolve o id do trabalho para consulta, então ela é gravada mesmo inline.
+    response = login_as(project_db.user).post("/export/history/jobs?include=focus_sessions")
+    assert JobService().stats() == {EXPORT_HISTORY: {JobDB.DONE: 1}}
+    assert JobService().get(response.get_json()["data"]["job_id"]).status == JobDB.DONE
@@ -0,0 +1,48 @@
+from datetime import datetime
+
+from app.utils import json_provider
+from app.utils.metrics import metrics
+
+
+def test_task_endpoints_serialize_domain_objects(db_session, make_project, login_as):
+    project_db = make_project()
+    client = login_as(project_db.user)
+    metrics.reset()
+
+    response = client.post(f"/task/{project_db.identificator}/create_task", json={"title": "Write report"})
+    assert response.status_code == 201
+    body = response.get_json()
+    assert body["success"] is True and body["error"] is None
+    task = body["data"]
+    assert (task["title"], task["status"], task["completed_at"]) == ("Write report", "in progress", None)
+    # Mesmo formato de data que o Flask usava (o front-end faz new Date(...)).
+    assert task["created_at"].endswith(" GMT")
+
+    response = client.put(f"/task/{project_db.identificator}/change_status/{task['id']}", json={"status": "completed"})
+    assert response.get_json()["data"]["status"] == "completed"
+    assert response.get_json()["data"]["completed_at"].endswith(" GMT")
+
+    timings = metrics.snapshot()["timings"]
+    assert timings["json.serialize./task/<project_id>/create_task"]["count"] == 1
+
+
+def test_error_envelope(db_session, make_project, login_as):
+    client = login_as(make_project().user)
+
+    response = client.put("/task/unknown-project/change_status/unknown-task", json={})
+    assert response.status_code == 400
+    assert response.get_json() == {
+        "success": False,
+        "message": "Missing 'status' field in request data.",
+        "data": None,
+        "error": {"code": 400, "type": "ValueError", "details": "Missing 'status' field in request data."},
+    }
+
+
+def test_stdlib_fallback_matches_orjson_format(app, monkeypatch):
+    payload = {"when": datetime(2025, 3, 10, 8, 30), "name": "ação", 1: [1.5, None]}
+    expected = '{"when":"Mon, 10 Mar 2025 08:30:00 GMT","name":"ação","1":[1.5,null]}\n'
+
+    monkeypatch.setattr(json_provider, "orjson", None)
+    with app.test_request_context():
+        assert app.json.response(payload).get_data(as_text=True) == expected
@@ -0,0 +1,70 @@
+import pytest
+
+from app.services import leaderboard_service
+from app.services.focus_group_service import FocusGroupService, user_groups, group_members
+from app.services.focus_session_service import FocusSessionService
+from app.utils.timezones import local_today
+
+
+@pytest.fixture(autouse=True)
+def clean_state(app):
+    leaderboard_service._backend = None
+    user_groups.clear()
+    group_members.clear()
+    yield
+    leaderboard_service._backend = None
+
+
+def _focus(project_db, seconds):
+    today = local_today(project_db.user.timezone)
+    FocusSessionService().save_focus_session(user_id=project_db.user.identificator, project_id=project_db.identificator,
+                                             started_at=f"{today.isoformat()}T00:05:00", duration_seconds=seconds)
+
+
+def test_leaderboard_is_rebuilt_from_rollups_then_updated_on_save(db_session, make_project, login_as):
+    first, second = make_project(), make_project()
+    _focus(first, 600)
+    _focus(second, 1200)
+
+    client = login_as(first.user)
+    data = client.get("/leaderboard/?period=day").get_json()["data"]
+    assert [(e["user_id"], e["seconds"]) for e in data["entries"]] == [(second.user.identificator, 1200), (first.user.identificator, 600)]
+    assert data["entries"][0]["username"] == second.user.username
+    assert data["me"]["rank"] == 2
+
+    # Com o índice já montado, a próxima sessão só atualiza a pontuação do dono.
+    _focus(first, 900)
+    data = client.get("/leaderboard/?period=week").get_json()["data"]
+    assert data["entries"][0] == {"rank": 1, "user_id": first.user.identificator, "seconds": 1500,
+                                  "time": "00h25m", "username": first.user.username}
+    data = client.get("/leaderboard/?period=day").get_json()["data"]
+    assert data["me"]["rank"] == 1 and data["me"]["seconds"] == 1500
+
+    assert client.get("/leaderboard/?period=year").status_code == 400
+
+
+def test_group_leaderboard_only_ranks_members(db_session, make_project, login_as):
+    member, outsider = make_project(), make_project()
+    _focus(member, 300)
+    _focus(outsider, 3000)
+    group = FocusGroupService().create_group(name="Equipe", user_id=member.user.identificator)
+
+    client = login_as(member.user)
+    data = client.get(f"/leaderboard/?group={group['identificator']}").get_json()["data"]
+    assert [e["user_id"] for e in data["entries"]] == [member.user.identificator]
+    assert login_as(outsider.user).get(f"/leaderboard/?group={group['identificator']}").status_code == 404
+
+
+def test_web_index_follows_new_sessions_when_jobs_run_in_a_worker(app, db_session, make_project, login_as, monkeypatch):
+    project_db = make_project()
+    _focus(project_db, 600)
+    client = login_as(project_db.user)
+    for period in ("day", "week"):
+        assert client.get(f"/leaderboard/?period={period}").get_json()["data"]["me"]["seconds"] == 600
+
+    # Sem inline o rollup fica na fila (o worker atualizaria só o índice dele); o processo web soma a sessão.
+    monkeypatch.setitem(app.config, "JOBS_RUN_INLINE", False)
+    _focus(project_db, 300)
+
+    for period in ("day", "week"):
+        assert client.get(f"/leaderboard/?period={period}").get_json()["data"]["me"]["seconds"] == 900
@@ -0,0 +1,49 @@
+import json
+import os
+
+from sqlalchemy import func, select
+
+from app.infra.entities import UserDB, ProjectDB, TaskDB, FocusSessionDB
+from app.infra.importers import LegacyJsonImporter
+
+LEGACY_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "infra", "repository", "database")
+
+
+def _count(db_session, model):
+    return db_session.execute(select(func.count()).select_from(model)).scalar_one()
+
+
+def _load(name):
+    with open(os.path.join(LEGACY_DIR, name)) as f:
+        return json.load(f)
+
+
+def test_import_legacy_store(db_session, tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+    stats = LegacyJsonImporter(source_dir=LEGACY_DIR, batch_size=5, checkpoint_path=str(checkpoint)).run()
+
+    users, projects, todos = _load("user.json"), _load("task.json"), _load("todo.json")
+    days = sum(len(p["seconds_in_focus_per_day"]) for p in projects)
+    assert _count(db_session, UserDB) == stats.users == len(users)
+    assert _count(db_session, ProjectDB) == stats.projects == len(projects)
+    assert _count(db_session, TaskDB) == stats.tasks
+    assert stats.tasks + stats.skipped["tasks"] == len(todos)
+    assert _count(db_session, FocusSessionDB) == stats.focus_sessions >= days
+    assert json.loads(checkpoint.read_text()) == {"user.json": len(users), "task.json": len(projects), "todo.json": len(todos)}
+
+    project_db = db_session.execute(select(ProjectDB).where(ProjectDB.title == projects[0]["title"])).scalars().first()
+    assert len(project_db.identificator) == 36
+
+
+def test_import_is_resumable_and_idempotent(db_session, tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+    LegacyJsonImporter(source_dir=LEGACY_DIR, batch_size=4, checkpoint_path=str(checkpoint)).run()
+    sessions = _count(db_session, FocusSessionDB)
+
+    resumed = LegacyJsonImporter(source_dir=LEGACY_DIR, batch_size=4, checkpoint_path=str(checkpoint)).run()
+    assert (resumed.users, resumed.projects, resumed.tasks, resumed.focus_sessions) == (0, 0, 0, 0)
+
+    os.remove(checkpoint)
+    restarted = LegacyJsonImporter(source_dir=LEGACY_DIR, batch_size=4, checkpoint_path=str(checkpoint)).run()
+    assert (restarted.users, restarted.projects, restarted.tasks) == (0, 0, 0)
+    assert _count(db_session, FocusSessionDB) == sessions
@@ -0,0 +1,64 @@
+import pytest
+
+from app.services.task_service import TaskService
+from app.utils.fragment_cache import HIT, MISS, fragment_cache
+from app.utils.metrics import metrics
+
+
+@pytest.fixture(autouse=True)
+def _empty_fragment_cache():
+    fragment_cache.clear()
+    metrics.reset()
+    yield
+    fragment_cache.clear()
+
+
+def _grids(html):
+    """(trecho da lista em andamento, trecho da lista de concluídas)."""
+    in_progress, completed = html.split('id="taskGridCompleted"')
+    return in_progress.split('id="taskGridInProgress"')[1], completed
+
+
+def test_project_room_streams_and_splits_tasks(db_session, make_project, login_as):
+    project_db = make_project()
+    user_id, project_id = project_db.user.identificator, project_db.identificator
+    service = TaskService()
+    service.create_task(user_id=user_id, project_id=project_id, title="Write report")
+    done = service.create_task(user_id=user_id, project_id=project_id, title="Read paper")
+    service.change_task_status(user_id=user_id, project_id=project_id, task_id=done.identificator, target_status_name="completed")
+    client = login_as(project_db.user)
+
+    response = client.get(f"/project/{project_id}")
+    assert response.status_code == 200
+    assert response.is_streamed
+    html = response.get_data(as_text=True)
+    in_progress, completed = _grids(html)
+    assert "Write report" in in_progress and "Read paper" not in in_progress
+    assert "<del>Read paper</del>" in completed
+    assert metrics.counter(MISS) == 2
+
+    assert client.get(f"/project/{project_id}").get_data(as_text=True) == html
+    assert metrics.counter(HIT) == 2
+
+    # Mudança nas tarefas muda a versão: os fragmentos são renderizados de novo.
+    service.change_task_status(user_id=user_id, project_id=project_id, task_id=done.identificator, target_status_name="in progress")
+    html = client.get(f"/project/{project_id}").get_data(as_text=True)
+    assert "Read paper" in _grids(html)[0]
+    assert metrics.counter(MISS) == 4
+
+    timings = metrics.snapshot()["timings"]
+    assert timings["render.project_room.html.ttfb"]["count"] == 3
+    assert timings["render.project_room.html.cpu"]["count"] == 3
+
+
+def test_my_projects_cards_are_cached(db_session, make_project, login_as):
+    project_db = make_project(title="Reading")
+    make_project(user_db=project_db.user, title="Writing")
+    client = login_as(project_db.user)
+
+    first = client.get("/project/").get_data(as_text=True)
+    second = client.get("/project/").get_data(as_text=True)
+
+    assert first == second
+    assert 'data-id="%s"' % project_db.identificator in first and "<h3 class=\"text-break\">Writing</h3>" in first
+    assert (metrics.counter(MISS), metrics.counter(HIT)) == (2, 2)
@@ -0,0 +1,127 @@
+import os
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event, func, inspect, select, text
+from sqlalchemy.orm import Session
+
+from app.infra.db import db
+from app.infra.entities.focus_daily_rollup_db import FocusDailyRollupDB
+from app.infra.entities.focus_session_db import FocusSessionDB
+from app.infra.partitioning import FocusSessionPartitions, add_months, period_table_name
+from app.infra.repository.focus_daily_rollup_repository import FocusDailyRollupRepository
+from app.infra.repository.focus_session_repository import FocusSessionRepository
+
+INDEX = "ix_focus_sessions_project_id_started_at"
+TODAY = date(2025, 6, 15)
+
+
+@pytest.fixture
+def partitions(db_session):
+    yield FocusSessionPartitions(db_session)
+    # As tabelas de período não estão no metadata, então o drop_all do db_session não as remove.
+    for month in FocusSessionPartitions(db_session).detached_months():
+        db_session.execute(text(f"DROP TABLE {period_table_name(month)}"))
+    db_session.commit()
+
+
+def _add_sessions(db_session, project_db, months=6, per_month=3):
+    for offset in range(months):
+        month = add_months(date(TODAY.year, TODAY.month, 1), -offset)
+        for i in range(per_month):
+            db_session.add(FocusSessionDB(project_id=project_db.id, started_at=datetime(month.year, month.month, 2 + i, 10), duration_seconds=600))
+    db_session.commit()
+
+
+def test_detach_moves_old_months_and_keeps_their_rollups(db_session, make_project, partitions):
+    project_db = make_project()
+    _add_sessions(db_session, project_db)
+    FocusDailyRollupRepository(db_session).rebuild()
+    db_session.commit()
+    rollup_seconds = db_session.execute(select(func.sum(FocusDailyRollupDB.seconds))).scalar()
+
+    detached = partitions.detach_older_than(keep_months=3, today=TODAY)
+    db_session.commit()
+
+    assert detached == [period_table_name(date(2025, 1, 1)), period_table_name(date(2025, 2, 1)), period_table_name(date(2025, 3, 1))]
+    assert partitions.live_since() == date(2025, 4, 1)
+    assert db_session.execute(select(func.count()).select_from(FocusSessionDB)).scalar() == 9
+    assert db_session.execute(text(f"SELECT COUNT(*) FROM {detached[0]}")).scalar() == 3
+    assert any(index["name"].endswith("_project_id_started_at") for index in inspect(db_session.connection()).get_indexes(detached[0]))
+
+    # Rodar de novo não duplica nada; rebuild parcial preserva os dias destacados.
+    assert partitions.detach_older_than(keep_months=3, today=TODAY) == []
+    FocusDailyRollupRepository(db_session).rebuild(since=partitions.live_since() + timedelta(days=1))
+    db_session.commit()
+    assert db_session.execute(select(func.sum(FocusDailyRollupDB.seconds))).scalar() == rollup_seconds
+
+
+def test_detached_months_stay_in_export_and_go_away_with_the_project(db_session, make_project, partitions):
+    from app.infra.repository.project_repository import ProjectRepository
+    from app.services.export_service import ExportService
+
+    project_db = make_project()
+    user_id, project_id = project_db.user.identificator, project_db.identificator
+    _add_sessions(db_session, project_db, per_month=1)
+    partitions.detach_older_than(keep_months=2, today=TODAY)
+    db_session.commit()
+
+    records = list(ExportService().iter_records(user_id, datasets=("focus_sessions",)))
+    assert [record["started_at"][:7] for record in records] == ["2025-01", "2025-02", "2025-03", "2025-04", "2025-05", "2025-06"]
+
+    assert ProjectRepository(db_session).delete(project_identificator=project_id, user_identificator=user_id)
+    db_session.commit()
+    assert all(db_session.execute(text(f"SELECT COUNT(*) FROM {period_table_name(month)}")).scalar() == 0
+               for month in partitions.detached_months())
+    assert list(ExportService().iter_records(user_id, datasets=("focus_sessions",))) == []
+
+
+def test_hot_queries_search_started_at_range_in_index(app, db_session, make_project):
+    project_db = make_project()
+    _add_sessions(db_session, project_db)
+    repo = FocusSessionRepository(db_session)
+    start, end = datetime(2025, 6, 1), datetime(2025, 6, 16)
+
+    statements = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if "focus_sessions" in statement:
+            statements.append((statement, parameters))
+
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", _capture)
+    try:
+        assert len(repo.get_by_project_in_range(project_db.identificator, start, end)) == 3
+        assert repo.sum_duration_by_project(project_db.identificator, start, end) == 1800
+        repo.get_time_summary_by_user(project_db.user.identificator, today_start=start, week_start=start, end=end)
+    finally:
+        event.remove(engine, "before_cursor_execute", _capture)
+
+    assert len(statements) == 3
+    for statement, parameters in statements:
+        plan = " | ".join(row[-1] for row in db_session.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters))
+        focus_step = next(step for step in plan.split(" | ") if "focus_sessions" in step)
+        assert focus_step.startswith("SEARCH") and INDEX in focus_step and "started_at>" in focus_step, plan
+
+
+@pytest.mark.skipif(not os.getenv("MYSQL_TEST_DATABASE_URI"), reason="MYSQL_TEST_DATABASE_URI não definido")
+def test_mysql_ranged_queries_prune_partitions(app):
+    engine = create_engine(os.environ["MYSQL_TEST_DATABASE_URI"])
+    db.metadata.drop_all(engine)
+    db.metadata.create_all(engine)
+    try:
+        with Session(engine) as session:
+            partitions = FocusSessionPartitions(session)
+            assert partitions.ensure(months_ahead=2, today=TODAY)[-1] == "p202508"
+            session.commit()
+            plan = session.execute(text(
+                "EXPLAIN SELECT SUM(duration_seconds) FROM focus_sessions "
+                "WHERE project_id = 1 AND started_at >= '2025-06-01' AND started_at < '2025-06-16'"
+            )).mappings().one()
+            assert plan["partitions"] == "p202506"
+    finally:
+        with engine.begin() as connection:
+            for name in inspect(connection).get_table_names():
+                if name.startswith("focus_sessions_p"):
+                    connection.execute(text(f"DROP TABLE {name}"))
+        db.metadata.drop_all(engine)
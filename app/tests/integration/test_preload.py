@@ -0,0 +1,32 @@
+from app.routes import task_routes
+from app.services import task_service
+from app.tests.query_budget import QueryCounter
+from app.utils.preload import preload
+
+
+def test_preload_warms_controllers_statements_templates_and_statuses(app, db_session):
+    task_service._status_cache.clear()
+
+    result = preload(app)
+
+    assert result["controllers"] > 0 and task_routes.task_controller.loaded
+    assert result["statements"] > 0
+    assert result["templates"] > 0
+    assert result["task_statuses"] == 2
+    assert set(task_service._status_cache) == {"in progress", "completed"}
+    task_service._status_cache.clear()
+
+
+def test_cached_status_saves_the_lookup_when_creating_tasks(app, client, make_project, login_as, db_session):
+    project_db = make_project()
+    login_as(project_db.user)
+    task_service._status_cache.clear()
+    with app.app_context():
+        task_service.TaskService().warm_status_cache()
+
+    with QueryCounter() as queries:
+        response = client.post(f"/task/{project_db.identificator}/create_task", json={"title": "Warm"})
+
+    assert response.status_code == 201, response.get_data(as_text=True)
+    assert not any("FROM task_status WHERE task_status.name" in sql for sql in queries.statements)
+    task_service._status_cache.clear()
@@ -0,0 +1,46 @@
+import time
+
+import pytest
+
+from app.utils.profiler import profiler
+
+
+@pytest.fixture
+def admin(app, make_user, monkeypatch, tmp_path):
+    user = make_user()
+    monkeypatch.setitem(app.config, "ADMIN_USER_IDS", {user.identificator})
+    monkeypatch.setitem(app.config, "PROFILE_DIR", str(tmp_path))
+    yield user
+    profiler.disarm()
+
+
+def test_profiler_is_admin_only(admin, make_user, login_as):
+    response = login_as(make_user(username=admin.identificator)).post("/admin/profiler", json={"requests": 1})
+    assert response.status_code == 404 and response.get_json()["error"]["type"] == "NotFound"
+    assert login_as(admin).post("/admin/profiler", json={}).status_code == 400
+    assert not profiler.armed
+
+
+def test_profiles_next_matching_requests_then_disarms(admin, login_as, monkeypatch):
+    from app.routes import metrics_routes
+
+    def slow_metrics():
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            pass
+        return "ok"
+
+    monkeypatch.setattr(metrics_routes.metrics_controller, "get_metrics", slow_metrics)
+    client = login_as(admin)
+    response = client.post("/admin/profiler", json={"route": "metrics.metrics_route", "requests": 1, "interval_ms": 1})
+    assert response.get_json()["data"]["armed"] is True
+
+    client.get("/leaderboard/")  # não casa com o filtro
+    client.get("/metrics/")
+    assert not profiler.armed
+
+    profiles = client.get("/admin/profiler").get_json()["data"]["profiles"]
+    assert len(profiles) == 1 and "metrics.metrics_route" in profiles[0]
+    folded = client.get(f"/admin/profiler/profiles/{profiles[0]}").get_data(as_text=True)
+    stack, count = folded.splitlines()[0].rsplit(" ", 1)
+    assert stack.endswith("test_profiler:slow_metrics") and int(count) > 0
@@ -0,0 +1,156 @@
+# Orçamento de SQL por rota: quantos statements cada endpoint pode executar com um usuário de tamanho médio
+# (3 projetos, 3 tarefas e 3 sessões por projeto, um grupo, uma exportação). Uma mudança que adicione consultas
+# (ou um N+1 que cresça com o número de projetos/tarefas) falha aqui com a lista de statements.
+#
+# Toda rota registrada precisa estar em BUDGETS; ao criar uma rota, meça e declare o orçamento dela.
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+import pytest
+from sqlalchemy import text
+
+from app.infra.entities import TaskDB, TaskStatusDB
+from app.services.export_service import ExportService
+from app.services.focus_group_service import FocusGroupService, user_groups, group_members
+from app.services.focus_session_service import FocusSessionService
+from app.services import leaderboard_service
+from app.tests.query_budget import QueryBudgetExceeded, QueryCounter
+from app.utils.timezones import local_today
+
+PASSWORD = "Budget#Pass123"
+
+
+@dataclass
+class Case:
+    method: str
+    path: str
+    statements: int
+    json: Optional[dict] = None
+    login: bool = True
+    max_repeats: int = 1  # quantas vezes o mesmo SQL pode aparecer (login_required + controller leem o usuário)
+    setup: Optional[Callable[[Any, dict], None]] = None
+
+
+def _register(client, scenario):
+    client.post("/auth/register/create_account", json={"email": "budget@example.com", "username": "budget_user", "password": PASSWORD})
+
+
+BUDGETS = {
+    "home.home": Case("GET", "/", 0, login=False),
+    "auth.login_route": Case("POST", "/auth/login", 1, json={"email": "budget@example.com", "password": PASSWORD},
+                             login=False, setup=_register),
+    "auth.register_route": Case("GET", "/auth/register", 0, login=False),
+    "auth.create_account_route": Case("POST", "/auth/register/create_account", 3, login=False,
+                                      json={"email": "new@example.com", "username": "new_user", "password": PASSWORD}),
+    # Trocar de fuso recalcula os rollups do usuário (job inline).
+    "auth.update_timezone_route": Case("PUT", "/auth/timezone", 8, json={"timezone": "America/Sao_Paulo"}),
+    "auth.logout_route": Case("POST", "/auth/logout", 1),
+    "project.projects_route": Case("GET", "/project/", 3),
+    # Conhecido: o repository busca de novo o usuário que o login_required já carregou.
+    "project.create_project_route": Case("POST", "/project/create_project", 3, json={"title": "New", "color": "#000000"},
+                                         max_repeats=2),
+    "project.get_data_for_last_365_days_home_chart_route": Case("GET", "/project/get_data_for_last_365_days_home_chart", 3),
+    "project.analytics_route": Case("GET", "/project/analytics?start={week_ago}&end={today}", 2),
+    "project.project_room_route": Case("GET", "/project/{project}", 5),
+    "task.create_task_route": Case("POST", "/task/{project}/create_task", 6, json={"title": "New task"}),
+    # Conhecido: Task.from_orm carrega projeto, usuário e status um a um, e o update relê a tarefa.
+    "task.change_task_status_route": Case("PUT", "/task/{project}/change_status/{task}", 10, json={"status": "completed"},
+                                          max_repeats=2),
+    "task.delete_task_route": Case("DELETE", "/task/{project}/delete/{task}", 7),
+    "focus_session.focus_session_save_route": Case("POST", "/focus_session/save", 6,
+                                                   json={"project_id": "{project}", "started_at": "{today}T08:00:00Z", "duration_seconds": 600}),
+    "export.export_history_route": Case("GET", "/export/history?gzip=0", 4),
+    "export.request_history_export_route": Case("POST", "/export/history/jobs", 8),
+    "export.export_job_route": Case("GET", "/export/jobs/{job}", 2),
+    "export.export_job_download_route": Case("GET", "/export/jobs/{job}/download", 2),
+    "metrics.metrics_route": Case("GET", "/metrics/", 1),
+    "focus_groups.my_groups_route": Case("GET", "/groups/", 2),
+    "focus_groups.create_group_route": Case("POST", "/groups/", 5, json={"name": "Outro"}),
+    "focus_groups.join_group_route": Case("POST", "/groups/{group}/join", 5),
+    "focus_groups.leave_group_route": Case("POST", "/groups/{group}/leave", 5),
+    "leaderboard.leaderboard_route": Case("GET", "/leaderboard/?period=week", 4),
+    "admin.profiler_status_route": Case("GET", "/admin/profiler", 1),
+    "admin.profiler_arm_route": Case("POST", "/admin/profiler", 1, json={"requests": 1, "route": "nothing"}),
+    "admin.profiler_disarm_route": Case("DELETE", "/admin/profiler", 1),
+    "admin.profiler_download_route": Case("GET", "/admin/profiler/profiles/missing.folded", 1),
+}
+
+
+@pytest.fixture
+def scenario(app, db_session, make_user, make_project, monkeypatch, tmp_path):
+    monkeypatch.setitem(app.config, "EXPORT_DIR", str(tmp_path / "exports"))
+    monkeypatch.setitem(app.config, "PROFILE_DIR", str(tmp_path / "profiles"))
+    leaderboard_service._backend = None
+    user_groups.clear()
+    group_members.clear()
+
+    user = make_user()
+    monkeypatch.setitem(app.config, "ADMIN_USER_IDS", {user.identificator})
+    status_id = db_session.query(TaskStatusDB.id).filter_by(name="in progress").scalar()
+    today = local_today(user.timezone)
+    projects = [make_project(user_db=user, title=f"Project {i}") for i in range(3)]
+    for project_db in projects:
+        for i in range(3):
+            db_session.add(TaskDB(title=f"Task {i}", project_id=project_db.id, status_id=status_id, created_at=datetime(2026, 1, 1)))
+            FocusSessionService().save_focus_session(user_id=user.identificator, project_id=project_db.identificator,
+                                                     started_at=f"{today.isoformat()}T0{i + 1}:00:00Z", duration_seconds=300)
+    db_session.commit()
+
+    other = make_user()
+    group = FocusGroupService().create_group(name="Equipe", user_id=other.identificator)
+    FocusGroupService().join_group(group_identificator=group["identificator"], user_id=user.identificator)
+    job = ExportService().request_export(user_id=user.identificator, export_format="ndjson", compress=False, datasets=("tasks",))
+    db_session.commit()
+
+    task = db_session.query(TaskDB).filter_by(project_id=projects[0].id).first()
+    yield {"user": user, "project": projects[0].identificator, "task": task.identificator, "group": group["identificator"],
+           "job": job.id, "today": today.isoformat(), "week_ago": (today.replace(day=1)).isoformat()}
+    leaderboard_service._backend = None
+
+
+def _format(value, scenario):
+    if isinstance(value, str):
+        return value.format(**scenario)
+    if isinstance(value, dict):
+        return {key: _format(item, scenario) for key, item in value.items()}
+    return value
+
+
+def test_every_route_has_a_budget(app):
+    endpoints = {rule.endpoint for rule in app.url_map.iter_rules() if rule.endpoint != "static"}
+    assert sorted(endpoints - set(BUDGETS)) == []
+    assert sorted(set(BUDGETS) - endpoints) == []
+
+
+@pytest.mark.parametrize("endpoint", sorted(BUDGETS))
+def test_route_stays_within_query_budget(endpoint, app, client, login_as, scenario, db_session):
+    case = BUDGETS[endpoint]
+    if case.login:
+        login_as(scenario["user"])
+    if case.setup:
+        case.setup(client, scenario)
+    # Sem isso a requisição acharia no identity map os objetos criados pelo cenário, escondendo lazy loads.
+    db_session.expunge_all()
+
+    with QueryCounter() as queries:
+        response = client.open(_format(case.path, scenario), method=case.method, json=_format(case.json, scenario))
+        response.get_data()  # respostas em streaming só consultam enquanto o corpo é gerado
+    response.close()
+
+    assert response.status_code < 500, response.get_data(as_text=True)[:500]
+    queries.assert_within(statements=case.statements, max_repeats=case.max_repeats, label=endpoint)
+
+
+def test_repeated_statements_fail_with_the_offending_sql(db_session, make_user):
+    identificators = [make_user().identificator for _ in range(3)]
+
+    with QueryCounter() as queries:
+        for identificator in identificators:
+            db_session.execute(text("SELECT username FROM users WHERE identificator = :id"), {"id": identificator})
+
+    with pytest.raises(QueryBudgetExceeded) as error:
+        queries.assert_within(statements=5, label="lookup")
+    assert "[3x] SELECT username FROM users WHERE identificator = ?" in str(error.value)
+    assert "possible N+1" in str(error.value)
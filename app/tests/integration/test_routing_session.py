@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+
+import pytest
+from flask import Flask, request
+
+from app.infra.db import db
+from app.infra.entities import UserDB
+from app.infra.repository.user_repository import UserRepository
+from app.infra.routing_session import forget_recent_writes
+
+
+@pytest.fixture
+def replicated_app(tmp_path):
+    """App isolado com dois SQLite: primário e "réplica" (sem replicação, para saber de onde veio cada leitura)."""
+    app = Flask("replicated")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'primary.db'}"
+    app.config["SQLALCHEMY_BINDS"] = {"replica": f"sqlite:///{tmp_path / 'replica.db'}"}
+    app.config["READ_YOUR_WRITES_SECONDS"] = 0
+    had_replica_metadata = "replica" in db.metadatas
+    db.init_app(app)
+    with app.app_context():
+        db.metadata.create_all(db.engines[None])
+        db.metadata.create_all(db.engines["replica"])
+        yield app
+        db.session.remove()
+    forget_recent_writes()
+    # init_app registra um MetaData para cada bind; o app dos outros testes não tem o bind "replica".
+    if not had_replica_metadata:
+        db.metadatas.pop("replica", None)
+
+
+def _add_user(username):
+    db.session.add(UserDB(identificator=username, username=username, email=f"{username}@example.com", password="x"))
+
+
+def test_reads_go_to_replica_and_writes_to_primary(replicated_app):
+    _add_user("alice")
+    db.session.commit()
+    db.session.remove()
+
+    # Só existe no primário: a leitura marcada como read_only consulta a réplica.
+    assert UserRepository().get_by_id("alice") is None
+    assert db.session.execute(db.select(UserDB.username)).scalars().all() == ["alice"]
+
+
+def test_reads_inside_write_transaction_use_primary(replicated_app):
+    _add_user("bob")
+    db.session.flush()
+
+    assert UserRepository().get_by_id("bob").username == "bob"
+    db.session.rollback()
+
+
+def test_read_your_writes_window(replicated_app):
+    replicated_app.config["READ_YOUR_WRITES_SECONDS"] = 60
+    with replicated_app.test_request_context():
+        request.current_user = SimpleNamespace(identificator="carol")
+        _add_user("carol")
+        db.session.commit()
+
+        assert UserRepository().get_by_id("carol").username == "carol"
+
+    with replicated_app.test_request_context():
+        request.current_user = SimpleNamespace(identificator="someone-else")
+        assert UserRepository().get_by_id("carol") is None
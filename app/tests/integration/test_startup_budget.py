@@ -0,0 +1,50 @@
+# Orçamento de boot: o que `import app; app.create_app()` importa num processo limpo.
+# STARTUP_IMPORT_BUDGET_MS ajusta o limite de tempo para máquinas mais lentas (CI compartilhado).
+
+import os
+
+import pytest
+
+from app.routes import metrics_routes
+from app.tests.testbench.import_report import measure, parse_importtime, total_ms
+
+BUDGET_MS = float(os.getenv("STARTUP_IMPORT_BUDGET_MS", "3000"))
+# Não é usado para atender requisições; se voltar a aparecer no boot, algum import puxou de novo.
+NOT_AT_BOOT = ("pydoc",)
+
+
+@pytest.fixture(scope="module")
+def boot_imports():
+    return measure()
+
+
+def test_boot_stays_within_import_budget(boot_imports):
+    assert total_ms(boot_imports) < BUDGET_MS
+
+
+def test_boot_does_not_import_controllers_or_unneeded_modules(boot_imports):
+    modules = {cost.module for cost in boot_imports}
+    assert sorted(m for m in modules if m.startswith("app.controllers")) == []
+    assert sorted(modules.intersection(NOT_AT_BOOT)) == []
+
+
+def test_controller_is_built_on_first_use(app, client, make_user, login_as, monkeypatch):
+    user = make_user()
+    monkeypatch.setitem(app.config, "ADMIN_USER_IDS", {user.identificator})
+    login_as(user)
+    client.get("/metrics/")
+    assert metrics_routes.metrics_controller.loaded
+
+
+def test_parse_importtime_keeps_depth_and_times():
+    output = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       120 |        120 |     jwt.utils",
+        "import time:       300 |        420 |   jwt",
+        "import time:      1000 |       1420 | app",
+    ])
+
+    costs = parse_importtime(output)
+
+    assert [(c.module, c.depth) for c in costs] == [("jwt.utils", 2), ("jwt", 1), ("app", 0)]
+    assert total_ms(costs) == 1.42
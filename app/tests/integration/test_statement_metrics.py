@@ -0,0 +1,36 @@
+from app.infra.repository.project_repository import ProjectRepository
+from app.infra.repository.user_repository import UserRepository
+from app.infra.statement_metrics import HIT, MISS
+from app.utils.metrics import metrics
+
+
+def test_hot_queries_reuse_compiled_statements(db_session, make_project):
+    project_db = make_project()
+    user_id = project_db.user.identificator
+    repo = ProjectRepository(db_session)
+    repo.get_by_id(project_identificator=project_db.identificator, user_identificator=user_id)
+    metrics.reset()
+
+    for _ in range(5):
+        repo.get_by_id(project_identificator=project_db.identificator, user_identificator=user_id)
+        UserRepository(db_session).get_by_id(user_id)
+
+    assert metrics.counter(HIT) >= 5
+    assert metrics.counter(MISS) <= 1
+
+
+def test_metrics_route_exposes_hit_rate(app, db_session, make_user, login_as, monkeypatch):
+    user = make_user()
+    monkeypatch.setitem(app.config, "ADMIN_USER_IDS", {user.identificator})
+    client = login_as(user)
+
+    response = client.get("/metrics/")
+
+    assert response.status_code == 200
+    assert 0.0 <= response.get_json()["data"]["gauges"]["sql.compile_cache.hit_rate"] <= 1.0
+
+
+def test_metrics_route_is_hidden_from_non_admins(db_session, make_user, login_as):
+    response = login_as(make_user()).get("/metrics/")
+
+    assert response.status_code == 404
@@ -0,0 +1,52 @@
+import gzip
+import shutil
+
+import pytest
+from flask import render_template_string, url_for
+
+from app.utils.asset_build import build_assets
+from app.utils.assets import IMMUTABLE_CACHE_CONTROL, load_manifest
+
+
+@pytest.fixture
+def built_static(app, tmp_path):
+    """Build em uma cópia de static/, para não gravar dist/ dentro do repositório."""
+    original = app.static_folder
+    app.static_folder = str(tmp_path / "static")
+    shutil.copytree(original, app.static_folder, ignore=shutil.ignore_patterns("dist"))
+    manifest = build_assets(app.static_folder)
+    load_manifest(app)
+    yield manifest
+    app.static_folder = original
+    load_manifest(app)
+
+
+def test_without_build_bundles_fall_back_to_sources(app):
+    with app.test_request_context():
+        html = render_template_string("{% for src in asset_urls('js/login.bundle.js') %}{{ src }} {% endfor %}")
+    assert html.split() == ["/static/js/toast.js", "/static/js/auth/login.js"]
+
+
+def test_built_assets_are_fingerprinted_and_served_precompressed(app, client, built_static):
+    hashed = built_static["assets"]["js/my_projects.bundle.js"]
+    with app.test_request_context():
+        assert url_for("static", filename="css/app.css") == "/static/" + built_static["assets"]["css/app.css"]
+        html = render_template_string("{% for src in asset_urls('js/my_projects.bundle.js') %}{{ src }} {% endfor %}")
+    assert html.split() == ["/static/" + hashed]
+
+    plain = client.get("/static/" + hashed)
+    assert plain.headers["Cache-Control"] == IMMUTABLE_CACHE_CONTROL
+    assert "Content-Encoding" not in plain.headers
+    assert "Accept-Encoding" in plain.headers["Vary"]
+
+    compressed = client.get("/static/" + hashed, headers={"Accept-Encoding": "gzip, deflate"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert compressed.mimetype == plain.mimetype
+    assert gzip.decompress(compressed.data) == plain.data
+    plain.close()
+    compressed.close()
+
+    # Arquivos fora de dist/ continuam com o cache padrão do Flask.
+    source = client.get("/static/js/toast.js")
+    assert source.status_code == 200 and source.headers.get("Cache-Control") != IMMUTABLE_CACHE_CONTROL
+    source.close()
@@ -0,0 +1,104 @@
+import pytest
+
+from app.extensions import socketio
+from app.services.focus_group_service import FocusGroupService, user_groups, group_members
+from app.websocket import presence
+
+
+@pytest.fixture(autouse=True)
+def clean_presence():
+    presence.clear()
+    user_groups.clear()
+    group_members.clear()
+    yield
+    presence.clear()
+
+
+def _received(socket_client, name):
+    return [event["args"][0] for event in socket_client.get_received() if event["name"] == name]
+
+
+def test_connect_requires_auth_cookie(app, client):
+    assert not socketio.test_client(app, flask_test_client=client).is_connected()
+
+
+def test_disconnect_evicts_only_that_tabs_focus(app, make_user, login_as):
+    user = make_user()
+    other = make_user()
+    group = FocusGroupService().create_group(name="Equipe", user_id=user.identificator)
+    FocusGroupService().join_group(group_identificator=group["identificator"], user_id=other.identificator)
+    client = login_as(user)
+    tab_1 = socketio.test_client(app, flask_test_client=client)
+    tab_2 = socketio.test_client(app, flask_test_client=client)
+    observer = socketio.test_client(app, flask_test_client=login_as(other))
+
+    # user_id/username enviados pelo cliente são ignorados: vale o usuário do cookie.
+    tab_1.emit("enter_focus", {"user_id": "someone-else", "username": "x", "task_name": "Estudo", "start_time": 1})
+    tab_2.emit("enter_focus", {"task_name": "Leitura", "start_time": 2})
+    assert _received(observer, "focus_user_joined")[-1] == {user.identificator: {"start_time": 2, "username": user.username, "task_name": "Leitura"}}
+
+    tab_2.disconnect()
+    assert _received(observer, "focus_user_joined") == [{user.identificator: {"start_time": 1, "username": user.username, "task_name": "Estudo"}}]
+    tab_1.disconnect()
+    assert _received(observer, "focus_user_left") == [{"user_id": user.identificator}]
+
+    observer.emit("get_focus_users")
+    assert _received(observer, "update_focus_users") == [{"focused_users": {}}]
+
+
+def test_spammed_get_focus_users_is_throttled(app, make_user, login_as):
+    from app.utils.metrics import metrics
+    from app.websocket import limiter
+
+    limiter.clear()
+    socket_client = socketio.test_client(app, flask_test_client=login_as(make_user()))
+    throttled_before = metrics.counter("socket.throttled.get_focus_users")
+    for _ in range(20):
+        socket_client.emit("get_focus_users")
+
+    # O burst responde na hora; o resto vira no máximo uma resposta adiada.
+    burst = limiter.policy("get_focus_users").burst
+    assert len(_received(socket_client, "update_focus_users")) == burst
+    assert metrics.counter("socket.throttled.get_focus_users") - throttled_before == 20 - burst
+    socket_client.disconnect()
+
+
+def test_saved_session_pushes_project_deltas_to_owner_only(app, make_project, make_user, login_as):
+    from app.services.focus_session_service import FocusSessionService
+    from app.utils.timezones import local_today
+
+    project_db = make_project()
+    owner_socket = socketio.test_client(app, flask_test_client=login_as(project_db.user))
+    stranger_socket = socketio.test_client(app, flask_test_client=login_as(make_user()))
+
+    today = local_today(project_db.user.timezone)
+    FocusSessionService().save_focus_session(user_id=project_db.user.identificator, project_id=project_db.identificator,
+                                             started_at=f"{today.isoformat()}T00:10:00", duration_seconds=600)
+
+    assert _received(owner_socket, "project_time_delta") == [{"deltas": [
+        {"project_id": project_db.identificator, "day": today.isoformat(), "seconds": 600, "today": True, "week": True}]}]
+    assert _received(stranger_socket, "project_time_delta") == []
+
+
+def test_sync_rooms_follows_membership_changed_in_another_worker(app, make_user, login_as):
+    from app.utils.live_updates import group_room
+    from app.websocket import limiter
+
+    limiter.clear()
+    owner = make_user()
+    member = make_user()
+    group = FocusGroupService().create_group(name="Equipe", user_id=owner.identificator)
+    member_socket = socketio.test_client(app, flask_test_client=login_as(member))
+    member_socket.get_received()
+
+    # Entrada feita por outro worker: nenhum sid deste processo mudou de sala e o cache ainda tem a lista antiga.
+    FocusGroupService().join_group(group_identificator=group["identificator"], user_id=member.identificator)
+    user_groups.get(member.identificator, lambda: ())
+    socketio.emit("ping_group", {}, to=group_room(group["id"]))
+    assert _received(member_socket, "ping_group") == []
+
+    member_socket.emit("sync_rooms", {"group_id": group["id"]})
+    socketio.emit("ping_group", {}, to=group_room(group["id"]))
+    received = member_socket.get_received()
+    assert [event["name"] for event in received] == ["update_focus_users", "ping_group"]
+    member_socket.disconnect()
@@ -0,0 +1,72 @@
+# Contagem de SQL por chamada, para os testes de orçamento de consultas (ver integration/test_query_budgets.py).
+#
+#   with QueryCounter() as queries:
+#       client.get("/project/")
+#   queries.assert_within(statements=4)
+#
+# Conta cada statement enviado ao banco (after_cursor_execute, em todos os Engines), as linhas alteradas por
+# INSERT/UPDATE/DELETE e os objetos ORM carregados (um por linha de entidade lida). Statements com o mesmo SQL
+# executados várias vezes na mesma chamada são o sinal de N+1: uma consulta por item de uma lista.
+
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Mapper
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryCounter:
+    def __init__(self):
+        self.statements: List[str] = []
+        self.rows_written = 0
+        self.objects_loaded = 0
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(_WHITESPACE.sub(" ", statement).strip())
+        if not statement.lstrip().upper().startswith("SELECT") and cursor.rowcount and cursor.rowcount > 0:
+            self.rows_written += cursor.rowcount
+
+    def _on_load(self, target, context):
+        self.objects_loaded += 1
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(Engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(Mapper, "load", self._on_load)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        event.remove(Engine, "after_cursor_execute", self._after_cursor_execute)
+        event.remove(Mapper, "load", self._on_load)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def repeated(self, max_repeats: int = 1) -> List[Tuple[str, int]]:
+        """Statements idênticos executados mais de max_repeats vezes, do mais repetido para o menos."""
+        return [(sql, n) for sql, n in Counter(self.statements).most_common() if n > max_repeats]
+
+    def summary(self) -> Dict[str, int]:
+        return {"statements": self.count, "rows_written": self.rows_written, "objects_loaded": self.objects_loaded}
+
+    def assert_within(self, statements: int, max_repeats: int = 1, objects_loaded: Optional[int] = None,
+                      label: str = "call") -> None:
+        problems = []
+        if self.count > statements:
+            problems.append(f"{self.count} statements (budget {statements})")
+        if objects_loaded is not None and self.objects_loaded > objects_loaded:
+            problems.append(f"{self.objects_loaded} ORM objects loaded (budget {objects_loaded})")
+        repeated = self.repeated(max_repeats)
+        if repeated:
+            problems.append(f"{len(repeated)} statement(s) repeated more than {max_repeats}x (possible N+1)")
+        if problems:
+            listing = "\n".join(f"  [{Counter(self.statements)[sql]}x] {sql}" for sql in dict.fromkeys(self.statements))
+            raise QueryBudgetExceeded(f"{label}: " + "; ".join(problems) + f"\nStatements:\n{listing}")
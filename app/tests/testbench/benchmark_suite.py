@@ -0,0 +1,249 @@
+# Benchmark repetível dos caminhos quentes de services/repositories, com saída em JSON para comparar commits.
+#
+# Uso (por padrão cria um SQLite temporário e gera a base com dataset_generator):
+#   python -m app.tests.testbench.benchmark_suite --users 20 --years 2 --repeat 30 --output bench.json
+#   python -m app.tests.testbench.benchmark_suite --database-uri mysql+pymysql://... --no-generate --user-email ...
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict, Any, List, Optional
+
+from app.tests.testbench.dataset_generator import DEFAULT_PASSWORD, add_spec_arguments, spec_from_args, generate_dataset
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(timings_ms: List[float]) -> Dict[str, float]:
+    ordered = sorted(timings_ms)
+    return {
+        "runs": len(ordered),
+        "min_ms": round(ordered[0], 3),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+        "median_ms": round(statistics.median(ordered), 3),
+        "p90_ms": round(_percentile(ordered, 90), 3),
+        "p95_ms": round(_percentile(ordered, 95), 3),
+        "p99_ms": round(_percentile(ordered, 99), 3),
+        "max_ms": round(ordered[-1], 3),
+    }
+
+
+def time_call(fn: Callable[[], Any], repeat: int, warmup: int = 1, setup: Optional[Callable[[], None]] = None, teardown: Optional[Callable[[], None]] = None) -> Dict[str, float]:
+    """Executa fn `warmup` + `repeat` vezes; só as `repeat` últimas entram nas estatísticas."""
+    timings = []
+    for i in range(warmup + repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if teardown:
+            teardown()
+        if i >= warmup:
+            timings.append(elapsed_ms)
+    return summarize(timings)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(user_id: str, user_email: str, password: str, project_id: str, repeat: int) -> Dict[str, Dict[str, float]]:
+    """Precisa de app context. Cada chamada usa uma sessão nova, como uma requisição real."""
+    from app.infra.db import db
+    from app.services.project_service import ProjectService
+    from app.services.task_service import TaskService
+    from app.services.auth_service import AuthService
+    from app.services.analytics_service import AnalyticsService
+
+    project_service = ProjectService()
+    task_service = TaskService()
+    auth_service = AuthService()
+    analytics_service = AnalyticsService()
+    fresh_session = db.session.remove
+    results = {}
+
+    results["project_service.get_projects_with_time_summary"] = time_call(
+        lambda: project_service.get_projects_with_time_summary(user_id=user_id), repeat, teardown=fresh_session)
+    results["project_service.get_details_for_project_room"] = time_call(
+        lambda: project_service.get_details_for_project_room(project_id=project_id, user_id=user_id), repeat, teardown=fresh_session)
+    results["project_service.get_data_for_last_365_days_home_chart"] = time_call(
+        lambda: project_service.get_data_for_last_365_days_home_chart(user_id=user_id), repeat, teardown=fresh_session)
+
+    # Séries sobre os rollups diários: o custo deve depender do número de dias com foco, não de sessões.
+    today = date.today()
+    for label, days, granularity in (("1 year, day", 365, "day"), ("10 years, week", 3650, "week"), ("10 years, month", 3650, "month")):
+        results[f"analytics_service.get_focus_series ({label})"] = time_call(
+            lambda days=days, granularity=granularity: analytics_service.get_focus_series(
+                user_id=user_id, start=today - timedelta(days=days - 1), end=today, granularity=granularity),
+            repeat, teardown=fresh_session)
+
+    created_ids = []
+    results["task_service.create_task"] = time_call(
+        lambda: created_ids.append(task_service.create_task(user_id=user_id, project_id=project_id, title="Benchmark task").identificator),
+        repeat, teardown=fresh_session)
+
+    toggle = {"i": 0}
+    def change_status():
+        task_id = created_ids[toggle["i"] % len(created_ids)]
+        toggle["i"] += 1
+        task_service.change_task_status(user_id=user_id, project_id=project_id, task_id=task_id, target_status_name="completed")
+        task_service.change_task_status(user_id=user_id, project_id=project_id, task_id=task_id, target_status_name="in progress")
+    results["task_service.change_task_status (complete + reopen)"] = time_call(change_status, repeat, teardown=fresh_session)
+
+    results["task_service.delete_task"] = time_call(
+        lambda: task_service.delete_task(user_id=user_id, project_id=project_id, task_id=created_ids.pop()),
+        min(repeat, len(created_ids) - 1), teardown=fresh_session)
+
+    results["auth_service.login"] = time_call(
+        lambda: auth_service.login(user_email=user_email, password=password), repeat, teardown=fresh_session)
+
+    return results
+
+
+def run_page_benchmarks(app, user_email: str, password: str, project_id: str, repeat: int) -> Dict[str, Dict[str, Any]]:
+    """Páginas HTML pelo test client: TTFB (primeiro chunk do streaming), tempo total e CPU de render.
+
+    "cold" limpa o cache de fragmentos antes de cada requisição (equivale ao render sem cache);
+    "warm" reaproveita os fragmentos, como na navegação normal.
+    """
+    from app.infra.db import db
+    from app.services.auth_service import AuthService
+    from app.utils.fragment_cache import fragment_cache
+    from app.utils.metrics import metrics
+
+    client = app.test_client()
+    client.set_cookie("auth_token", AuthService().login(user_email=user_email, password=password))
+    db.session.remove()
+    results = {}
+
+    for label, path, template in (("GET /project/", "/project/", "my_projects.html"),
+                                  ("GET /project/<id>", f"/project/{project_id}", "project_room.html")):
+        for mode in ("cold", "warm"):
+            ttfb, total = [], []
+            cpu_before = metrics.snapshot()["timings"].get(f"render.{template}.cpu", {}).get("total_ms", 0.0)
+            for i in range(1 + repeat):
+                if mode == "cold":
+                    fragment_cache.clear()
+                start = time.perf_counter()
+                response = client.get(path, buffered=False)
+                chunks = iter(response.response)
+                next(chunks)
+                first_chunk_ms = (time.perf_counter() - start) * 1000
+                for _ in chunks:
+                    pass
+                response.close()
+                if i == 0:
+                    cpu_before = metrics.snapshot()["timings"][f"render.{template}.cpu"]["total_ms"]
+                    continue
+                ttfb.append(first_chunk_ms)
+                total.append((time.perf_counter() - start) * 1000)
+            cpu_total = metrics.snapshot()["timings"][f"render.{template}.cpu"]["total_ms"] - cpu_before
+            results[f"{label} ({mode} fragments)"] = {
+                "ttfb": summarize(ttfb),
+                "total": summarize(total),
+                "render_cpu_mean_ms": round(cpu_total / repeat, 3),
+            }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark dos services do Focus Time com saída em JSON.")
+    parser.add_argument("--database-uri", help="Banco a usar. Padrão: SQLite temporário.")
+    parser.add_argument("--no-generate", action="store_true", help="Não gera dados; usa a base existente.")
+    parser.add_argument("--user-email", help="Com --no-generate: email do usuário de amostra.")
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", help="Arquivo JSON de saída. Padrão: stdout.")
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+
+    tmp_dir = None
+    if args.database_uri:
+        os.environ["DATABASE_URI"] = args.database_uri
+    else:
+        tmp_dir = tempfile.mkdtemp(prefix="focus_time_bench_")
+        os.environ["DATABASE_URI"] = f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+
+    # Os logs DEBUG dos services dominariam as medições.
+    logging.getLogger("app.utils.logger").setLevel(logging.WARNING)
+
+    from sqlalchemy import select
+    from app import create_app
+    from app.infra.db import db
+    from app.infra.entities import UserDB, ProjectDB
+    from app.infra.statement_metrics import HIT, MISS, compile_cache_hit_rate
+    from app.utils.metrics import metrics
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        dataset = None
+        if args.no_generate:
+            user_db = db.session.execute(select(UserDB).where(UserDB.email == args.user_email)).scalar_one()
+            project_db = db.session.execute(select(ProjectDB).where(ProjectDB.user_id == user_db.id).limit(1)).scalar_one()
+            sample = {"user_identificator": user_db.identificator, "user_email": user_db.email, "project_identificator": project_db.identificator}
+        else:
+            dataset = generate_dataset(spec_from_args(args))
+            sample = dataset["sample"]
+        db.session.remove()
+
+        metrics.reset()
+        results = run_benchmarks(
+            user_id=sample["user_identificator"],
+            user_email=sample["user_email"],
+            password=args.password,
+            project_id=sample["project_identificator"],
+            repeat=args.repeat,
+        )
+        results.update(run_page_benchmarks(
+            app,
+            user_email=sample["user_email"],
+            password=args.password,
+            project_id=sample["project_identificator"],
+            repeat=args.repeat,
+        ))
+        statement_cache = {
+            "hits": metrics.counter(HIT),
+            "misses": metrics.counter(MISS),
+            "hit_rate": compile_cache_hit_rate(),
+        }
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database_dialect": os.environ["DATABASE_URI"].split(":", 1)[0],
+            "repeat": args.repeat,
+            "dataset": dataset,
+            "statement_cache": statement_cache,
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+# Gera uma base sintética (usuários, projetos, tasks e anos de focus sessions) para medir performance.
+#
+# Uso (banco do .env ou --database-uri; use sempre uma base descartável):
+#   python -m app.tests.testbench.dataset_generator --users 50 --projects-per-user 6 --years 2
+
+import argparse
+import json
+import os
+import random
+import uuid
+from dataclasses import dataclass, asdict
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Any
+
+import bcrypt
+from sqlalchemy import insert, select
+
+from app.infra.db import db
+from app.infra.entities import UserDB, ProjectDB, TaskDB, TaskStatusDB, FocusSessionDB
+from app.infra.repository.focus_daily_rollup_repository import FocusDailyRollupRepository
+from app.utils.logger import logger
+
+DEFAULT_PASSWORD = "Password123"
+PROJECT_COLORS = ["#e74c3c", "#3498db", "#2ecc71", "#9b59b6", "#f1c40f", "#1abc9c", "#e67e22"]
+
+
+@dataclass
+class DatasetSpec:
+    users: int = 10
+    projects_per_user: int = 5
+    tasks_per_project: int = 30
+    years: float = 1.0
+    sessions_per_day: int = 2
+    active_day_ratio: float = 0.7
+    completed_task_ratio: float = 0.5
+    chunk_size: int = 5000
+    seed: int = 42
+
+
+def _insert_chunked(model, rows: List[Dict[str, Any]], chunk_size: int) -> None:
+    for start in range(0, len(rows), chunk_size):
+        db.session.execute(insert(model), rows[start:start + chunk_size])
+
+
+def _ensure_task_statuses() -> Dict[str, int]:
+    statuses = {}
+    for name in ("in progress", "completed"):
+        status_db = db.session.execute(select(TaskStatusDB).where(TaskStatusDB.name == name)).scalar_one_or_none()
+        if not status_db:
+            status_db = TaskStatusDB(name=name)
+            db.session.add(status_db)
+            db.session.flush()
+        statuses[name] = status_db.id
+    return statuses
+
+
+def _ids_by_identificator(model, identificators: List[str], chunk_size: int) -> Dict[str, int]:
+    ids = {}
+    for start in range(0, len(identificators), chunk_size):
+        chunk = identificators[start:start + chunk_size]
+        stmt = select(model.identificator, model.id).where(model.identificator.in_(chunk))
+        ids.update({identificator: id_ for identificator, id_ in db.session.execute(stmt)})
+    return ids
+
+
+def _day_sessions(rng: random.Random, day: date, spec: DatasetSpec) -> List[tuple]:
+    """Sessões de um dia, sempre dentro do próprio dia (como gravadas após a segmentação por dia)."""
+    if rng.random() > spec.active_day_ratio:
+        return []
+    sessions = []
+    for _ in range(rng.randint(1, spec.sessions_per_day)):
+        duration = rng.randint(10, 90) * 60
+        start_second = rng.randint(6 * 3600, 86400 - duration - 1)
+        sessions.append((datetime.combine(day, datetime.min.time()) + timedelta(seconds=start_second), duration))
+    return sessions
+
+
+def generate_dataset(spec: DatasetSpec) -> Dict[str, Any]:
+    """Popula o banco do app context atual. Retorna contagens e um usuário/projeto de amostra para os benchmarks."""
+    rng = random.Random(spec.seed)
+    run_tag = uuid.uuid4().hex[:8]
+    password_hash = bcrypt.hashpw(DEFAULT_PASSWORD.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    today = date.today()
+    first_day = today - timedelta(days=int(spec.years * 365))
+    logger.info(f"Testbench: Generating dataset {asdict(spec)} (run tag {run_tag})")
+
+    statuses = _ensure_task_statuses()
+
+    user_rows = [
+        {
+            "identificator": str(uuid.uuid4()),
+            "username": f"bench_{run_tag}_{i}",
+            "email": f"bench_{run_tag}_{i}@example.com",
+            "password": password_hash,
+            "active": True,
+        }
+        for i in range(spec.users)
+    ]
+    _insert_chunked(UserDB, user_rows, spec.chunk_size)
+    user_ids = _ids_by_identificator(UserDB, [u["identificator"] for u in user_rows], spec.chunk_size)
+
+    project_rows = [
+        {
+            "identificator": str(uuid.uuid4()),
+            "title": f"Project {p}",
+            "color": PROJECT_COLORS[p % len(PROJECT_COLORS)],
+            "active": True,
+            "user_id": user_ids[user["identificator"]],
+        }
+        for user in user_rows
+        for p in range(spec.projects_per_user)
+    ]
+    _insert_chunked(ProjectDB, project_rows, spec.chunk_size)
+    project_ids = list(_ids_by_identificator(ProjectDB, [p["identificator"] for p in project_rows], spec.chunk_size).values())
+
+    task_rows = []
+    for project_id in project_ids:
+        for t in range(spec.tasks_per_project):
+            created_at = datetime.combine(first_day, datetime.min.time()) + timedelta(seconds=rng.randint(0, max(1, (today - first_day).days) * 86400))
+            completed = rng.random() < spec.completed_task_ratio
+            task_rows.append({
+                "identificator": str(uuid.uuid4()),
+                "title": f"Task {t}",
+                "description": None,
+                "created_at": created_at,
+                "completed_at": created_at + timedelta(hours=rng.randint(1, 72)) if completed else None,
+                "project_id": project_id,
+                "status_id": statuses["completed"] if completed else statuses["in progress"],
+            })
+    _insert_chunked(TaskDB, task_rows, spec.chunk_size)
+
+    session_count = 0
+    session_rows = []
+    for project_id in project_ids:
+        day = first_day
+        while day <= today:
+            for started_at, duration in _day_sessions(rng, day, spec):
+                session_rows.append({"project_id": project_id, "started_at": started_at, "duration_seconds": duration})
+            day += timedelta(days=1)
+        # Escreve por projeto para manter a memória limitada mesmo com muitos anos de histórico.
+        if len(session_rows) >= spec.chunk_size:
+            _insert_chunked(FocusSessionDB, session_rows, spec.chunk_size)
+            session_count += len(session_rows)
+            session_rows = []
+    _insert_chunked(FocusSessionDB, session_rows, spec.chunk_size)
+    session_count += len(session_rows)
+
+    # Recalcula os rollups diários a partir das sessões inseridas (INSERT ... SELECT no próprio banco).
+    rollup_count = FocusDailyRollupRepository(db.session).rebuild()
+
+    db.session.commit()
+
+    sample_user = user_rows[0] if user_rows else None
+    sample_project = next((p for p in project_rows if sample_user and p["user_id"] == user_ids[sample_user["identificator"]]), None)
+    result = {
+        "spec": asdict(spec),
+        "counts": {
+            "users": len(user_rows),
+            "projects": len(project_rows),
+            "tasks": len(task_rows),
+            "focus_sessions": session_count,
+            "focus_daily_rollups": rollup_count,
+        },
+        "sample": {
+            "user_identificator": sample_user["identificator"] if sample_user else None,
+            "user_email": sample_user["email"] if sample_user else None,
+            "password": DEFAULT_PASSWORD,
+            "project_identificator": sample_project["identificator"] if sample_project else None,
+        },
+    }
+    logger.info(f"Testbench: Dataset generated {result['counts']}")
+    return result
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = DatasetSpec()
+    parser.add_argument("--users", type=int, default=defaults.users)
+    parser.add_argument("--projects-per-user", type=int, default=defaults.projects_per_user)
+    parser.add_argument("--tasks-per-project", type=int, default=defaults.tasks_per_project)
+    parser.add_argument("--years", type=float, default=defaults.years)
+    parser.add_argument("--sessions-per-day", type=int, default=defaults.sessions_per_day)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def spec_from_args(args: argparse.Namespace) -> DatasetSpec:
+    return DatasetSpec(
+        users=args.users,
+        projects_per_user=args.projects_per_user,
+        tasks_per_project=args.tasks_per_project,
+        years=args.years,
+        sessions_per_day=args.sessions_per_day,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Popula um banco local com dados sintéticos do Focus Time.")
+    parser.add_argument("--database-uri", help="Sobrescreve DATABASE_URI (ex.: sqlite:///bench.db).")
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+
+    if args.database_uri:
+        os.environ["DATABASE_URI"] = args.database_uri
+
+    from app import create_app
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        result = generate_dataset(spec_from_args(args))
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
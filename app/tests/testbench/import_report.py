@@ -0,0 +1,100 @@
+# Relatório do custo de import no boot do app (o que cada worker novo paga antes da primeira requisição).
+#
+# Roda `import app; app.create_app()` num processo limpo com `python -X importtime` e resume a saída:
+# o total, os módulos de topo mais caros (tempo acumulado, com tudo que eles importam) e os mais caros por
+# conta própria. Com --budget-ms sai com código 1 se o total passar do orçamento.
+#
+# Uso:
+#   python -m app.tests.testbench.import_report --top 20
+#   python -m app.tests.testbench.import_report --budget-ms 1500 --json
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+BOOT_STATEMENT = "import app; app.create_app()"
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$")
+
+
+@dataclass
+class ImportCost:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int  # 0 = importado diretamente pelo statement, 1 = por um desses, ...
+
+
+def parse_importtime(output: str) -> List[ImportCost]:
+    costs = []
+    for line in output.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            costs.append(ImportCost(module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return costs
+
+
+def measure(statement: str = BOOT_STATEMENT, env: Optional[Dict[str, str]] = None) -> List[ImportCost]:
+    """Executa o statement num interpretador novo (nada em sys.modules) e devolve o custo de cada import."""
+    run_env = {**os.environ, "DATABASE_URI": os.environ.get("DATABASE_URI", "sqlite://"), **(env or {})}
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], env=run_env,
+                            capture_output=True, text=True, timeout=120)
+    if result.returncode != 0:
+        raise RuntimeError(f"Boot failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def total_ms(costs: List[ImportCost]) -> float:
+    return sum(cost.cumulative_us for cost in costs if cost.depth == 0) / 1000
+
+
+def report(costs: List[ImportCost], top: int = 20) -> Dict:
+    def rows(items):
+        return [{"module": c.module, "self_ms": round(c.self_us / 1000, 1), "cumulative_ms": round(c.cumulative_us / 1000, 1)}
+                for c in items[:top]]
+
+    return {
+        "total_ms": round(total_ms(costs), 1),
+        "modules": len(costs),
+        "app_modules": sum(1 for c in costs if c.module == "app" or c.module.startswith("app.")),
+        "top_level": rows(sorted((c for c in costs if c.depth == 0), key=lambda c: -c.cumulative_us)),
+        "self": rows(sorted(costs, key=lambda c: -c.self_us)),
+    }
+
+
+def _print_table(title: str, rows: List[Dict]) -> None:
+    print(f"\n{title}")
+    for row in rows:
+        print(f"  {row['cumulative_ms']:>9.1f} ms  {row['self_ms']:>8.1f} ms  {row['module']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Custo de import por módulo no boot do app.")
+    parser.add_argument("--statement", default=BOOT_STATEMENT)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, help="Falha (código 1) se o total passar disso.")
+    parser.add_argument("--json", action="store_true", help="Saída em JSON.")
+    args = parser.parse_args()
+
+    costs = measure(args.statement)
+    summary = report(costs, top=args.top)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(f"{summary['total_ms']:.1f} ms importing {summary['modules']} modules ({summary['app_modules']} from app)")
+        print(f"  {'cumulative':>12}  {'self':>11}")
+        _print_table("Top-level imports (cumulative):", summary["top_level"])
+        _print_table("Most expensive modules (self):", summary["self"])
+    if args.budget_ms is not None and summary["total_ms"] > args.budget_ms:
+        print(f"Import budget exceeded: {summary['total_ms']:.1f} ms > {args.budget_ms:.1f} ms", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
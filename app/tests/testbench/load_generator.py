@@ -0,0 +1,288 @@
+# Gerador de carga HTTP + Socket.IO que simula usuários reais do timer de foco contra uma instância local.
+#
+# Cada usuário virtual faz login em /auth/login, abre o Socket.IO como o timer.js (query user_id/username),
+# e repete o ciclo: abre o project room, enter_focus, alterna uma task, leave_focus e POST /focus_session/save.
+#
+# Uso (suba o app antes, ex.: `python main.py`):
+#   python -m app.tests.testbench.load_generator --base-url http://127.0.0.1:5000 --register --users 50 --duration 120
+#   python -m app.tests.testbench.load_generator --credentials users.json --users 200 --cycles-per-minute 4
+#
+# users.json: [{"email": "...", "password": "..."}, ...]
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import jwt
+import requests
+import socketio
+
+from app.tests.testbench.benchmark_suite import summarize
+
+
+class LatencyRecorder:
+    """Guarda latências por nome (endpoint ou evento), com contagem de erros, de forma thread-safe."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timings: Dict[str, List[float]] = defaultdict(list)
+        self._errors: Dict[str, int] = defaultdict(int)
+
+    def record(self, name: str, elapsed_ms: float, ok: bool = True) -> None:
+        with self._lock:
+            if ok:
+                self._timings[name].append(elapsed_ms)
+            else:
+                self._errors[name] += 1
+
+    def report(self, elapsed_seconds: float) -> Dict[str, Dict]:
+        with self._lock:
+            names = set(self._timings) | set(self._errors)
+            report = {}
+            for name in sorted(names):
+                timings = self._timings.get(name, [])
+                entry = summarize(timings) if timings else {"runs": 0}
+                entry["errors"] = self._errors.get(name, 0)
+                entry["per_second"] = round(len(timings) / elapsed_seconds, 3) if elapsed_seconds else 0.0
+                report[name] = entry
+            return report
+
+
+class VirtualUser(threading.Thread):
+    def __init__(self, base_url: str, email: str, password: str, recorder: LatencyRecorder, stop_event: threading.Event,
+                 cycle_interval: float, focus_seconds: float, socket_timeout: float):
+        super().__init__(daemon=True)
+        self.base_url = base_url.rstrip("/")
+        self.email = email
+        self.password = password
+        self.recorder = recorder
+        self.stop_event = stop_event
+        self.cycle_interval = cycle_interval
+        self.focus_seconds = focus_seconds
+        self.socket_timeout = socket_timeout
+        self.http = requests.Session()
+        self.sio = socketio.Client(reconnection=False)
+        self.user_id: Optional[str] = None
+        self.username = email.split("@")[0]
+        self.project_id: Optional[str] = None
+        self.task_ids: List[str] = []
+        self.connected = False
+        self._pending: Dict[str, tuple] = {}
+        self._pending_lock = threading.Lock()
+
+    # --- HTTP ---
+
+    def _request(self, name: str, method: str, path: str, **kwargs) -> Optional[requests.Response]:
+        start = time.perf_counter()
+        try:
+            response = self.http.request(method, self.base_url + path, allow_redirects=False, timeout=30, **kwargs)
+            ok = response.status_code < 400
+        except requests.RequestException:
+            response, ok = None, False
+        self.recorder.record(name, (time.perf_counter() - start) * 1000, ok)
+        return response if ok else None
+
+    def login(self) -> bool:
+        response = self._request("POST /auth/login", "POST", "/auth/login", json={"email": self.email, "password": self.password})
+        if response is None:
+            return False
+        token = response.cookies.get("auth_token")
+        # O cookie é `secure`; contra http://localhost o requests não o reenviaria sozinho.
+        self.http.headers["Cookie"] = f"auth_token={token}"
+        self.user_id = jwt.decode(token, options={"verify_signature": False})["id"]
+        return True
+
+    def prepare_project(self) -> bool:
+        response = self._request("GET /project/", "GET", "/project/")
+        if response is None:
+            return False
+        project_ids = re.findall(r'class="d-flex custom-card h-100"[^>]*?data-id="([0-9a-f-]{36})"', response.text, re.S)
+        if project_ids:
+            self.project_id = project_ids[0]
+        else:
+            created = self._request("POST /project/create_project", "POST", "/project/create_project", json={"title": "Load test", "color": "#6A17FF"})
+            if created is None:
+                return False
+            self.project_id = created.json()["data"]["identificator"]
+
+        for i in range(3):
+            created = self._request("POST /task/<project_id>/create_task", "POST", f"/task/{self.project_id}/create_task", json={"title": f"Load task {i}"})
+            if created is not None:
+                self.task_ids.append(created.json()["data"]["id"])
+        return True
+
+    # --- Socket.IO ---
+
+    def _expect(self, event: str, match_user: bool) -> threading.Event:
+        done = threading.Event()
+        with self._pending_lock:
+            self._pending[event] = (done, time.perf_counter(), match_user)
+        return done
+
+    def _resolve(self, event: str, data: dict) -> None:
+        with self._pending_lock:
+            pending = self._pending.get(event)
+            if not pending:
+                return
+            done, start, match_user = pending
+            if match_user:
+                # focus_user_joined vem como {user_id: {...}}, focus_user_left como {"user_id": ...}
+                if self.user_id not in data and data.get("user_id") != self.user_id:
+                    return
+            del self._pending[event]
+        self.recorder.record(f"socket {event}", (time.perf_counter() - start) * 1000)
+        done.set()
+
+    def _emit_and_wait(self, emit_event: str, reply_event: str, payload=None, match_user: bool = True) -> None:
+        done = self._expect(reply_event, match_user)
+        if payload is None:
+            self.sio.emit(emit_event)
+        else:
+            self.sio.emit(emit_event, payload)
+        if not done.wait(self.socket_timeout):
+            with self._pending_lock:
+                self._pending.pop(reply_event, None)
+            self.recorder.record(f"socket {reply_event}", 0, ok=False)
+
+    def connect_socket(self) -> bool:
+        for event in ("focus_user_joined", "focus_user_left", "update_focus_users"):
+            self.sio.on(event, lambda data, event=event: self._resolve(event, data))
+        start = time.perf_counter()
+        try:
+            self.sio.connect(f"{self.base_url}?user_id={self.user_id}&username={self.username}",
+                             headers={"Cookie": self.http.headers["Cookie"]}, transports=["websocket"])
+            self.recorder.record("socket connect", (time.perf_counter() - start) * 1000)
+            return True
+        except socketio.exceptions.ConnectionError:
+            self.recorder.record("socket connect", 0, ok=False)
+            return False
+
+    # --- Ciclo ---
+
+    def cycle(self) -> None:
+        self._request("GET /project/<project_id>", "GET", f"/project/{self.project_id}")
+        self._emit_and_wait("get_focus_users", "update_focus_users", match_user=False)
+
+        started_at = datetime.now(timezone.utc)
+        self._emit_and_wait("enter_focus", "focus_user_joined", {
+            "username": self.username, "user_id": self.user_id,
+            "task_name": "Load test", "start_time": int(time.time() * 1000),
+        })
+        self.stop_event.wait(self.focus_seconds)
+
+        if self.task_ids:
+            task_id = random.choice(self.task_ids)
+            for status in ("completed", "in progress"):
+                self._request("PUT /task/<project_id>/change_status/<task_id>", "PUT",
+                              f"/task/{self.project_id}/change_status/{task_id}", json={"status": status})
+
+        self._emit_and_wait("leave_focus", "focus_user_left", {"user_id": self.user_id})
+        self._request("POST /focus_session/save", "POST", "/focus_session/save", json={
+            "started_at": started_at.isoformat(timespec="milliseconds"),
+            "duration_seconds": max(1, int(self.focus_seconds)),
+            "project_id": self.project_id,
+        })
+
+    def run(self) -> None:
+        if not (self.login() and self.prepare_project() and self.connect_socket()):
+            return
+        self.connected = True
+        try:
+            # Espalha o início dos ciclos para não sincronizar todos os usuários.
+            self.stop_event.wait(random.uniform(0, self.cycle_interval))
+            while not self.stop_event.is_set():
+                cycle_start = time.perf_counter()
+                self.cycle()
+                self.stop_event.wait(max(0.0, self.cycle_interval - (time.perf_counter() - cycle_start)))
+        finally:
+            self.sio.disconnect()
+
+
+def register_users(base_url: str, count: int, password: str) -> List[Dict[str, str]]:
+    tag = uuid.uuid4().hex[:6]
+    credentials = []
+    for i in range(count):
+        email = f"load_{tag}_{i}@example.com"
+        response = requests.post(f"{base_url.rstrip('/')}/auth/register/create_account",
+                                 json={"email": email, "username": f"load_{tag}_{i}", "password": password}, timeout=30)
+        response.raise_for_status()
+        credentials.append({"email": email, "password": password})
+    return credentials
+
+
+def run_load(base_url: str, credentials: List[Dict[str, str]], duration: float, cycles_per_minute: float,
+             focus_seconds: float, ramp_up: float, socket_timeout: float) -> Dict:
+    recorder = LatencyRecorder()
+    stop_event = threading.Event()
+    cycle_interval = 60.0 / cycles_per_minute
+    users = [
+        VirtualUser(base_url, c["email"], c["password"], recorder, stop_event, cycle_interval, focus_seconds, socket_timeout)
+        for c in credentials
+    ]
+
+    start = time.perf_counter()
+    for user in users:
+        user.start()
+        if ramp_up:
+            time.sleep(ramp_up / len(users))
+    stop_event.wait(max(0.0, duration - (time.perf_counter() - start)))
+    stop_event.set()
+    for user in users:
+        user.join(timeout=socket_timeout + 30)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "meta": {
+            "base_url": base_url,
+            "users": len(users),
+            "duration_seconds": round(elapsed, 3),
+            "cycles_per_minute_per_user": cycles_per_minute,
+            "focus_seconds": focus_seconds,
+            "connected_users": sum(1 for u in users if u.connected),
+        },
+        "results": recorder.report(elapsed),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Gerador de carga HTTP + Socket.IO para o Focus Time.")
+    parser.add_argument("--base-url", default="http://127.0.0.1:5000")
+    parser.add_argument("--users", type=int, default=10, help="Usuários virtuais simultâneos.")
+    parser.add_argument("--credentials", help="Arquivo JSON com [{email, password}]. Sem ele, use --register.")
+    parser.add_argument("--register", action="store_true", help="Cria as contas via /auth/register/create_account.")
+    parser.add_argument("--password", default="Password123", help="Senha usada com --register.")
+    parser.add_argument("--duration", type=float, default=60.0, help="Segundos de carga.")
+    parser.add_argument("--cycles-per-minute", type=float, default=6.0, help="Ciclos de foco por usuário por minuto.")
+    parser.add_argument("--focus-seconds", type=float, default=2.0, help="Tempo entre enter_focus e leave_focus.")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="Segundos para iniciar todos os usuários.")
+    parser.add_argument("--socket-timeout", type=float, default=10.0, help="Espera máxima pela resposta de um evento.")
+    parser.add_argument("--output", help="Arquivo JSON de saída. Padrão: stdout.")
+    args = parser.parse_args()
+
+    if args.credentials:
+        with open(args.credentials) as f:
+            credentials = json.load(f)[:args.users]
+    elif args.register:
+        credentials = register_users(args.base_url, args.users, args.password)
+    else:
+        parser.error("informe --credentials ou --register")
+
+    report = run_load(args.base_url, credentials, args.duration, args.cycles_per_minute,
+                      args.focus_seconds, args.ramp_up, args.socket_timeout)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
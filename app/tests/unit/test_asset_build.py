@@ -0,0 +1,33 @@
+from app.utils.asset_build import minify_css, minify_js
+
+
+def test_minify_js_keeps_strings_regex_and_line_breaks():
+    source = """
+    // comentário
+    const a = 'x  // não é comentário';
+    const b = `linha ${ a + "}" }   fim`;   /* bloco */
+    const re = /a\\/b [/]/g.test(a);
+    let c = a
+    ++i
+    return x - -y
+    """
+    assert minify_js(source) == (
+        "const a='x  // não é comentário';\n"
+        "const b=`linha ${ a + \"}\" }   fim`;\n"
+        "const re=/a\\/b [/]/g.test(a);\n"
+        "let c=a\n"
+        "++i\n"
+        "return x- -y"
+    )
+
+
+def test_minify_css():
+    source = """
+    /* tema */
+    body {
+        font-family: 'Stick No Bills', sans-serif;
+        margin: 0 auto;
+    }
+    a > span:hover { color: #fff; }
+    """
+    assert minify_css(source) == "body{font-family:'Stick No Bills',sans-serif;margin:0 auto}a>span:hover{color:#fff}"
@@ -0,0 +1,49 @@
+from datetime import datetime
+
+from app.models.focus_session import split_by_day
+
+
+def test_split_by_day_keeps_session_inside_one_day():
+    started_at = datetime(2025, 3, 10, 9, 0, 0)
+
+    assert split_by_day(started_at, 3600) == [(started_at, 3600)]
+
+
+def test_split_by_day_cuts_at_midnight():
+    started_at = datetime(2025, 3, 10, 23, 30, 0)
+
+    assert split_by_day(started_at, 3600) == [
+        (started_at, 1800),
+        (datetime(2025, 3, 11, 0, 0, 0), 1800),
+    ]
+
+
+def test_split_by_day_spanning_several_days():
+    started_at = datetime(2025, 3, 10, 22, 0, 0)
+    segments = split_by_day(started_at, 2 * 3600 + 86400 + 600)
+
+    assert [s[0] for s in segments] == [
+        started_at,
+        datetime(2025, 3, 11, 0, 0, 0),
+        datetime(2025, 3, 12, 0, 0, 0),
+    ]
+    assert [s[1] for s in segments] == [7200, 86400, 600]
+
+
+def test_split_by_day_skips_empty_sub_second_segment():
+    started_at = datetime(2025, 3, 10, 23, 59, 59, 500000)
+    segments = split_by_day(started_at, 10)
+
+    assert segments == [(datetime(2025, 3, 11, 0, 0, 0), 10)]
+
+
+def test_split_by_day_uses_local_midnight_across_dst():
+    # Nova York, 09/03/2025: o dia local tem 23h (meia-noite = 05:00 UTC; a seguinte = 04:00 UTC).
+    started_at = datetime(2025, 3, 9, 3, 0, 0)
+    segments = split_by_day(started_at, 26 * 3600, "America/New_York")
+
+    assert segments == [
+        (started_at, 7200),
+        (datetime(2025, 3, 9, 5, 0, 0), 23 * 3600),
+        (datetime(2025, 3, 10, 4, 0, 0), 3600),
+    ]
@@ -0,0 +1,28 @@
+import io
+import json
+
+import pytest
+
+from app.utils.json_stream import iter_json_array
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 16, 4096])
+def test_iter_json_array_matches_json_load(chunk_size):
+    payload = [{"a": 1, "b": [1, 2, {"c": "x]"}]}, {"d": None}, 12345, "tail"]
+    text = json.dumps(payload, indent=4)
+
+    assert list(iter_json_array(io.StringIO(text), chunk_size=chunk_size)) == payload
+
+
+def test_iter_json_array_empty_array():
+    assert list(iter_json_array(io.StringIO("  [ ]\n"))) == []
+
+
+def test_iter_json_array_rejects_non_array():
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO('{"a": 1}')))
+
+
+def test_iter_json_array_rejects_truncated_file():
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO('[{"a": 1}, {"b":'), chunk_size=4))
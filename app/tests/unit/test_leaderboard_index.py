@@ -0,0 +1,43 @@
+from datetime import date
+
+from app.infra.leaderboard import MemoryLeaderboard, board_key
+
+
+def test_sorted_index_updates_ranks_and_prunes():
+    board = MemoryLeaderboard()
+    key = board_key("day", date(2026, 10, 19))
+    board.replace(key, [("ana", 600), ("bia", 1200), ("caio", 300)])
+
+    assert board.top(key, 2) == [("bia", 1200), ("ana", 600)]
+    board.set_score(key, "caio", 1800)
+    assert board.top(key, 3) == [("caio", 1800), ("bia", 1200), ("ana", 600)]
+    assert (board.rank(key, "ana"), board.rank(key, "nobody")) == (2, None)
+    assert board.scores(key, ["ana", "nobody"]) == {"ana": 600}
+    board.increment(key, "ana", 1500)
+    assert board.top(key, 1) == [("ana", 2100)] and board.rank(key, "caio") == 1
+    board.set_score(key, "ana", 600)
+
+    # O período de um dia fica mais RETENTION (2 dias) depois de acabar.
+    assert board.prune(date(2026, 10, 21)) == 0
+    assert board.prune(date(2026, 10, 22)) == 1 and not board.exists(key)
+
+
+def test_skip_list_matches_a_sorted_list():
+    import random
+
+    from app.infra.leaderboard import _SkipList
+
+    rng = random.Random(7)
+    skip_list, reference = _SkipList(), []
+    for _ in range(3000):
+        key = (-rng.randrange(50), f"u{rng.randrange(200)}")
+        if key in reference:
+            assert skip_list.remove(key)
+            reference.remove(key)
+        else:
+            skip_list.insert(key)
+            reference.append(key)
+        reference.sort()
+    assert skip_list.first(len(reference) + 1) == reference
+    assert all(skip_list.index(key) == position for position, key in enumerate(reference))
+    assert skip_list.index((1, "nobody")) is None and not skip_list.remove((1, "nobody"))
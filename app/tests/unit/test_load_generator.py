@@ -0,0 +1,18 @@
+from app.tests.testbench.load_generator import LatencyRecorder
+
+
+def test_latency_recorder_reports_per_name_percentiles_and_errors():
+    recorder = LatencyRecorder()
+    for ms in (10.0, 20.0, 30.0, 40.0):
+        recorder.record("POST /focus_session/save", ms)
+    recorder.record("POST /focus_session/save", 0, ok=False)
+    recorder.record("socket focus_user_joined", 0, ok=False)
+
+    report = recorder.report(elapsed_seconds=2.0)
+
+    save = report["POST /focus_session/save"]
+    assert save["runs"] == 4
+    assert save["errors"] == 1
+    assert save["max_ms"] == 40.0
+    assert save["per_second"] == 2.0
+    assert report["socket focus_user_joined"] == {"runs": 0, "errors": 1, "per_second": 0.0}
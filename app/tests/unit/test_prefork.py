@@ -0,0 +1,41 @@
+import gc
+import os
+import sys
+import time
+
+import pytest
+
+from app.utils.prefork import PreforkMaster, parse_smaps_rollup
+
+
+def test_parse_smaps_rollup_sums_shared_and_private_pages():
+    text = "\n".join([
+        "55d0c0000000-7ffd00000000 ---p 00000000 00:00 0                          [rollup]",
+        "Rss:               62868 kB",
+        "Pss:               22985 kB",
+        "Shared_Clean:      50000 kB",
+        "Shared_Dirty:       9460 kB",
+        "Private_Clean:       400 kB",
+        "Private_Dirty:      3008 kB",
+    ])
+
+    assert parse_smaps_rollup(text) == {"rss_kb": 62868, "pss_kb": 22985, "shared_kb": 59460, "private_kb": 3408}
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_master_forks_workers_reports_them_and_stops_them():
+    master = PreforkMaster(lambda index: time.sleep(30), workers=2)
+    try:
+        workers = master.start()
+        report = master.report()
+    finally:
+        master.stop(timeout=5)
+        gc.unfreeze()
+
+    assert [w.index for w in workers] == [0, 1]
+    assert all(w.fork_ms >= 0 for w in workers)
+    assert [w["pid"] for w in report["workers"]] == [w.pid for w in workers]
+    assert report["frozen_objects"] > 0
+    if sys.platform.startswith("linux"):
+        assert all(w["rss_kb"] > 0 for w in report["workers"])
+    assert master.workers == {}
@@ -0,0 +1,52 @@
+from app.utils.presence import PresenceRegistry
+
+
+def test_tabs_share_one_presence_entry_until_the_last_leaves():
+    presence = PresenceRegistry()
+    presence.connect("tab-1", "u1", "ana")
+    presence.connect("tab-2", "u1", "ana")
+
+    assert presence.enter("tab-1", task_name="Estudo", start_time=1) == ("u1", {"start_time": 1, "username": "ana", "task_name": "Estudo"})
+    assert presence.enter("tab-2", task_name="Leitura", start_time=2)[1]["task_name"] == "Leitura"
+
+    # Fechar uma aba mantém o usuário em foco com a outra; a última remove tudo.
+    assert presence.disconnect("tab-2") == ("u1", {"start_time": 1, "username": "ana", "task_name": "Estudo"})
+    assert presence.disconnect("tab-1") == ("u1", None)
+    assert presence.snapshot() == {} and presence.tabs("u1") == 0
+    assert presence.enter("tab-1", task_name="x", start_time=3) is None  # sid desconhecido
+
+
+def test_sweep_evicts_vanished_sids_and_stale_focus():
+    presence = PresenceRegistry(max_focus_seconds=0)
+    presence.connect("alive", "u1", "ana")
+    presence.connect("ghost", "u2", "bia")
+    presence.enter("alive", task_name="a", start_time=1)
+    presence.enter("ghost", task_name="b", start_time=1)
+
+    changes = presence.sweep(is_connected=lambda sid: sid == "alive")
+
+    assert sorted(changes) == [("u1", None), ("u2", None)]
+    assert presence.user_for("ghost") is None and presence.user_for("alive") == "u1"
+
+
+def test_workers_sharing_a_store_see_each_others_tabs():
+    from app.utils.presence import MemoryFocusStore
+
+    store = MemoryFocusStore()  # no lugar do Redis: o mesmo store para os dois "workers"
+    worker_1, worker_2 = PresenceRegistry(store=store), PresenceRegistry(store=store)
+    worker_1.connect("tab-1", "u1", "ana")
+    worker_2.connect("tab-2", "u1", "ana")
+    worker_2.connect("tab-3", "u2", "bia")
+
+    worker_1.enter("tab-1", task_name="Estudo", start_time=1)
+    worker_2.enter("tab-3", task_name="Leitura", start_time=2)
+    assert worker_1.snapshot(["u1", "u2"]) == worker_2.snapshot(["u1", "u2"]) == {
+        "u1": {"start_time": 1, "username": "ana", "task_name": "Estudo"},
+        "u2": {"start_time": 2, "username": "bia", "task_name": "Leitura"},
+    }
+
+    # A aba do outro worker ainda em foco mantém o usuário na lista.
+    worker_2.enter("tab-2", task_name="Revisão", start_time=3)
+    assert worker_2.disconnect("tab-2") == ("u1", {"start_time": 1, "username": "ana", "task_name": "Estudo"})
+    assert worker_1.leave("tab-1") == ("u1", None)
+    assert worker_2.snapshot() == {"u2": {"start_time": 2, "username": "bia", "task_name": "Leitura"}}
@@ -0,0 +1,41 @@
+from app.utils.rate_limit import SocketRateLimiter, EventPolicy, COALESCE, slow_consumers
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_bucket_allows_burst_then_refills_per_sid_and_event():
+    clock = FakeClock()
+    limiter = SocketRateLimiter({"get_focus_users": EventPolicy(rate=2, burst=3, on_limit=COALESCE)},
+                                default=EventPolicy(rate=1, burst=1), clock=clock)
+
+    assert [limiter.check("a", "get_focus_users") for _ in range(3)] == [0, 0, 0]
+    assert limiter.check("a", "get_focus_users") == 0.5
+    assert limiter.check("b", "get_focus_users") == 0  # outro sid, outro bucket
+    assert limiter.check("a", "other") == 0 and limiter.check("a", "other") == 1.0
+
+    clock.now = 0.5
+    assert limiter.check("a", "get_focus_users") == 0
+
+
+def test_coalesce_keeps_only_latest_args_and_forget_drops_state():
+    limiter = SocketRateLimiter({}, default=EventPolicy(rate=1, burst=1, on_limit=COALESCE), clock=FakeClock())
+    assert limiter.defer("a", "focus", ("enter",)) is True
+    assert limiter.defer("a", "focus", ("leave",)) is False
+    assert limiter.pop_pending("a", "focus") == ("leave",)
+    assert limiter.pop_pending("a", "focus") is None
+
+    limiter.check("a", "focus")
+    limiter.defer("a", "focus", ("enter",))
+    limiter.forget("a")
+    assert limiter.pop_pending("a", "focus") is None
+    assert limiter.check("a", "focus") == 0  # bucket novo
+
+
+def test_slow_consumers():
+    assert slow_consumers([("a", 10), ("b", 300), ("c", 256)], max_packets=256) == ["b"]
@@ -0,0 +1,23 @@
+from datetime import date, datetime
+
+import pytest
+
+from app.utils.timezones import get_zone, local_date, local_day_range_utc, to_utc
+
+
+def test_to_utc_reads_naive_values_in_user_timezone():
+    assert to_utc(datetime(2025, 1, 15, 9, 0), "America/Sao_Paulo") == datetime(2025, 1, 15, 12, 0)
+    assert to_utc(datetime.fromisoformat("2025-01-15T09:00:00+01:00"), "America/Sao_Paulo") == datetime(2025, 1, 15, 8, 0)
+
+
+def test_local_day_range_follows_dst():
+    # Dia da mudança para o horário de verão em Berlim: 23 horas.
+    start, end = local_day_range_utc(date(2025, 3, 30), date(2025, 3, 30), "Europe/Berlin")
+
+    assert (start, end) == (datetime(2025, 3, 29, 23, 0), datetime(2025, 3, 30, 22, 0))
+    assert local_date(datetime(2025, 3, 30, 22, 30), "Europe/Berlin") == date(2025, 3, 31)
+
+
+def test_get_zone_rejects_unknown_names():
+    with pytest.raises(ValueError):
+        get_zone("Mars/Olympus_Mons")
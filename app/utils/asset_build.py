@@ -0,0 +1,212 @@
+# Build dos assets estáticos: junta os scripts de cada página em um bundle, minifica, grava com o hash do
+# conteúdo no nome (static/dist/...) e gera as variantes .gz e .br ao lado, mais o manifest.json lido
+# por app/utils/assets.py. Rodar no deploy com `flask assets build`.
+#
+# Os minificadores são conservadores: tiram comentários e espaços fora de strings, template literals e
+# regex, mas mantêm as quebras de linha do JS (a inserção automática de ponto e vírgula continua igual).
+
+import gzip
+import hashlib
+import json
+import os
+from typing import Dict, List
+
+try:
+    import brotli
+except ImportError:  # opcional: sem o pacote, só as variantes .gz são geradas
+    brotli = None
+
+from app.utils.assets import BUNDLES, DIST_DIR, MANIFEST_NAME, STANDALONE_ASSETS
+from app.utils.logger import logger
+
+HASH_LENGTH = 12
+
+_REGEX_PRECEDERS = set("(,=:[!&|?{};+-*%<>~^")
+_KEYWORDS_BEFORE_EXPRESSION = {
+    "return", "typeof", "instanceof", "in", "of", "new", "delete", "void", "throw", "case", "do", "else", "yield", "await",
+}
+
+
+def _is_word(ch: str) -> bool:
+    return bool(ch) and (ch.isalnum() or ch in "_$" or ord(ch) > 127)
+
+
+def _end_of_string(source: str, i: int) -> int:
+    """Índice logo após a string/template literal que começa em source[i]."""
+    quote, n = source[i], len(source)
+    i += 1
+    while i < n:
+        c = source[i]
+        if c == "\\":
+            i += 2
+            continue
+        if c == quote:
+            return i + 1
+        if quote == "`" and source.startswith("${", i):
+            i += 2
+            depth = 1
+            while i < n and depth:
+                c = source[i]
+                if c in "'\"`":
+                    i = _end_of_string(source, i)
+                    continue
+                depth += c == "{"
+                depth -= c == "}"
+                i += 1
+            continue
+        i += 1
+    return n
+
+
+def _end_of_regex(source: str, i: int) -> int:
+    """Índice logo após a regex literal em source[i], ou -1 se não for uma regex (ex.: quebra de linha)."""
+    n, in_class = len(source), False
+    i += 1
+    while i < n:
+        c = source[i]
+        if c == "\n":
+            return -1
+        if c == "\\":
+            i += 2
+            continue
+        if c == "[":
+            in_class = True
+        elif c == "]":
+            in_class = False
+        elif c == "/" and not in_class:
+            i += 1
+            while i < n and _is_word(source[i]):
+                i += 1
+            return i
+        i += 1
+    return -1
+
+
+def minify_js(source: str) -> str:
+    out: List[str] = []
+    last, last_word = "", ""
+    pending_space = pending_newline = False
+    i, n = 0, len(source)
+    while i < n:
+        c = source[i]
+        if c == "\n":
+            pending_newline = True
+            i += 1
+            continue
+        if c.isspace():
+            pending_space = True
+            i += 1
+            continue
+        if source.startswith("//", i):
+            end = source.find("\n", i)
+            i = n if end == -1 else end
+            continue
+        if source.startswith("/*", i):
+            end = source.find("*/", i + 2)
+            i = n if end == -1 else end + 2
+            pending_space = True
+            continue
+
+        if out and pending_newline:
+            out.append("\n")
+        elif out and pending_space and (
+            (_is_word(last) and _is_word(c)) or (last in "+-" and c in "+-") or (last.isdigit() and c == ".")
+        ):
+            out.append(" ")
+        pending_space = pending_newline = False
+
+        word = ""
+        if c in "'\"`":
+            end = _end_of_string(source, i)
+        elif c == "/" and (not last or last in _REGEX_PRECEDERS or last_word in _KEYWORDS_BEFORE_EXPRESSION) \
+                and _end_of_regex(source, i) != -1:
+            end = _end_of_regex(source, i)
+        elif _is_word(c):
+            end = i + 1
+            while end < n and _is_word(source[end]):
+                end += 1
+            word = source[i:end]
+        else:
+            end = i + 1
+        out.append(source[i:end])
+        last, last_word = source[end - 1], word
+        i = end
+    return "".join(out)
+
+
+def minify_css(source: str) -> str:
+    out: List[str] = []
+    pending_space = False
+    i, n = 0, len(source)
+    while i < n:
+        c = source[i]
+        if source.startswith("/*", i):
+            end = source.find("*/", i + 2)
+            i = n if end == -1 else end + 2
+            pending_space = True
+            continue
+        if c.isspace():
+            pending_space = True
+            i += 1
+            continue
+        if pending_space and out and out[-1][-1] not in "{};,:>" and c not in "{};,>":
+            out.append(" ")
+        pending_space = False
+        if c in "'\"":
+            end = _end_of_string(source, i)
+        elif c == "}" and out and out[-1] == ";":
+            out.pop()
+            end = i + 1
+        else:
+            end = i + 1
+        out.append(source[i:end])
+        i = end
+    return "".join(out)
+
+
+def _write(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def build_assets(static_folder: str) -> Dict[str, Dict]:
+    """Gera static/dist e devolve o manifest gravado."""
+    manifest = {"assets": {}, "encodings": {}}
+    sources = dict(BUNDLES)
+    sources.update({name: [name] for name in STANDALONE_ASSETS})
+
+    for name, files in sources.items():
+        parts = []
+        for file in files:
+            with open(os.path.join(static_folder, file), encoding="utf-8") as f:
+                parts.append(f.read())
+        if name.endswith(".css"):
+            data = "\n".join(minify_css(part) for part in parts).encode()
+        else:
+            # Cada arquivo fecha com ";" para o próximo não continuar a última expressão do anterior.
+            data = "\n;".join(minify_js(part) for part in parts).encode()
+
+        base, ext = os.path.splitext(name)
+        hashed = f"{DIST_DIR}/{base}.{hashlib.sha256(data).hexdigest()[:HASH_LENGTH]}{ext}"
+        path = os.path.join(static_folder, hashed)
+        _write(path, data)
+
+        encodings = []
+        variants = [("br", ".br", lambda d: brotli.compress(d, quality=11))] if brotli else []
+        variants.append(("gzip", ".gz", lambda d: gzip.compress(d, compresslevel=9, mtime=0)))
+        for encoding, suffix, compress in variants:
+            compressed = compress(data)
+            if len(compressed) < len(data):
+                _write(path + suffix, compressed)
+                encodings.append(encoding)
+
+        manifest["assets"][name] = hashed
+        manifest["encodings"][hashed] = encodings
+        logger.info(f"Assets: {name} -> {hashed} ({len(data)} bytes, {', '.join(encodings) or 'uncompressed'})")
+
+    if brotli is None:
+        logger.warning("Assets: package 'brotli' not installed; only gzip variants were written.")
+
+    _write(os.path.join(static_folder, DIST_DIR, MANIFEST_NAME), json.dumps(manifest, indent=2, sort_keys=True).encode())
+    return manifest
@@ -0,0 +1,97 @@
+# Assets com hash no nome (gerados por app/utils/asset_build.py) e como o Flask os resolve e serve.
+#
+# - url_for('static', filename='css/app.css') passa pelo manifest e vira static/dist/css/app.<hash>.css;
+# - asset_urls('js/my_projects.bundle.js') no template devolve o bundle, ou os arquivos de origem
+#   quando ainda não houve build (desenvolvimento);
+# - arquivos de static/dist nunca mudam de conteúdo: saem com cache imutável de um ano e, se o
+#   navegador aceitar, na variante .br/.gz já comprimida no build.
+
+import json
+import mimetypes
+import os
+from typing import Dict, List
+
+from flask import current_app, request, send_from_directory, url_for
+
+from app.utils.logger import logger
+
+DIST_DIR = "dist"
+MANIFEST_NAME = "manifest.json"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Scripts de cada página, na mesma ordem em que eram incluídos.
+BUNDLES: Dict[str, List[str]] = {
+    "js/my_projects.bundle.js": [
+        "js/my_projects/project_card_charts.js",
+        "js/my_projects/project_handler.js",
+        "js/my_projects/jquery.heatmap.js",
+        "js/my_projects/heatmap_init.js",
+        "js/my_projects/focus_users_display..js",
+        "js/toast.js",
+        "js/auth/logout.js",
+    ],
+    "js/project_room.bundle.js": [
+        "js/toast.js",
+        "js/project_room/timer.js",
+        "js/project_room/task_handler.js",
+        "js/project_room/tooltip_init.js",
+    ],
+    "js/login.bundle.js": ["js/toast.js", "js/auth/login.js"],
+    "js/register.bundle.js": ["js/toast.js", "js/auth/register.js"],
+}
+STANDALONE_ASSETS = ["css/app.css", "css/login.css"]
+
+_ENCODING_SUFFIXES = (("br", ".br"), ("gzip", ".gz"))
+
+_manifest: Dict[str, Dict] = {"assets": {}, "encodings": {}}
+
+
+def load_manifest(app) -> Dict[str, Dict]:
+    """Lê static/dist/manifest.json; sem build, os assets são servidos a partir dos arquivos de origem."""
+    global _manifest
+    path = os.path.join(app.static_folder, DIST_DIR, MANIFEST_NAME)
+    try:
+        with open(path, encoding="utf-8") as f:
+            _manifest = json.load(f)
+        logger.info(f"Assets: loaded manifest with {len(_manifest['assets'])} assets from {path}")
+    except FileNotFoundError:
+        _manifest = {"assets": {}, "encodings": {}}
+    return _manifest
+
+
+def asset_urls(name: str) -> List[str]:
+    if name in _manifest["assets"] or name not in BUNDLES:
+        return [url_for("static", filename=name)]
+    return [url_for("static", filename=file) for file in BUNDLES[name]]
+
+
+def _fingerprint_static_urls(endpoint, values):
+    if endpoint == "static":
+        hashed = _manifest["assets"].get(values.get("filename"))
+        if hashed:
+            values["filename"] = hashed
+
+
+def serve_static(filename):
+    if not filename.startswith(DIST_DIR + "/"):
+        return current_app.send_static_file(filename)
+
+    mimetype = mimetypes.guess_type(filename)[0]
+    available = _manifest["encodings"].get(filename, ())
+    for encoding, suffix in _ENCODING_SUFFIXES:
+        if encoding in available and request.accept_encodings[encoding]:
+            response = send_from_directory(current_app.static_folder, filename + suffix, mimetype=mimetype)
+            response.headers["Content-Encoding"] = encoding
+            break
+    else:
+        response = send_from_directory(current_app.static_folder, filename, mimetype=mimetype)
+    response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+def register_assets(app) -> None:
+    load_manifest(app)
+    app.url_defaults(_fingerprint_static_urls)
+    app.view_functions["static"] = serve_static
+    app.jinja_env.globals["asset_urls"] = asset_urls
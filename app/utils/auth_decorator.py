@@ -1,7 +1,8 @@
 from functools import wraps
-from flask import request, current_app, redirect, url_for, jsonify
+from flask import request, current_app, redirect, url_for
 import jwt
 from app.infra.repository.user_repository import UserRepository
+from app.utils.responses import error_response
 
 
 
@@ -37,6 +38,22 @@ def login_required(f):
     return decorated_function
 
 
+def admin_required(f):
+    """Depois do login_required: só usuários com identificator em ADMIN_USER_IDS. Para os outros, a rota não existe.
+
+    Pelo identificator, não pelo username: o username é escolhido no cadastro público, então um nome de admin
+    ainda não cadastrado (ou de uma conta apagada) poderia ser registrado por qualquer um.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        user = getattr(request, "current_user", None)
+        if user is None or user.identificator not in current_app.config["ADMIN_USER_IDS"]:
+            return error_response(404, "Not found.", "NotFound")
+        return f(*args, **kwargs)
+
+    return decorated_function
+
+
 def redirect_if_logged_in(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
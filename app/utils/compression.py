@@ -0,0 +1,135 @@
+# Compressão das respostas dinâmicas (HTML, JSON, NDJSON/CSV), registrada em create_app.
+#
+# - negocia br (se o pacote brotli estiver instalado) ou gzip pelo Accept-Encoding;
+# - ignora corpos pequenos, tipos que não compensam (imagens, application/gzip), respostas que já têm
+#   Content-Encoding (variantes .br/.gz de static/dist) e arquivos servidos por send_file;
+# - respostas em streaming são comprimidas por chunk com flush, então cada chunk continua saindo assim
+#   que é gerado (o TTFB das páginas em streaming não piora);
+# - por rota: bytes antes/depois, taxa de compressão e tempo de CPU em /metrics.
+
+import gzip
+import time
+import zlib
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # opcional: sem o pacote, só gzip
+    brotli = None
+
+from app.utils.metrics import metrics
+
+COMPRESSIBLE_MIMETYPES = {
+    "text/html", "text/css", "text/plain", "text/csv", "text/javascript",
+    "application/json", "application/javascript", "application/x-ndjson", "image/svg+xml",
+}
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4  # respostas dinâmicas: qualidade baixa, bem mais rápida que a 11 usada no build dos assets
+
+
+def _choose_encoding():
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"] and accepted["br"] >= accepted["gzip"]:
+        return "br"
+    if accepted["gzip"]:
+        return "gzip"
+    return None
+
+
+def _record(route: str, bytes_in: int, bytes_out: int, cpu_ms: float) -> None:
+    prefix = f"compression.{route}"
+    metrics.incr(f"{prefix}.bytes_in", bytes_in)
+    metrics.incr(f"{prefix}.bytes_out", bytes_out)
+    metrics.observe(f"{prefix}.cpu", cpu_ms)
+    metrics.register_gauge(f"{prefix}.ratio", lambda: _ratio(prefix))
+
+
+def _ratio(prefix: str) -> float:
+    bytes_in = metrics.counter(f"{prefix}.bytes_in")
+    return round(metrics.counter(f"{prefix}.bytes_out") / bytes_in, 4) if bytes_in else 0.0
+
+
+def _compressor(encoding: str):
+    """(compress(chunk), flush(), finish()) para um stream."""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        return compressor.process, compressor.flush, compressor.finish
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # wbits 16+: cabeçalho gzip
+    return compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+
+def _compress_stream(body, encoding: str, route: str):
+    compress, flush, finish = _compressor(encoding)
+    bytes_in = bytes_out = 0
+    cpu = 0.0
+    try:
+        for chunk in body:
+            if not chunk:
+                continue
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            started = time.thread_time()
+            data = compress(chunk) + flush()
+            cpu += time.thread_time() - started
+            bytes_in += len(chunk)
+            bytes_out += len(data)
+            yield data
+        started = time.thread_time()
+        data = finish()
+        cpu += time.thread_time() - started
+        bytes_out += len(data)
+        yield data
+        _record(route, bytes_in, bytes_out, cpu * 1000)
+    finally:
+        # O iterável original (ex.: stream_with_context) fecha o contexto da requisição no close().
+        close = getattr(body, "close", None)
+        if close:
+            close()
+
+
+def compress_response(response, min_size: int):
+    if (
+        request.method == "HEAD"
+        or response.status_code < 200 or response.status_code in (204, 304)
+        or response.direct_passthrough
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+        or "no-transform" in response.headers.get("Cache-Control", "")
+    ):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    if not response.is_streamed and (response.content_length or 0) < min_size:
+        return response
+    encoding = _choose_encoding()
+    if encoding is None:
+        return response
+
+    route = request.url_rule.rule if request.url_rule else "unmatched"
+    if response.is_streamed:
+        response.response = _compress_stream(response.response, encoding, route)
+        response.headers.pop("Content-Length", None)
+    else:
+        body = response.get_data()
+        started = time.thread_time()
+        if encoding == "br":
+            data = brotli.compress(body, quality=BROTLI_QUALITY)
+        else:
+            data = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+        _record(route, len(body), len(data), (time.thread_time() - started) * 1000)
+        response.set_data(data)
+
+    response.headers["Content-Encoding"] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def register_compression(app) -> None:
+    min_size = app.config["COMPRESS_MIN_SIZE"]
+
+    @app.after_request
+    def _compress(response):
+        return compress_response(response, min_size)
@@ -0,0 +1,70 @@
+# Cache de fragmentos de template (cards de projeto, listas de tarefas), em memória e por processo.
+#
+# A chave inclui a versão dos dados do fragmento, calculada a partir do que ele exibe; quando os dados
+# mudam a chave muda e a entrada antiga só sai pelo LRU, então não há invalidação entre workers.
+#
+# Uso no template (o corpo do call só é renderizado em cache miss):
+#   {% call cached_fragment("task_list", project_id, version) %} ... {% endcall %}
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable, Optional
+
+from markupsafe import Markup
+
+from app.utils.metrics import metrics
+
+HIT = "template.fragment_cache.hit"
+MISS = "template.fragment_cache.miss"
+
+
+def data_version(rows: Iterable[Iterable[Any]]) -> str:
+    """Versão curta e estável (entre processos) de uma sequência de linhas."""
+    digest = hashlib.blake2b(digest_size=12)
+    for row in rows:
+        digest.update(repr(tuple(row)).encode())
+        digest.update(b"\x1e")
+    return digest.hexdigest()
+
+
+class FragmentCache:
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Markup]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Markup]:
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+            return html
+
+    def set(self, key: Hashable, html: Markup) -> None:
+        with self._lock:
+            self._entries[key] = html
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def render(self, name: str, *key: Hashable, caller: Callable[[], str]) -> Markup:
+        cache_key = (name, *key)
+        html = self.get(cache_key)
+        if html is not None:
+            metrics.incr(HIT)
+            return html
+        metrics.incr(MISS)
+        html = Markup(caller())
+        self.set(cache_key, html)
+        return html
+
+
+fragment_cache = FragmentCache()
@@ -0,0 +1,54 @@
+import json
+from typing import Any, Iterator, TextIO
+
+
+def iter_json_array(file: TextIO, chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """Itera os elementos de um array JSON de topo lendo o arquivo em blocos.
+
+    A memória fica limitada ao maior elemento do array, não ao tamanho do arquivo.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buffer, pos, eof
+        chunk = file.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    def skip(chars: str) -> None:
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in chars:
+                pos += 1
+            if pos < len(buffer) or not fill():
+                return
+
+    skip(" \t\r\n")
+    if pos >= len(buffer) or buffer[pos] != "[":
+        raise ValueError("Expected a top-level JSON array.")
+    pos += 1
+
+    while True:
+        skip(" \t\r\n,")
+        if pos >= len(buffer):
+            raise ValueError("Unexpected end of file inside JSON array.")
+        if buffer[pos] == "]":
+            return
+        try:
+            element, end = decoder.raw_decode(buffer, pos)
+            # Um valor que termina exatamente no fim do buffer pode estar truncado (ex.: número).
+            if end == len(buffer) and not eof:
+                raise json.JSONDecodeError("Possibly truncated value", buffer, end)
+        except json.JSONDecodeError:
+            if eof or not fill():
+                raise
+            continue
+        pos = end
+        yield element
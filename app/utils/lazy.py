@@ -0,0 +1,59 @@
+# Construção preguiçosa dos controllers nos módulos de rotas.
+#
+#   task_controller = lazy_instance("app.controllers.task_controller:TaskController")
+#
+# Registrar o blueprint não importa o controller, nem os services e repositories que ele puxa: o import e o
+# construtor rodam no primeiro acesso a um atributo (a primeira requisição da rota, ou o warm-up do launcher).
+# O objeto devolvido repassa getattr/setattr/delattr para a instância, então monkeypatch nos testes continua valendo.
+
+import threading
+from importlib import import_module
+from typing import Any
+
+
+def import_string(path: str) -> Any:
+    """"pacote.modulo:Nome" -> objeto."""
+    module_name, _, name = path.partition(":")
+    if not name:
+        raise ValueError(f"Expected 'module:name', got '{path}'.")
+    return getattr(import_module(module_name), name)
+
+
+class LazyInstance:
+    __slots__ = ("_instance", "_lock", "_path")
+
+    def __init__(self, path: str):
+        object.__setattr__(self, "_path", path)
+        object.__setattr__(self, "_instance", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    @property
+    def loaded(self) -> bool:
+        return object.__getattribute__(self, "_instance") is not None
+
+    def load(self) -> Any:
+        instance = object.__getattribute__(self, "_instance")
+        if instance is None:
+            with object.__getattribute__(self, "_lock"):
+                instance = object.__getattribute__(self, "_instance")
+                if instance is None:
+                    instance = import_string(self._path)()
+                    object.__setattr__(self, "_instance", instance)
+        return instance
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.load(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self.load(), name, value)
+
+    def __delattr__(self, name: str) -> None:
+        delattr(self.load(), name)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<LazyInstance {self._path} ({state})>"
+
+
+def lazy_instance(path: str) -> LazyInstance:
+    return LazyInstance(path)
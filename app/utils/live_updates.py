@@ -0,0 +1,46 @@
+# Eventos enviados pelo servidor para as abas abertas de um usuário (sala privada user:<id>, em que todo
+# socket autenticado entra no connect; ver app/websocket.py).
+#
+# O envio é best-effort e acontece depois do commit: uma falha aqui nunca desfaz a operação que originou o
+# evento, e quem perdeu o evento vê os números certos no próximo carregamento da página. Com vários processos
+# web, o SocketIO precisa de message_queue para o evento chegar a sockets conectados em outro processo.
+
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterable, List, Tuple
+
+from app.extensions import socketio
+from app.utils.logger import logger
+from app.utils.metrics import metrics
+from app.utils.timezones import local_today, first_day_of_week
+
+PROJECT_TIME_DELTA = "project_time_delta"
+
+
+def user_room(user_id: str) -> str:
+    return f"user:{user_id}"
+
+
+def group_room(group_id: int) -> str:
+    return f"group:{group_id}"
+
+
+def project_time_deltas(project_id: str, seconds_by_day: Iterable[Tuple[date, int]], tz_name: str) -> List[Dict]:
+    """Um delta por dia local, já marcado como de hoje/desta semana no fuso do usuário."""
+    today = local_today(tz_name)
+    totals: Dict[date, int] = defaultdict(int)
+    for day, seconds in seconds_by_day:
+        totals[day] += seconds
+    return [
+        {"project_id": project_id, "day": day.isoformat(), "seconds": seconds,
+         "today": day == today, "week": first_day_of_week(today) <= day <= today}
+        for day, seconds in sorted(totals.items())
+    ]
+
+
+def push_to_user(user_id: str, event: str, payload: Dict) -> None:
+    try:
+        socketio.emit(event, payload, to=user_room(user_id))
+        metrics.incr(f"live_updates.{event}")
+    except Exception as e:
+        logger.warning(f"LiveUpdates: Failed to push '{event}' to user '{user_id}': {e}")
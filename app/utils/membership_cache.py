@@ -0,0 +1,47 @@
+# Cache em memória, por processo, da pertinência a grupos de foco (ver app/services/focus_group_service.py).
+#
+# O connect do websocket e cada evento de presença perguntam "em quais grupos este usuário está"; a resposta
+# só muda quando alguém entra ou sai de um grupo. O processo que faz a mudança invalida a entrada na hora; nos
+# outros workers a entrada expira depois de ttl_seconds, que é o atraso máximo para eles verem a mudança.
+
+import threading
+import time
+from typing import Callable, Dict, Hashable, Tuple
+
+from app.utils.metrics import metrics
+
+
+class MembershipCache:
+    def __init__(self, name: str, ttl_seconds: float = 60, max_entries: int = 50_000):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, Tuple[float, Tuple]] = {}
+        metrics.register_gauge(f"{name}.entries", lambda: len(self._entries))
+
+    def get(self, key: Hashable, load: Callable[[], Tuple]) -> Tuple:
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > now:
+            metrics.incr(f"{self.name}.hit")
+            return entry[1]
+
+        metrics.incr(f"{self.name}.miss")
+        value = tuple(load())
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                # Cheio: descarta o que já expirou; se nada expirou, recomeça do zero (só custa recarregar).
+                expired = [k for k, (expires_at, _) in self._entries.items() if expires_at <= now]
+                for k in expired or list(self._entries):
+                    del self._entries[k]
+            self._entries[key] = (now + self.ttl_seconds, value)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,56 @@
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, Any
+
+
+class MetricsRegistry:
+    """Contadores, tempos e valores derivados do processo, expostos em /metrics. Thread-safe e sem dependências."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = defaultdict(int)
+        self._timings: Dict[str, Dict[str, float]] = {}
+        self._gauges: Dict[str, Callable[[], Any]] = {}
+
+    def incr(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += value
+
+    def observe(self, name: str, value_ms: float) -> None:
+        with self._lock:
+            timing = self._timings.get(name)
+            if timing is None:
+                self._timings[name] = {"count": 1, "total_ms": value_ms, "max_ms": value_ms}
+            else:
+                timing["count"] += 1
+                timing["total_ms"] += value_ms
+                timing["max_ms"] = max(timing["max_ms"], value_ms)
+
+    def register_gauge(self, name: str, fn: Callable[[], Any]) -> None:
+        """Valor calculado na leitura (ex.: taxa de acerto a partir de dois contadores)."""
+        self._gauges[name] = fn
+
+    def counter(self, name: str) -> int:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+            timings = {
+                name: {**timing, "mean_ms": round(timing["total_ms"] / timing["count"], 3)}
+                for name, timing in self._timings.items()
+            }
+        return {
+            "counters": counters,
+            "timings": timings,
+            "gauges": {name: fn() for name, fn in self._gauges.items()},
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._timings.clear()
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,167 @@
+# Master pre-fork: o app é importado e aquecido uma vez no master, e os workers nascem com os.fork(), herdando
+# módulos, SQL compilado e templates em páginas compartilhadas copy-on-write.
+#
+# gc.freeze() logo antes do fork move tudo que o master criou para a geração permanente do GC: as coletas dos
+# workers não visitam esses objetos (nem escrevem nos cabeçalhos deles), então as páginas continuam
+# compartilhadas. O master desliga o GC durante o aquecimento (não abre buracos nas páginas) e cada worker
+# o religa ao nascer. Só em sistemas com fork; memória por worker vem de /proc (Linux).
+
+import gc
+import os
+import signal
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+
+from app.utils.logger import logger
+from app.utils.metrics import metrics
+
+# Um worker que morre antes disso é refeito só depois da mesma espera (evita fork em laço se o boot quebra).
+MIN_WORKER_LIFETIME_SECONDS = 1.0
+
+
+def parse_smaps_rollup(text: str) -> Dict[str, int]:
+    values = {}
+    for line in text.splitlines():
+        key, _, rest = line.partition(":")
+        parts = rest.split()
+        if len(parts) == 2 and parts[1] == "kB":
+            values[key.strip()] = int(parts[0])
+    return {
+        "rss_kb": values.get("Rss", 0),
+        "pss_kb": values.get("Pss", 0),  # RSS com cada página compartilhada dividida entre quem a usa
+        "shared_kb": values.get("Shared_Clean", 0) + values.get("Shared_Dirty", 0),
+        "private_kb": values.get("Private_Clean", 0) + values.get("Private_Dirty", 0),
+    }
+
+
+def read_memory(pid: int) -> Dict[str, int]:
+    """Memória do processo em kB (rss, pss, shared, private); vazio fora do Linux ou se o processo já saiu."""
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            return parse_smaps_rollup(f.read())
+    except OSError:
+        return {}
+
+
+@dataclass
+class Worker:
+    index: int
+    pid: int
+    fork_ms: float
+    started_at: float
+
+
+class PreforkMaster:
+    def __init__(self, target: Callable[[int], None], workers: int):
+        if workers < 1:
+            raise ValueError("workers must be at least 1.")
+        self.target = target
+        self.size = workers
+        self.workers: Dict[int, Worker] = {}
+        self.stopping = False
+
+    def start(self) -> List[Worker]:
+        gc.freeze()
+        return [self.spawn(index) for index in range(self.size)]
+
+    def spawn(self, index: int) -> Worker:
+        started_at = time.perf_counter()
+        pid = os.fork()
+        if pid == 0:
+            self._run_worker(index)
+        worker = Worker(index=index, pid=pid, fork_ms=round((time.perf_counter() - started_at) * 1000, 2),
+                        started_at=time.monotonic())
+        self.workers[pid] = worker
+        metrics.incr("prefork.spawned")
+        logger.info(f"Prefork: Worker {index} started (pid {pid}, fork {worker.fork_ms} ms).")
+        return worker
+
+    def _run_worker(self, index: int) -> None:
+        code = 0
+        try:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            gc.enable()
+            self.target(index)
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else 1
+        except BaseException:
+            logger.exception(f"Prefork: Worker {index} crashed.")
+            code = 1
+        finally:
+            os._exit(code)  # nunca volta para o código do master (atexit, finally, testes)
+
+    def report(self) -> Dict:
+        return {
+            "master": {"pid": os.getpid(), **read_memory(os.getpid())},
+            "frozen_objects": gc.get_freeze_count(),
+            "workers": [{"index": w.index, "pid": w.pid, "fork_ms": w.fork_ms, **read_memory(w.pid)}
+                        for w in sorted(self.workers.values(), key=lambda w: w.index)],
+        }
+
+    def log_report(self) -> None:
+        report = self.report()
+        master = report["master"]
+        logger.info(f"Prefork: master pid {master['pid']} rss={master.get('rss_kb')}kB, {report['frozen_objects']} frozen objects.")
+        for worker in report["workers"]:
+            logger.info(f"Prefork: worker {worker['index']} pid {worker['pid']} fork={worker['fork_ms']}ms "
+                        f"rss={worker.get('rss_kb')}kB pss={worker.get('pss_kb')}kB shared={worker.get('shared_kb')}kB "
+                        f"private={worker.get('private_kb')}kB")
+
+    def reap(self) -> List[Worker]:
+        """Recolhe os workers que saíram (sem bloquear)."""
+        exited = []
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            worker = self.workers.pop(pid, None)
+            if worker is not None:
+                exited.append(worker)
+                if not self.stopping:
+                    logger.warning(f"Prefork: Worker {worker.index} (pid {pid}) exited with status {os.waitstatus_to_exitcode(status)}.")
+        return exited
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """SIGTERM para todos os workers; SIGKILL nos que não saírem em `timeout` segundos."""
+        self.stopping = True
+        for pid in list(self.workers):
+            self._signal(pid, signal.SIGTERM)
+        deadline = time.monotonic() + timeout
+        while self.workers and time.monotonic() < deadline:
+            self.reap()
+            time.sleep(0.05)
+        for pid in list(self.workers):
+            self._signal(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+            self.workers.pop(pid, None)
+
+    def run(self, report_interval: float = 60.0) -> None:
+        """Inicia os workers e fica vigiando: refaz os que morrerem e registra o relatório de memória."""
+        signal.signal(signal.SIGTERM, lambda *_: setattr(self, "stopping", True))
+        signal.signal(signal.SIGINT, lambda *_: setattr(self, "stopping", True))
+        self.start()
+        next_report = time.monotonic() + min(report_interval, 5.0) if report_interval else None
+        while not self.stopping:
+            for worker in self.reap():
+                if time.monotonic() - worker.started_at < MIN_WORKER_LIFETIME_SECONDS:
+                    time.sleep(MIN_WORKER_LIFETIME_SECONDS)
+                if not self.stopping:
+                    self.spawn(worker.index)
+            if next_report is not None and time.monotonic() >= next_report:
+                self.log_report()
+                next_report = time.monotonic() + report_interval
+            time.sleep(0.2)
+        logger.info("Prefork: Stopping workers.")
+        self.stop()
+
+    @staticmethod
+    def _signal(pid: int, signum: int) -> None:
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
@@ -0,0 +1,80 @@
+# Aquecimento do processo antes de atender requisições: o que a primeira requisição de cada rota pagaria
+# (import e construção dos controllers, SQL compilado, templates, status de tarefa) é feito uma vez.
+#
+# No launcher pre-fork (python prefork.py) isso roda no master, e os workers herdam o resultado em páginas
+# copy-on-write em vez de refazer tudo a cada processo.
+
+import importlib
+import pkgutil
+import sys
+import time
+from typing import Dict
+
+from sqlalchemy import Select
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.utils.lazy import LazyInstance
+from app.utils.logger import logger
+
+
+def warm_controllers(app) -> int:
+    """Constrói os controllers preguiçosos (lazy_instance) dos módulos de rotas registrados no app."""
+    modules = {sys.modules[view.__module__] for view in app.view_functions.values()}
+    controllers = [value for module in modules for value in vars(module).values() if isinstance(value, LazyInstance)]
+    for controller in controllers:
+        controller.load()
+    return len(controllers)
+
+
+def warm_templates(app) -> int:
+    """Compila todos os templates .html (cache em memória do ambiente e bytecode cache em disco)."""
+    env = app.jinja_env
+    names = [name for name in env.list_templates() if name.endswith(".html")]
+    for name in names:
+        env.get_template(name)
+    return len(names)
+
+
+def warm_compiled_statements(session) -> int:
+    """Executa uma vez as consultas quentes dos repositories (os `_SELECT_*` de cada módulo) com parâmetros nulos.
+
+    Nada volta do banco, mas o SQL compilado de cada uma fica no cache de compilação do Engine.
+    """
+    import app.infra.repository as repositories
+
+    warmed = 0
+    for info in pkgutil.iter_modules(repositories.__path__):
+        module = importlib.import_module(f"{repositories.__name__}.{info.name}")
+        for name, statement in vars(module).items():
+            if not (name.startswith("_SELECT_") and isinstance(statement, Select)):
+                continue
+            binds = statement.compile().binds.values()
+            params = {bind.key: [] if bind.expanding else None for bind in binds if bind.value is None and bind.callable is None}
+            try:
+                session.execute(statement, params).all()
+                warmed += 1
+            except SQLAlchemyError as e:
+                # O SQL já foi compilado (e guardado) antes de o banco recusar os parâmetros nulos.
+                logger.debug(f"Preload: {module.__name__}.{name} did not run with null parameters: {e}")
+                session.rollback()
+    session.rollback()
+    return warmed
+
+
+def preload(app) -> Dict[str, float]:
+    """Aquece tudo e devolve quantos itens de cada tipo, mais o tempo total."""
+    from app.infra.db import db
+    from app.services.task_service import TaskService
+
+    started_at = time.perf_counter()
+    with app.app_context():
+        result = {
+            "controllers": warm_controllers(app),
+            "templates": warm_templates(app),
+            "statements": warm_compiled_statements(db.session),
+            "task_statuses": TaskService().warm_status_cache(),
+        }
+        db.session.remove()
+    result["elapsed_ms"] = round((time.perf_counter() - started_at) * 1000, 1)
+    logger.info(f"Preload: {result}")
+    return result
@@ -0,0 +1,257 @@
+# Quem está em foco agora, mantido pelos eventos do Socket.IO (ver app/websocket.py).
+#
+# Um usuário pode ter várias abas (sids). Cada sid conectado está no índice sid -> usuário desde o connect, e
+# cada aba em foco tem a própria entrada; o usuário aparece no mapa público enquanto pelo menos uma aba estiver
+# em foco, com os dados da aba que entrou em foco por último. O disconnect remove o sid e as entradas dele, e
+# uma varredura periódica remove o que sobrar de sids que o servidor não vê mais (ou focos longos demais), então
+# o tamanho do mapa e de cada broadcast acompanha os usuários realmente ativos.
+#
+# O índice de sids é sempre do processo (um sid só existe no worker que tem a conexão). As entradas de foco
+# ficam num store com dois backends de mesma interface, como o leaderboard:
+# - MemoryFocusStore: por processo; serve com um único worker web;
+# - RedisFocusStore: um hash por usuário (sid -> entrada) compartilhado entre os workers, então a lista de
+#   quem está em foco e a entrada pública de quem tem abas em workers diferentes são as mesmas em todos.
+#   Cada entrada guarda o worker dono; cada worker renova um heartbeat na varredura, e a varredura de qualquer
+#   worker remove as entradas de workers cujo heartbeat expirou (processo morto sem disconnect).
+#   Precisa do pacote redis e de PRESENCE_REDIS_URL.
+
+import json
+import os
+import socket
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    import redis
+except ImportError:  # opcional: sem o pacote, só o backend em memória
+    redis = None
+
+from app.utils.metrics import metrics
+
+# (user_id, entrada pública ou None): None quando o usuário saiu de foco em todas as abas.
+PresenceChange = Tuple[str, Optional[Dict]]
+# sid -> entrada de foco (start_time, username, task_name, entered_at em epoch, owner)
+Tabs = Dict[str, Dict]
+
+
+class MemoryFocusStore:
+    shared = False  # cada processo tem o seu
+
+    def __init__(self):
+        self._focus: Dict[str, Tabs] = {}
+
+    def put(self, user_id: str, sid: str, entry: Dict) -> Tabs:
+        """Grava a entrada da aba e devolve todas as abas em foco do usuário."""
+        tabs = self._focus.setdefault(user_id, {})
+        tabs[sid] = entry
+        return dict(tabs)
+
+    def remove(self, user_id: str, sid: str) -> Optional[Tabs]:
+        """Remove a entrada da aba e devolve as que sobraram, ou None se a aba não estava em foco."""
+        tabs = self._focus.get(user_id)
+        if not tabs or tabs.pop(sid, None) is None:
+            return None
+        if not tabs:
+            del self._focus[user_id]
+        return dict(tabs)
+
+    def tabs(self, user_ids: Optional[Iterable[str]] = None) -> Dict[str, Tabs]:
+        users = self._focus if user_ids is None else [u for u in user_ids if u in self._focus]
+        return {user_id: dict(self._focus[user_id]) for user_id in users}
+
+    def heartbeat(self, owner: str, ttl_seconds: float) -> None:
+        pass
+
+    def live_owners(self, owners: Iterable[str]) -> Set[str]:
+        return set(owners)  # um processo só: toda entrada é dele
+
+    def count(self) -> int:
+        return len(self._focus)
+
+    def clear(self) -> None:
+        self._focus.clear()
+
+
+class RedisFocusStore:
+    shared = True
+
+    def __init__(self, url: str, prefix: str = "presence:"):
+        if redis is None:
+            raise RuntimeError("PRESENCE_REDIS_URL is set but the 'redis' package is not installed.")
+        self._redis = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def _key(self, user_id: str) -> str:
+        return f"{self.prefix}focus:{user_id}"
+
+    def _owner_key(self, owner: str) -> str:
+        return f"{self.prefix}owner:{owner}"
+
+    @staticmethod
+    def _decode(values: Dict[bytes, bytes]) -> Tabs:
+        return {sid.decode(): json.loads(entry) for sid, entry in values.items()}
+
+    def put(self, user_id: str, sid: str, entry: Dict) -> Tabs:
+        pipe = self._redis.pipeline()
+        pipe.hset(self._key(user_id), sid, json.dumps(entry))
+        pipe.hgetall(self._key(user_id))
+        return self._decode(pipe.execute()[1])
+
+    def remove(self, user_id: str, sid: str) -> Optional[Tabs]:
+        # MULTI/EXEC: o HGETALL vê exatamente o que sobrou depois do HDEL, mesmo com outros workers gravando.
+        pipe = self._redis.pipeline()
+        pipe.hdel(self._key(user_id), sid)
+        pipe.hgetall(self._key(user_id))
+        removed, remaining = pipe.execute()
+        return self._decode(remaining) if removed else None
+
+    def tabs(self, user_ids: Optional[Iterable[str]] = None) -> Dict[str, Tabs]:
+        if user_ids is None:
+            keys = list(self._redis.scan_iter(self._key("*")))
+            user_ids = [key.decode()[len(self._key("")):] for key in keys]
+        else:
+            user_ids = list(user_ids)
+        pipe = self._redis.pipeline(transaction=False)
+        for user_id in user_ids:
+            pipe.hgetall(self._key(user_id))
+        return {user_id: self._decode(values) for user_id, values in zip(user_ids, pipe.execute()) if values}
+
+    def heartbeat(self, owner: str, ttl_seconds: float) -> None:
+        self._redis.set(self._owner_key(owner), 1, px=int(ttl_seconds * 1000))
+
+    def live_owners(self, owners: Iterable[str]) -> Set[str]:
+        owners = list(owners)
+        pipe = self._redis.pipeline(transaction=False)
+        for owner in owners:
+            pipe.exists(self._owner_key(owner))
+        return {owner for owner, alive in zip(owners, pipe.execute()) if alive}
+
+    def count(self) -> int:
+        return sum(1 for _ in self._redis.scan_iter(self._key("*")))
+
+    def clear(self) -> None:
+        for key in self._redis.scan_iter(self.prefix + "*"):
+            self._redis.delete(key)
+
+
+class PresenceRegistry:
+    def __init__(self, max_focus_seconds: float = 12 * 3600, store=None):
+        self.max_focus_seconds = max_focus_seconds
+        self.store = store or MemoryFocusStore()
+        self._lock = threading.Lock()
+        self._sid_users: Dict[str, str] = {}
+        self._user_sids: Dict[str, Set[str]] = {}
+        self._usernames: Dict[str, str] = {}
+        metrics.register_gauge("presence.sids", lambda: len(self._sid_users))
+        metrics.register_gauge("presence.focused_users", lambda: self.store.count())
+
+    def use(self, store) -> None:
+        """Troca o store das entradas de foco (no boot, antes das conexões)."""
+        with self._lock:
+            self.store = store
+
+    @property
+    def owner(self) -> str:
+        # Calculado na hora: o registry é criado no import, antes do fork dos workers.
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    def connect(self, sid: str, user_id: str, username: str) -> None:
+        with self._lock:
+            self._sid_users[sid] = user_id
+            self._user_sids.setdefault(user_id, set()).add(sid)
+            self._usernames[user_id] = username
+
+    def user_for(self, sid: str) -> Optional[str]:
+        return self._sid_users.get(sid)
+
+    def tabs(self, user_id: str) -> int:
+        return len(self._user_sids.get(user_id, ()))
+
+    def sids(self, user_id: str) -> List[str]:
+        with self._lock:
+            return list(self._user_sids.get(user_id, ()))
+
+    def enter(self, sid: str, task_name: str, start_time) -> Optional[PresenceChange]:
+        with self._lock:
+            user_id = self._sid_users.get(sid)
+            if user_id is None:
+                return None
+            tabs = self.store.put(user_id, sid, {
+                "start_time": start_time, "username": self._usernames[user_id], "task_name": task_name,
+                "entered_at": time.time(), "owner": self.owner,
+            })
+            return user_id, self._public(tabs)
+
+    def leave(self, sid: str) -> Optional[PresenceChange]:
+        with self._lock:
+            return self._drop_focus(sid)
+
+    def disconnect(self, sid: str) -> Optional[PresenceChange]:
+        with self._lock:
+            change = self._drop_focus(sid)
+            self._forget(sid)
+            return change
+
+    def heartbeat(self, ttl_seconds: float) -> None:
+        """Marca este worker como vivo por `ttl_seconds`; as entradas dele só são varridas depois disso."""
+        self.store.heartbeat(self.owner, ttl_seconds)
+
+    def sweep(self, is_connected: Callable[[str], bool]) -> List[PresenceChange]:
+        """Remove sids que o servidor não conhece mais, focos mais longos que max_focus_seconds e, com o store
+        compartilhado, entradas de workers que pararam de renovar o heartbeat."""
+        now = time.time()
+        changes: List[PresenceChange] = []
+        with self._lock:
+            for sid in [sid for sid in self._sid_users if not is_connected(sid)]:
+                change = self._drop_focus(sid)
+                self._forget(sid)
+                if change:
+                    changes.append(change)
+            focus = self.store.tabs()
+            owners = {entry.get("owner") for tabs in focus.values() for entry in tabs.values()} - {self.owner}
+            live = self.store.live_owners(owners) | {self.owner}
+            for user_id, tabs in focus.items():
+                for sid, entry in tabs.items():
+                    if now - entry["entered_at"] > self.max_focus_seconds or entry.get("owner") not in live:
+                        change = self._remove(user_id, sid)
+                        if change:
+                            changes.append(change)
+        if changes:
+            metrics.incr("presence.swept", len(changes))
+        return changes
+
+    def snapshot(self, user_ids: Optional[List[str]] = None) -> Dict[str, Dict]:
+        with self._lock:
+            return {user_id: self._public(tabs) for user_id, tabs in self.store.tabs(user_ids).items()}
+
+    def _drop_focus(self, sid: str) -> Optional[PresenceChange]:
+        user_id = self._sid_users.get(sid)
+        return None if user_id is None else self._remove(user_id, sid)
+
+    def _remove(self, user_id: str, sid: str) -> Optional[PresenceChange]:
+        remaining = self.store.remove(user_id, sid)
+        if remaining is None:
+            return None
+        return user_id, self._public(remaining) if remaining else None
+
+    def _forget(self, sid: str) -> None:
+        user_id = self._sid_users.pop(sid, None)
+        sids = self._user_sids.get(user_id)
+        if sids is not None:
+            sids.discard(sid)
+            if not sids:
+                del self._user_sids[user_id]
+                self._usernames.pop(user_id, None)
+
+    @staticmethod
+    def _public(tabs: Tabs) -> Dict:
+        latest = max(tabs.values(), key=lambda entry: entry["entered_at"])
+        return {"start_time": latest["start_time"], "username": latest["username"], "task_name": latest["task_name"]}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sid_users.clear()
+            self._user_sids.clear()
+            self._usernames.clear()
+            self.store.clear()
@@ -0,0 +1,174 @@
+# Profiler estatístico sob demanda para as rotas Flask e os handlers do Socket.IO.
+#
+# Desligado, o custo é um `if profiler.armed` por requisição/evento. Ligado (POST /admin/profiler), vale para as
+# próximas N requisições que casam com o filtro (endpoint, regra da URL ou "socketio:<evento>") e/ou até o fim
+# de uma janela de tempo. Durante uma requisição perfilada, uma thread do sistema (mesmo com o eventlet
+# aplicado) lê a pilha da thread da requisição a cada `interval` segundos com sys._current_frames(); cada
+# amostra vira uma linha "mod:func;mod:func;... contagem" (formato collapsed do flamegraph.pl / speedscope),
+# gravada em um arquivo por requisição em PROFILE_DIR. Com o eventlet todas as green threads dividem uma thread
+# do sistema, então a amostra é da green thread que estiver rodando (com pouca concorrência, a perfilada).
+# O estado é por processo: com vários workers, cada um precisa ser ligado.
+
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from flask import g, request
+
+from app.utils.logger import logger
+from app.utils.metrics import metrics
+
+
+def _os_thread_api():
+    """(threading, sleep, get_ident) do sistema operacional, mesmo com o eventlet aplicado: green threads não
+    rodariam enquanto a requisição ocupa o hub, e sys._current_frames() é indexado por threads do sistema."""
+    if "eventlet" in sys.modules:  # sem o eventlet importado não há monkey patch; não vale pagar o import dele aqui
+        from eventlet import patcher
+        if patcher.is_monkey_patched("thread"):
+            return patcher.original("threading"), patcher.original("time").sleep, patcher.original("_thread").get_ident
+    return threading, time.sleep, threading.get_ident
+
+
+def collapse(frame, max_depth: int = 128) -> str:
+    names: List[str] = []
+    while frame is not None and len(names) < max_depth:
+        names.append(f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+@dataclass
+class _Capture:
+    name: str
+    thread_id: int
+    started_at: float
+    samples: Counter = field(default_factory=Counter)
+
+
+class SamplingProfiler:
+    def __init__(self):
+        self.armed = False
+        self.match: Optional[str] = None
+        self.remaining: Optional[int] = None
+        self.until: Optional[float] = None
+        self.interval = 0.005
+        self.directory: Optional[str] = None
+        self.max_files = 200
+        self._lock = _os_thread_api()[0].Lock()  # dividido com a thread de amostragem, que é do sistema
+        self._active: Dict[int, _Capture] = {}
+        self._sampler = None
+
+    def arm(self, directory: str, match: Optional[str] = None, requests: Optional[int] = None,
+            seconds: Optional[float] = None, interval_ms: float = 5, max_files: int = 200) -> Dict:
+        if requests is None and seconds is None:
+            raise ValueError("Give 'requests' and/or 'seconds' so profiling stops by itself.")
+        if (requests is not None and requests < 1) or (seconds is not None and seconds <= 0) or interval_ms <= 0:
+            raise ValueError("'requests', 'seconds' and 'interval_ms' must be positive.")
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            self.directory, self.match, self.max_files = directory, match, max_files
+            self.remaining = requests
+            self.until = time.monotonic() + seconds if seconds is not None else None
+            self.interval = interval_ms / 1000
+            self.armed = True
+        logger.warning(f"Profiler: Armed (match={match}, requests={requests}, seconds={seconds}, interval={interval_ms}ms).")
+        return self.status()
+
+    def disarm(self) -> None:
+        self.armed = False
+
+    def status(self) -> Dict:
+        return {
+            "armed": self.armed,
+            "match": self.match,
+            "remaining_requests": self.remaining,
+            "remaining_seconds": max(0.0, round(self.until - time.monotonic(), 1)) if self.until is not None else None,
+            "interval_ms": self.interval * 1000,
+        }
+
+    def start(self, name: str, *aliases: str) -> Optional[_Capture]:
+        """Começa a amostrar a thread atual se o profiler estiver ligado e `name` (ou um alias) casar com o filtro."""
+        if not self.armed:
+            return None
+        with self._lock:
+            if self.until is not None and time.monotonic() > self.until:
+                self.armed = False
+                return None
+            if self.match and self.match not in (name, *aliases):
+                return None
+            if self.remaining is not None:
+                self.remaining -= 1
+                if self.remaining <= 0:
+                    self.armed = False
+            threading_api, sleep, get_ident = _os_thread_api()
+            capture = _Capture(name=name, thread_id=get_ident(), started_at=time.perf_counter())
+            self._active[capture.thread_id] = capture
+            if self._sampler is None:
+                self._sampler = threading_api.Thread(target=self._sample_loop, args=(sleep,), name="profiler-sampler", daemon=True)
+                self._sampler.start()
+        return capture
+
+    def stop(self, capture: Optional[_Capture]) -> Optional[str]:
+        """Termina a captura e grava o arquivo .folded; devolve o nome do arquivo."""
+        if capture is None:
+            return None
+        with self._lock:
+            self._active.pop(capture.thread_id, None)
+        elapsed_ms = (time.perf_counter() - capture.started_at) * 1000
+        metrics.incr("profiler.captures")
+        if not capture.samples:
+            return None
+        safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", capture.name).strip("_")[:80]
+        filename = f"{time.strftime('%Y%m%dT%H%M%S')}-{int(elapsed_ms)}ms-{safe}-{capture.thread_id % 100000}.folded"
+        with open(os.path.join(self.directory, filename), "w") as f:
+            for stack, count in capture.samples.most_common():
+                f.write(f"{stack} {count}\n")
+        self._trim()
+        return filename
+
+    def profiles(self) -> List[str]:
+        if not self.directory or not os.path.isdir(self.directory):
+            return []
+        return sorted((name for name in os.listdir(self.directory) if name.endswith(".folded")), reverse=True)
+
+    def _trim(self) -> None:
+        for name in self.profiles()[self.max_files:]:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+    def _sample_loop(self, sleep) -> None:
+        while True:
+            frames = sys._current_frames()
+            with self._lock:
+                if not self._active:
+                    self._sampler = None
+                    return
+                for capture in self._active.values():
+                    frame = frames.get(capture.thread_id)
+                    if frame is not None:
+                        capture.samples[collapse(frame)] += 1
+            del frames
+            sleep(self.interval)
+
+
+profiler = SamplingProfiler()
+
+
+def register_profiler(app) -> None:
+    @app.before_request
+    def _start_profile():
+        if profiler.armed:
+            rule = request.url_rule.rule if request.url_rule else request.path
+            g.profile_capture = profiler.start(request.endpoint or request.path, rule, request.path)
+
+    @app.teardown_request
+    def _stop_profile(exc=None):
+        if "profile_capture" in g:
+            profiler.stop(g.pop("profile_capture", None))
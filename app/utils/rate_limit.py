@@ -0,0 +1,108 @@
+# Limite de eventos por conexão do Socket.IO (ver app/websocket.py).
+#
+# Cada (sid, evento) tem um token bucket: `burst` eventos de uma vez e depois `rate` por segundo. O que passa
+# do limite segue a política do evento:
+# - drop: o evento é descartado;
+# - coalesce: para eventos em que só o último importa (pedir a lista, entrar/sair de foco), guarda só os
+#   argumentos mais recentes e executa uma vez quando houver token. N chamadas em rajada viram no máximo uma.
+# Os buckets somem no disconnect, então a memória acompanha as conexões abertas.
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.utils.metrics import metrics
+
+DROP = "drop"
+COALESCE = "coalesce"
+
+
+@dataclass(frozen=True)
+class EventPolicy:
+    rate: float
+    burst: int
+    on_limit: str = DROP
+
+
+class TokenBucket:
+    __slots__ = ("rate", "burst", "tokens", "updated_at")
+
+    def __init__(self, rate: float, burst: int, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = now
+
+    def take(self, now: float) -> float:
+        """Consome um token e devolve 0; sem token, devolve quantos segundos faltam para o próximo."""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class SocketRateLimiter:
+    def __init__(self, policies: Dict[str, EventPolicy], default: EventPolicy,
+                 clock: Callable[[], float] = time.monotonic):
+        self.policies = dict(policies)
+        self.default = default
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Dict[str, TokenBucket]] = {}  # sid -> {evento: bucket}
+        self._pending: Dict[str, Dict[str, tuple]] = {}  # sid -> {evento: argumentos mais recentes}
+        metrics.register_gauge("socket.rate_limit.sids", lambda: len(self._buckets))
+
+    def policy(self, event: str) -> EventPolicy:
+        return self.policies.get(event, self.default)
+
+    def check(self, sid: str, event: str) -> float:
+        """0 se o evento pode rodar agora; senão, os segundos até o próximo token."""
+        now = self._clock()
+        with self._lock:
+            buckets = self._buckets.setdefault(sid, {})
+            bucket = buckets.get(event)
+            if bucket is None:
+                policy = self.policy(event)
+                bucket = buckets[event] = TokenBucket(policy.rate, policy.burst, now)
+            wait = bucket.take(now)
+        if wait:
+            metrics.incr(f"socket.throttled.{event}")
+        return wait
+
+    def defer(self, sid: str, event: str, args: tuple) -> bool:
+        """Guarda os argumentos mais recentes de um evento limitado. True se ainda não havia um pendente
+        (o chamador agenda a execução); False se só substituiu os argumentos do que já estava agendado."""
+        with self._lock:
+            pending = self._pending.setdefault(sid, {})
+            first = event not in pending
+            pending[event] = args
+        metrics.incr(f"socket.coalesced.{event}")
+        return first
+
+    def pop_pending(self, sid: str, event: str) -> Optional[tuple]:
+        with self._lock:
+            pending = self._pending.get(sid)
+            if not pending:
+                return None
+            args = pending.pop(event, None)
+            if not pending:
+                del self._pending[sid]
+            return args
+
+    def forget(self, sid: str) -> None:
+        with self._lock:
+            self._buckets.pop(sid, None)
+            self._pending.pop(sid, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+            self._pending.clear()
+
+
+def slow_consumers(queue_sizes: Iterable[Tuple[str, int]], max_packets: int) -> List[str]:
+    """Conexões com mais de max_packets pacotes esperando envio: o cliente não está lendo."""
+    return [sid for sid, size in queue_sizes if size > max_packets]
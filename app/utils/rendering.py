@@ -0,0 +1,41 @@
+# Renderização de páginas em streaming.
+#
+# O gerador do Jinja produz um pedaço por instrução do template; aqui eles são agrupados para não mandar
+# centenas de writes pequenos. O primeiro chunk sai cedo (head com os CSS e o topo da página), antes de
+# o template chegar às listas, e o restante é enviado em blocos de STREAM_CHUNK_BYTES.
+
+import time
+
+from flask import Response, g, stream_template, stream_with_context
+
+from app.utils.metrics import metrics
+
+FIRST_CHUNK_BYTES = 1024
+STREAM_CHUNK_BYTES = 16 * 1024
+
+
+def _chunks(template_name: str, pieces):
+    started_at = g.get("request_started_at") or time.perf_counter()
+    cpu_started_at = time.thread_time()
+    buffer, size, first = [], 0, True
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= (FIRST_CHUNK_BYTES if first else STREAM_CHUNK_BYTES):
+            if first:
+                metrics.observe(f"render.{template_name}.ttfb", (time.perf_counter() - started_at) * 1000)
+                first = False
+            yield "".join(buffer)
+            buffer, size = [], 0
+    if first:
+        metrics.observe(f"render.{template_name}.ttfb", (time.perf_counter() - started_at) * 1000)
+    if buffer:
+        yield "".join(buffer)
+    metrics.observe(f"render.{template_name}.cpu", (time.thread_time() - cpu_started_at) * 1000)
+    metrics.observe(f"render.{template_name}.total", (time.perf_counter() - started_at) * 1000)
+
+
+def stream_page(template_name: str, **context) -> Response:
+    """Como render_template, mas devolve uma resposta em streaming e registra TTFB e CPU de render em /metrics."""
+    pieces = stream_template(template_name, **context)
+    return Response(stream_with_context(_chunks(template_name, pieces)), mimetype="text/html")
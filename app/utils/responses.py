@@ -0,0 +1,19 @@
+# Envelope padrão das respostas JSON: {"success", "message", "data", "error"}.
+# `data` pode ser um objeto de domínio (Task, Project, ...): o provider de JSON chama o __json__() dele.
+
+from typing import Any, Optional
+
+from flask import jsonify
+
+
+def success_response(data: Any = None, message: str = "", status: int = 200):
+    return jsonify({"success": True, "message": message, "data": data, "error": None}), status
+
+
+def error_response(status: int, message: str, error_type: str, details: Optional[Any] = None):
+    return jsonify({
+        "success": False,
+        "message": message,
+        "data": None,
+        "error": {"code": status, "type": error_type, "details": details},
+    }), status
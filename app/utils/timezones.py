@@ -0,0 +1,61 @@
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from typing import Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+# started_at é gravado como datetime "naive" em UTC; o fuso do usuário só entra na hora de decidir a que dia local
+# cada instante pertence. Todas as funções abaixo recebem e devolvem UTC naive, exceto onde dito.
+
+DEFAULT_TIMEZONE = "UTC"
+
+
+@lru_cache(maxsize=None)
+def get_zone(name: str) -> ZoneInfo:
+    """ZoneInfo pelo nome IANA (ex.: 'America/Sao_Paulo'). Levanta ValueError para nomes desconhecidos."""
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError, TypeError):
+        raise ValueError(f"Unknown timezone '{name}'.")
+
+
+def is_valid_timezone(name: str) -> bool:
+    try:
+        get_zone(name)
+        return True
+    except ValueError:
+        return False
+
+
+def to_utc(value: datetime, tz_name: str) -> datetime:
+    """Converte para UTC naive. Datetimes sem offset são interpretados no fuso do usuário (clientes antigos)."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=get_zone(tz_name))
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def to_local(value_utc: datetime, tz_name: str) -> datetime:
+    """UTC naive -> datetime local com tzinfo."""
+    return value_utc.replace(tzinfo=timezone.utc).astimezone(get_zone(tz_name))
+
+
+def local_date(value_utc: datetime, tz_name: str) -> date:
+    return to_local(value_utc, tz_name).date()
+
+
+def local_today(tz_name: str) -> date:
+    return datetime.now(get_zone(tz_name)).date()
+
+
+def first_day_of_week(day: date) -> date:
+    """Domingo da semana de `day` (as somas semanais da home começam no domingo)."""
+    return day - timedelta(days=(day.weekday() + 1) % 7)
+
+
+def local_midnight_utc(day: date, tz_name: str) -> datetime:
+    """Instante UTC (naive) em que o dia local começa; em dias de horário de verão o dia tem 23 ou 25 horas."""
+    return datetime.combine(day, time.min, tzinfo=get_zone(tz_name)).astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def local_day_range_utc(first_day: date, last_day: date, tz_name: str) -> Tuple[datetime, datetime]:
+    """Intervalo UTC semiaberto [início de first_day, início do dia seguinte a last_day) no fuso do usuário."""
+    return local_midnight_utc(first_day, tz_name), local_midnight_utc(last_day + timedelta(days=1), tz_name)
@@ -1,43 +1,226 @@
-from flask_socketio import SocketIO, join_room, leave_room, emit
-from flask import request
+from functools import wraps
+
+import jwt
+from flask_socketio import join_room
+from flask import current_app, request
+from .infra.repository.user_repository import UserRepository
+from .services.focus_group_service import FocusGroupService
+from .utils.live_updates import group_room, user_room
 from .utils.logger import logger
+from .utils.metrics import metrics
+from .utils.presence import MemoryFocusStore, PresenceRegistry, RedisFocusStore
+from .utils.profiler import profiler
+from .utils.rate_limit import SocketRateLimiter, EventPolicy, COALESCE, DROP, slow_consumers
 from .extensions import socketio
 
 
-focused_users = {}  # Armazena usuários em foco
+presence = PresenceRegistry()  # Usuários em foco, com índice sid -> usuário (ver app/utils/presence.py)
+# enter_focus e leave_focus dividem o mesmo limite ("focus"): numa rajada vale o último dos dois.
+limiter = SocketRateLimiter(
+    policies={
+        "get_focus_users": EventPolicy(rate=1, burst=3, on_limit=COALESCE),
+        "focus": EventPolicy(rate=2, burst=5, on_limit=COALESCE),
+        "sync_rooms": EventPolicy(rate=1, burst=3, on_limit=COALESCE),
+    },
+    default=EventPolicy(rate=5, burst=10, on_limit=DROP),
+)
+_sweeper_started = False
+
+
+def _authenticated_user():
+    """Usuário do cookie auth_token (o mesmo do login_required); user_id da query string não é confiável."""
+    token = request.cookies.get("auth_token")
+    if not token:
+        return None
+    try:
+        payload = jwt.decode(token, current_app.config["SECRET_KEY"], algorithms=["HS256"])
+    except (jwt.ExpiredSignatureError, jwt.InvalidTokenError):
+        return None
+    return UserRepository().get_by_id(payload.get("id"))
+
+
+def _broadcast(change):
+    # Só para as salas de quem se importa: as outras abas do usuário e os grupos dele. A lista nunca é vazia
+    # (emit com to=[] iria para todas as conexões), e quem está em dois grupos em comum recebe uma vez só.
+    user_id, entry = change
+    rooms = FocusGroupService().get_rooms(user_id)
+    if entry is None:
+        socketio.emit("focus_user_left", {"user_id": user_id}, to=rooms)
+    else:
+        socketio.emit("focus_user_joined", {user_id: entry}, to=rooms)
+
+
+def sync_group_rooms(user_id, group_id, joined):
+    """Coloca (ou tira) as abas abertas do usuário na sala do grupo depois de entrar ou sair dele.
+
+    Só move os sids deste processo; abas conectadas a outros workers recebem groups_changed (pela message queue)
+    e pedem sync_rooms, que refaz as salas delas no worker onde estão.
+    """
+    room = group_room(group_id)
+    for sid in presence.sids(user_id):
+        if joined:
+            socketio.server.enter_room(sid, room, namespace="/")
+        else:
+            socketio.server.leave_room(sid, room, namespace="/")
+    # Os dois lados refazem a lista: quem mudou de grupo e quem já estava nele.
+    socketio.emit("groups_changed", {"group_id": group_id}, to=[user_room(user_id), room])
+
+
+def configure_presence(app):
+    """Entradas de foco no Redis de PRESENCE_REDIS_URL (compartilhadas entre os workers web) ou em memória."""
+    url = app.config["PRESENCE_REDIS_URL"]
+    presence.use(RedisFocusStore(url) if url else MemoryFocusStore())
+
+
+def _sweep_loop():
+    interval = current_app.config["PRESENCE_SWEEP_SECONDS"]
+    manager = socketio.server.manager
+    while True:
+        # Três varreduras de folga antes de os outros workers considerarem este morto.
+        presence.heartbeat(ttl_seconds=3 * interval)
+        socketio.sleep(interval)
+        for change in presence.sweep(lambda sid: manager.is_connected(sid, "/")):
+            _broadcast(change)
+
+
+def _disconnect_slow_consumers():
+    """Derruba conexões cuja fila de saída passou de SOCKET_OUTBOUND_MAX_PACKETS: o cliente não lê, e a fila
+    (na memória do servidor) cresceria a cada broadcast. O disconnect limpa a presença como qualquer outro."""
+    eio = socketio.server.eio
+    sizes = [(eio_sid, sock.queue.qsize()) for eio_sid, sock in list(eio.sockets.items())]
+    for eio_sid in slow_consumers(sizes, current_app.config["SOCKET_OUTBOUND_MAX_PACKETS"]):
+        logger.warning(f"Websocket: Disconnecting slow consumer {eio_sid}: outbound queue over limit.")
+        metrics.incr("socket.slow_consumer_disconnects")
+        eio.disconnect(eio_sid)
+
+
+def _outbound_loop():
+    interval = current_app.config["SOCKET_OUTBOUND_CHECK_SECONDS"]
+    while True:
+        socketio.sleep(interval)
+        _disconnect_slow_consumers()
+
+
+def _start_sweeper():
+    global _sweeper_started
+    if not _sweeper_started:
+        _sweeper_started = True
+        app = current_app._get_current_object()
+
+        for loop in (_sweep_loop, _outbound_loop):
+            def run(loop=loop):
+                with app.app_context():
+                    loop()
+
+            socketio.start_background_task(run)
+
+
+def _run_deferred(app, sid, key, wait):
+    # Executa a última chamada limitada de (sid, key) quando houver token, se a conexão ainda existir.
+    while wait:
+        socketio.sleep(wait)
+        if presence.user_for(sid) is None:
+            limiter.pop_pending(sid, key)
+            return
+        wait = limiter.check(sid, key)
+    pending = limiter.pop_pending(sid, key)
+    if pending is not None:
+        func, args = pending
+        with app.app_context():
+            func(sid, *args)
+
+
+def limited(event, key=None):
+    """Registra o handler de `event` com o limite de `key` (padrão: o próprio evento). O handler recebe o sid."""
+    key = key or event
+
+    def decorator(func):
+        @wraps(func)
+        def handler(*args):
+            sid = request.sid
+            wait = limiter.check(sid, key)
+            if not wait:
+                if not profiler.armed:
+                    return func(sid, *args)
+                capture = profiler.start(f"socketio:{event}")
+                try:
+                    return func(sid, *args)
+                finally:
+                    profiler.stop(capture)
+            if limiter.policy(key).on_limit == COALESCE:
+                if limiter.defer(sid, key, (func, args)):
+                    socketio.start_background_task(_run_deferred, current_app._get_current_object(), sid, key, wait)
+            else:
+                metrics.incr(f"socket.dropped.{event}")
+
+        return socketio.on(event)(handler)
+    return decorator
+
 
 @socketio.on("connect")
 def handle_connect():
-    user_id = request.args.get("user_id")
-    username = request.args.get("username")
+    user = _authenticated_user()
+    if user is None:
+        logger.warning(f"Websocket: Connection {request.sid} refused: missing or invalid auth token.")
+        return False
+
+    presence.connect(request.sid, user.identificator, user.username)
+    for room in FocusGroupService().get_rooms(user.identificator):
+        join_room(room)
+    _start_sweeper()
+    logger.info(f"Usuário {user.username} ({user.identificator}) conectado ao websocket.")
+
 
-    # emit("user_connected", {"user_id": user_id}, broadcast=True)
-    logger.info(f"Usuário {username} ({user_id}) conectado ao websocket.")
+@socketio.on("disconnect")
+def handle_disconnect(*args):
+    # Aba fechada ou caída sem leave_focus: remove só as entradas deste sid.
+    change = presence.disconnect(request.sid)
+    limiter.forget(request.sid)
+    if change:
+        _broadcast(change)
 
 
+@limited("enter_focus", key="focus")
+def enter_focus(sid, data):
+    # O usuário vem do sid (autenticado no connect), não do user_id/username enviados pelo cliente.
+    change = presence.enter(sid, task_name=data.get("task_name"), start_time=data.get("start_time"))
+    if change:
+        _broadcast(change)
 
-@socketio.on("enter_focus")
-def enter_focus(data):
-    user_id = data.get("user_id")
-    username = data.get("username")
+@limited("leave_focus", key="focus")
+def leave_focus(sid, data=None):
+    change = presence.leave(sid)
+    if change:
+        _broadcast(change)
 
-    task_name = data.get("task_name")
-    start_time = data.get("start_time")
+@limited("get_focus_users")
+def get_focus_users(sid):
+    # Só para quem pediu, e só quem está nos grupos dele (mais ele mesmo).
+    user_id = presence.user_for(sid)
+    if user_id is None:
+        return
+    _send_focus_users(sid, user_id)
 
-    if user_id:
-        # join_room("focus_session")
-        focused_users[user_id] = {"start_time": start_time, "username": username, "task_name": task_name }
-        emit("focus_user_joined", { user_id: {"start_time": start_time, "username": username, "task_name": task_name } }, broadcast=True)
 
-@socketio.on("leave_focus")
-def leave_focus(data):
-    user_id = data.get("user_id")
+@limited("sync_rooms")
+def sync_rooms(sid, data=None):
+    # Resposta do cliente a groups_changed: relê do banco os grupos do usuário e os membros do grupo que mudou,
+    # acerta as salas de grupo deste sid e devolve a lista visível já atualizada.
+    user_id = presence.user_for(sid)
+    if user_id is None:
+        return
+    service = FocusGroupService()
+    group_id = (data or {}).get("group_id")
+    if isinstance(group_id, int):
+        service.refresh(user_id, group_id)
+    wanted = set(service.get_rooms(user_id))
+    current = {room for room in socketio.server.rooms(sid, namespace="/") if room.startswith(group_room(""))}
+    for room in current - wanted:
+        socketio.server.leave_room(sid, room, namespace="/")
+    for room in wanted - current:
+        socketio.server.enter_room(sid, room, namespace="/")
+    _send_focus_users(sid, user_id)
 
-    if user_id in focused_users:
-        #leave_room("focus_session")
-        del focused_users[user_id]
-        emit("focus_user_left", {"user_id": user_id}, broadcast=True)
 
-@socketio.on("get_focus_users")
-def get_focus_users():
-    emit("update_focus_users", {"focused_users": focused_users}, broadcast=True)
\ No newline at end of file
+def _send_focus_users(sid, user_id):
+    socketio.emit("update_focus_users", {"focused_users": presence.snapshot(FocusGroupService().get_visible_users(user_id))}, to=sid)
@@ -0,0 +1,75 @@
+# Servidor com master pré-carregado: importa e aquece o app uma vez, congela o heap (gc.freeze) e faz fork
+# dos workers, que dividem com o master as páginas de memória copy-on-write (ver app/utils/prefork.py).
+#
+#   python prefork.py --workers 4 --port 5000
+#   python prefork.py --workers 4 --job-workers 2   # a fila de trabalhos sai das requisições (JOBS_RUN_INLINE=0)
+#
+# Todos os workers aceitam conexões do mesmo socket, aberto no master, então uma conexão cai em qualquer um
+# deles. Por isso, com mais de um worker web: o Socket.IO precisa de SOCKETIO_MESSAGE_QUEUE (emits para salas
+# chegam aos sockets de todos os workers), a presença precisa de PRESENCE_REDIS_URL (quem está em foco é o
+# mesmo em todos os workers; por padrão o Redis da fila) e os clientes usam só o transporte websocket (uma
+# sessão de long-polling não sobrevive a requisições em workers diferentes). O rate limit dos eventos continua
+# por conexão, e o leaderboard sem Redis, por worker.
+# Não use pelo `flask` CLI: lá o Flask-SocketIO força o modo threading.
+
+import argparse
+import gc
+import os
+import socket
+
+gc.disable()  # sem coletas no master até o fork: objetos liberados deixariam buracos nas páginas compartilhadas
+
+from app import create_app, socketio
+from app.commands.job_commands import run_worker
+from app.infra.db import db
+from app.utils.prefork import PreforkMaster
+from app.utils.preload import preload
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Master pre-fork para o Focus Time.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=1, help="Workers web; mais de um exige SOCKETIO_MESSAGE_QUEUE e PRESENCE_REDIS_URL.")
+    parser.add_argument("--job-workers", type=int, default=0,
+                        help="Workers da fila de trabalhos; com 0 os trabalhos rodam na própria requisição.")
+    parser.add_argument("--report-interval", type=float, default=60.0,
+                        help="Segundos entre relatórios de memória por worker (0 desliga).")
+    args = parser.parse_args()
+
+    app = create_app()
+    if args.workers > 1 and not app.config["SOCKETIO_MESSAGE_QUEUE"]:
+        parser.error("more than one web worker needs SOCKETIO_MESSAGE_QUEUE (e.g. redis://localhost:6379/0).")
+    if args.workers > 1 and not app.config["PRESENCE_REDIS_URL"]:
+        parser.error("more than one web worker needs a shared presence store: set PRESENCE_REDIS_URL (e.g. redis://localhost:6379/0).")
+    if args.job_workers:
+        app.config["JOBS_RUN_INLINE"] = False
+    if socketio.async_mode != "eventlet":
+        parser.error(f"the prefork server needs eventlet (Socket.IO async mode is '{socketio.async_mode}').")
+    import eventlet
+    import eventlet.wsgi
+
+    warmed = preload(app)
+    print(f"Preloaded in {warmed['elapsed_ms']} ms: {warmed['controllers']} controllers, {warmed['statements']} statements, "
+          f"{warmed['templates']} templates, {warmed['task_statuses']} task statuses.", flush=True)
+
+    # Cada worker abre as próprias conexões; nenhuma conexão do aquecimento pode ser herdada.
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
+
+    listener = eventlet.listen((args.host, args.port))
+
+    def serve(index: int) -> None:
+        if index >= args.workers:
+            with app.app_context():
+                run_worker(f"{socket.gethostname()}:{os.getpid()}", burst=False, poll_interval=1.0)
+            return
+        eventlet.wsgi.server(listener, app, log_output=False)
+
+    print(f"Listening on {args.host}:{args.port} with {args.workers} web workers and {args.job_workers} job workers.", flush=True)
+    PreforkMaster(serve, args.workers + args.job_workers).run(report_interval=args.report_interval)
+
+
+if __name__ == "__main__":
+    main()